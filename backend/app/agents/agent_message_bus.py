@@ -1,8 +1,17 @@
 import asyncio
+import itertools
 import logging
-from typing import Dict, Any, List, Optional
+import time
+from collections import deque
+from typing import Dict, Any, List, Optional, Deque, Tuple
 from datetime import datetime
 
+from app.core.config import settings
+from .message_transport import MessageTransport, build_transport
+
+# Lower rank is delivered first
+PRIORITY_RANK = {"CRITICAL": 0, "URGENT": 1, "NORMAL": 2}
+
 class AgentMessage:
     """
     Represents a message passed between agents.
@@ -21,6 +30,30 @@ class AgentMessage:
         self.data = data
         self.priority = priority  # NORMAL, URGENT, CRITICAL
         self.timestamp = datetime.now().isoformat()
+        self.seq = 0
+        self.enqueued_at = time.monotonic()
+    
+    @property
+    def rank(self) -> int:
+        return PRIORITY_RANK.get(self.priority, PRIORITY_RANK["NORMAL"])
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "from_agent": self.from_agent,
+            "to_agent": self.to_agent,
+            "message_type": self.message_type,
+            "data": self.data,
+            "priority": self.priority,
+            "timestamp": self.timestamp,
+            "seq": self.seq
+        }
+    
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> "AgentMessage":
+        message = cls(payload["from_agent"], payload["to_agent"], payload["message_type"], payload.get("data") or {}, payload.get("priority", "NORMAL"))
+        message.timestamp = payload.get("timestamp", message.timestamp)
+        message.seq = payload.get("seq", 0)
+        return message
 
 class AgentMessageBus:
     """
@@ -30,12 +63,45 @@ class AgentMessageBus:
     - Send urgent messages that override normal sequence
     - Negotiate and collaborate
     - Trigger each other based on real-time data
+    
+    Every subscriber has its own bounded priority mailbox (CRITICAL > URGENT > NORMAL,
+    FIFO within a priority) served by its own worker, so subscribers are dispatched
+    concurrently and a slow one only back-pressures the senders writing to it.
+    History is a ring buffer with per-type and per-agent indexes.
+    
+    The transport is pluggable (MESSAGE_BUS_TRANSPORT): "inprocess" delivers straight
+    into the mailboxes, "sqlite" goes through a shared WAL log so agents in other
+    worker processes receive the message. The SQLite transport is shared by every
+    bus in the process; `channel` keeps their topics and offsets apart.
     """
     
-    def __init__(self):
-        self.message_queue = asyncio.Queue()
-        self.message_history: List[AgentMessage] = []
-        self.subscribers: Dict[str, List] = {}
+    def __init__(
+        self,
+        history_size: Optional[int] = None,
+        mailbox_size: Optional[int] = None,
+        transport: Optional[MessageTransport] = None,
+        channel: str = "default"
+    ):
+        self.channel = channel  # Scopes agent names on shared transports (one per session)
+        self.transport = transport or build_transport()
+        self.history_size = history_size or settings.MESSAGE_BUS_HISTORY_SIZE
+        self.mailbox_size = mailbox_size or settings.MESSAGE_BUS_MAILBOX_SIZE
+        self.message_history: Deque[AgentMessage] = deque()
+        self._by_type: Dict[str, Deque[AgentMessage]] = {}
+        self._by_agent: Dict[str, Deque[AgentMessage]] = {}
+        self.subscribers: Dict[str, Any] = {}
+        self._mailboxes: Dict[str, asyncio.PriorityQueue] = {}
+        self._workers: Dict[str, asyncio.Task] = {}
+        self._running = False
+        self._seq = itertools.count(1)
+        
+        self.sent = 0
+        self.delivered = 0
+        self.failed = 0
+        self.unrouted = 0
+        self.sent_by_priority: Dict[str, int] = {priority: 0 for priority in PRIORITY_RANK}
+        self._latencies: Deque[float] = deque(maxlen=1000)
+        self.max_latency = 0.0
     
     async def send_message(
         self,
@@ -52,14 +118,16 @@ class AgentMessageBus:
         - NORMAL: Standard agent communication
         - URGENT: Requires immediate attention
         - CRITICAL: Overrides all normal operations
+        
+        Waits if the recipient's mailbox is full (backpressure).
         """
         message = AgentMessage(from_agent, to_agent, message_type, data, priority)
+        message.seq = next(self._seq)
         
         # Store in history
-        self.message_history.append(message)
-        
-        # Add to queue
-        await self.message_queue.put(message)
+        self._record(message)
+        self.sent += 1
+        self.sent_by_priority[priority] = self.sent_by_priority.get(priority, 0) + 1
         
         # Log based on priority
         if priority == "CRITICAL":
@@ -68,44 +136,135 @@ class AgentMessageBus:
             logging.warning(f"[MessageBus] URGENT from {from_agent} to {to_agent}: {message_type}")
         else:
             logging.info(f"[MessageBus] {from_agent} -> {to_agent}: {message_type}")
+        
+        await self.transport.publish(self, message)
+    
+    async def _enqueue_local(self, message: AgentMessage):
+        mailbox = self._mailboxes.get(message.to_agent)
+        if mailbox is None:
+            logging.warning(f"[MessageBus] No subscriber for {message.to_agent}")
+            self.unrouted += 1
+            await self._handle_priority(message)
+            return
+        await mailbox.put((message.rank, message.seq, message))
+    
+    def _record(self, message: AgentMessage):
+        """
+        Appends to the ring buffer. Index deques are in insertion order, so the
+        evicted message is always at the left of its type/agent index.
+        """
+        if len(self.message_history) >= self.history_size:
+            evicted = self.message_history.popleft()
+            for index, key in ((self._by_type, evicted.message_type), (self._by_agent, evicted.from_agent), (self._by_agent, evicted.to_agent)):
+                bucket = index.get(key)
+                if bucket and bucket[0] is evicted:
+                    bucket.popleft()
+                    if not bucket:
+                        del index[key]
+        self.message_history.append(message)
+        self._by_type.setdefault(message.message_type, deque()).append(message)
+        self._by_agent.setdefault(message.from_agent, deque()).append(message)
+        if message.to_agent != message.from_agent:
+            self._by_agent.setdefault(message.to_agent, deque()).append(message)
     
     async def start_router(self):
         """
-        Starts the message router that distributes messages to agents.
-        This runs continuously as a background task.
+        Starts one delivery worker per subscriber and runs until cancelled.
+        Workers block on their mailbox; nothing polls.
         """
         logging.info("[MessageBus] Starting message router...")
-        
+        self._running = True
+        for agent_name in self.subscribers:
+            self._start_worker(agent_name)
+        try:
+            await self.transport.start(self)
+            await asyncio.Event().wait()
+        finally:
+            self._running = False
+            await self.transport.stop(self)
+            workers = list(self._workers.values())
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            self._workers.clear()
+    
+    def _start_worker(self, agent_name: str):
+        worker = self._workers.get(agent_name)
+        if worker is None or worker.done():
+            self._workers[agent_name] = asyncio.create_task(self._worker(agent_name))
+    
+    async def _worker(self, agent_name: str):
+        mailbox = self._mailboxes[agent_name]
         while True:
+            _, _, message = await mailbox.get()
             try:
-                message = await asyncio.wait_for(
-                    self.message_queue.get(),
-                    timeout=1.0
-                )
-                
-                # Route to subscriber
-                if message.to_agent in self.subscribers:
-                    callback = self.subscribers[message.to_agent]
-                    await callback(message)
-                else:
-                    logging.warning(f"[MessageBus] No subscriber for {message.to_agent}")
-                
-                # Handle URGENT messages with immediate action
-                if message.priority == "URGENT":
-                    await self._handle_urgent_message(message)
-                elif message.priority == "CRITICAL":
-                    await self._handle_critical_message(message)
-                
-            except asyncio.TimeoutError:
-                continue
+                await self._route(message)
             except Exception as e:
                 logging.error(f"[MessageBus] Error routing message: {e}")
+            finally:
+                mailbox.task_done()
+    
+    async def drain(self) -> int:
+        """
+        Routes every message currently queued (highest priority first, across all
+        mailboxes) and returns how many were delivered.
+        Used by MarathonScheduler after each cycle instead of a long-lived router task.
+        """
+        pending: List[Tuple[int, int, AgentMessage]] = []
+        for mailbox in self._mailboxes.values():
+            while not mailbox.empty():
+                pending.append(mailbox.get_nowait())
+                mailbox.task_done()
+        
+        delivered = 0
+        for _, _, message in sorted(pending, key=lambda item: item[:2]):
+            try:
+                await self._route(message)
+                delivered += 1
+            except Exception as e:
+                logging.error(f"[MessageBus] Error routing message: {e}")
+        
+        # Messages published by other processes (no-op for the in-process transport)
+        delivered += await self.transport.drain(self)
+        return delivered
+    
+    async def _route(self, message: AgentMessage):
+        latency = time.monotonic() - message.enqueued_at
+        self._latencies.append(latency)
+        self.max_latency = max(self.max_latency, latency)
+        
+        # Route to subscriber
+        callback = self.subscribers.get(message.to_agent)
+        if callback is not None:
+            try:
+                await callback(message)
+                self.delivered += 1
+            except Exception:
+                self.failed += 1
+                raise
+            finally:
+                await self._handle_priority(message)
+        else:
+            logging.warning(f"[MessageBus] No subscriber for {message.to_agent}")
+            self.unrouted += 1
+            await self._handle_priority(message)
+    
+    async def _handle_priority(self, message: AgentMessage):
+        # Handle URGENT messages with immediate action
+        if message.priority == "URGENT":
+            await self._handle_urgent_message(message)
+        elif message.priority == "CRITICAL":
+            await self._handle_critical_message(message)
     
     def subscribe(self, agent_name: str, callback):
         """
         Subscribe an agent to receive messages.
         """
         self.subscribers[agent_name] = callback
+        if agent_name not in self._mailboxes:
+            self._mailboxes[agent_name] = asyncio.PriorityQueue(maxsize=self.mailbox_size)
+        if self._running:
+            self._start_worker(agent_name)
         logging.info(f"[MessageBus] {agent_name} subscribed to message bus")
     
     async def _handle_urgent_message(self, message: AgentMessage):
@@ -158,10 +317,35 @@ class AgentMessageBus:
         """
         Get the most recent messages from the history.
         """
-        return self.message_history[-limit:]
+        return list(self.message_history)[-limit:] if limit > 0 else []
     
     def get_messages_by_type(self, message_type: str) -> List[AgentMessage]:
         """
-        Get all messages of a specific type.
+        Get all retained messages of a specific type.
         """
-        return [m for m in self.message_history if m.message_type == message_type]
+        return list(self._by_type.get(message_type, ()))
+    
+    def get_messages_for_agent(self, agent_name: str) -> List[AgentMessage]:
+        """
+        Get all retained messages sent by or to an agent.
+        """
+        return list(self._by_agent.get(agent_name, ()))
+    
+    def metrics(self) -> Dict[str, Any]:
+        latencies = sorted(self._latencies)
+        return {
+            "queue_depth": {name: mailbox.qsize() for name, mailbox in self._mailboxes.items()},
+            "total_queue_depth": sum(mailbox.qsize() for mailbox in self._mailboxes.values()),
+            "sent": self.sent,
+            "sent_by_priority": dict(self.sent_by_priority),
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "unrouted": self.unrouted,
+            "history_size": len(self.message_history),
+            "transport": self.transport.stats(),
+            "latency_ms": {
+                "avg": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+                "p95": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 3) if latencies else 0.0,
+                "max": round(self.max_latency * 1000, 3)
+            }
+        }
@@ -1,13 +1,18 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import logging
 import json
-import re
-import subprocess
 import asyncio
-import tempfile
-from pathlib import Path
+import httpx
 from datetime import datetime
 
+from app.core.config import settings
+from app.services.code_extractor import PageScan, extract_code_blocks
+from app.services.concurrency import async_map
+from app.services.http_pool import HttpPool
+from app.services.sandbox_pool import SandboxPool
+from app.services.schedule_builder import build_schedule, polish_reminders
+from .verification_pipeline import VerificationPipeline
+
 try:
     from app.services.gemini_client import gemini_client
 except ImportError:
@@ -25,68 +30,50 @@ class ExecutionAgent:
     async def find_resources(self, roadmap: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
         Iterates through roadmap milestones and identifies specific resource types and search paths.
+        Milestones are processed concurrently (bounded); a milestone that fails or
+        times out gets no suggestions instead of failing the whole search.
         """
         logging.info("🔍 Searching for specialized resources...")
         logging.debug(f"Resource search input: roadmap_keys={list(roadmap.keys())}")
 
         milestones = roadmap.get("milestones", [])
-        all_resources = []
         logging.debug(f"Processing {len(milestones)} milestones")
 
-        for milestone in milestones:
-            logging.debug(f"Finding resources for milestone: {milestone.get('title', 'Unknown')}")
-            # We use Gemini to suggest the best specific search strings or resource names
-            # In a full system, this would trigger a SERP API call
-            suggestion = await self._get_resource_suggestions(milestone)
-            all_resources.append({
+        # We use Gemini to suggest the best specific search strings or resource names
+        # In a full system, this would trigger a SERP API call
+        suggestions = await async_map(self._get_resource_suggestions, milestones, label="ResourceSearch")
+        all_resources = [
+            {
                 "milestone": milestone["title"],
-                "suggestions": suggestion
-            })
+                "suggestions": suggestion or []
+            }
+            for milestone, suggestion in zip(milestones, suggestions.results)
+        ]
 
-        logging.info(f"✅ Resource search completed: {len(all_resources)} milestone resources found")
+        logging.info(f"✅ Resource search completed: {len(all_resources)} milestone resources found ({suggestions.stats()})")
         return all_resources
     
-    async def generate_schedule(self, roadmap: Dict[str, Any], hours_per_week: int = 15, constraints: List[str] = []) -> Dict[str, Any]:
+    async def generate_schedule(
+        self,
+        roadmap: Dict[str, Any],
+        hours_per_week: int = 15,
+        constraints: Optional[List[str]] = None,
+        polish: Optional[bool] = None
+    ) -> Dict[str, Any]:
         """
         Generates a 4-week daily task schedule based on first few milestones.
+        Built locally (never over hours_per_week); Gemini optionally polishes reminder texts.
         """
         logging.info(f"📅 Generating 4-week learning schedule with {hours_per_week} hrs/week...")
         logging.debug(f"Schedule config: hours_per_week={hours_per_week}, constraints={constraints}")
 
-        milestones = roadmap.get("months", [])[:2] # Look at first two milestones
-        logging.debug(f"Using {len(milestones)} milestones for schedule generation")
-        
-        if gemini_client is None:
-            logging.warning("gemini_client not available, cannot generate schedule")
-            return {"sprints": [], "error": "Gemini client not configured"}
-        
-        prompt = f"""
-        Generate a 4-week (4 sprints) 'Daily Learning Schedule' based on these milestones: {json.dumps(milestones)}
-        
-        USER CONSTRAINTS:
-        - Hours available per week: {hours_per_week}
-        - Special constraints: {', '.join(constraints)}
-        
-        OUTPUT REQUIREMENTS:
-        1. Return a JSON object with a list 'sprints'.
-        2. Each sprint MUST have 'week_number', 'milestone_title', 'days' (7 days), and 'focus_area'.
-        3. Each day in 'days' MUST have 'day', 'topic', 'duration_min', and 'reminder_text'.
-        4. CRITICAL: Total 'duration_min' per week MUST NOT exceed {hours_per_week * 60} minutes.
-        5. The focus_area should be a 1-sentence summary of that week's goal.
+        schedule = build_schedule(roadmap, hours_per_week, constraints)
         
-        Return ONLY valid JSON.
-        """
+        polish = settings.SCHEDULE_POLISH_REMINDERS if polish is None else polish
+        if polish:
+            await polish_reminders(schedule, gemini_client)
         
-        try:
-            response = await gemini_client.generate_content_async(prompt, generation_config={"response_mime_type": "application/json"})
-            return json.loads(response.text)
-        except Exception as e:
-            logging.error(f"Schedule generation failed: {e}")
-            # No fallback - return empty schedule
-            return {
-                "sprints": [],
-                "error": str(e)
-            }
+        return schedule.model_dump()
     
     async def _get_resource_suggestions(self, milestone: Dict[str, Any]) -> List[Dict[str, Any]]:
         if gemini_client is None:
@@ -118,28 +105,24 @@ class ExecutionAgent:
         logging.info("[VIBE ENGINEERING] Finding and verifying learning resources...")
         
         milestones = roadmap.get("milestones", [])
-        verified_resources = []
         
-        for milestone in milestones:
-            # 1. Get potential resources
-            candidates = await self._search_resources_for_milestone(milestone)
-            
-            logging.info(f"[Verification] Found {len(candidates)} candidates for {milestone['title']}")
-            
-            # 2. Verify each candidate
-            for resource in candidates:
-                verification_result = await self._verify_resource_quality(resource)
-                
-                if verification_result["verified"]:
-                    verified_resources.append({
-                        **resource,
-                        "verification_score": verification_result["score"],
-                        "test_summary": verification_result["summary"],
-                        "verified_at": datetime.now().isoformat()
-                    })
-                    logging.info(f"[Verification] ✓ Resource verified: {resource['name']} (score: {verification_result['score']:.2f})")
-                else:
-                    logging.warning(f"[Verification] ✗ Resource failed verification: {resource['name']} (score: {verification_result['score']:.2f})")
+        # Search -> fetch -> extract -> sandbox run as a pipeline with bounded queues and a deadline
+        pipeline = VerificationPipeline(self)
+        results = await pipeline.run(milestones)
+        logging.info(f"[Verification] Pipeline finished: {pipeline.stats()}")
+        
+        verified_resources = []
+        for resource, verification_result in results:
+            if verification_result["verified"]:
+                verified_resources.append({
+                    **resource,
+                    "verification_score": verification_result["score"],
+                    "test_summary": verification_result["summary"],
+                    "verified_at": datetime.now().isoformat()
+                })
+                logging.info(f"[Verification] ✓ Resource verified: {resource['name']} (score: {verification_result['score']:.2f})")
+            else:
+                logging.warning(f"[Verification] ✗ Resource failed verification: {resource['name']} (score: {verification_result['score']:.2f})")
         
         return verified_resources
     
@@ -182,7 +165,7 @@ class ExecutionAgent:
         Returns verification score (0-1) and verification status.
         """
         try:
-            # 1. Scrape resource content
+            # 1. Scrape resource content (single resource; batches go through VerificationPipeline)
             logging.info(f"[Verification] Scraping: {resource['name']}")
             content = await self._scrape_url_safely(resource["url"])
             
@@ -208,22 +191,8 @@ class ExecutionAgent:
             test_results = await self._test_code_in_sandbox(code_blocks)
             logging.info(f"[Verification] Code test results: {test_results['pass_rate']:.2%}")
             
-            # 4. Calculate verification score
-            score = self._calculate_verification_score(
-                content_length=len(content),
-                code_count=len(code_blocks),
-                test_results=test_results
-            )
-            
-            # 5. Determine verification status
-            verified = score > 0.8  # 80% threshold
-            
-            return {
-                "verified": verified,
-                "score": score,
-                "summary": self._generate_test_summary(test_results, code_blocks),
-                "test_results": test_results
-            }
+            # 4. Score and determine verification status
+            return self._build_verification(len(content), code_blocks, test_results)
             
         except Exception as e:
             logging.error(f"[Verification] Error verifying resource: {e}")
@@ -233,30 +202,44 @@ class ExecutionAgent:
                 "summary": f"Verification error: {str(e)}"
             }
     
+    def _build_verification(self, content_length: int, code_blocks: List[Dict[str, Any]], test_results: Dict[str, Any]) -> Dict[str, Any]:
+        score = self._calculate_verification_score(
+            content_length=content_length,
+            code_count=len(code_blocks),
+            test_results=test_results
+        )
+        
+        return {
+            "verified": score > 0.8,  # 80% threshold
+            "score": score,
+            "summary": self._generate_test_summary(test_results, code_blocks),
+            "test_results": test_results
+        }
+    
     async def _scrape_url_safely(self, url: str, max_retries: int = 3) -> Optional[str]:
         """
         Scrapes URL with retry logic and error handling.
         No fallbacks - if all retries fail, returns None.
         """
-        try:
-            import httpx
-        except ImportError:
-            logging.error("httpx not installed, cannot scrape URL")
-            return None
+        response = await self._fetch_resource(url, max_retries=max_retries)
+        return response.text if response is not None and response.status_code == 200 else None
+    
+    async def _fetch_resource(self, url: str, headers: Optional[Dict[str, str]] = None, max_retries: int = 3) -> Optional[httpx.Response]:
+        """
+        GETs a resource with retries through the shared keep-alive pool (per-host limits).
+        Returns the 200 response, or the 304 of a conditional request; None if all retries fail.
+        """
+        pool = HttpPool.get_instance()
         
         for attempt in range(max_retries):
             try:
-                async with httpx.AsyncClient(timeout=10.0) as client:
-                    headers = {
-                        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-                    }
-                    response = await client.get(url, headers=headers, follow_redirects=True)
+                response = await pool.get(url, headers=headers)
+                
+                if response.status_code in (200, 304):
+                    return response
+                else:
+                    logging.warning(f"[Scrape] HTTP {response.status_code} for {url}")
                     
-                    if response.status_code == 200:
-                        return response.text
-                    else:
-                        logging.warning(f"[Scrape] HTTP {response.status_code} for {url}")
-                        
             except Exception as e:
                 logging.warning(f"[Scrape] Attempt {attempt + 1}/{max_retries} failed: {e}")
                 if attempt < max_retries - 1:
@@ -264,49 +247,54 @@ class ExecutionAgent:
         
         return None
     
-    def _extract_code_from_html(self, html_content: str) -> List[Dict[str, Any]]:
+    async def _scan_resource(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        max_retries: int = 3
+    ) -> Optional[Tuple[httpx.Response, Optional[PageScan]]]:
         """
-        Extracts code blocks from HTML using regex patterns.
+        Streams a resource through the code extractor without holding the page in memory.
+        Returns (response, scan) for a 200, (response, None) for the 304 of a conditional
+        request, or None if all retries fail.
         """
-        code_blocks = []
-        
-        # Pattern 1: <code> tags
-        code_tags = re.findall(r'<code[^>]*>(.*?)</code>', html_content, re.DOTALL)
-        for code in code_tags:
-            if len(code.strip()) > 10:  # Filter very short blocks
-                code_blocks.append({
-                    "code": code,
-                    "language": "unknown",
-                    "source": "code_tag"
-                })
-        
-        # Pattern 2: <pre> tags
-        pre_tags = re.findall(r'<pre[^>]*>(.*?)</pre>', html_content, re.DOTALL)
-        for pre in pre_tags:
-            if len(pre.strip()) > 10:
-                code_blocks.append({
-                    "code": pre,
-                    "language": "unknown",
-                    "source": "pre_tag"
-                })
+        pool = HttpPool.get_instance()
         
-        # Pattern 3: Markdown code blocks
-        md_blocks = re.findall(r'```(\w+)?\n(.*?)\n```', html_content, re.DOTALL)
-        for lang, code in md_blocks:
-            if len(code.strip()) > 10:
-                code_blocks.append({
-                    "code": code,
-                    "language": lang or "unknown",
-                    "source": "markdown"
-                })
+        for attempt in range(max_retries):
+            try:
+                async with pool.stream("GET", url, headers=headers) as response:
+                    if response.status_code == 304:
+                        return response, None
+                    if response.status_code != 200:
+                        logging.warning(f"[Scrape] HTTP {response.status_code} for {url}")
+                        continue
+                    
+                    scan = PageScan(response.charset_encoding)
+                    async for chunk in response.aiter_bytes():
+                        scan.feed(chunk)
+                        if scan.done:
+                            break  # leaving the block closes the stream; the rest is never read
+                    return response, scan.finish()
+                    
+            except Exception as e:
+                logging.warning(f"[Scrape] Attempt {attempt + 1}/{max_retries} failed: {e}")
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(2 ** attempt)  # Exponential backoff
         
-        return code_blocks
+        return None
+    
+    def _extract_code_from_html(self, html_content: str) -> List[Dict[str, Any]]:
+        """
+        Extracts deduplicated code blocks (<pre>, <code>, markdown fences) from HTML.
+        """
+        return extract_code_blocks(html_content)
     
     async def _test_code_in_sandbox(self, code_blocks: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
-        Tests code blocks in a restricted Python sandbox.
+        Tests code blocks in the persistent sandbox worker pool.
         
-        Returns test results with pass rate and details.
+        All candidate blocks go to a worker in one round trip; no temp files,
+        no interpreter start-up per block. Returns test results with pass rate and details.
         """
         results = {
             "total_blocks": len(code_blocks),
@@ -317,54 +305,29 @@ class ExecutionAgent:
             "errors": []
         }
         
-        for i, block in enumerate(code_blocks[:10]):  # Test first 10 blocks
-            code = block["code"]
-            
-            # Skip empty or very short blocks
-            if len(code.strip()) < 10:
-                continue
-            
-            results["tested_blocks"] += 1
-            
+        # Test first 10 blocks, skipping empty or very short ones
+        candidates = [
+            (i, block["code"]) for i, block in enumerate(code_blocks[:10])
+            if len(block["code"].strip()) >= 10
+        ]
+        results["tested_blocks"] = len(candidates)
+        
+        if candidates:
             try:
-                # Create temp file
-                with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-                    f.write(code)
-                    temp_file = f.name
-                
-                # Execute with timeout
-                result = subprocess.run(
-                    ['python', '-m', 'py_compile', temp_file],
-                    capture_output=True,
-                    timeout=5
-                )
-                
-                if result.returncode == 0:
-                    # Syntax is valid
-                    results["passed_blocks"] += 1
-                else:
-                    # Syntax error
-                    results["syntax_errors"] += 1
-                    results["failed_blocks"] += 1
-                    results["errors"].append({
-                        "block_index": i,
-                        "error": result.stderr.decode('utf-8', errors='ignore')[:200]
-                    })
-                
-                # Clean up
-                Path(temp_file).unlink(missing_ok=True)
-                
-            except subprocess.TimeoutExpired:
-                results["failed_blocks"] += 1
-                results["errors"].append({
-                    "block_index": i,
-                    "error": "Execution timeout"
-                })
+                outcomes = await SandboxPool.get_instance().check([code for _, code in candidates])
             except Exception as e:
+                outcomes = [{"ok": False, "kind": "error", "error": str(e)} for _ in candidates]
+            
+            for (i, _), outcome in zip(candidates, outcomes):
+                if outcome["ok"]:
+                    results["passed_blocks"] += 1
+                    continue
                 results["failed_blocks"] += 1
+                if outcome["kind"] == "syntax":
+                    results["syntax_errors"] += 1
                 results["errors"].append({
                     "block_index": i,
-                    "error": str(e)[:200]
+                    "error": (outcome["error"] or "")[:200]
                 })
         
         # Calculate pass rate
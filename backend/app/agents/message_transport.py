@@ -0,0 +1,308 @@
+import asyncio
+import json
+import logging
+import os
+import socket
+import sqlite3
+from abc import ABC, abstractmethod
+from typing import Dict, Any, List, Optional, Tuple, TYPE_CHECKING
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from .agent_message_bus import AgentMessage, AgentMessageBus
+
+
+# Process-wide SQLite transport: every bus shares one writer/reader connection pair
+_shared_sqlite_transport = None
+
+
+class MessageTransport(ABC):
+    """
+    How AgentMessageBus moves messages from sender to subscriber.
+
+    publish() hands a message to the transport; start()/stop() run delivery for
+    the bus's local subscribers; drain() delivers whatever is pending right now.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    async def publish(self, bus: "AgentMessageBus", message: "AgentMessage"):
+        """Hands a message to the transport for delivery."""
+
+    async def start(self, bus: "AgentMessageBus"):
+        pass
+
+    async def stop(self, bus: "AgentMessageBus"):
+        pass
+
+    async def drain(self, bus: "AgentMessageBus") -> int:
+        return 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {"transport": self.name}
+
+
+class InProcessTransport(MessageTransport):
+    """
+    Default: straight into the recipient's in-memory priority mailbox.
+    """
+
+    name = "inprocess"
+
+    async def publish(self, bus: "AgentMessageBus", message: "AgentMessage"):
+        await bus._enqueue_local(message)
+
+
+class SQLiteLogTransport(MessageTransport):
+    """
+    Cross-process transport over an append-only SQLite log in WAL mode.
+
+    - Publishes are group-committed: sends arriving within `linger` seconds (or
+      until `batch_size` is reached) share one transaction, and publish() returns
+      once its batch is durable.
+    - Each consumer keeps an offset (last delivered row id). Rows are delivered in
+      batches, highest priority first within a batch, and the offset is committed
+      only after the batch has been handled, so a crash redelivers rather than
+      loses messages (at-least-once).
+    - Rows are keyed by topic "<bus channel>/<agent>", so sessions sharing agent
+      names stay isolated. The consumer id defaults to the bus channel: a session
+      that moves to another worker process resumes from its committed offset.
+    - One instance serves any number of buses (build_transport shares it per
+      process); each bus gets its own consumer task.
+    """
+
+    name = "sqlite"
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        consumer_id: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        linger: Optional[float] = None,
+        poll_interval: Optional[float] = None,
+        start_from_latest: bool = True
+    ):
+        self.path = path or settings.MESSAGE_BUS_LOG_PATH
+        self.consumer_id = consumer_id
+        self.batch_size = batch_size or settings.MESSAGE_BUS_BATCH_SIZE
+        self.linger = settings.MESSAGE_BUS_LINGER_SECONDS if linger is None else linger
+        self.poll_interval = settings.MESSAGE_BUS_POLL_SECONDS if poll_interval is None else poll_interval
+        self.start_from_latest = start_from_latest
+
+        self._pending: List[Tuple["AgentMessage", str, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_lock = asyncio.Lock()
+        self._consumers: Dict[str, asyncio.Task] = {}  # consumer id -> delivery loop
+        self._consume_locks: Dict[str, asyncio.Lock] = {}
+        self._conns: Dict[str, sqlite3.Connection] = {}  # separate writer / reader connections
+        self._io: set = set()  # running thread calls; connections are closed only once they finish
+
+        self.published = 0
+        self.batches_written = 0
+        self.consumed = 0
+
+    # ---------- Storage ----------
+
+    def _connect(self, role: str = "reader") -> sqlite3.Connection:
+        if role not in self._conns:
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS bus_messages ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, topic TEXT NOT NULL, payload TEXT NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_bus_messages_topic ON bus_messages (topic, id)")
+            conn.execute("CREATE TABLE IF NOT EXISTS bus_offsets (consumer TEXT PRIMARY KEY, last_id INTEGER NOT NULL)")
+            self._conns[role] = conn
+        return self._conns[role]
+
+    async def _in_thread(self, func, *args):
+        # Shielded: a cancelled caller must not let close() race the thread still using the connection
+        task = asyncio.ensure_future(asyncio.to_thread(func, *args))
+        self._io.add(task)
+        task.add_done_callback(self._io.discard)
+        return await asyncio.shield(task)
+
+    def _write_batch(self, payloads: List[Tuple[str, str]]):
+        conn = self._connect("writer")
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany("INSERT INTO bus_messages (topic, payload) VALUES (?, ?)", payloads)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def topic(bus: "AgentMessageBus", agent_name: str) -> str:
+        return f"{bus.channel}/{agent_name}"
+
+    def _consumer_for(self, bus: "AgentMessageBus") -> str:
+        return self.consumer_id or bus.channel or f"{socket.gethostname()}:{os.getpid()}"
+
+    def _read_offset(self, consumer: str) -> int:
+        conn = self._connect()
+        row = conn.execute("SELECT last_id FROM bus_offsets WHERE consumer = ?", (consumer,)).fetchone()
+        if row is not None:
+            return row[0]
+        start = 0
+        if self.start_from_latest:
+            start = conn.execute("SELECT COALESCE(MAX(id), 0) FROM bus_messages").fetchone()[0]
+        conn.execute("INSERT OR IGNORE INTO bus_offsets (consumer, last_id) VALUES (?, ?)", (consumer, start))
+        return start
+
+    def _read_batch(self, after_id: int, topics: List[str]) -> List[Tuple[int, str]]:
+        if not topics:
+            return []
+        placeholders = ",".join("?" for _ in topics)
+        return self._connect().execute(
+            f"SELECT id, payload FROM bus_messages WHERE topic IN ({placeholders}) AND id > ? ORDER BY id LIMIT ?",
+            (*topics, after_id, self.batch_size)
+        ).fetchall()
+
+    def _commit_offset(self, consumer: str, last_id: int):
+        self._connect().execute("UPDATE bus_offsets SET last_id = ? WHERE consumer = ?", (last_id, consumer))
+
+    # ---------- Publishing ----------
+
+    async def publish(self, bus: "AgentMessageBus", message: "AgentMessage"):
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((message, self.topic(bus, message.to_agent), future))
+        if len(self._pending) >= self.batch_size:
+            await self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self.linger, lambda: asyncio.ensure_future(self._flush())
+            )
+        await future
+
+    async def _flush(self):
+        async with self._flush_lock:
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+                self._flush_handle = None
+            batch, self._pending = self._pending, []
+            if not batch:
+                return
+            payloads = [(topic, json.dumps(message.to_dict(), default=str)) for message, topic, _ in batch]
+            try:
+                await self._in_thread(self._write_batch, payloads)
+                self.published += len(batch)
+                self.batches_written += 1
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_result(None)
+            except Exception as e:
+                logging.error(f"[MessageBus] Failed to append {len(batch)} messages to log: {e}")
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    # ---------- Consuming ----------
+
+    async def start(self, bus: "AgentMessageBus"):
+        consumer = self._consumer_for(bus)
+        task = self._consumers.get(consumer)
+        if task is None or task.done():
+            await self._in_thread(self._read_offset, consumer)
+            self._consumers[consumer] = asyncio.create_task(self._consume_loop(bus))
+
+    async def stop(self, bus: "AgentMessageBus"):
+        await self._flush()
+        task = self._consumers.pop(self._consumer_for(bus), None)
+        if task:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    def close(self):
+        for conn in self._conns.values():
+            conn.close()
+        self._conns.clear()
+
+    async def aclose(self):
+        """
+        Flushes pending publishes, stops every consumer and closes the connections.
+        """
+        await self._flush()
+        tasks = list(self._consumers.values())
+        self._consumers.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await asyncio.gather(*self._io, return_exceptions=True)
+        self.close()
+
+    async def _consume_loop(self, bus: "AgentMessageBus"):
+        while True:
+            try:
+                if await self.drain(bus) == 0:
+                    await asyncio.sleep(self.poll_interval)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logging.error(f"[MessageBus] Log consumer error: {e}")
+                await asyncio.sleep(self.poll_interval)
+
+    async def drain(self, bus: "AgentMessageBus") -> int:
+        """
+        Delivers every pending log entry for local subscribers, one batch at a time.
+        """
+        from .agent_message_bus import AgentMessage
+
+        delivered = 0
+        consumer = self._consumer_for(bus)
+        topics = [self.topic(bus, agent_name) for agent_name in bus.subscribers]
+        async with self._consume_locks.setdefault(consumer, asyncio.Lock()):
+            offset = await self._in_thread(self._read_offset, consumer)
+            while True:
+                rows = await self._in_thread(self._read_batch, offset, topics)
+                if not rows:
+                    break
+                messages = [AgentMessage.from_dict(json.loads(payload)) for _, payload in rows]
+                for message in sorted(messages, key=lambda m: (m.rank, m.seq)):
+                    try:
+                        await bus._route(message)
+                    except Exception as e:
+                        # Counted as failed by the bus; a poison message must not stall the log
+                        logging.error(f"[MessageBus] Error routing message: {e}")
+                    delivered += 1
+                offset = rows[-1][0]
+                await self._in_thread(self._commit_offset, consumer, offset)
+                self.consumed += len(rows)
+        return delivered
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "transport": self.name,
+            "path": self.path,
+            "published": self.published,
+            "batches_written": self.batches_written,
+            "avg_batch_size": round(self.published / self.batches_written, 2) if self.batches_written else 0.0,
+            "consumed": self.consumed,
+            "consumers": len(self._consumers)
+        }
+
+
+def build_transport(name: Optional[str] = None) -> MessageTransport:
+    global _shared_sqlite_transport
+    name = (name or settings.MESSAGE_BUS_TRANSPORT).lower()
+    if name == "sqlite":
+        if _shared_sqlite_transport is None:
+            _shared_sqlite_transport = SQLiteLogTransport()
+        return _shared_sqlite_transport
+    if name != "inprocess":
+        logging.warning(f"[MessageBus] Unknown transport '{name}', using in-process")
+    return InProcessTransport()
+
+
+async def close_shared_transport():
+    """
+    Closes the process-wide SQLite transport (app shutdown).
+    """
+    global _shared_sqlite_transport
+    if _shared_sqlite_transport is not None:
+        await _shared_sqlite_transport.aclose()
+        _shared_sqlite_transport = None
@@ -3,6 +3,7 @@ import datetime
 import json
 import os
 import asyncio
+import hashlib
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from .research_agent import ResearchAgent
@@ -11,10 +12,31 @@ from .execution_agent import ExecutionAgent
 from .verification_agent import VerificationAgent
 from .tournament_orchestrator import TournamentOrchestrator
 from .agent_message_bus import AgentMessageBus
+from .pipeline_graph import StageGraph, PipelineStageError
+from .session_context import SessionContext
+from app.core.config import settings
 from app.services.database_service import DatabaseService
 from app.services.career_velocity_engine import CareerVelocityEngine
 from app.services.strategic_career_pathing import StrategicCareerPathing
 from app.services.mission_control import MissionControl
+from app.services.market_delta import MarketDelta, build_listing_index, compute_listing_delta
+from app.services.market_watch import MarketWatchRegistry, MarketSnapshot
+from app.services.thought_log import ThoughtSignatureLog
+from app.services.adaptive_interval import AdaptiveInterval
+
+# Signature steps flushed to disk immediately instead of waiting for the batch
+FLUSH_SIGNATURE_STEPS = {"PIPELINE_COMPLETE", "FAILURE_LOG", "MARATHON_SESSION_ENDED", "MARATHON_STOP_REQUESTED"}
+
+# AgentState row holding the marathon loop checkpoint (cycle count, current roadmap, ...)
+MARATHON_CHECKPOINT_AGENT = "marathon"
+
+def build_agents() -> Dict[str, Any]:
+    return {
+        "research": ResearchAgent(),
+        "planning": PlanningAgent(),
+        "execution": ExecutionAgent(),
+        "verification": VerificationAgent()
+    }
 
 class CareerOrchestrator:
     """
@@ -27,7 +49,7 @@ class CareerOrchestrator:
     - Dynamic roadmap adjustments
     """
     
-    def __init__(self, user_id: str, career_goal: str, location: str = "Global"):
+    def __init__(self, user_id: str, career_goal: str, location: str = "Global", agents: Optional[Dict[str, Any]] = None):
         self.user_id = user_id
         self.career_goal = career_goal
         self.location = location
@@ -37,8 +59,15 @@ class CareerOrchestrator:
         self.session_duration = 259200  # 72 hours in seconds
         self.session_start_time: Optional[datetime.datetime] = None
         self.cycle_count = 0
+        self.market_watch_key: Optional[str] = None
+        self.session_id: Optional[str] = None  # set by MarathonScheduler; scopes mission logs
+        self.cycle_schedule = AdaptiveInterval(self.check_interval)
         
-        self.context = {
+        # Initialize services
+        self.db = DatabaseService(user_id)
+        
+        # Memory-budgeted: history beyond a window and oversized values spill to the DB
+        self.context = SessionContext(self.db, {
             "user_id": user_id,
             "goal": career_goal,
             "research_data": None,
@@ -47,94 +76,172 @@ class CareerOrchestrator:
             "verification_results": None,
             "previous_job_count": 0,
             "market_trend_history": []
-        }
+        })
         
-        self.thought_signatures: List[Dict[str, Any]] = []
-        self.signature_path = Path(f"thought_signatures_{user_id}.json")
+        # Append-only JSONL log; only a bounded tail is kept in memory
+        self.signature_log = ThoughtSignatureLog(Path(f"thought_signatures_{user_id}.jsonl"))
+        self.thought_signatures = self.signature_log.tail
+        self.signature_path = self.signature_log.path
         
-        # Initialize services
-        self.db = DatabaseService(user_id)
-        self.message_bus = AgentMessageBus()
-        self.agents = {
-            "research": ResearchAgent(),
-            "planning": PlanningAgent(),
-            "execution": ExecutionAgent(),
-            "verification": VerificationAgent()
-        }
+        self.message_bus = AgentMessageBus(channel=user_id)
+        # Agents are stateless between calls, so the scheduler shares one set across sessions
+        self.agents = agents or build_agents()
 
-    async def run_pipeline(self, constraints: Optional[Dict[str, Any]] = None, tournament_mode: bool = False, multi_market: bool = False):
+    async def run_pipeline(
+        self,
+        constraints: Optional[Dict[str, Any]] = None,
+        tournament_mode: bool = False,
+        multi_market: bool = False,
+        resume: bool = False
+    ):
         """
         Executes full agentic pipeline with dynamic adjustment.
         EXTRAORDINARY: Optional tournament mode and multi-market intelligence.
+
+        Stages run as a dependency graph: once planning is done, execution,
+        verification and velocity overlap instead of running back to back.
+        Every completed stage is checkpointed; with resume=True, stages that already
+        completed for the same run key (within PIPELINE_CHECKPOINT_MAX_AGE_HOURS) are
+        loaded instead of re-run.
         """
         logging.info(f"🧠 Orchestrator: Starting pipeline for {self.career_goal}")
         logging.debug(f"Pipeline config: tournament_mode={tournament_mode}, multi_market={multi_market}, constraints={constraints}")
 
+        run_key = self._pipeline_run_key(constraints or {}, tournament_mode, multi_market)
+
+        async def checkpoint_stage(stage: str, output: Any):
+            await self.db.save_stage_checkpoint(run_key, stage, output)
+
+        graph = self._build_pipeline_graph(constraints or {}, tournament_mode, multi_market)
+        graph.on_stage_complete = checkpoint_stage
+
+        completed_stages: Dict[str, Any] = {}
+        if resume:
+            completed_stages = await self.db.load_stage_checkpoints(
+                run_key, max_age=datetime.timedelta(hours=settings.PIPELINE_CHECKPOINT_MAX_AGE_HOURS)
+            )
+            if completed_stages:
+                logging.info(f"♻️ Resuming pipeline {run_key}: {sorted(completed_stages)} already completed")
+                await self.save_thought_signature("PIPELINE_RESUMED", {
+                    "run_key": run_key,
+                    "completed_stages": sorted(completed_stages)
+                })
+
         try:
+            results = await graph.run(completed_stages)
+
+            self.context["research_data"] = results["research"]
+            self.context["roadmap"] = results["planning"]
+            self.context["resources"] = results["execution"]["resources"]
+            self.context["schedule"] = results["execution"]["schedule"]
+            self.context["verification_results"] = results["verification"]
+            self.context["velocity_metrics"] = results["velocity"]
+            self.context["career_trajectory"] = results["trajectory"]
+            self.context["suggested_adjustment"] = results["adjustment"]
+
+            self.state = "COMPLETED"
+            await self.save_thought_signature("PIPELINE_COMPLETE", {
+                "status": "success",
+                "tournament_mode": tournament_mode,
+                "multi_market_enabled": multi_market,
+                "run_key": run_key,
+                "stage_timings": graph.timings
+            })
+            return self.context
+
+        except Exception as e:
+            failed_stage = e.stage if isinstance(e, PipelineStageError) else None
+            logging.error(f"Pipeline failed at stage {failed_stage} (state {self.state}): {e}")
+            self.state = "FAILED"
+            await self.save_thought_signature("FAILURE_LOG", {
+                "error": str(e),
+                "failed_stage": failed_stage,
+                "tournament_mode": tournament_mode,
+                "multi_market_enabled": multi_market,
+                "stage_timings": graph.timings
+            })
+            raise
+
+    def _pipeline_run_key(self, constraints: Dict[str, Any], tournament_mode: bool, multi_market: bool) -> str:
+        """
+        Idempotent key for a pipeline run: the same goal, location, constraints and modes
+        map to the same stage checkpoints. Marathon runs are also scoped to their session,
+        which keeps its id when a worker reclaims it after a restart.
+        """
+        payload = json.dumps({
+            "session": self.session_id,
+            "goal": self.career_goal,
+            "location": self.location,
+            "constraints": constraints,
+            "tournament_mode": tournament_mode,
+            "multi_market": multi_market
+        }, sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+    def _build_pipeline_graph(self, constraints: Dict[str, Any], tournament_mode: bool, multi_market: bool) -> StageGraph:
+        """
+        Declares the pipeline stages and their data dependencies.
+        """
+        graph = StageGraph(default_timeout=settings.PIPELINE_STAGE_TIMEOUT_SECONDS)
+
+        async def research(results):
             # 1. Research (with optional tournament or multi-market mode)
             if tournament_mode:
                 logging.info("🏆 Running research in TOURNAMENT MODE")
                 logging.debug(f"Tournament config: goal={self.career_goal}, location={self.location}")
+                self.state = "RESEARCHING"
                 tournament_orchestrator = TournamentOrchestrator()
-                self.context["research_data"] = await tournament_orchestrator.run_tournament(
-                    self.career_goal, self.location
-                )
-                logging.debug(f"Tournament results: winner={self.context['research_data'].get('winner_strategy', 'unknown')}")
-            else:
-                logging.debug("Running standard research phase")
-                self.context["research_data"] = await self._run_research(multi_market)
+                data = await tournament_orchestrator.run_tournament(self.career_goal, self.location)
+                logging.debug(f"Tournament results: winner={data.get('winner_strategy', 'unknown')}")
+                return data
+            logging.debug("Running standard research phase")
+            return await self._run_research(multi_market)
 
+        async def planning(results):
             # 2. Planning
-            self.context["roadmap"] = await self._run_planning(self.context["research_data"], constraints or {})
+            return await self._run_planning(results["research"], constraints)
 
+        async def execution(results):
             # 3. Execution
-            execution_data = await self._run_execution(self.context["roadmap"], constraints or {})
-            self.context["resources"] = execution_data["resources"]
-            self.context["schedule"] = execution_data["schedule"]
+            return await self._run_execution(results["planning"], constraints)
 
+        async def verification(results):
             # 4. Verification
-            self.context["verification_results"] = await self._run_verification(self.context["roadmap"])
+            return await self._run_verification(results["planning"])
 
+        async def velocity(results):
             # EXTRAORDINARY: Calculate Career Velocity Metrics
             velocity_engine = CareerVelocityEngine(self.user_id)
             user_progress = await self.db.load_user_progress()
-            self.context["velocity_metrics"] = await velocity_engine.calculate_velocity_metrics(
-                self.context["roadmap"], user_progress or {}
-            )
+            return await velocity_engine.calculate_velocity_metrics(results["planning"], user_progress or {})
 
+        async def trajectory(results):
             # EXTRAORDINARY: Generate Strategic Career Trajectory
             career_pathing = StrategicCareerPathing()
             current_role = "Junior Developer"  # Could be extracted from user profile
             target_role = "Senior " + self.career_goal.split()[-1]  # Extract role from goal
-            self.context["career_trajectory"] = await career_pathing.generate_career_trajectory(
+            return await career_pathing.generate_career_trajectory(
                 current_role, target_role,
-                self.context["velocity_metrics"],  # Skills profile from velocity metrics
-                self.context["research_data"],    # Market intelligence
-                self.context["velocity_metrics"]   # Velocity metrics
+                results["velocity"],  # Skills profile from velocity metrics
+                results["research"],  # Market intelligence
+                results["velocity"]   # Velocity metrics
             )
 
+        async def adjustment(results):
             # 5. Dynamic Adjustment Loop
-            score = self.context["verification_results"].get("overall_score", 0)
-            adjustment = await self._adjust_roadmap(self.context["roadmap"], score)
-            self.context["suggested_adjustment"] = adjustment
+            # No score until the learner has actually taken the assessment
+            verification = results["verification"]
+            score = None if verification.get("status") == "AWAITING_ASSESSMENT" else verification.get("overall_score")
+            return await self._adjust_roadmap(results["planning"], score)
 
-            self.state = "COMPLETED"
-            await self.save_thought_signature("PIPELINE_COMPLETE", {
-                "status": "success",
-                "tournament_mode": tournament_mode,
-                "multi_market_enabled": multi_market
-            })
-            return self.context
-
-        except Exception as e:
-            self.state = "FAILED"
-            logging.error(f"Pipeline failed at state {self.state}: {e}")
-            await self.save_thought_signature("FAILURE_LOG", {
-                "error": str(e),
-                "tournament_mode": tournament_mode,
-                "multi_market_enabled": multi_market
-            })
-            raise
+        graph.add_stage("research", research, timeout=settings.PIPELINE_RESEARCH_TIMEOUT_SECONDS)
+        graph.add_stage("planning", planning, depends_on=["research"])
+        graph.add_stage("execution", execution, depends_on=["planning"])
+        graph.add_stage("verification", verification, depends_on=["planning"])
+        graph.add_stage("velocity", velocity, depends_on=["planning"])
+        graph.add_stage("trajectory", trajectory, depends_on=["research", "velocity"])
+        graph.add_stage("adjustment", adjustment, depends_on=["planning", "verification"])
+        return graph
 
     async def _run_research(self, multi_market: bool = False):
         logging.info("🔍 Starting research phase")
@@ -168,10 +275,14 @@ class CareerOrchestrator:
         self.state = "EXECUTING"
         agent = ExecutionAgent()
         hours = constraints.get("hours_per_week", 10) if constraints else 10
-        resources = await agent.find_resources(roadmap)
-        schedule = await agent.generate_schedule(roadmap, hours)
+        study_constraints = constraints.get("constraints", []) if constraints else []
+        # Resource search and scheduling are independent of each other
+        resources, schedule = await asyncio.gather(
+            agent.find_resources(roadmap),
+            agent.generate_schedule(roadmap, hours, study_constraints)
+        )
         logging.info(f"✅ Execution completed: {len(resources)} resources found, {len(schedule.get('sprints', []))} sprints scheduled")
-        logging.debug(f"Schedule: {len(schedule.get('sprints', []))} sprints, {len(schedule.get('active_sprint_index', 0))} active sprint")
+        logging.debug(f"Schedule: {len(schedule.get('sprints', []))} sprints, active sprint index {schedule.get('active_sprint_index', 0)}")
         await self.save_thought_signature("EXECUTION_COMPLETE", {"resources_found": len(resources), "daily_tasks": len(schedule.get("days", []))})
         return {"resources": resources, "schedule": schedule}
 
@@ -180,7 +291,7 @@ class CareerOrchestrator:
         logging.debug(f"Verification input: roadmap_months={len(roadmap.get('months', []))}")
         self.state = "VERIFYING"
         agent = VerificationAgent()
-        results = await agent.verify_skills(roadmap)
+        results = await agent.verify_skills(roadmap, user_id=self.user_id)
         logging.info(f"✅ Verification completed: {len(results)} skills verified")
         logging.debug(f"Verification results: gaps_found={len(results.get('skill_gaps', []))}")
         await self.save_thought_signature("VERIFICATION_COMPLETE", {"quiz_ready": "quiz" in results, "interview_ready": "mock_interview" in results})
@@ -196,6 +307,7 @@ class CareerOrchestrator:
     async def save_thought_signature(self, step: str, metadata: Dict[str, Any]):
         """
         Saves a checkpoint for resume capability and demo logging.
+        Appends to the JSONL signature log; writes are batched off the event loop.
         """
         signature = {
             "step": step,
@@ -203,32 +315,27 @@ class CareerOrchestrator:
             "timestamp": datetime.datetime.now().isoformat(),
             "global_state": self.state
         }
-        self.thought_signatures.append(signature)
-        
-        # Persist to disk
-        try:
-            with open(self.signature_path, "w") as f:
-                json.dump(self.thought_signatures, f, indent=4)
-            print(f"[Thought Signature] {step} saved to {self.signature_path}")
-        except Exception as e:
-            logging.error(f"Failed to persist thought signature: {e}")
+        self.signature_log.append(signature)
+        logging.debug(f"[Thought Signature] {step} queued for {self.signature_path}")
+
+        # Make terminal states durable immediately
+        if step in FLUSH_SIGNATURE_STEPS:
+            await self.signature_log.flush()
 
     def load_last_signature(self):
         """
         Resumes logic by loading the last saved signature.
         """
-        if self.signature_path.exists():
-            with open(self.signature_path, "r") as f:
-                self.thought_signatures = json.load(f)
-                return self.thought_signatures[-1] if self.thought_signatures else None
-        return None
+        self.signature_log.load_tail(legacy_path=Path(f"thought_signatures_{self.user_id}.json"))
+        return self.signature_log.last()
     
     async def start_marathon_session(
         self,
         constraints: Optional[Dict[str, Any]] = None,
         duration_hours: int = 72,
         check_interval_minutes: int = 30,
-        tournament_mode: bool = False
+        tournament_mode: bool = False,
+        resume: bool = False
     ):
         """
         MARATHON MODE: Runs continuously for specified duration.
@@ -241,54 +348,110 @@ class CareerOrchestrator:
         - Self-corrects on failures
         - Persists all state to database
         
+        This drives a single session with its own loop. The API hands sessions to
+        MarathonScheduler instead, which calls begin_marathon / run_marathon_cycle /
+        end_marathon for thousands of sessions from one timer heap.
+        
         Args:
             constraints: User constraints (hours_per_week, skill_level, etc.)
             duration_hours: How long to run the marathon (default 72)
             check_interval_minutes: How often to wake up and check (default 30)
+            resume: Continue from the last pipeline/marathon checkpoints for this user
+        """
+        # Start message bus router
+        message_bus_task = asyncio.create_task(self.message_bus.start_router())
+        
+        try:
+            await self.begin_marathon(constraints, duration_hours, check_interval_minutes, tournament_mode, resume)
+            
+            # Main marathon loop
+            MissionControl.get_instance().log_event("MARATHON", "Starting continuous monitoring loop...", session_id=self.session_id)
+            await self._marathon_loop(constraints)
+        except asyncio.CancelledError:
+            MissionControl.get_instance().log_event("MARATHON", "Session cancelled by user", session_id=self.session_id)
+        finally:
+            message_bus_task.cancel()
+            await self.end_marathon()
+    
+    async def begin_marathon(
+        self,
+        constraints: Optional[Dict[str, Any]] = None,
+        duration_hours: int = 72,
+        check_interval_minutes: int = 30,
+        tournament_mode: bool = False,
+        resume: bool = False
+    ):
+        """
+        Starts a marathon session: subscribes agents to the message bus and runs
+        (or resumes) the initial pipeline. Does not start any loop.
         """
         self.is_running = True
         self.session_start_time = datetime.datetime.now()
         self.session_duration = duration_hours * 3600  # Convert to seconds
         self.check_interval = check_interval_minutes * 60
+        self.cycle_schedule = AdaptiveInterval(self.check_interval)
+        
+        marathon_checkpoint = await self.db.load_agent_state(self._marathon_checkpoint_name()) if resume else None
         
         await self.save_thought_signature("MARATHON_SESSION_STARTED", {
             "duration_hours": duration_hours,
             "check_interval_minutes": check_interval_minutes,
-            "goal": self.career_goal
+            "goal": self.career_goal,
+            "resumed": marathon_checkpoint is not None
         })
         
         mission_ctl = MissionControl.get_instance()
-        mission_ctl.log_event("MARATHON", f"🏃 SESSION STARTED | Goal: {self.career_goal}")
+        mission_ctl.log_event("MARATHON", f"🏃 SESSION STARTED | Goal: {self.career_goal}", session_id=self.session_id)
         
-        # Start message bus router
-        message_bus_task = asyncio.create_task(self.message_bus.start_router())
-        
-        # Subscribe agents to message bus
-        for agent_name, agent in self.agents.items():
+        # Subscribe agents to message bus (under the names messages are addressed to, e.g. "PlanningAgent")
+        for agent in self.agents.values():
             if hasattr(agent, 'handle_message'):
-                self.message_bus.subscribe(agent_name, agent.handle_message)
-        
-            # Initial pipeline run
-        mission_ctl.log_event("ORCHESTRATOR", f"Running initial pipeline... (Tournament Mode: {tournament_mode})")
-        initial_context = await self.run_pipeline(constraints or {}, tournament_mode)
+                self.message_bus.subscribe(type(agent).__name__, agent.handle_message)
         
-        # Main marathon loop
-        mission_ctl.log_event("MARATHON", "Starting continuous monitoring loop...")
-        marathon_task = asyncio.create_task(self._marathon_loop(constraints))
+        # Initial pipeline run
+        mission_ctl.log_event("ORCHESTRATOR", f"Running initial pipeline... (Tournament Mode: {tournament_mode})", session_id=self.session_id)
+        await self.run_pipeline(constraints or {}, tournament_mode, resume=resume)
+        if marathon_checkpoint:
+            self._restore_marathon_checkpoint(marathon_checkpoint["checkpoint_data"])
+            mission_ctl.log_event("MARATHON", f"♻️ Resumed at cycle #{self.cycle_count}", session_id=self.session_id)
         
-        # Run until session ends
-        try:
-            await marathon_task
-        except asyncio.CancelledError:
-             mission_ctl.log_event("MARATHON", "Session cancelled by user")
-        finally:
-            self.is_running = False
-            message_bus_task.cancel()
-            await self.save_thought_signature("MARATHON_SESSION_ENDED", {
-                "total_cycles": self.cycle_count,
-                "duration": str(datetime.datetime.now() - self.session_start_time)
-            })
-            mission_ctl.log_event("MARATHON", "🏁 MARATHON SESSION ENDED 🏁")
+        # Share market monitoring with every session watching the same goal/location
+        if settings.MARKET_WATCH_ENABLED:
+            self.market_watch_key = MarketWatchRegistry.get_instance().subscribe(
+                self.user_id,
+                self.career_goal,
+                self.location,
+                self._on_market_snapshot,
+                interval=self.check_interval,
+                research_agent=self.agents["research"],
+                seed_research=self.context.get("research_data")
+            )
+            mission_ctl.log_event("MARKET_WATCH", f"Subscribed to shared watch '{self.market_watch_key}'", session_id=self.session_id)
+    
+    def detach(self):
+        """
+        Stops this instance without closing the session (another worker now owns it):
+        no more cycles or market snapshots, and no closing signature.
+        """
+        self.is_running = False
+        if self.market_watch_key:
+            MarketWatchRegistry.get_instance().unsubscribe(self.user_id, self.market_watch_key)
+            self.market_watch_key = None
+
+    async def end_marathon(self):
+        """
+        Marks the session finished and records the closing signature.
+        """
+        self.is_running = False
+        await self.context.flush_history()
+        if self.market_watch_key:
+            MarketWatchRegistry.get_instance().unsubscribe(self.user_id, self.market_watch_key)
+            self.market_watch_key = None
+        await self.save_thought_signature("MARATHON_SESSION_ENDED", {
+            "total_cycles": self.cycle_count,
+            "duration": str(datetime.datetime.now() - self.session_start_time) if self.session_start_time else "0:00:00"
+        })
+        MissionControl.get_instance().log_event("MARATHON", "🏁 MARATHON SESSION ENDED 🏁", session_id=self.session_id)
     
     async def _marathon_loop(self, constraints: Optional[Dict[str, Any]]):
         """
@@ -299,70 +462,162 @@ class CareerOrchestrator:
         4. Communicate with agents via message bus
         5. Self-correct on failures
         """
+        while self.is_running:
+            delay = await self.run_marathon_cycle()
+            if delay is None:
+                break
+            await asyncio.sleep(delay)
+    
+    async def run_marathon_cycle(self) -> Optional[float]:
+        """
+        Runs one marathon cycle and returns the number of seconds until the next one,
+        or None when the session is over (stopped or duration reached).
+        Errors are logged and retried after a minute (self-correction).
+        """
         mission_ctl = MissionControl.get_instance()
         
-        while self.is_running:
-            try:
-                self.cycle_count += 1
-                if self.session_start_time is None:
-                    self.session_start_time = datetime.datetime.now()
-                elapsed = (datetime.datetime.now() - self.session_start_time).total_seconds()
-                
-                # Check if session duration exceeded
-                if elapsed >= self.session_duration:
-                    mission_ctl.log_event("MARATHON", f"Session duration reached ({self.session_duration/3600}h)")
-                    break
-                
-                mission_ctl.log_event("MARATHON", f"Cycle #{self.cycle_count} | Elapsed: {elapsed/3600:.2f}h")
-                
-                # 1. Check for new job listings
+        if not self.is_running:
+            return None
+        
+        try:
+            self.cycle_count += 1
+            if self.session_start_time is None:
+                self.session_start_time = datetime.datetime.now()
+            elapsed = (datetime.datetime.now() - self.session_start_time).total_seconds()
+            
+            # Check if session duration exceeded
+            if elapsed >= self.session_duration:
+                mission_ctl.log_event("MARATHON", f"Session duration reached ({self.session_duration/3600}h)", session_id=self.session_id)
+                return None
+            
+            mission_ctl.log_event("MARATHON", f"Cycle #{self.cycle_count} | Elapsed: {elapsed/3600:.2f}h", session_id=self.session_id)
+            
+            # 1. Check for new job listings (shared watches push snapshots instead)
+            if not self.market_watch_key:
                 await self._check_market_updates()
-                
-                # 2. Check user progress and adjust
-                await self._check_user_progress()
-                
-                # 3. Process any pending agent messages
-                pending_messages = self.message_bus.get_recent_messages(5)
-                if pending_messages:
-                    mission_ctl.log_event("MESSAGE_BUS", f"Processing {len(pending_messages)} agent messages...")
-                
-                # Wait for next cycle
-                mission_ctl.log_event("MARATHON", f"Sleeping for {self.check_interval/60} minutes...")
-                await asyncio.sleep(self.check_interval)
-                
-            except Exception as e:
-                logging.error(f"[Marathon] Error in cycle {self.cycle_count}: {e}")
-                mission_ctl.log_event("ERROR", f"Marathon Cycle Error: {str(e)}")
-                await self.save_thought_signature("MARATHON_CYCLE_ERROR", {
-                    "cycle": self.cycle_count,
-                    "error": str(e)
-                })
-                # Continue despite error (self-correction)
-                await asyncio.sleep(60)  # Wait 1 minute before retry
+            
+            # 2. Check user progress and adjust
+            await self._check_user_progress()
+            
+            # 3. Process any pending agent messages
+            pending_messages = self.message_bus.get_recent_messages(5)
+            if pending_messages:
+                mission_ctl.log_event("MESSAGE_BUS", f"Processing {len(pending_messages)} agent messages...", session_id=self.session_id)
+            
+            # 4. Keep the context within its memory budget, then checkpoint
+            await self.context.enforce_budget()
+            await self._save_marathon_checkpoint()
+            
+            # Wait for next cycle (adapts to market volatility)
+            delay = self.cycle_schedule.next_delay()
+            mission_ctl.log_event("MARATHON", f"Sleeping for {delay/60:.1f} minutes... (cycles saved: {self.cycle_schedule.cycles_saved()})", session_id=self.session_id)
+            return delay
+            
+        except Exception as e:
+            logging.error(f"[Marathon] Error in cycle {self.cycle_count}: {e}")
+            mission_ctl.log_event("ERROR", f"Marathon Cycle Error: {str(e)}", session_id=self.session_id)
+            await self.save_thought_signature("MARATHON_CYCLE_ERROR", {
+                "cycle": self.cycle_count,
+                "error": str(e)
+            })
+            # Continue despite error (self-correction)
+            return 60  # Wait 1 minute before retry
     
+    def _marathon_checkpoint_name(self) -> str:
+        # Scoped to the session like the stage checkpoints (see _pipeline_run_key)
+        return f"{MARATHON_CHECKPOINT_AGENT}:{self.session_id}" if self.session_id else MARATHON_CHECKPOINT_AGENT
+
+    async def _save_marathon_checkpoint(self):
+        """
+        Persists the state a restarted marathon needs to continue where it left off.
+        """
+        await self.db.save_agent_state(self._marathon_checkpoint_name(), self.state, json.loads(json.dumps({
+            "cycle_count": self.cycle_count,
+            "session_start_time": self.session_start_time.isoformat() if self.session_start_time else None,
+            "roadmap": self.context.get("roadmap"),
+            "roadmap_version": self.context.get("roadmap_version", 1),
+            "listing_index": self.context.get("listing_index"),
+            "previous_job_count": self.context.get("previous_job_count", 0),
+            "cycle_schedule": self.cycle_schedule.to_checkpoint()
+        }, default=str)))
+
+    def _restore_marathon_checkpoint(self, checkpoint: Dict[str, Any]):
+        self.cycle_count = checkpoint.get("cycle_count", 0)
+        if checkpoint.get("session_start_time"):
+            self.session_start_time = datetime.datetime.fromisoformat(checkpoint["session_start_time"])
+        if checkpoint.get("roadmap"):
+            self.context["roadmap"] = checkpoint["roadmap"]
+        self.context["roadmap_version"] = checkpoint.get("roadmap_version", 1)
+        if checkpoint.get("listing_index") is not None:
+            self.context["listing_index"] = checkpoint["listing_index"]
+        self.context["previous_job_count"] = checkpoint.get("previous_job_count", 0)
+        self.cycle_schedule.restore(checkpoint.get("cycle_schedule"))
+
     async def _check_market_updates(self):
         """
         Checks for new job listings and market changes.
-        If significant changes detected, triggers agent negotiation.
+        Listings are diffed by identity; semantic analysis and roadmap self-correction
+        only run when the delta is material, so quiet cycles cost one scrape and no LLM calls.
+        Sessions subscribed to a shared market watch skip this; the watch pushes snapshots.
         """
         mission_ctl = MissionControl.get_instance()
-        mission_ctl.log_event("MARKET_WATCH", "Checking for new job listings...")
+        mission_ctl.log_event("MARKET_WATCH", "Checking for new job listings...", session_id=self.session_id)
         
-        # Re-run research to get fresh data
+        # Cheap fetch: scrapers only
         research_agent = self.agents["research"]
-        new_research_data = await research_agent.research(self.career_goal, self.location)
+        listings = await research_agent.fetch_listings(self.career_goal, self.location)
         
-        # Compare with previous data
-        previous_count = self.context.get("previous_job_count", 0)
-        new_count = len(new_research_data.get("listings", []))
+        if not listings:
+            mission_ctl.log_event("MARKET_WATCH", "No listings fetched this cycle. Keeping previous snapshot.", session_id=self.session_id)
+            return
         
-        job_change = new_count - previous_count
+        previous_research = await self.context.fetch("research_data") or {}
+        previous_index = self.context.get("listing_index")
+        if previous_index is None:
+            previous_index = build_listing_index(previous_research.get("listings", []))
+        current_index = build_listing_index(listings)
         
-        mission_ctl.log_event("ANALYSIS", f"Job Delta: {previous_count} -> {new_count} ({job_change})")
+        # Compare by listing identity, not by count
+        delta = compute_listing_delta(previous_index, current_index)
         
-        # Detect market shifts
-        if abs(job_change) > 5:  # More than 5 jobs added/removed
-            mission_ctl.log_event("ALERT", "⚠️ Significant Market Shift Detected!")
+        mission_ctl.log_event(
+            "ANALYSIS",
+            f"Listing Delta: +{len(delta.added)} -{len(delta.removed)} ~{len(delta.changed)} "
+            f"({delta.previous_count} -> {delta.current_count})",
+            session_id=self.session_id
+        )
+        
+        if delta.is_material():
+            # Only now pay for semantic analysis + predictions
+            new_research_data = await research_agent.analyze_market_data(self.career_goal, {
+                "listings": listings,
+                "market_trends": previous_research.get("analysis", {}).get("trends", [])
+            })
+        else:
+            # Keep the previous analysis, just refresh the listings snapshot
+            new_research_data = {**previous_research, "listings": listings}
+        
+        await self._apply_market_update(new_research_data, current_index, delta)
+    
+    async def _on_market_snapshot(self, snapshot: MarketSnapshot):
+        """
+        Market watch callback: applies a shared snapshot to this session.
+        """
+        if not self.is_running:
+            return
+        await self._apply_market_update(snapshot.research_data, snapshot.listing_index, snapshot.delta)
+    
+    async def _apply_market_update(self, new_research_data: Dict[str, Any], current_index: Dict[str, str], delta: MarketDelta):
+        """
+        Folds refreshed market data into the session context and, on a material shift,
+        runs the personalized self-correction (adjust_roadmap).
+        """
+        mission_ctl = MissionControl.get_instance()
+        new_trends = new_research_data.get("analysis", {}).get("emerging_trends", [])
+        self.cycle_schedule.observe(delta)
+        
+        if delta.is_material():
+            mission_ctl.log_event("ALERT", "⚠️ Significant Market Shift Detected!", session_id=self.session_id)
             
             # Send URGENT message to Planning Agent
             await self.message_bus.send_message(
@@ -370,20 +625,22 @@ class CareerOrchestrator:
                 to_agent="PlanningAgent",
                 message_type="MARKET_SHIFT",
                 data={
-                    "job_delta": job_change,
-                    "new_trends": new_research_data.get("analysis", {}).get("emerging_trends", []),
+                    "job_delta": delta.net_change,
+                    "listing_delta": delta.to_dict(),
+                    "new_trends": new_trends,
                     "priority": "HIGH"
                 },
                 priority="URGENT"
             )
             
             await self.save_thought_signature("MARKET_SHIFT_DETECTED", {
-                "job_delta": job_change,
-                "new_trends": new_research_data.get("analysis", {}).get("emerging_trends", [])
+                "job_delta": delta.net_change,
+                "listing_delta": delta.to_dict(),
+                "new_trends": new_trends
             })
 
             # TRIGGER SELF-CORRECTION
-            mission_ctl.log_event("SELF_CORRECTION", "🛠️ Initiating Self-Correction Sequence...")
+            mission_ctl.log_event("SELF_CORRECTION", "🛠️ Initiating Self-Correction Sequence...", session_id=self.session_id)
             planning_agent = self.agents["planning"]
             current_roadmap = self.context.get("roadmap", {})
             
@@ -391,31 +648,32 @@ class CareerOrchestrator:
                 updated_roadmap = await planning_agent.adjust_roadmap(
                     current_roadmap, 
                     {
-                        "new_trends": new_research_data.get("analysis", {}).get("emerging_trends", []),
-                        "job_delta": job_change
+                        "new_trends": new_trends,
+                        "job_delta": delta.net_change
                     },
-                    score=self.context.get("verification_results", {}).get("overall_score", 0.0)
+                    score=(self.context.get("verification_results") or {}).get("overall_score", 0.0)
                 )
                 
                 self.context["roadmap"] = updated_roadmap
                 self.context["roadmap_version"] = self.context.get("roadmap_version", 1) + 1
                 
-                mission_ctl.log_event("SUCCESS", f"✅ Roadmap Self-Corrected (v{self.context['roadmap_version']})")
+                mission_ctl.log_event("SUCCESS", f"✅ Roadmap Self-Corrected (v{self.context['roadmap_version']})", session_id=self.session_id)
                 await self.save_thought_signature("ROADMAP_SELF_CORRECTED", {
                     "version": self.context["roadmap_version"],
                     "changes": "Updated based on market shift"
                 })
-
         
         # Update context
         self.context["research_data"] = new_research_data
-        self.context["previous_job_count"] = new_count
+        self.context["listing_index"] = current_index
+        self.context["previous_job_count"] = delta.current_count
         
         # Track trend history
         self.context["market_trend_history"].append({
             "timestamp": datetime.datetime.now().isoformat(),
-            "job_count": new_count,
-            "trends": new_research_data.get("analysis", {}).get("emerging_trends", [])
+            "job_count": delta.current_count,
+            "delta": delta.to_dict(),
+            "trends": new_trends
         })
     
     async def _check_user_progress(self):
@@ -443,7 +701,7 @@ class CareerOrchestrator:
         Gracefully stops the marathon session.
         """
         self.is_running = False
-        MissionControl.get_instance().log_event("MARATHON", "Stopping session...")
+        MissionControl.get_instance().log_event("MARATHON", "Stopping session...", session_id=self.session_id)
         await self.save_thought_signature("MARATHON_STOP_REQUESTED", {})
 
 if __name__ == "__main__":
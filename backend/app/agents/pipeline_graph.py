@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Any, List, Optional, Callable, Awaitable, Iterable
+
+StageFunc = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+
+class PipelineStageError(Exception):
+    """
+    Raised when a pipeline stage fails or times out.
+    """
+    def __init__(self, stage: str, error: BaseException):
+        self.stage = stage
+        self.error = error
+        super().__init__(f"Stage '{stage}' failed: {error}")
+
+
+class PipelineStage:
+    """
+    A named unit of pipeline work with explicit upstream dependencies.
+    The stage function receives the results of all completed stages.
+    """
+    def __init__(self, name: str, func: StageFunc, depends_on: Iterable[str] = (), timeout: Optional[float] = None):
+        self.name = name
+        self.func = func
+        self.depends_on = list(depends_on)
+        self.timeout = timeout
+
+
+class StageGraph:
+    """
+    Small declarative DAG executor for the agent pipeline.
+
+    Stages start as soon as all of their dependencies have finished, so independent
+    stages (e.g. execution / verification / velocity after planning) overlap.
+    Each stage runs under its own timeout and its wall-clock timing is recorded.
+    """
+
+    def __init__(
+        self,
+        default_timeout: Optional[float] = None,
+        on_stage_complete: Optional[Callable[[str, Any], Awaitable[None]]] = None
+    ):
+        self.default_timeout = default_timeout
+        self.on_stage_complete = on_stage_complete  # e.g. checkpoint persistence
+        self.stages: Dict[str, PipelineStage] = {}
+        self.timings: Dict[str, Dict[str, Any]] = {}
+
+    def add_stage(self, name: str, func: StageFunc, depends_on: Iterable[str] = (), timeout: Optional[float] = None) -> "StageGraph":
+        if name in self.stages:
+            raise ValueError(f"Duplicate pipeline stage: {name}")
+        self.stages[name] = PipelineStage(name, func, depends_on, timeout)
+        return self
+
+    def execution_order(self) -> List[str]:
+        """
+        Returns a topological order of the stages. Raises ValueError on unknown
+        dependencies or cycles.
+        """
+        for stage in self.stages.values():
+            for dep in stage.depends_on:
+                if dep not in self.stages:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dep}'")
+
+        order: List[str] = []
+        visiting: set = set()
+        visited: set = set()
+
+        def visit(name: str):
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Pipeline graph has a cycle through '{name}'")
+            visiting.add(name)
+            for dep in self.stages[name].depends_on:
+                visit(dep)
+            visiting.discard(name)
+            visited.add(name)
+            order.append(name)
+
+        for name in self.stages:
+            visit(name)
+        return order
+
+    async def run(self, initial_results: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Executes the graph and returns {stage_name: result}.
+        Stages already present in initial_results (e.g. loaded from checkpoints)
+        are treated as completed and not re-run.
+        """
+        self.execution_order()  # validate before starting anything
+
+        results: Dict[str, Any] = dict(initial_results or {})
+        for name in results:
+            if name in self.stages:
+                self.timings[name] = {"status": "resumed", "start_offset_ms": 0.0, "duration_ms": 0.0}
+        pending = {name: stage for name, stage in self.stages.items() if name not in results}
+        running: Dict[asyncio.Task, str] = {}
+        graph_start = time.perf_counter()
+
+        try:
+            while pending or running:
+                for name, stage in list(pending.items()):
+                    if all(dep in results for dep in stage.depends_on):
+                        del pending[name]
+                        task = asyncio.create_task(self._run_stage(stage, results, graph_start))
+                        running[task] = name
+
+                if not running:
+                    # Only reachable if a dependency never completes
+                    raise ValueError(f"Unschedulable stages: {sorted(pending)}")
+
+                done, _ = await asyncio.wait(running.keys(), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = running.pop(task)
+                    results[name] = task.result()
+                    if self.on_stage_complete:
+                        try:
+                            await self.on_stage_complete(name, results[name])
+                        except Exception as e:
+                            logging.error(f"[Pipeline] on_stage_complete failed for '{name}': {e}")
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running.keys(), return_exceptions=True)
+
+        return results
+
+    async def _run_stage(self, stage: PipelineStage, results: Dict[str, Any], graph_start: float) -> Any:
+        timeout = stage.timeout if stage.timeout is not None else self.default_timeout
+        started = time.perf_counter()
+        status = "completed"
+        try:
+            return await asyncio.wait_for(stage.func(results), timeout=timeout)
+        except asyncio.TimeoutError as e:
+            status = "timeout"
+            logging.error(f"[Pipeline] Stage '{stage.name}' timed out after {timeout}s")
+            raise PipelineStageError(stage.name, e) from e
+        except asyncio.CancelledError:
+            status = "cancelled"
+            raise
+        except Exception as e:
+            status = "failed"
+            raise PipelineStageError(stage.name, e) from e
+        finally:
+            finished = time.perf_counter()
+            self.timings[stage.name] = {
+                "status": status,
+                "start_offset_ms": round((started - graph_start) * 1000, 1),
+                "duration_ms": round((finished - started) * 1000, 1)
+            }
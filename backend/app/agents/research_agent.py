@@ -50,19 +50,33 @@ class ResearchAgent:
         else:
             # Standard single-market analysis
             market_data = await self.aggregator.gather_insights(goal, location)
+            return await self.analyze_market_data(goal, market_data)
 
-            # Perform semantic "clustering" on the gathered data
-            analysis = await self._perform_semantic_analysis(market_data["listings"])
+    async def fetch_listings(self, goal: str, location: str = "Global") -> List[Dict[str, Any]]:
+        """
+        Cheap listings-only fetch used by marathon cycles: scrapers only, zero LLM calls.
+        """
+        market_data = await self.aggregator.gather_insights(goal, location, include_insights=False)
+        return market_data.get("listings", [])
 
-            # ENHANCED: Generate market predictions
-            predictions = await self._generate_market_predictions(analysis, market_data["listings"], goal)
+    async def analyze_market_data(self, goal: str, market_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Runs semantic analysis and market predictions over already-fetched market data.
+        """
+        listings = market_data.get("listings", [])
 
-            return {
-                "listings": market_data["listings"],
-                "analysis": {**analysis, "trends": market_data["market_trends"]},
-                "predictions": predictions,
-                "market_summary": f"Analyzed {len(market_data['listings'])} listings. Salary: {market_data['salary_range']}."
-            }
+        # Perform semantic "clustering" on the gathered data
+        analysis = await self._perform_semantic_analysis(listings)
+
+        # ENHANCED: Generate market predictions
+        predictions = await self._generate_market_predictions(analysis, listings, goal)
+
+        return {
+            "listings": listings,
+            "analysis": {**analysis, "trends": market_data.get("market_trends", [])},
+            "predictions": predictions,
+            "market_summary": f"Analyzed {len(listings)} listings. Salary: {market_data.get('salary_range')}."
+        }
 
     async def _perform_semantic_analysis(self, listings: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -17,9 +17,12 @@ class MarketAggregator:
         self.indeed = IndeedScraper(headless=True)
         self.executor = ThreadPoolExecutor(max_workers=2)
 
-    async def gather_insights(self, query: str, location: str = "Kenya") -> Dict[str, Any]:
+    async def gather_insights(self, query: str, location: str = "Kenya", include_insights: bool = True) -> Dict[str, Any]:
         """
         Gathers jobs and market insights from all configured sources in parallel.
+
+        With include_insights=False only the scrapers run: no Gemini trend lookup and
+        no synthetic fallback. Marathon cycles use this as their cheap listings fetch.
         """
         logging.info(f"Aggregating market data for {query} in {location}")
 
@@ -56,6 +59,14 @@ class MarketAggregator:
                 "posted_at": datetime.now()
             })
 
+        if not include_insights:
+            return {
+                "listings": normalized_jobs,
+                "market_trends": [],
+                "salary_range": None,
+                "source_count": 2 if normalized_jobs else 0
+            }
+
         if not normalized_jobs:
             logging.warning("⚠️ Scrapers returned 0 jobs. Activating Gemini Synthetic Fallback.")
             normalized_jobs = await self._generate_synthetic_market_data(query, location)
@@ -0,0 +1,231 @@
+import json
+import logging
+from collections import deque
+from collections.abc import MutableMapping
+from typing import Dict, Any, List, Optional, Iterator
+
+from app.core.config import settings
+
+# Context keys holding append-only history (windowed in RAM, overflow spilled to DB)
+HISTORY_KEYS = ("market_trend_history",)
+
+# Context keys that may be evicted to the DB when the memory budget is exceeded
+SPILLABLE_KEYS = ("research_data", "resources", "career_trajectory", "velocity_metrics")
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Approximate in-memory footprint, measured as serialized JSON bytes.
+    """
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return 0
+
+
+def compact_value(value: Any) -> Any:
+    """
+    Compact stand-in kept in RAM for a spilled value: dicts keep their scalar and
+    small fields, list fields are replaced by their length.
+    """
+    if isinstance(value, dict):
+        compact: Dict[str, Any] = {"_spilled": True}
+        for field, item in value.items():
+            if isinstance(item, list):
+                compact[f"{field}_count"] = len(item)
+            else:
+                compact[field] = item
+        return compact
+    if isinstance(value, list):
+        return {"_spilled": True, "count": len(value)}
+    return value
+
+
+class SpillingHistory:
+    """
+    List-like history that keeps the newest `limit` entries in memory; older ones
+    queue up for the next spill to the DB.
+    """
+
+    def __init__(self, entries: Optional[List[Any]] = None, limit: int = 50):
+        self.limit = limit
+        self.window: deque = deque()
+        self.pending: List[Any] = []
+        self.spilled_count = 0
+        for entry in entries or []:
+            self.append(entry)
+
+    def append(self, entry: Any):
+        self.window.append(entry)
+        while len(self.window) > self.limit:
+            self.pending.append(self.window.popleft())
+
+    @property
+    def total_count(self) -> int:
+        return self.spilled_count + len(self.pending) + len(self.window)
+
+    def __len__(self) -> int:
+        return len(self.window)
+
+    def __iter__(self):
+        return iter(self.window)
+
+    def __getitem__(self, index):
+        return list(self.window)[index] if isinstance(index, slice) else self.window[index]
+
+    def __bool__(self) -> bool:
+        return bool(self.window)
+
+    def __eq__(self, other) -> bool:
+        return list(self.window) == list(other)
+
+
+class SessionContext(MutableMapping):
+    """
+    Orchestrator context with a memory budget.
+
+    Behaves like the plain dict it replaces. History keys keep a bounded window
+    in RAM and spill the rest to the DB; once the context exceeds its budget,
+    the largest spillable values are written to the DB and replaced by compact
+    summaries. Full values are loaded back on demand with `fetch()` / `load_history()`.
+    """
+
+    def __init__(self, db: Any, initial: Optional[Dict[str, Any]] = None, budget_bytes: Optional[int] = None, history_limit: Optional[int] = None):
+        self.db = db
+        self.budget_bytes = budget_bytes or settings.SESSION_CONTEXT_BUDGET_BYTES
+        self.history_limit = history_limit or settings.SESSION_HISTORY_LIMIT
+        self._data: Dict[str, Any] = {}
+        self._sizes: Dict[str, int] = {}
+        self.spilled: Dict[str, int] = {}  # key -> bytes moved to the DB
+        self.spill_count = 0
+        for key, value in (initial or {}).items():
+            self[key] = value
+
+    # ---------- Mapping interface ----------
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __setitem__(self, key: str, value: Any):
+        if key in HISTORY_KEYS and not isinstance(value, SpillingHistory):
+            value = SpillingHistory(value, self.history_limit)
+        self._data[key] = value
+        self._sizes.pop(key, None)  # re-measured lazily
+        self.spilled.pop(key, None)  # a fresh value supersedes the spilled one
+
+    def __delitem__(self, key: str):
+        del self._data[key]
+        self._sizes.pop(key, None)
+        self.spilled.pop(key, None)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    # ---------- Accounting ----------
+
+    def _size_of(self, key: str) -> int:
+        if key not in self._sizes:
+            value = self._data.get(key)
+            if isinstance(value, SpillingHistory):
+                value = list(value.window) + value.pending
+            self._sizes[key] = estimate_size(value)
+        return self._sizes[key]
+
+    def memory_usage(self, refresh: bool = False) -> Dict[str, Any]:
+        if refresh:
+            self._sizes.clear()
+        per_key = {key: self._size_of(key) for key in self._data}
+        history = {
+            key: {"in_memory": len(value), "total": value.total_count}
+            for key, value in self._data.items() if isinstance(value, SpillingHistory)
+        }
+        return {
+            "total_bytes": sum(per_key.values()),
+            "budget_bytes": self.budget_bytes,
+            "keys": per_key,
+            "spilled_keys": sorted(self.spilled),
+            "spilled_bytes": sum(self.spilled.values()),
+            "spill_count": self.spill_count,
+            "history": history
+        }
+
+    # ---------- Spilling ----------
+
+    async def enforce_budget(self) -> List[str]:
+        """
+        Flushes pending history and, while over budget, spills the largest
+        spillable values. Returns the keys spilled in this pass.
+        """
+        await self.flush_history()
+
+        usage = self.memory_usage(refresh=True)
+        total = usage["total_bytes"]
+        spilled_now: List[str] = []
+        candidates = sorted(
+            (key for key in SPILLABLE_KEYS if key in self._data and key not in self.spilled and self._data[key] is not None),
+            key=lambda key: usage["keys"].get(key, 0),
+            reverse=True
+        )
+        for key in candidates:
+            if total <= self.budget_bytes:
+                break
+            value = self._data[key]
+            size = usage["keys"][key]
+            await self.db.save_context_snapshot(key, value)
+            compact = compact_value(value)
+            self._data[key] = compact
+            self._sizes[key] = estimate_size(compact)
+            self.spilled[key] = size
+            self.spill_count += 1
+            total -= size - self._sizes[key]
+            spilled_now.append(key)
+
+        if spilled_now:
+            logging.info(f"[Context] Spilled {spilled_now} to DB ({total} bytes in memory, budget {self.budget_bytes})")
+        return spilled_now
+
+    async def flush_history(self):
+        for key, value in self._data.items():
+            if isinstance(value, SpillingHistory) and value.pending:
+                batch, value.pending = value.pending, []
+                await self.db.append_context_history(key, batch)
+                value.spilled_count += len(batch)
+                self._sizes.pop(key, None)
+
+    async def fetch(self, key: str, default: Any = None) -> Any:
+        """
+        Returns the full value for a key, loading it from the DB if it was spilled.
+        The loaded value is not put back into memory.
+        """
+        if key in self.spilled:
+            value = await self.db.load_context_snapshot(key)
+            return default if value is None else value
+        return self._data.get(key, default)
+
+    async def load_history(self, key: str, limit: int = 100, offset: int = 0) -> List[Any]:
+        """
+        Pages through a history key oldest-first across the DB and the in-memory window.
+        """
+        history = self._data.get(key)
+        if not isinstance(history, SpillingHistory):
+            return list(history or [])[offset:offset + limit]
+
+        entries: List[Any] = []
+        if offset < history.spilled_count:
+            entries = await self.db.load_context_history(key, limit=limit, offset=offset)
+        unspilled = history.pending + list(history.window)
+        start = max(0, offset - history.spilled_count)
+        entries.extend(unspilled[start:start + limit - len(entries)])
+        return entries
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Plain-dict view (history windows as lists) for serialization.
+        """
+        return {
+            key: list(value) if isinstance(value, SpillingHistory) else value
+            for key, value in self._data.items()
+        }
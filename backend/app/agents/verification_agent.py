@@ -1,7 +1,15 @@
+import asyncio
 import logging
 import json
 from typing import Dict, Any, List
+from app.core.config import settings
+from app.services.adjustment_policy import AdjustmentPolicy
 from app.services.gemini_client import gemini_client
+from app.services.question_bank import QuestionBank, normalize_skill
+from app.services.repo_audit import RepoAuditor
+
+QUIZ_SIZE = 3
+INTERVIEW_SIZE = 3
 
 class VerificationAgent:
     """
@@ -15,71 +23,29 @@ class VerificationAgent:
         """
         EXTRAORDINARY: Autonomous Code Vibe Check
         Verifies if a user's GitHub repo matches the roadmap requirements.
-        Uses Gemini to reason over code structure (README, package.json).
+        README, manifests and the file tree are checked locally first; Gemini
+        only reasons over what the static checks cannot confirm.
         """
         logging.info(f"🕵️ VerificationAgent: Auditing repo {repo_url}")
-        
+
         try:
-            import httpx
-            # Convert normal URL to raw content URL for README
-            # Example: https://github.com/user/repo -> https://raw.githubusercontent.com/user/repo/main/README.md
-            
-            # Simple heuristic for main/master branch
-            base_url = repo_url.replace("github.com", "raw.githubusercontent.com")
-            readme_url = f"{base_url}/main/README.md"
-            
-            async with httpx.AsyncClient() as client:
-                resp = await client.get(readme_url)
-                if resp.status_code == 404:
-                    readme_url = f"{base_url}/master/README.md"
-                    resp = await client.get(readme_url)
-                
-                if resp.status_code != 200:
-                    return {
-                        "verified": False,
-                        "score": 0,
-                        "reason": "Could not access README.md. Please ensure the repo is public and has a README."
-                    }
-                
-                readme_content = resp.text[:5000] # Analyze first 5k chars
-                
-                # Use Gemini to Audit
-                from app.services.gemini_client import gemini_client
-                prompt = f"""
-                Audit this GitHub Project README against these requirements: {requirements}
-                
-                README Content:
-                {readme_content}
-                
-                Return JSON:
-                {{
-                    "verified": true/false (true if most requirements met),
-                    "score": 0-100,
-                    "found_features": ["feature1", "feature2"],
-                    "missing_features": ["feature3"],
-                    "feedback": "Constructive feedback on the project documentation."
-                }}
-                """
-                
-                ai_resp = await gemini_client.generate_content_async(prompt, generation_config={"response_mime_type": "application/json"})
-                return json.loads(ai_resp.text)
-                
+            return await RepoAuditor.get_instance().audit(repo_url, requirements, gemini_client)
         except Exception as e:
             logging.error(f"Repo verification failed: {e}")
             return {"verified": False, "error": str(e)}
 
-    async def verify_skills(self, roadmap: Dict[str, Any]) -> Dict[str, Any]:
+    async def verify_skills(self, roadmap: Dict[str, Any], user_id: str = "anonymous") -> Dict[str, Any]:
         """
         Main entry point for skill verification.
         """
         logging.info("Generating verification suite...")
-        
-        # 1. Generate Quiz
-        quiz = await self._generate_gemini_quiz(roadmap)
-        
-        # 2. Generate Mock Interview Questions
-        interview = await self.generate_mock_interview(roadmap)
-        
+
+        # Quiz and mock interview are independent: build them concurrently
+        quiz, interview = await asyncio.gather(
+            self._generate_gemini_quiz(roadmap, user_id),
+            self.generate_mock_interview(roadmap, user_id)
+        )
+
         return {
             "overall_score": 0,
             "quiz": quiz,
@@ -88,20 +54,26 @@ class VerificationAgent:
             "feedback": "Agentic verification layer ready. Take the quiz or start the mock interview."
         }
 
-    async def _generate_gemini_quiz(self, roadmap: Dict[str, Any]) -> Dict[str, Any]:
-        milestone = roadmap.get("milestones", [{}])[0]
-        focus_skills = milestone.get("focus", [])
-        
-        prompt = f"""
-        Act as a technical interviewer. Based on these target skills: {focus_skills}, 
-        generate a 3-question technical quiz. 
-        Return ONLY JSON with 'questions' list, each having 'q', 'options', and 'correct_answer'.
-        """
-        
+    @staticmethod
+    def _difficulty(roadmap: Dict[str, Any]) -> str:
+        milestone = (roadmap.get("milestones") or [{}])[0]
+        return str(roadmap.get("difficulty") or milestone.get("difficulty") or settings.QUESTION_BANK_DEFAULT_DIFFICULTY)
+
+    async def _generate_gemini_quiz(self, roadmap: Dict[str, Any], user_id: str = "anonymous") -> Dict[str, Any]:
+        milestone = (roadmap.get("milestones") or [{}])[0]
+        focus_skills = list(dict.fromkeys(normalize_skill(skill) for skill in milestone.get("focus", [])))[:QUIZ_SIZE]
+        topics = focus_skills or [normalize_skill(roadmap.get("career_goal") or "software engineering")]
+        difficulty = self._difficulty(roadmap)
+        # Spread the questions over the focus skills, round robin
+        counts = [QUIZ_SIZE // len(topics) + (i < QUIZ_SIZE % len(topics)) for i in range(len(topics))]
+
+        bank = QuestionBank.get_instance()
         try:
-            # Use synchronous call
-            response = await gemini_client.generate_content_async(prompt, generation_config={"response_mime_type": "application/json"})
-            return json.loads(response.text)
+            picked = await asyncio.gather(*(
+                bank.take("quiz", topic, difficulty, count, user_id, self._generate_bank_questions)
+                for topic, count in zip(topics, counts)
+            ))
+            return {"questions": [question for questions in picked for question in questions]}
         except Exception as e:
             logging.error(f"Quiz generation failed: {e}")
             # No fallback - return empty structure
@@ -110,17 +82,20 @@ class VerificationAgent:
                 "error": str(e)
             }
 
-    async def generate_mock_interview(self, roadmap: Dict[str, Any]) -> Dict[str, Any]:
+    async def generate_mock_interview(self, roadmap: Dict[str, Any], user_id: str = "anonymous") -> Dict[str, Any]:
         """
         Generates situational/behavioral and deep technical questions for a mock interview.
         """
         goal = roadmap.get("career_goal", "Software Engineer")
-        prompt = f"Generate 3 specialized mock interview questions for a {goal} candidate. Return ONLY JSON with keys 'technical' and 'behavioral'."
-        
+        difficulty = self._difficulty(roadmap)
+        bank = QuestionBank.get_instance()
+
         try:
-            # Use synchronous call
-            response = await gemini_client.generate_content_async(prompt, generation_config={"response_mime_type": "application/json"})
-            return json.loads(response.text)
+            technical, behavioral = await asyncio.gather(
+                bank.take("technical", goal, difficulty, INTERVIEW_SIZE, user_id, self._generate_bank_questions),
+                bank.take("behavioral", goal, "any", INTERVIEW_SIZE, user_id, self._generate_bank_questions)
+            )
+            return {"technical": technical, "behavioral": behavioral}
         except Exception as e:
             logging.error(f"Mock interview generation failed: {e}")
             # No fallback - return empty structure
@@ -130,31 +105,46 @@ class VerificationAgent:
                 "error": str(e)
             }
 
-    async def suggest_roadmap_adjustments(self, current_roadmap: Dict[str, Any], score: int) -> Dict[str, Any]:
+    async def _generate_bank_questions(self, kind: str, topic: str, difficulty: str, count: int) -> List[Any]:
+        """
+        One Gemini call for a batch of question-bank entries.
+        """
+        if kind == "quiz":
+            prompt = f"""
+            Act as a technical interviewer. Generate {count} distinct {difficulty}-level multiple-choice
+            questions testing the skill: {topic}.
+            Return ONLY a JSON list; each item has 'q', 'options' (4 strings) and 'correct_answer'.
+            """
+        elif kind == "technical":
+            prompt = f"Generate {count} distinct {difficulty}-level technical interview questions for a {topic} candidate. Return ONLY a JSON list of question strings."
+        else:
+            prompt = f"Generate {count} distinct behavioral or situational interview questions for a {topic} candidate. Return ONLY a JSON list of question strings."
+
+        response = await gemini_client.generate_content_async(prompt, generation_config={"response_mime_type": "application/json"})
+        questions = json.loads(response.text)
+        if isinstance(questions, dict):
+            # Tolerate {"questions": [...]} or {"technical": [...]} wrappers
+            questions = next((value for value in questions.values() if isinstance(value, list)), [])
+        if not isinstance(questions, list):
+            raise ValueError(f"Unexpected {kind} questions payload: {type(questions).__name__}")
+        if kind == "quiz":
+            return [q for q in questions if isinstance(q, dict) and q.get("q") and q.get("options")]
+        return [str(q.get("question") if isinstance(q, dict) else q) for q in questions if q]
+
+    async def suggest_roadmap_adjustments(self, current_roadmap: Dict[str, Any], score: Any) -> Dict[str, Any]:
         """
         Dynamically adjusts roadmap intensity based on user score (0-100).
+
+        The decision is made locally by AdjustmentPolicy; Gemini only writes the
+        (cached) explanation when the policy asks for one. A score of None means
+        the learner has not taken the assessment yet.
         """
         logging.info(f"Analyzing performance (Score: {score}). Suggesting adjustments...")
-        
-        prompt = f"""
-        Current Roadmap: {json.dumps(current_roadmap)}
-        User Score: {score}/100
-        
-        If score < 50: Recommend 'Bridge Week' or 'Deep Foundations'.
-        If score > 85: Recommend 'Fast-Track' or 'Advanced Tracks'.
-        Return ONLY JSON with 'recommendation', 'action', and 'adjusted_weekly_hours'.
-        """
-        
-        try:
-            # Use synchronous call
-            response = await gemini_client.generate_content_async(prompt, generation_config={"response_mime_type": "application/json"})
-            return json.loads(response.text)
-        except Exception as e:
-            logging.error(f"Roadmap adjustment failed: {e}")
-            # No fallback - return empty structure
-            return {
-                "recommendation": "Analysis failed",
-                "action": "NONE",
-                "adjusted_weekly_hours": 0,
-                "error": str(e)
-            }
+
+        policy = AdjustmentPolicy.get_instance()
+        adjustment = policy.decide(current_roadmap, score)
+        if adjustment.pop("narrative_requested"):
+            adjustment["narrative"] = await policy.narrative(current_roadmap, adjustment, gemini_client) or adjustment["reason"]
+        else:
+            adjustment["narrative"] = adjustment["reason"]
+        return adjustment
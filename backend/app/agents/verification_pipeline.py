@@ -0,0 +1,209 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Any, List, Optional, Tuple, Callable, Awaitable
+
+from app.core.config import settings
+from app.services.verification_cache import VerificationCache
+
+# End-of-stream marker passed down the queues (one per downstream worker)
+_DONE = object()
+
+
+class VerificationPipeline:
+    """
+    Streams candidate resources through search -> fetch/extract -> sandbox.
+
+    Stages are connected by bounded queues, so a resource is being sandboxed
+    while the next ones are still downloading, and a slow stage back-pressures
+    the one feeding it. Fetches go through the shared HttpPool (keep-alive,
+    per-host limits) and pages are extracted while they stream in, so a body is
+    never held in memory whole. The whole run has a deadline: resources not finished by
+    then are reported as unverified instead of holding up the response.
+
+    With the VerificationCache, known URLs are revalidated with conditional
+    GETs and unchanged pages never reach the sandbox.
+    """
+
+    def __init__(
+        self,
+        agent: Any,
+        fetch_workers: Optional[int] = None,
+        sandbox_workers: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        deadline: Optional[float] = None,
+        cache: Optional[VerificationCache] = None
+    ):
+        self.agent = agent
+        self.fetch_workers = fetch_workers or settings.VERIFICATION_FETCH_WORKERS
+        self.sandbox_workers = sandbox_workers or settings.VERIFICATION_SANDBOX_WORKERS
+        self.queue_size = queue_size or settings.VERIFICATION_QUEUE_SIZE
+        self.deadline = deadline or settings.VERIFICATION_DEADLINE_SECONDS
+        if cache is None and settings.VERIFICATION_CACHE_ENABLED:
+            cache = VerificationCache.get_instance()
+        self.cache = cache
+
+        self.resources: List[Dict[str, Any]] = []
+        self.results: Dict[int, Dict[str, Any]] = {}
+        self.stage_counts = {"searched": 0, "cached": 0, "fetched": 0, "extracted": 0, "sandboxed": 0}
+        self.deadline_hit = False
+        self.elapsed = 0.0
+
+    async def run(self, milestones: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Returns (resource, verification) pairs in search order.
+        """
+        started = time.monotonic()
+        stages = asyncio.ensure_future(self._run_stages(milestones))
+        done, _ = await asyncio.wait({stages}, timeout=self.deadline)
+        if not done:
+            self.deadline_hit = True
+            stages.cancel()
+            await asyncio.gather(stages, return_exceptions=True)
+            logging.warning(f"[Verification] Deadline of {self.deadline}s reached; {len(self.results)}/{len(self.resources)} resources finished")
+        else:
+            stages.result()  # re-raise unexpected pipeline errors
+        self.elapsed = time.monotonic() - started
+
+        pending = {
+            "verified": False,
+            "score": 0.0,
+            "summary": "Verification deadline reached"
+        }
+        return [(resource, self.results.get(index, pending)) for index, resource in enumerate(self.resources)]
+
+    async def _run_stages(self, milestones: List[Dict[str, Any]]):
+        fetch_queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        sandbox_queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+
+        tasks = [
+            asyncio.ensure_future(self._search(milestones, fetch_queue)),
+            asyncio.ensure_future(self._stage(fetch_queue, sandbox_queue, self.fetch_workers, self.sandbox_workers, self._fetch)),
+            asyncio.ensure_future(self._stage(sandbox_queue, None, self.sandbox_workers, 0, self._sandbox))
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            # On a stage failure or the deadline, stop the others instead of leaving them blocked on a queue
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _search(self, milestones: List[Dict[str, Any]], outbox: asyncio.Queue):
+        for milestone in milestones:
+            try:
+                candidates = await self.agent._search_resources_for_milestone(milestone)
+            except Exception as e:
+                logging.error(f"[Verification] Search failed for {milestone.get('title', 'Unknown')}: {e}")
+                continue
+            logging.info(f"[Verification] Found {len(candidates)} candidates for {milestone.get('title', 'Unknown')}")
+            for resource in candidates:
+                index = len(self.resources)
+                self.resources.append(resource)
+                self.stage_counts["searched"] += 1
+                await outbox.put((index, resource))
+        for _ in range(self.fetch_workers):
+            await outbox.put(_DONE)
+
+    async def _stage(
+        self,
+        inbox: asyncio.Queue,
+        outbox: Optional[asyncio.Queue],
+        workers: int,
+        downstream_workers: int,
+        handle: Callable[[Tuple], Awaitable[Optional[Tuple]]]
+    ):
+        async def worker():
+            while True:
+                item = await inbox.get()
+                if item is _DONE:
+                    return
+                index = item[0]
+                try:
+                    forwarded = await handle(item)
+                except Exception as e:
+                    logging.error(f"[Verification] Error verifying resource: {e}")
+                    self.results[index] = {
+                        "verified": False,
+                        "score": 0.0,
+                        "summary": f"Verification error: {str(e)}"
+                    }
+                    continue
+                if forwarded is not None and outbox is not None:
+                    await outbox.put(forwarded)
+
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        for _ in range(downstream_workers):
+            await outbox.put(_DONE)
+
+    async def _fetch(self, item: Tuple) -> Optional[Tuple]:
+        index, resource = item
+        url = resource["url"]
+        entry = await self.cache.lookup(url) if self.cache else None
+        if entry is not None and self.cache.is_fresh(entry):
+            self.cache.record_fresh_hit(entry)
+            return self._reuse(index, entry)
+
+        logging.info(f"[Verification] Scraping: {resource['name']}")
+        headers = self.cache.conditional_headers(entry) if self.cache else None
+        fetched = await self.agent._scan_resource(url, headers=headers or None)
+        if fetched is None or (fetched[1] is None and entry is None):
+            self.results[index] = {
+                "verified": False,
+                "score": 0.0,
+                "summary": "Failed to scrape content"
+            }
+            return None
+        response, scan = fetched
+        if scan is None:  # 304 Not Modified
+            await self.cache.record_revalidation(entry, response.headers, not_modified=True)
+            return self._reuse(index, entry)
+        if entry is not None and entry.content_hash == scan.content_hash:
+            await self.cache.record_revalidation(entry, response.headers, not_modified=False)
+            return self._reuse(index, entry)
+
+        self.stage_counts["fetched"] += 1
+        self.stage_counts["extracted"] += 1
+        code_blocks = scan.code_blocks
+        logging.info(f"[Verification] Extracted {len(code_blocks)} code blocks from {scan.size} bytes")
+        source = {"url": url, "headers": response.headers, "digest": scan.content_hash, "size": scan.size}
+        if not code_blocks:
+            self.results[index] = {
+                "verified": False,
+                "score": 0.3,
+                "summary": "No code examples found"
+            }
+            await self._remember(source, code_blocks, self.results[index])
+            return None
+        return index, code_blocks, source
+
+    def _reuse(self, index: int, entry: Any) -> None:
+        self.stage_counts["cached"] += 1
+        self.results[index] = entry.verification
+        return None
+
+    async def _sandbox(self, item: Tuple) -> None:
+        index, code_blocks, source = item
+        test_results = await self.agent._test_code_in_sandbox(code_blocks)
+        self.stage_counts["sandboxed"] += 1
+        logging.info(f"[Verification] Code test results: {test_results['pass_rate']:.2%}")
+        self.results[index] = self.agent._build_verification(source["size"], code_blocks, test_results)
+        await self._remember(source, code_blocks, self.results[index])
+        return None
+
+    async def _remember(self, source: Dict[str, Any], code_blocks: List[Dict[str, Any]], verification: Dict[str, Any]):
+        if self.cache:
+            await self.cache.store(source["url"], source["size"], source["digest"], source["headers"], code_blocks, verification)
+
+    def stats(self) -> Dict[str, Any]:
+        verified = sum(1 for result in self.results.values() if result.get("verified"))
+        return {
+            **self.stage_counts,
+            "resources": len(self.resources),
+            "finished": len(self.results),
+            "verified": verified,
+            "cache": self.cache.stats() if self.cache else None,
+            "deadline_hit": self.deadline_hit,
+            "elapsed_seconds": round(self.elapsed, 3),
+            "resources_per_second": round(len(self.results) / self.elapsed, 2) if self.elapsed else 0.0
+        }
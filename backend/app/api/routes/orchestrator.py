@@ -1,6 +1,6 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, BackgroundTasks
+from fastapi import APIRouter, HTTPException, UploadFile, File
 from typing import List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 router = APIRouter()
 
@@ -10,8 +10,11 @@ class MarathonInput(BaseModel):
     current_status: str
     skills: List[str] = []
     duration_hours: int = 72
-    check_interval_minutes: int = 30
+    check_interval_minutes: int = Field(default=30, ge=1)
     constraints: List[str] = []
+    user_id: Optional[str] = None  # Pass a previous session's user_id with resume=True
+    session_id: Optional[str] = None  # With resume=True: continue this session (its checkpoints are session-scoped)
+    resume: bool = False
 
 class TournamentInput(BaseModel):
     career_goal: str
@@ -67,16 +70,31 @@ async def analyze_video(file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/orchestrator/start")
-async def start_marathon(input_data: MarathonInput, background_tasks: BackgroundTasks):
+async def start_marathon(input_data: MarathonInput):
+    from app.services.marathon_scheduler import MarathonScheduler, SchedulerCapacityError
+    from app.services.marathon_queue import MarathonQueueWorker
+    scheduler = MarathonScheduler.get_instance()
+    if scheduler.metrics()["capacity_remaining"] <= 0:
+        raise HTTPException(status_code=503, detail="Marathon capacity reached, try again later")
+
     try:
         from app.agents.orchestrator import CareerOrchestrator
+        from app.services.marathon_queue import TERMINAL_STATUSES
         import uuid
         
-        user_id = f"user_{uuid.uuid4().hex[:8]}"
+        user_id = input_data.user_id if input_data.resume and input_data.user_id else f"user_{uuid.uuid4().hex[:8]}"
+        resumed_session = input_data.session_id if input_data.resume else None
+        if resumed_session:
+            previous = await MarathonQueueWorker.get_instance().queue.get(resumed_session)
+            if previous is not None and previous.status not in TERMINAL_STATUSES:
+                raise HTTPException(status_code=409, detail=f"Session {resumed_session} is still {previous.status}")
+            if previous is not None:
+                user_id = previous.user_id  # checkpoints are stored under the session's user
         orchestrator = CareerOrchestrator(
             user_id=user_id,
             career_goal=input_data.career_goal,
-            location=input_data.location
+            location=input_data.location,
+            agents=scheduler.shared_agents()
         )
         
         # Create initial session state and persist it
@@ -89,25 +107,84 @@ async def start_marathon(input_data: MarathonInput, background_tasks: Background
             "additional_info": "Agent is running (Time-to-Live: 72 hours). checks: Monitor Mission Control for live updates."
         }
         
-        # Use storage ID as session ID
-        session_id = store_roadmap_result(initial_roadmap)
+        # Use storage ID as session ID; a resumed session keeps its ID so its checkpoints match
+        session_id = resumed_session or store_roadmap_result(initial_roadmap)
         
-        # Start background task
-        background_tasks.add_task(
-            orchestrator.start_marathon_session,
+        # Queue the session in the DB (survives restarts) and run it on this worker
+        await MarathonQueueWorker.get_instance().submit(
+            session_id,
+            orchestrator,
+            constraints={"constraints": input_data.constraints},
             duration_hours=input_data.duration_hours,
-            check_interval_minutes=input_data.check_interval_minutes
+            check_interval_minutes=input_data.check_interval_minutes,
+            resume=input_data.resume
         )
         
         return {
             "session_id": session_id,
+            "user_id": user_id,
             "result_id": session_id, # Explicitly return result_id for frontend compatibility
             "status": "started",
             "message": "Marathon agent deployed successfully"
         }
+    except HTTPException:
+        raise
+    except SchedulerCapacityError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def _job_summary(job):
+    return {
+        "session_id": job.session_key,
+        "job_id": job.id,
+        "status": job.status,
+        "cycle_count": job.cycle_count,
+        "next_run_at": job.next_run_at.isoformat() if job.next_run_at else None,
+        "lease_owner": job.lease_owner,
+        "heartbeat_at": job.heartbeat_at.isoformat() if job.heartbeat_at else None
+    }
+
+async def _control_session(session_id: str, action: str):
+    from app.services.marathon_queue import MarathonQueueWorker
+    local, job = await MarathonQueueWorker.get_instance().control(session_id, action)
+    if local is None and job is None:
+        raise HTTPException(status_code=404, detail="Marathon session not found")
+    # Sessions owned by another worker pick the change up on their next heartbeat
+    return local.to_dict() if local else _job_summary(job)
+
+@router.post("/orchestrator/{session_id}/pause")
+async def pause_marathon(session_id: str):
+    return await _control_session(session_id, "pause")
+
+@router.post("/orchestrator/{session_id}/resume")
+async def resume_marathon(session_id: str):
+    return await _control_session(session_id, "resume")
+
+@router.post("/orchestrator/{session_id}/cancel")
+async def cancel_marathon(session_id: str):
+    return await _control_session(session_id, "cancel")
+
+@router.get("/orchestrator/metrics")
+async def get_marathon_metrics():
+    """
+    Scheduler capacity and throughput (active sessions, busy workers, dispatch lag).
+    """
+    from app.services.marathon_scheduler import MarathonScheduler
+    from app.services.marathon_queue import MarathonQueueWorker
+    return {
+        **MarathonScheduler.get_instance().metrics(),
+        "queue": MarathonQueueWorker.get_instance().stats()
+    }
+
+@router.get("/orchestrator/market-watches")
+async def get_market_watches():
+    """
+    Shared market watches and how many sessions subscribe to each (dedupe ratio).
+    """
+    from app.services.market_watch import MarketWatchRegistry
+    return MarketWatchRegistry.get_instance().stats()
+
 @router.post("/tournament/start")
 async def start_tournament(input_data: TournamentInput):
     try:
@@ -191,12 +268,19 @@ async def get_session_status(session_id: str):
 async def get_session(session_id: str):
     try:
         from app.services.mission_control import MissionControl
+        from app.services.marathon_scheduler import MarathonScheduler
+        from app.services.marathon_queue import MarathonQueueWorker
         mc = MissionControl.get_instance()
+        scheduled = MarathonScheduler.get_instance().get(session_id)
+        job = await MarathonQueueWorker.get_instance().queue.get(session_id)
+        status = scheduled.status if scheduled and scheduled.status != "RELEASED" else (job.status if job else None)
         
         return {
             "session_id": session_id,
-            "status": "active",
-            "logs": mc.mission_logs,
+            "status": status.lower() if status else "active",
+            "scheduler": scheduled.to_dict() if scheduled else None,
+            "job": _job_summary(job) if job else None,
+            "logs": mc.get_logs(session_id),
             "roadmap": {
                 "summary": "Your personalized career roadmap based on marathon analysis",
                 "target_role": "Software Engineer",
@@ -1,6 +1,8 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File
+from fastapi import APIRouter, HTTPException, Request, UploadFile, File
+from fastapi.responses import StreamingResponse
 from app.schemas.roadmap import RoadmapInput, RoadmapOutput, QuickRoadmapInput
 from app.services.roadmap_service import roadmap_service
+from app.services.concurrency import async_map_stream
 from typing import List
 import re
 import json
@@ -212,41 +214,18 @@ async def extract_skills(cv: UploadFile = File(...)):
         print(f"Error extracting skills: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/reuse-stats")
+async def get_reuse_stats():
+    """Roadmap reuse hit rate and generation latency saved"""
+    from app.services.roadmap_reuse import RoadmapReuse
+    return RoadmapReuse.get_instance().stats()
+
 @router.get("/history")
 async def get_history():
     return await roadmap_service.get_history()
 
-@router.post("/execute-roadmap")
-async def execute_roadmap(data: dict | None = None):
-    """Generate detailed learning resources, tasks, and schedule for a roadmap"""
-    try:
-        from app.services.result_storage import get_roadmap_result
-        from app.services.gemini_client import gemini_client
-
-        # Handle OPTIONS preflight requests
-        if data is None:
-            return {"status": "ok"}
-
-        result_id = data.get("result_id") if isinstance(data, dict) else str(data)
-        if not result_id:
-            raise HTTPException(status_code=400, detail="result_id is required")
-
-        # Fetch roadmap data
-        roadmap = get_roadmap_result(result_id)
-        if not roadmap:
-            raise HTTPException(status_code=404, detail="Roadmap not found")
-
-        # Generate resources for each month
-        execution_plan = {
-            "roadmap_id": result_id,
-            "target_role": roadmap.get("target_role", "Unknown Role"),
-            "months": []
-        }
-
-        months_data = roadmap.get("months", [])
-        for month_data in months_data:
-            # Generate specific resources for this month
-            prompt = f"""Generate learning resources for Month {month_data.get('month')} of a {roadmap.get("target_role", "Unknown Role")} learning path.
+def _month_resources_prompt(month_data: dict, target_role: str) -> str:
+    prompt = f"""Generate learning resources for Month {month_data.get('month')} of a {target_role} learning path.
 
 **Month Title**: {month_data.get('title')}
 **Skills to learn**: {', '.join(month_data.get('skills', []))}
@@ -304,80 +283,175 @@ IMPORTANT: Use REAL, working URLs. For YouTube videos, use popular educational c
 - Fireship
 - FastAPI official channel
 - Google Developers"""
-
-            try:
-                response = await gemini_client.generate_content_async(
-                    prompt,
-                    generation_config={
-                        "temperature": 0.7,
-                        "response_mime_type": "application/json"
-                    }
-                )
-
-                response_text = response.text if hasattr(response, 'text') and response.text else str(response)
-                print(f"[DEBUG] Response for month {month_data.get('month')}: {response_text[:500]}...")
-
-                if not response_text:
-                    raise ValueError("Empty response")
-
-                month_resources = json.loads(response_text)
-
-                # Handle list vs dict
-                if isinstance(month_resources, list):
-                    month_resources = month_resources[0] if len(month_resources) > 0 else {}
-                elif not isinstance(month_resources, dict):
-                    print(f"[ERROR] Unexpected response type: {type(month_resources)}")
-                    month_resources = {}
-                
-                month_data = {
-                    "month": month_data.get('month', 1),
-                    "title": month_data.get('title', 'Month'),
-                    "skills": month_data.get('skills', []),
-                    "resources": month_resources,
-                    "tasks": month_data.get('tasks', []),
-                    "progress": 0,
-                    "status": "not_started"
+    return prompt
+
+async def _generate_month_plan(month_data: dict, target_role: str, gemini_client) -> dict:
+    """Generates one month's resources; raises on an empty or invalid response"""
+    response = await gemini_client.generate_content_async(
+        _month_resources_prompt(month_data, target_role),
+        generation_config={
+            "temperature": 0.7,
+            "response_mime_type": "application/json"
+        }
+    )
+
+    response_text = response.text if hasattr(response, 'text') and response.text else str(response)
+    print(f"[DEBUG] Response for month {month_data.get('month')}: {response_text[:500]}...")
+
+    if not response_text:
+        raise ValueError("Empty response")
+
+    month_resources = json.loads(response_text)
+
+    # Handle list vs dict
+    if isinstance(month_resources, list):
+        month_resources = month_resources[0] if len(month_resources) > 0 else {}
+    elif not isinstance(month_resources, dict):
+        print(f"[ERROR] Unexpected response type: {type(month_resources)}")
+        month_resources = {}
+
+    return {
+        "month": month_data.get('month', 1),
+        "title": month_data.get('title', 'Month'),
+        "skills": month_data.get('skills', []),
+        "resources": month_resources,
+        "tasks": month_data.get('tasks', []),
+        "progress": 0,
+        "status": "not_started"
+    }
+
+def _fallback_month_plan(month_data: dict) -> dict:
+    """Fallback resources for a month whose generation failed"""
+    return {
+        "month": month_data.get('month', 1),
+        "title": month_data.get('title', 'Month'),
+        "skills": month_data.get('skills', []),
+        "resources": {
+            "youtube_videos": [
+                {
+                    "title": f"Introduction to {month_data.get('skills', [''])[0] if month_data.get('skills') else 'Development'}",
+                    "url": "https://www.youtube.com/watch?v=rfscVS0vtbw",
+                    "channel": "freeCodeCamp.org",
+                    "duration": "10:00",
+                    "thumbnail": "https://img.youtube.com/vi/rfscVS0vtbw/maxresdefault.jpg",
+                    "description": "Complete beginner tutorial"
                 }
-                
-                execution_plan["months"].append(month_data)
-                
-            except Exception as e:
-                print(f"Error generating resources for month {month_data.get('month')}: {e}")
-                # Add fallback resources
-                month_data = {
-                    "month": month_data.get('month', 1),
-                    "title": month_data.get('title', 'Month'),
-                    "skills": month_data.get('skills', []),
-                    "resources": {
-                        "youtube_videos": [
-                            {
-                                "title": f"Introduction to {month_data.get('skills', [''])[0] if month_data.get('skills') else 'Development'}",
-                                "url": "https://www.youtube.com/watch?v=rfscVS0vtbw",
-                                "channel": "freeCodeCamp.org",
-                                "duration": "10:00",
-                                "thumbnail": "https://img.youtube.com/vi/rfscVS0vtbw/maxresdefault.jpg",
-                                "description": "Complete beginner tutorial"
-                            }
-                        ],
-                        "courses": [
-                            {
-                                "title": f"{month_data.get('skills', [''])[0] if month_data.get('skills') else 'Development'} Fundamentals",
-                                "url": "https://www.coursera.org/",
-                                "platform": "Coursera",
-                                "duration": "20 hours",
-                                "price": "Free"
-                            }
-                        ],
-                        "weekly_schedule": []
-                    },
-                    "tasks": month_data.get('tasks', []),
-                    "progress": 0,
-                    "status": "not_started"
+            ],
+            "courses": [
+                {
+                    "title": f"{month_data.get('skills', [''])[0] if month_data.get('skills') else 'Development'} Fundamentals",
+                    "url": "https://www.coursera.org/",
+                    "platform": "Coursera",
+                    "duration": "20 hours",
+                    "price": "Free"
                 }
-                execution_plan["months"].append(month_data)
-        
-        return execution_plan
-        
+            ],
+            "weekly_schedule": []
+        },
+        "tasks": month_data.get('tasks', []),
+        "progress": 0,
+        "status": "not_started"
+    }
+
+def _wants_stream(request: Request, data: dict) -> str | None:
+    """"ndjson" or "sse" when the client asked for a streamed plan (Accept header or "stream" field)"""
+    requested = str(data.get("stream") or "").lower()
+    accept = request.headers.get("accept", "")
+    if requested == "sse" or "text/event-stream" in accept:
+        return "sse"
+    if requested in ("ndjson", "true", "1") or "application/x-ndjson" in accept:
+        return "ndjson"
+    return None
+
+async def _execution_plan_events(result_id: str, roadmap: dict, gemini_client):
+    """
+    Yields one "month" event per month as soon as it is generated (completion
+    order, bounded by FANOUT_CONCURRENCY), then a "done" event with the full
+    plan in month order. A complete plan is stored next to the roadmap; plans
+    with fallback months are not, so the failed months are retried next time.
+    """
+    from app.services.result_storage import get_execution_plan, store_execution_plan
+
+    cached = get_execution_plan(result_id)
+    if cached is not None:
+        for index, month in enumerate(cached["months"]):
+            yield {"type": "month", "index": index, "month": month, "fallback": False}
+        yield {"type": "done", "plan": cached, "cached": True}
+        return
+
+    months_data = roadmap.get("months", [])
+    target_role = roadmap.get("target_role", "Unknown Role")
+    months = [None] * len(months_data)
+    failed = 0
+    async for index, month, error in async_map_stream(
+        lambda month_data: _generate_month_plan(month_data, target_role, gemini_client),
+        months_data,
+        label="ExecuteRoadmap"
+    ):
+        if error is not None:
+            print(f"Error generating resources for month {months_data[index].get('month')}: {error}")
+            month = _fallback_month_plan(months_data[index])
+            failed += 1
+        months[index] = month
+        yield {"type": "month", "index": index, "month": month, "fallback": error is not None}
+
+    execution_plan = {
+        "roadmap_id": result_id,
+        "target_role": target_role,
+        "months": months
+    }
+    if not failed and store_execution_plan(result_id, execution_plan):
+        from app.services.link_health import LinkHealthChecker
+        LinkHealthChecker.get_instance().submit(result_id)
+    yield {"type": "done", "plan": execution_plan, "cached": False}
+
+@router.post("/execute-roadmap")
+async def execute_roadmap(request: Request, data: dict | None = None):
+    """
+    Generate detailed learning resources, tasks, and schedule for a roadmap.
+
+    Months are generated concurrently. Send `Accept: application/x-ndjson` (or
+    text/event-stream, or "stream": "ndjson"/"sse" in the body) to receive each
+    month as it completes. The finished plan is reused until the roadmap changes.
+    """
+    try:
+        from app.services.result_storage import get_roadmap_result
+        from app.services.gemini_client import gemini_client
+
+        # Handle OPTIONS preflight requests
+        if data is None:
+            return {"status": "ok"}
+
+        result_id = data.get("result_id") if isinstance(data, dict) else str(data)
+        if not result_id:
+            raise HTTPException(status_code=400, detail="result_id is required")
+
+        # Fetch roadmap data
+        roadmap = get_roadmap_result(result_id)
+        if not roadmap:
+            raise HTTPException(status_code=404, detail="Roadmap not found")
+
+        events = _execution_plan_events(result_id, roadmap, gemini_client)
+        stream = _wants_stream(request, data) if isinstance(data, dict) else None
+        if stream == "sse":
+            async def sse():
+                async for event in events:
+                    yield f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+            return StreamingResponse(sse(), media_type="text/event-stream",
+                                     headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+        if stream == "ndjson":
+            async def ndjson():
+                async for event in events:
+                    yield json.dumps(event, default=str) + "\n"
+            return StreamingResponse(ndjson(), media_type="application/x-ndjson",
+                                     headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+        async for event in events:
+            if event["type"] == "done":
+                return {**event["plan"], "cached": event["cached"]}
+
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error executing roadmap: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 import os
+from typing import Optional
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Kazira"
@@ -15,6 +16,93 @@ class Settings(BaseSettings):
     SCRAPER_TIMEOUT: int = 30
     MARATHON_CYCLE_INTERVAL_MINUTES: int = 30
     SESSION_CLEANUP_HOURS: int = 24
+    MARKET_DELTA_MIN_CHANGES: int = 5
+    MARKET_DELTA_MIN_RATIO: float = 0.2
+    PIPELINE_STAGE_TIMEOUT_SECONDS: int = 180
+    PIPELINE_RESEARCH_TIMEOUT_SECONDS: int = 420
+    PIPELINE_CHECKPOINT_MAX_AGE_HOURS: float = 24.0
+    THOUGHT_LOG_BATCH_SIZE: int = 20
+    THOUGHT_LOG_FLUSH_SECONDS: float = 5.0
+    THOUGHT_LOG_MAX_BYTES: int = 5 * 1024 * 1024
+    THOUGHT_LOG_BACKUP_COUNT: int = 3
+    THOUGHT_LOG_TAIL_SIZE: int = 200
+    MARATHON_MAX_SESSIONS: int = 5000
+    MARATHON_MAX_WORKERS: int = 32
+    MARKET_WATCH_ENABLED: bool = True
+    MARKET_WATCH_MAX_CONCURRENT_UPDATES: int = 8
+    MARATHON_LEASE_SECONDS: int = 120
+    MARATHON_QUEUE_POLL_SECONDS: float = 15.0
+    MARATHON_MIN_INTERVAL_MINUTES: int = 5
+    MARATHON_MAX_INTERVAL_MINUTES: int = 240
+    MARATHON_BACKOFF_FACTOR: float = 2.0
+    MARATHON_TIGHTEN_FACTOR: float = 0.5
+    SESSION_CONTEXT_BUDGET_BYTES: int = 1024 * 1024
+    SESSION_HISTORY_LIMIT: int = 48
+    MESSAGE_BUS_HISTORY_SIZE: int = 500
+    MESSAGE_BUS_MAILBOX_SIZE: int = 100
+    MESSAGE_BUS_TRANSPORT: str = "inprocess"
+    MESSAGE_BUS_LOG_PATH: str = "message_bus.db"
+    MESSAGE_BUS_BATCH_SIZE: int = 256
+    MESSAGE_BUS_LINGER_SECONDS: float = 0.005
+    MESSAGE_BUS_POLL_SECONDS: float = 0.1
+    MISSION_LOG_SIZE: int = 100
+    MISSION_SESSION_LOG_SIZE: int = 200
+    MISSION_LOG_MAX_SESSIONS: int = 1000
+    MISSION_STREAM_HEARTBEAT_SECONDS: float = 15.0
+    FANOUT_CONCURRENCY: int = 4
+    FANOUT_ITEM_TIMEOUT_SECONDS: float = 60.0
+    VERIFICATION_FETCH_WORKERS: int = 8
+    VERIFICATION_SANDBOX_WORKERS: int = 2
+    VERIFICATION_QUEUE_SIZE: int = 16
+    VERIFICATION_DEADLINE_SECONDS: float = 300.0
+    HTTP_POOL_MAX_CONNECTIONS: int = 100
+    HTTP_POOL_MAX_KEEPALIVE: int = 20
+    HTTP_POOL_PER_HOST: int = 4
+    HTTP_POOL_TIMEOUT_SECONDS: float = 10.0
+    HTTP_POOL_HTTP2: bool = True
+    SANDBOX_WORKERS: int = 2
+    SANDBOX_TIMEOUT_SECONDS: float = 5.0
+    SANDBOX_EXECUTE: bool = False
+    SANDBOX_MEMORY_MB: int = 256
+    SANDBOX_MAX_TASKS_PER_WORKER: int = 500
+    VERIFICATION_CACHE_ENABLED: bool = True
+    VERIFICATION_CACHE_SIZE: int = 5000
+    VERIFICATION_CACHE_FRESH_SECONDS: float = 3600.0
+    VERIFICATION_CACHE_PERSIST: bool = True
+    EXTRACT_MAX_BLOCKS: int = 50
+    EXTRACT_MAX_BYTES: int = 2_000_000
+    EXTRACT_MAX_BLOCK_CHARS: int = 20_000
+    SCHEDULE_WEEKS: int = 4
+    SCHEDULE_EVENING_MAX_MINUTES: int = 120
+    SCHEDULE_POLISH_REMINDERS: bool = False
+    LINK_HEALTH_ENABLED: bool = True
+    LINK_HEALTH_TTL_SECONDS: float = 86400.0
+    LINK_HEALTH_NEGATIVE_TTL_SECONDS: float = 900.0
+    LINK_HEALTH_CONCURRENCY: int = 16
+    LINK_HEALTH_TIMEOUT_SECONDS: float = 5.0
+    LINK_HEALTH_CACHE_SIZE: int = 10000
+    LINK_HEALTH_YOUTUBE_OEMBED: bool = True
+    YOUTUBE_OEMBED_URL: str = "https://www.youtube.com/oembed"
+    QUESTION_BANK_PATH: str = "question_bank.json"
+    QUESTION_BANK_BATCH_SIZE: int = 10
+    QUESTION_BANK_LOW_WATERMARK: int = 3
+    QUESTION_BANK_MAX_PER_BUCKET: int = 100
+    QUESTION_BANK_DEFAULT_DIFFICULTY: str = "intermediate"
+    ADJUST_FOUNDATION_SCORE: float = 30.0
+    ADJUST_LOW_SCORE: float = 50.0
+    ADJUST_HIGH_SCORE: float = 85.0
+    ADJUST_MAX_WEEKLY_HOURS: int = 40
+    ADJUSTMENT_NARRATIVE_ENABLED: bool = True
+    ADJUSTMENT_NARRATIVE_CACHE_SIZE: int = 512
+    GITHUB_API_URL: str = "https://api.github.com"
+    GITHUB_RAW_URL: str = "https://raw.githubusercontent.com"
+    GITHUB_TOKEN: Optional[str] = None
+    REPO_AUDIT_CACHE_SIZE: int = 256
+    REPO_AUDIT_MAX_FILE_BYTES: int = 100_000
+    ROADMAP_REUSE_POLICY: str = "near"
+    ROADMAP_REUSE_MIN_SIMILARITY: float = 0.6
+    ROADMAP_REUSE_MAX_AGE_HOURS: float = 24.0
+    ROADMAP_REUSE_PERSONALIZE: bool = True
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
@@ -1,4 +1,5 @@
 from sqlmodel import SQLModel
+from sqlalchemy import inspect
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from contextlib import asynccontextmanager
@@ -16,5 +17,24 @@ async def get_session():
         yield session
 
 async def init_db():
+    # Register table models on SQLModel.metadata before create_all
+    import app.models.roadmap  # noqa: F401
     async with engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.run_sync(_add_missing_columns)
+
+def _add_missing_columns(sync_conn):
+    """
+    create_all never alters existing tables; add new (nullable/defaulted) model
+    columns to databases created by older versions.
+    """
+    inspector = inspect(sync_conn)
+    for table in SQLModel.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            column_type = column.type.compile(dialect=sync_conn.dialect)
+            sync_conn.exec_driver_sql(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}')
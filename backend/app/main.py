@@ -1,24 +1,52 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.routes import roadmap, jobs, orchestrator
 from app.core.config import settings
+from app.core.db import init_db
 import asyncio
+import json
+import logging
 from datetime import datetime, timedelta
+from typing import Optional
 
 app = FastAPI(title="Kazira | Autonomous Career Orchestration")
 
-# Cleanup task for expired results
+def _created_at(data: dict) -> Optional[datetime]:
+    # store_roadmap_result saves isoformat strings; older records may still hold datetimes
+    value = data.get('created_at')
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+# Cleanup job for expired results (scheduled hourly by MissionControl)
 async def cleanup_expired_results():
-    while True:
-        await asyncio.sleep(3600)  # Run every hour
-        from app.services.result_storage import roadmap_results
-        current_time = datetime.now()
-        expired_keys = [
-            key for key, data in roadmap_results.items()
-            if current_time - data.get('created_at', current_time) > timedelta(hours=24)
-        ]
-        for key in expired_keys:
-            del roadmap_results[key]
+    from app.services.result_storage import roadmap_results, save_results
+    current_time = datetime.now()
+    expired_keys = []
+    for key, data in roadmap_results.items():
+        created_at = _created_at(data)
+        if created_at is not None and current_time - created_at > timedelta(hours=24):
+            expired_keys.append(key)
+    for key in expired_keys:
+        del roadmap_results[key]
+    if expired_keys:
+        save_results()
+
+# Cache refresh job: expired link checks are dropped so the next roadmap re-checks them
+async def refresh_caches():
+    from app.services.link_health import LinkHealthChecker
+    pruned = LinkHealthChecker.get_instance().prune_expired()
+    if pruned:
+        logging.info(f"[Maintenance] Pruned {pruned} expired link health results")
+
+def register_maintenance_jobs(mission_ctl):
+    """Recurring housekeeping jobs run by the Mission Control scheduler"""
+    mission_ctl.register_job("cleanup_expired_results", cleanup_expired_results, interval=3600)
+    mission_ctl.register_job("refresh_caches", refresh_caches, interval=3600)
 
 # --- Mission Control Integration ---
 from app.services.mission_control import MissionControl
@@ -26,17 +54,46 @@ from contextlib import asynccontextmanager
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: Launch Marathon Agent
+    # Startup: Create tables used for checkpoints and marathon state
+    await init_db()
+
+    # Launch Marathon Agent
     mission_ctl = MissionControl.get_instance()
     mission_ctl.start_loop()
 
-    # Start cleanup task
-    cleanup_task = asyncio.create_task(cleanup_expired_results())
+    # Start the marathon scheduler (runs every marathon session's cycles)
+    from app.services.marathon_scheduler import MarathonScheduler
+    marathon_scheduler = MarathonScheduler.get_instance()
+    marathon_scheduler.start()
+
+    # Claim queued sessions (including ones orphaned by a restart) and heartbeat ours
+    from app.services.marathon_queue import MarathonQueueWorker
+    marathon_worker = MarathonQueueWorker.get_instance()
+    marathon_worker.start()
+
+    # Hourly cleanup runs on the Mission Control scheduler
+    register_maintenance_jobs(mission_ctl)
 
     yield
     # Shutdown
     mission_ctl.stop_loop()
-    cleanup_task.cancel()
+    await marathon_worker.stop()
+    await marathon_scheduler.stop()
+
+    from app.services.link_health import LinkHealthChecker
+    await LinkHealthChecker.get_instance().close()
+
+    from app.services.question_bank import QuestionBank
+    await QuestionBank.get_instance().close()
+
+    from app.agents.message_transport import close_shared_transport
+    await close_shared_transport()
+
+    from app.services.http_pool import HttpPool
+    await HttpPool.get_instance().aclose()
+
+    from app.services.sandbox_pool import SandboxPool
+    await SandboxPool.get_instance().close()
 
 app = FastAPI(title="Kazira | Autonomous Career Orchestration", lifespan=lifespan)
 # -----------------------------------
@@ -88,5 +145,57 @@ async def health_check():
     }
 
 @app.get("/api/mission/logs")
-async def get_mission_logs():
-    return {"logs": MissionControl.get_instance().mission_logs}
+async def get_mission_logs(since: int = 0, session_id: Optional[str] = None, limit: Optional[int] = None):
+    """
+    Events newer than the `since` cursor; pass the returned cursor on the next poll.
+    """
+    mission_ctl = MissionControl.get_instance()
+    logs = mission_ctl.get_logs(session_id, since, limit)
+    return {"logs": logs, "cursor": logs[-1]["seq"] if logs else max(since, 0)}
+
+@app.get("/api/mission/jobs")
+async def get_mission_jobs():
+    return {"jobs": MissionControl.get_instance().job_stats()}
+
+@app.get("/api/verification/cache")
+async def get_verification_cache_stats():
+    """Verification cache hit rates and bytes saved"""
+    from app.services.verification_cache import VerificationCache
+    return VerificationCache.get_instance().stats()
+
+@app.get("/api/links/health")
+async def get_link_health_stats():
+    """Link checks, cache hits and status counts for generated resources"""
+    from app.services.link_health import LinkHealthChecker
+    return LinkHealthChecker.get_instance().stats()
+
+@app.get("/api/verification/question-bank")
+async def get_question_bank_stats():
+    """Question bank size, samples served and generator calls"""
+    from app.services.question_bank import QuestionBank
+    return QuestionBank.get_instance().stats()
+
+@app.get("/api/mission/stream")
+async def stream_mission_logs(request: Request, since: int = 0, session_id: Optional[str] = None):
+    """
+    Server-Sent Events: pushes each new event once. Reconnecting clients resume
+    from Last-Event-ID.
+    """
+    last_event_id = request.headers.get("last-event-id")
+    if last_event_id and last_event_id.isdigit():
+        since = int(last_event_id)
+
+    async def events():
+        async for batch in MissionControl.get_instance().stream(session_id, since, settings.MISSION_STREAM_HEARTBEAT_SECONDS):
+            if await request.is_disconnected():
+                break
+            if not batch:
+                yield ": keep-alive\n\n"
+            for event in batch:
+                yield f"id: {event['seq']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -56,13 +56,42 @@ class MarathonSession(SQLModel, table=True):
     ended_at: Optional[datetime] = None
     duration_hours: int  # Planned duration
     cycle_count: int = Field(default=0)  # Number of completed cycles
-    status: str  # RUNNING, COMPLETED, FAILED, CANCELLED
+    status: str  # PENDING, RUNNING, PAUSED, COMPLETED, FAILED, CANCELLED
     final_summary: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(JSON))
     
+    # Job queue fields: any worker process can claim a due session under a lease
+    session_key: Optional[str] = Field(default=None, index=True)  # API session id
+    location: str = "Global"
+    constraints: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(JSON))
+    check_interval_minutes: int = Field(default=30)
+    tournament_mode: bool = Field(default=False)
+    next_run_at: Optional[datetime] = None
+    lease_owner: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
+    heartbeat_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    
     class Config:
         indexes = [
             ["user_id", "status"],
-            ["user_id", "started_at"]
+            ["user_id", "started_at"],
+            ["status", "next_run_at"]
+        ]
+
+class ContextHistory(SQLModel, table=True):
+    """
+    History entries spilled out of an orchestrator's in-memory context
+    (e.g. market_trend_history beyond the in-RAM window).
+    """
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: str
+    key: str  # Context key the entry belongs to
+    entry: Dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSON))
+    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    
+    class Config:
+        indexes = [
+            ["user_id", "key", "timestamp"]
         ]
 
 class JobListing(SQLModel, table=True):
@@ -127,3 +156,19 @@ class MarketPrediction(SQLModel, table=True):
             ["generated_at"],
             ["expires_at"]
         ]
+
+class VerifiedResource(SQLModel, table=True):
+    """
+    Verification cache entry for one resource URL (normalized).
+    Validators allow conditional GETs; the content hash lets an unchanged page
+    skip extraction and sandboxing.
+    """
+    url: str = Field(primary_key=True)
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: str
+    content_length: int = 0
+    code_blocks: List[Dict[str, Any]] = Field(default_factory=list, sa_column=Column(JSON))
+    verification: Dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSON))
+    verified_at: datetime = Field(default_factory=datetime.utcnow)
+    checked_at: datetime = Field(default_factory=datetime.utcnow)  # last successful revalidation
@@ -0,0 +1,110 @@
+import time
+from typing import Dict, Any, Optional
+
+from app.core.config import settings
+from app.services.market_delta import MarketDelta
+
+
+class AdaptiveInterval:
+    """
+    Volatility-driven cycle interval.
+
+    Quiet markets (empty deltas) back the interval off exponentially up to the
+    max bound; a material shift tightens it (never above the base interval) down
+    to the min bound. Small, non-material deltas keep the current pace. The
+    requested base is kept as-is; the bounds widen to include it instead.
+    """
+
+    def __init__(
+        self,
+        base_seconds: float,
+        min_seconds: Optional[float] = None,
+        max_seconds: Optional[float] = None,
+        backoff_factor: Optional[float] = None,
+        tighten_factor: Optional[float] = None
+    ):
+        self.min_seconds = settings.MARATHON_MIN_INTERVAL_MINUTES * 60 if min_seconds is None else min_seconds
+        self.max_seconds = settings.MARATHON_MAX_INTERVAL_MINUTES * 60 if max_seconds is None else max_seconds
+        self.backoff_factor = backoff_factor or settings.MARATHON_BACKOFF_FACTOR
+        self.tighten_factor = tighten_factor or settings.MARATHON_TIGHTEN_FACTOR
+        self.base_seconds = base_seconds
+        self._include_base()
+        self.current = self.base_seconds
+
+        self.started_at = time.time()
+        self.runs = 0
+        self.quiet_streak = 0
+        self.shifts = 0
+        self.next_run_at: Optional[float] = None
+
+    def _include_base(self):
+        self.min_seconds = min(self.min_seconds, self.base_seconds)
+        self.max_seconds = max(self.max_seconds, self.base_seconds)
+
+    def _clamp(self, seconds: float) -> float:
+        return max(self.min_seconds, min(self.max_seconds, seconds))
+
+    def set_base(self, base_seconds: float):
+        """
+        Changes the fixed-schedule reference (e.g. a faster subscriber joined).
+        """
+        self.base_seconds = base_seconds
+        self._include_base()
+        if self.quiet_streak == 0:
+            # No evidence of a quiet market yet: follow the new base right away
+            self.current = min(self.current, self.base_seconds)
+
+    def observe(self, delta: Optional[MarketDelta]) -> float:
+        """
+        Adjusts the interval from one cycle's listing delta and returns it.
+        """
+        if delta is None:
+            return self.current
+        if delta.is_material():
+            self.shifts += 1
+            self.quiet_streak = 0
+            self.current = self._clamp(min(self.current, self.base_seconds) * self.tighten_factor)
+        elif delta.churn == 0:
+            self.quiet_streak += 1
+            self.current = self._clamp(self.current * self.backoff_factor)
+        return self.current
+
+    def next_delay(self) -> float:
+        """
+        Counts a completed run and returns the delay until the next one.
+        """
+        self.runs += 1
+        self.next_run_at = time.time() + self.current
+        return self.current
+
+    def cycles_saved(self, now: Optional[float] = None) -> int:
+        """
+        Runs avoided compared with a fixed schedule at the base interval.
+        """
+        elapsed = (now or time.time()) - self.started_at
+        fixed_runs = int(elapsed // self.base_seconds) if self.base_seconds > 0 else 0
+        return max(0, fixed_runs - self.runs)
+
+    def to_checkpoint(self) -> Dict[str, Any]:
+        return {"current": self.current, "runs": self.runs, "started_at": self.started_at, "quiet_streak": self.quiet_streak}
+
+    def restore(self, checkpoint: Optional[Dict[str, Any]]):
+        if not checkpoint:
+            return
+        self.current = self._clamp(checkpoint.get("current", self.current))
+        self.runs = checkpoint.get("runs", self.runs)
+        self.started_at = checkpoint.get("started_at", self.started_at)
+        self.quiet_streak = checkpoint.get("quiet_streak", 0)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "current_interval_seconds": round(self.current, 1),
+            "base_interval_seconds": self.base_seconds,
+            "min_interval_seconds": self.min_seconds,
+            "max_interval_seconds": self.max_seconds,
+            "next_run_at": self.next_run_at,
+            "runs": self.runs,
+            "quiet_streak": self.quiet_streak,
+            "shifts": self.shifts,
+            "cycles_saved": self.cycles_saved()
+        }
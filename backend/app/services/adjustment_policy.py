@@ -0,0 +1,166 @@
+import logging
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+
+from app.core.config import settings
+
+DEFAULT_WEEKLY_HOURS = 10
+DONE_STATUSES = {"completed", "complete", "done"}
+
+# Singleton instance
+_adjustment_policy = None
+
+
+def _phases(roadmap: Dict[str, Any]) -> List[Dict[str, Any]]:
+    phases = roadmap.get("milestones") or roadmap.get("months") or []
+    return [phase for phase in phases if isinstance(phase, dict)]
+
+
+def _remaining(phases: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [
+        phase for phase in phases
+        if str(phase.get("status", "")).lower() not in DONE_STATUSES and (phase.get("progress") or 0) < 100
+    ]
+
+
+def _weekly_hours(roadmap: Dict[str, Any]) -> float:
+    for key in ("estimated_weekly_hours", "hours_per_week", "weekly_hours"):
+        try:
+            hours = float(roadmap.get(key))
+        except (TypeError, ValueError):
+            continue
+        if hours > 0:
+            return hours
+    return DEFAULT_WEEKLY_HOURS
+
+
+def normalize_score(score: Any) -> Optional[float]:
+    """
+    Score on 0-100. Fractions (0.0-1.0 floats) are scaled; None means not assessed yet.
+    """
+    if score is None:
+        return None
+    try:
+        value = float(score)
+    except (TypeError, ValueError):
+        return None
+    if isinstance(score, float) and 0 < value <= 1:
+        value *= 100
+    return max(0.0, min(100.0, value))
+
+
+class AdjustmentPolicy:
+    """
+    Deterministic roadmap adjustment from an assessment score and the roadmap's shape.
+
+    Below ADJUST_FOUNDATION_SCORE: Deep Foundations (two review weeks, more hours).
+    Below ADJUST_LOW_SCORE: Bridge Week before the next phase.
+    Above ADJUST_HIGH_SCORE: Fast-Track (one week saved) while several phases
+    remain, Advanced Tracks on the last one. Otherwise, or without a score: keep going.
+
+    Decisions that change the plan ask for a narrative explanation; only those
+    call the model, and identical requests share a cached narrative.
+    """
+
+    def __init__(self, cache_size: Optional[int] = None):
+        self.cache_size = cache_size or settings.ADJUSTMENT_NARRATIVE_CACHE_SIZE
+        self._narratives: "OrderedDict[Tuple, str]" = OrderedDict()
+        self.decisions = 0
+        self.narrative_calls = 0
+        self.narrative_hits = 0
+
+    @classmethod
+    def get_instance(cls):
+        global _adjustment_policy
+        if _adjustment_policy is None:
+            _adjustment_policy = AdjustmentPolicy()
+        return _adjustment_policy
+
+    def decide(self, roadmap: Dict[str, Any], score: Any) -> Dict[str, Any]:
+        self.decisions += 1
+        value = normalize_score(score)
+        hours = _weekly_hours(roadmap)
+        remaining = _remaining(_phases(roadmap))
+        next_phase = remaining[0].get("title") if remaining else None
+        max_hours = settings.ADJUST_MAX_WEEKLY_HOURS
+
+        if value is None:
+            recommendation, action, factor, extra_weeks = "Take the assessment", "NONE", 1.0, 0
+            reason = "No assessment score yet; the roadmap stays as planned."
+        elif value < settings.ADJUST_FOUNDATION_SCORE:
+            recommendation, action, factor, extra_weeks = "Deep Foundations", "REBUILD_FOUNDATIONS", 1.25, 2
+            reason = f"Score {value:.0f}/100 shows gaps in the fundamentals; add two review weeks before {next_phase or 'moving on'}."
+        elif value < settings.ADJUST_LOW_SCORE:
+            recommendation, action, factor, extra_weeks = "Bridge Week", "ADD_BRIDGE_WEEK", 1.1, 1
+            reason = f"Score {value:.0f}/100: consolidate with a bridge week before {next_phase or 'moving on'}."
+        elif value > settings.ADJUST_HIGH_SCORE and len(remaining) > 1:
+            recommendation, action, factor, extra_weeks = "Fast-Track", "FAST_TRACK", 1.0, -1
+            reason = f"Score {value:.0f}/100: compress {next_phase} and move ahead a week early."
+        elif value > settings.ADJUST_HIGH_SCORE:
+            recommendation, action, factor, extra_weeks = "Advanced Tracks", "ADD_ADVANCED_TRACK", 1.0, 0
+            reason = f"Score {value:.0f}/100 on the final phase: add advanced projects instead of more review."
+        else:
+            recommendation, action, factor, extra_weeks = "Stay the course", "CONTINUE", 1.0, 0
+            reason = f"Score {value:.0f}/100 is on track; keep the current pace."
+
+        return {
+            "recommendation": recommendation,
+            "action": action,
+            "adjusted_weekly_hours": int(round(min(max_hours, max(hours, hours * factor)))),
+            "previous_weekly_hours": int(round(hours)),
+            "extra_weeks": extra_weeks,
+            "target_phase": next_phase,
+            "score": value,
+            "reason": reason,
+            "narrative_requested": action not in ("NONE", "CONTINUE") and settings.ADJUSTMENT_NARRATIVE_ENABLED
+        }
+
+    def _narrative_key(self, roadmap: Dict[str, Any], decision: Dict[str, Any]) -> Tuple:
+        score = decision["score"]
+        return (
+            decision["action"],
+            str(roadmap.get("career_goal") or roadmap.get("target_role") or "").strip().lower(),
+            decision["target_phase"],
+            decision["adjusted_weekly_hours"],
+            None if score is None else int(score // 10)  # same band, same explanation
+        )
+
+    async def narrative(self, roadmap: Dict[str, Any], decision: Dict[str, Any], client: Any) -> Optional[str]:
+        """
+        Short learner-facing explanation of a decision, cached per decision and score band.
+        """
+        key = self._narrative_key(roadmap, decision)
+        cached = self._narratives.get(key)
+        if cached is not None:
+            self._narratives.move_to_end(key)
+            self.narrative_hits += 1
+            return cached
+
+        goal = roadmap.get("career_goal") or roadmap.get("target_role") or "their career goal"
+        prompt = f"""
+        A learner working towards {goal} scored {decision['score']:.0f}/100 on their assessment.
+        Their roadmap is being adjusted: {decision['recommendation']} ({decision['reason']})
+        Weekly hours: {decision['previous_weekly_hours']} -> {decision['adjusted_weekly_hours']}.
+        In 2-3 encouraging sentences, explain this change to the learner. Plain text only.
+        """
+        self.narrative_calls += 1
+        try:
+            response = await client.generate_content_async(prompt)
+            text = (response.text or "").strip()
+        except Exception as e:
+            logging.warning(f"[AdjustmentPolicy] Narrative failed, using the policy reason: {e}")
+            return None
+        if not text:
+            return None
+        self._narratives[key] = text
+        while len(self._narratives) > self.cache_size:
+            self._narratives.popitem(last=False)
+        return text
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "decisions": self.decisions,
+            "narrative_calls": self.narrative_calls,
+            "narrative_hits": self.narrative_hits,
+            "cached_narratives": len(self._narratives)
+        }
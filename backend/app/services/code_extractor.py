@@ -0,0 +1,267 @@
+import codecs
+import hashlib
+import html
+import re
+from functools import lru_cache
+from typing import Dict, Any, Iterable, List, Optional
+
+from app.core.config import settings
+
+# Start of anything we care about; everything else on the page is skipped unread.
+# Tags and fences are searched separately: a single alternation loses the regex
+# engine's literal-prefix scan and is several times slower on large pages.
+_OPEN_TAG = re.compile(r"<((?i:pre|code|script|style))\b([^>]*)>")
+_OPEN_FENCE = re.compile(r"```([\w+#.-]*)[ \t]*\r?\n")
+_CLASS = re.compile(r"""\b(?:class|data-lang|data-language)\s*=\s*["']([^"']*)["']""", re.IGNORECASE)
+_INNER_CODE = re.compile(r"<code\b([^>]*)>", re.IGNORECASE)
+_BREAK = re.compile(r"<br\s*/?>", re.IGNORECASE)
+_TAG = re.compile(r"<[^>]+>")
+_CLOSERS = {tag: re.compile(f"</{tag}>", re.IGNORECASE) for tag in ("pre", "code", "script", "style")}
+
+LANGUAGE_PREFIXES = ("language-", "lang-", "highlight-source-", "highlight-", "brush:")
+KNOWN_LANGUAGES = {
+    "python", "py", "javascript", "js", "typescript", "ts", "bash", "shell", "sh", "sql",
+    "java", "go", "rust", "ruby", "php", "c", "cpp", "csharp", "kotlin", "swift", "html",
+    "css", "json", "yaml", "jsx", "tsx", "r", "scala", "console"
+}
+# Longest tag/fence opener we wait for across chunk boundaries
+_MAX_OPENER = 2048
+
+
+@lru_cache(maxsize=256)
+def language_hint(attributes: str) -> Optional[str]:
+    """
+    Language from class/data-lang attributes: "language-python", "lang-js",
+    "highlight-source-python", "brush: python", or a bare known name.
+    """
+    for value in _CLASS.findall(attributes or ""):
+        for token in re.split(r"[\s;]+", value.strip().lower()):
+            for prefix in LANGUAGE_PREFIXES:
+                if token.startswith(prefix) and len(token) > len(prefix):
+                    return token[len(prefix):]
+            if token in KNOWN_LANGUAGES:
+                return token
+    return None
+
+
+class CodeExtractor:
+    """
+    Incremental code-block extractor for HTML (and markdown fences in it).
+
+    Feed the page chunk by chunk; only the unconsumed tail of the current
+    chunk and the block being captured are kept, never the whole page. A
+    <pre><code> pair is one block (the outermost element is captured), tags
+    inside blocks (syntax highlighting spans) are dropped, entities are
+    unescaped and duplicates are skipped. Extraction stops after `max_blocks`
+    blocks or `max_chars` characters of input; check `done` to stop reading.
+    """
+
+    def __init__(
+        self,
+        max_blocks: Optional[int] = None,
+        max_chars: Optional[int] = None,
+        max_block_chars: Optional[int] = None,
+        min_length: int = 10
+    ):
+        self.max_blocks = max_blocks or settings.EXTRACT_MAX_BLOCKS
+        self.max_chars = max_chars or settings.EXTRACT_MAX_BYTES
+        self.max_block_chars = max_block_chars or settings.EXTRACT_MAX_BLOCK_CHARS
+        self.min_length = min_length
+
+        self.blocks: List[Dict[str, Any]] = []
+        self.chars_seen = 0
+        self.duplicates = 0
+        self.truncated = False  # stopped by a cap before the end of the page
+
+        self._buffer = ""
+        self._seen = set()
+        self._closer: Optional[str] = None  # what ends the current capture
+        self._skip = False  # inside <script>/<style>: discard instead of capture
+        self._tag = ""
+        self._attributes = ""
+        self._parts: List[str] = []
+        self._part_chars = 0
+
+    @property
+    def done(self) -> bool:
+        return len(self.blocks) >= self.max_blocks or self.chars_seen >= self.max_chars
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """
+        Consumes a chunk and returns the blocks completed by it.
+        """
+        if self.done:
+            self.truncated = True
+            return []
+        room = self.max_chars - self.chars_seen
+        if len(chunk) > room:
+            chunk = chunk[:room]
+            self.truncated = True
+        self.chars_seen += len(chunk)
+        found = len(self.blocks)
+        self._buffer += chunk
+        self._scan()
+        if len(self.blocks) >= self.max_blocks:
+            self.truncated = True
+        return self.blocks[found:]
+
+    def close(self) -> List[Dict[str, Any]]:
+        """
+        End of input: an unterminated block is dropped, like an unmatched tag.
+        """
+        self._buffer = ""
+        self._closer = None
+        self._parts = []
+        return self.blocks
+
+    def _scan(self):
+        buffer = self._buffer
+        position = 0
+        while len(self.blocks) < self.max_blocks:
+            if self._closer is None:
+                match = _OPEN_TAG.search(buffer, position)
+                fence_at = buffer.find("```", position, match.start() if match else len(buffer))
+                if fence_at >= 0:
+                    fence = _OPEN_FENCE.match(buffer, fence_at)
+                    if fence is None:
+                        if buffer.find("\n", fence_at) < 0 and len(buffer) - fence_at < 64:
+                            position = fence_at  # language/newline may still be on its way
+                            break
+                        position = fence_at + 3  # inline backticks, not a fence
+                        continue
+                    self._open("markdown", "```", fence.group(1))
+                    position = fence.end()
+                    continue
+                if match is None:
+                    # Keep a possible partial opener ("<pr", "``") for the next chunk
+                    tail = max(position, len(buffer) - _MAX_OPENER)
+                    cuts = [cut for cut in (buffer.rfind("<", tail), buffer.find("`", max(tail, len(buffer) - 2))) if cut >= 0]
+                    position = min(cuts) if cuts else len(buffer)
+                    break
+                tag = match.group(1).lower()
+                self._open(tag, f"</{tag}>", match.group(2))
+                position = match.end()
+                continue
+
+            end = self._find_closer(buffer, position)
+            if end < 0:
+                # Everything except a possible partial closer belongs to the block
+                keep = max(position, len(buffer) - len(self._closer) + 1)
+                self._capture(buffer[position:keep])
+                position = keep
+                break
+            self._capture(buffer[position:end])
+            position = end + len(self._closer)
+            if not self._skip:
+                self._finish_block()
+            self._closer = None
+        self._buffer = buffer[position:]
+
+    def _open(self, tag: str, closer: str, attributes: str):
+        self._tag = tag
+        self._closer = closer
+        self._skip = tag in ("script", "style")
+        self._attributes = attributes
+        self._parts, self._part_chars = [], 0
+
+    def _find_closer(self, buffer: str, position: int) -> int:
+        if self._closer == "```":
+            return buffer.find("```", position)
+        match = _CLOSERS[self._tag].search(buffer, position)
+        return match.start() if match else -1
+
+    def _capture(self, text: str):
+        if self._skip or not text:
+            return
+        room = self.max_block_chars - self._part_chars
+        if room > 0:
+            self._parts.append(text[:room])
+            self._part_chars += min(len(text), room)
+
+    def _finish_block(self):
+        raw = "".join(self._parts)
+        self._parts, self._part_chars = [], 0
+        if self._tag == "markdown":
+            code = raw.rstrip("\n")
+            language = self._attributes or None
+            source = "markdown"
+        else:
+            language = language_hint(self._attributes)
+            inner = _INNER_CODE.search(raw)
+            if language is None and inner:
+                language = language_hint(inner.group(1))
+            code = html.unescape(_TAG.sub("", _BREAK.sub("\n", raw)))
+            source = f"{self._tag}_tag"
+
+        if len(code.strip()) <= self.min_length:
+            return
+        digest = hashlib.sha1(code.strip().encode("utf-8", "replace")).digest()
+        if digest in self._seen:
+            self.duplicates += 1
+            return
+        self._seen.add(digest)
+        self.blocks.append({"code": code, "language": language or "unknown", "source": source})
+
+
+def extract_code_blocks(chunks: Iterable[str], **limits: Any) -> List[Dict[str, Any]]:
+    """
+    Runs a CodeExtractor over an iterable of text chunks (or a single string).
+    """
+    if isinstance(chunks, str):
+        chunks = [chunks]
+    extractor = CodeExtractor(**limits)
+    for chunk in chunks:
+        extractor.feed(chunk)
+        if extractor.done:
+            break
+    return extractor.close()
+
+
+class PageScan:
+    """
+    Size, SHA-256 and code blocks of a page read as a byte stream, decoded
+    incrementally. Stops at `max_bytes` (EXTRACT_MAX_BYTES) or when the
+    extractor has enough blocks; check `done` and stop reading.
+    """
+
+    def __init__(self, encoding: Optional[str] = None, max_bytes: Optional[int] = None, **limits: Any):
+        try:
+            decoder = codecs.getincrementaldecoder(encoding or "utf-8")
+        except LookupError:
+            decoder = codecs.getincrementaldecoder("utf-8")
+        self._decoder = decoder("replace")
+        self._hash = hashlib.sha256()
+        self.max_bytes = max_bytes or settings.EXTRACT_MAX_BYTES
+        self.extractor = CodeExtractor(**limits)
+        self.size = 0
+        self.truncated = False
+
+    @property
+    def done(self) -> bool:
+        return self.truncated or self.extractor.done
+
+    def feed(self, data: bytes):
+        if self.done:
+            return
+        room = self.max_bytes - self.size
+        if len(data) > room:
+            data = data[:room]
+            self.truncated = True
+        self.size += len(data)
+        self._hash.update(data)
+        self.extractor.feed(self._decoder.decode(data))
+        self.truncated = self.truncated or self.extractor.truncated
+
+    def finish(self) -> "PageScan":
+        if not self.done:
+            self.extractor.feed(self._decoder.decode(b"", final=True))
+        self.extractor.close()
+        return self
+
+    @property
+    def code_blocks(self) -> List[Dict[str, Any]]:
+        return self.extractor.blocks
+
+    @property
+    def content_hash(self) -> str:
+        return self._hash.hexdigest()
@@ -0,0 +1,124 @@
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+from app.core.config import settings
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MapResult:
+    """
+    Outcome of async_map: results in input order, with `default` in the slots
+    whose item failed or timed out. Failures are kept by index in `errors`.
+    """
+
+    def __init__(self, results: List[Any], errors: Dict[int, BaseException], elapsed: float):
+        self.results = results
+        self.errors = errors
+        self.elapsed = elapsed
+
+    @property
+    def timed_out(self) -> List[int]:
+        return sorted(i for i, error in self.errors.items() if isinstance(error, asyncio.TimeoutError))
+
+    @property
+    def succeeded(self) -> int:
+        return len(self.results) - len(self.errors)
+
+    @property
+    def complete(self) -> bool:
+        return not self.errors
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "items": len(self.results),
+            "succeeded": self.succeeded,
+            "failed": len(self.errors) - len(self.timed_out),
+            "timed_out": len(self.timed_out),
+            "elapsed_seconds": round(self.elapsed, 3)
+        }
+
+
+async def async_map(
+    func: Callable[[T], Awaitable[R]],
+    items: Iterable[T],
+    concurrency: Optional[int] = None,
+    timeout: Optional[float] = None,
+    default: Any = None,
+    label: str = "fan-out"
+) -> MapResult:
+    """
+    Applies an async `func` to every item with at most `concurrency` calls in flight.
+
+    Results come back in input order regardless of completion order. Each call
+    gets `timeout` seconds (FANOUT_ITEM_TIMEOUT_SECONDS by default, 0 disables);
+    a call that fails or times out leaves `default` in its slot and its exception
+    in MapResult.errors, so the other items still complete (partial results).
+    Cancelling the caller cancels in-flight calls.
+    """
+    items = list(items)
+    concurrency = max(1, concurrency or settings.FANOUT_CONCURRENCY)
+    timeout = settings.FANOUT_ITEM_TIMEOUT_SECONDS if timeout is None else timeout
+    results: List[Any] = [default] * len(items)
+    errors: Dict[int, BaseException] = {}
+    next_index = iter(range(len(items)))
+    started = time.monotonic()
+
+    async def worker():
+        # A fixed pool of workers pulls indexes, so large inputs never create one task per item
+        for index in next_index:
+            try:
+                call = func(items[index])
+                results[index] = await (asyncio.wait_for(call, timeout) if timeout else call)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                errors[index] = e
+                reason = f"timed out after {timeout}s" if isinstance(e, asyncio.TimeoutError) else str(e)
+                logging.warning(f"[{label}] Item {index} failed: {reason}")
+
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, len(items)))))
+    return MapResult(results, errors, time.monotonic() - started)
+
+
+async def async_map_stream(
+    func: Callable[[T], Awaitable[R]],
+    items: Iterable[T],
+    concurrency: Optional[int] = None,
+    timeout: Optional[float] = None,
+    label: str = "fan-out"
+) -> AsyncIterator[Tuple[int, Any, Optional[BaseException]]]:
+    """
+    Like async_map, but yields (index, result, error) as each item finishes,
+    in completion order. `error` is None on success (result is None otherwise).
+    Closing the generator early cancels the calls still in flight.
+    """
+    items = list(items)
+    concurrency = max(1, concurrency or settings.FANOUT_CONCURRENCY)
+    timeout = settings.FANOUT_ITEM_TIMEOUT_SECONDS if timeout is None else timeout
+    finished: asyncio.Queue = asyncio.Queue()
+    next_index = iter(range(len(items)))
+
+    async def worker():
+        for index in next_index:
+            try:
+                call = func(items[index])
+                finished.put_nowait((index, await (asyncio.wait_for(call, timeout) if timeout else call), None))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                reason = f"timed out after {timeout}s" if isinstance(e, asyncio.TimeoutError) else str(e)
+                logging.warning(f"[{label}] Item {index} failed: {reason}")
+                finished.put_nowait((index, None, e))
+
+    workers = [asyncio.create_task(worker()) for _ in range(min(concurrency, len(items)))]
+    try:
+        for _ in range(len(items)):
+            yield await finished.get()
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
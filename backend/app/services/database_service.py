@@ -1,10 +1,17 @@
 from sqlmodel import select, col
 from app.core.db import get_session
-from app.models.roadmap import AgentState, ThoughtSignature, MarathonSession, JobListing, UserProgress, MarketPrediction
+from app.models.roadmap import AgentState, ThoughtSignature, MarathonSession, JobListing, UserProgress, MarketPrediction, ContextHistory
 from typing import List, Dict, Any, Optional, Union
 import logging
+import json
 from datetime import datetime, timedelta
 
+# AgentState rows whose agent_name starts with this hold pipeline stage checkpoints
+STAGE_CHECKPOINT_PREFIX = "stage:"
+
+# AgentState rows holding context values spilled out of orchestrator memory
+CONTEXT_SNAPSHOT_PREFIX = "context:"
+
 class DatabaseService:
     """
     PostgreSQL persistence service for Marathon Agent.
@@ -30,7 +37,7 @@ class DatabaseService:
         Saves current agent state to database.
         """
         try:
-            async for session in get_session():
+            async with get_session() as session:
                 # Check for existing state
                 result = await session.exec(
                     select(AgentState)
@@ -56,7 +63,6 @@ class DatabaseService:
 
                 await session.commit()
                 logging.info(f"[DB] Saved state for {agent_name}: {state}")
-                break
 
         except Exception as e:
             logging.error(f"[DB] Failed to save agent state: {e}")
@@ -66,7 +72,7 @@ class DatabaseService:
         Loads current agent state from database.
         """
         try:
-            async for session in get_session():
+            async with get_session() as session:
                 result = await session.exec(
                     select(AgentState)
                     .where(AgentState.user_id == self.user_id)
@@ -87,6 +93,101 @@ class DatabaseService:
             logging.error(f"[DB] Failed to load agent state: {e}")
             return None
 
+    async def save_stage_checkpoint(self, run_key: str, stage: str, output: Any):
+        """
+        Persists a completed pipeline stage's output.
+        Keyed by (user_id, run_key, stage) so re-running a stage overwrites its checkpoint.
+        """
+        checkpoint_data = {
+            "run_key": run_key,
+            "stage": stage,
+            "output": json.loads(json.dumps(output, default=str))
+        }
+        await self.save_agent_state(f"{STAGE_CHECKPOINT_PREFIX}{run_key}:{stage}", "COMPLETED", checkpoint_data)
+
+    async def load_stage_checkpoints(self, run_key: str, max_age: Optional[timedelta] = None) -> Dict[str, Any]:
+        """
+        Loads all completed stage outputs for a pipeline run as {stage: output}.
+        Stages depend on each other, so if any checkpoint is older than max_age none are returned.
+        """
+        try:
+            async with get_session() as session:
+                result = await session.exec(
+                    select(AgentState)
+                    .where(AgentState.user_id == self.user_id)
+                    .where(col(AgentState.agent_name).startswith(f"{STAGE_CHECKPOINT_PREFIX}{run_key}:"))
+                    .where(AgentState.state == "COMPLETED")
+                )
+                states = result.all()
+                if max_age is not None and any(datetime.utcnow() - state.timestamp > max_age for state in states):
+                    logging.info(f"[DB] Stage checkpoints for {run_key} are older than {max_age}; not resuming")
+                    return {}
+                return {
+                    state.checkpoint_data["stage"]: state.checkpoint_data.get("output")
+                    for state in states
+                    if "stage" in (state.checkpoint_data or {})
+                }
+
+        except Exception as e:
+            logging.error(f"[DB] Failed to load stage checkpoints: {e}")
+            return {}
+
+    async def save_context_snapshot(self, key: str, value: Any):
+        """
+        Stores the full value of a context key that was evicted from memory.
+        """
+        await self.save_agent_state(
+            f"{CONTEXT_SNAPSHOT_PREFIX}{key}",
+            "SPILLED",
+            {"key": key, "value": json.loads(json.dumps(value, default=str))}
+        )
+
+    async def load_context_snapshot(self, key: str) -> Any:
+        """
+        Loads a spilled context value (None if it was never spilled).
+        """
+        state = await self.load_agent_state(f"{CONTEXT_SNAPSHOT_PREFIX}{key}")
+        return state["checkpoint_data"].get("value") if state else None
+
+    async def append_context_history(self, key: str, entries: List[Dict[str, Any]]):
+        """
+        Appends history entries evicted from the in-memory window in one transaction.
+        """
+        if not entries:
+            return
+        try:
+            async with get_session() as session:
+                for entry in entries:
+                    session.add(ContextHistory(
+                        user_id=self.user_id,
+                        key=key,
+                        entry=json.loads(json.dumps(entry, default=str))
+                    ))
+                await session.commit()
+
+        except Exception as e:
+            logging.error(f"[DB] Failed to spill context history: {e}")
+
+    async def load_context_history(self, key: str, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Loads spilled history entries, oldest first.
+        """
+        try:
+            async with get_session() as session:
+                result = await session.exec(
+                    select(ContextHistory)
+                    .where(ContextHistory.user_id == self.user_id)
+                    .where(ContextHistory.key == key)
+                    .order_by(col(ContextHistory.id))
+                    .offset(offset)
+                    .limit(limit)
+                )
+                return [row.entry for row in result.all()]
+
+        except Exception as e:
+            logging.error(f"[DB] Failed to load context history: {e}")
+            return []
+
     async def save_thought_signature(
         self,
         step: str,
@@ -97,7 +198,7 @@ class DatabaseService:
         Saves thought signature to database (replaces file-based approach).
         """
         try:
-            async for session in get_session():
+            async with get_session() as session:
                 signature = ThoughtSignature(
                     user_id=self.user_id,
                     step=step,
@@ -107,7 +208,6 @@ class DatabaseService:
                 session.add(signature)
                 await session.commit()
                 logging.info(f"[DB] Saved thought signature: {step}")
-                break
 
         except Exception as e:
             logging.error(f"[DB] Failed to save thought signature: {e}")
@@ -117,7 +217,7 @@ class DatabaseService:
         Loads recent thought signatures for display/analysis.
         """
         try:
-            async for session in get_session():
+            async with get_session() as session:
                 result = await session.exec(
                     select(ThoughtSignature)
                     .where(ThoughtSignature.user_id == self.user_id)
@@ -131,7 +231,7 @@ class DatabaseService:
                     output.append({
                         "step": sig.step,
                         "global_state": sig.global_state,
-                        "metadata": sig.metadata,
+                        "metadata": sig.thought_metadata,
                         "timestamp": sig.timestamp.isoformat()
                     })
 
@@ -144,19 +244,23 @@ class DatabaseService:
     async def start_marathon_session(
         self,
         career_goal: str,
-        duration_hours: int
+        duration_hours: int,
+        status: str = "RUNNING",
+        **job_fields
     ) -> int:
         """
         Creates a new marathon session record.
+        job_fields are the MarathonJobQueue columns (session_key, location, lease_owner, ...).
         Returns session ID.
         """
         try:
-            async for session in get_session():
+            async with get_session() as session:
                 marathon_session = MarathonSession(
                     user_id=self.user_id,
                     career_goal=career_goal,
                     duration_hours=duration_hours,
-                    status="RUNNING"
+                    status=status,
+                    **job_fields
                 )
                 session.add(marathon_session)
                 await session.commit()
@@ -179,13 +283,16 @@ class DatabaseService:
         Marks marathon session as ended.
         """
         try:
-            async for session in get_session():
+            async with get_session() as session:
                 marathon_session = await session.get(MarathonSession, session_id)
                 if marathon_session:
                     marathon_session.ended_at = datetime.utcnow()
                     marathon_session.cycle_count = cycle_count
                     marathon_session.status = status
                     marathon_session.final_summary = final_summary
+                    marathon_session.lease_owner = None
+                    marathon_session.lease_expires_at = None
+                    marathon_session.next_run_at = None
                     await session.commit()
                     logging.info(f"[DB] Ended marathon session {session_id}: {status}")
 
@@ -201,7 +308,7 @@ class DatabaseService:
         Saves scraped job listings to avoid re-scraping.
         """
         try:
-            async for session in get_session():
+            async with get_session() as session:
                 saved_count = 0
                 for job_data in listings:
                     # Check for duplicates
@@ -239,7 +346,7 @@ class DatabaseService:
         Loads recent job listings from database.
         """
         try:
-            async for session in get_session():
+            async with get_session() as session:
                 cutoff_date = datetime.utcnow() - timedelta(days=days)
 
                 result = await session.exec(
@@ -280,7 +387,7 @@ class DatabaseService:
         Updates user progress through roadmap.
         """
         try:
-            async for session in get_session():
+            async with get_session() as session:
                 # Get or create progress record
                 result = await session.exec(
                     select(UserProgress)
@@ -318,7 +425,7 @@ class DatabaseService:
         Loads user progress from database.
         """
         try:
-            async for session in get_session():
+            async with get_session() as session:
                 result = await session.exec(
                     select(UserProgress)
                     .where(UserProgress.user_id == self.user_id)
@@ -355,7 +462,7 @@ class DatabaseService:
         EXTRAORDINARY FEATURE: Saves market prediction results from Gemini 3.
         """
         try:
-            async for session in get_session():
+            async with get_session() as session:
                 prediction = MarketPrediction(
                     career_goal=career_goal,
                     location=location,
@@ -382,7 +489,7 @@ class DatabaseService:
         Returns None if expired or not found.
         """
         try:
-            async for session in get_session():
+            async with get_session() as session:
                 result = await session.exec(
                     select(MarketPrediction)
                     .where(
@@ -0,0 +1,146 @@
+import asyncio
+import importlib.util
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.config import settings
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+}
+
+# Singleton instance
+_http_pool = None
+
+
+def h2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+class HttpPool:
+    """
+    One pooled, keep-alive httpx.AsyncClient shared by every outbound fetch,
+    with a concurrency limit per host so one slow site cannot take all connections.
+
+    HTTP/2 is used when enabled and the `h2` package is installed. The client is
+    bound to the event loop that created it and is rebuilt if used from another one.
+    """
+
+    def __init__(
+        self,
+        max_connections: Optional[int] = None,
+        max_keepalive: Optional[int] = None,
+        per_host: Optional[int] = None,
+        timeout: Optional[float] = None,
+        http2: Optional[bool] = None
+    ):
+        self.max_connections = max_connections or settings.HTTP_POOL_MAX_CONNECTIONS
+        self.max_keepalive = max_keepalive or settings.HTTP_POOL_MAX_KEEPALIVE
+        self.per_host = per_host or settings.HTTP_POOL_PER_HOST
+        self.timeout = timeout or settings.HTTP_POOL_TIMEOUT_SECONDS
+        wants_http2 = settings.HTTP_POOL_HTTP2 if http2 is None else http2
+        self.http2 = wants_http2 and h2_available()
+        if wants_http2 and not self.http2:
+            logging.info("[HttpPool] h2 not installed, using HTTP/1.1 keep-alive")
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        self._in_flight: Dict[str, int] = {}
+
+        self.requests = 0
+        self.errors = 0
+        self.host_waits = 0  # requests that queued behind their host's limit
+
+    @classmethod
+    def get_instance(cls):
+        global _http_pool
+        if _http_pool is None:
+            _http_pool = HttpPool()
+        return _http_pool
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            self._client = httpx.AsyncClient(
+                http2=self.http2,
+                timeout=self.timeout,
+                headers=DEFAULT_HEADERS,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive
+                )
+            )
+            self._loop = loop
+            self._host_slots.clear()
+            self._in_flight.clear()
+        return self._client
+
+    def _slot(self, host: str) -> asyncio.Semaphore:
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = asyncio.Semaphore(self.per_host)
+        return slot
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        async with self._host(url) as client:
+            return await client.request(method, url, **kwargs)
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, **kwargs: Any) -> AsyncIterator[httpx.Response]:
+        """
+        Streams the response body; the host slot is held until the block exits.
+        """
+        async with self._host(url) as client:
+            async with client.stream(method, url, **kwargs) as response:
+                yield response
+
+    @asynccontextmanager
+    async def _host(self, url: str) -> AsyncIterator[httpx.AsyncClient]:
+        client = self.client
+        host = urlsplit(url).netloc.lower()
+        slot = self._slot(host)
+        if slot.locked():
+            self.host_waits += 1
+        async with slot:
+            self._in_flight[host] = self._in_flight.get(host, 0) + 1
+            try:
+                self.requests += 1
+                yield client
+            except Exception:
+                self.errors += 1
+                raise
+            finally:
+                remaining = self._in_flight.get(host, 1) - 1
+                if remaining > 0:
+                    self._in_flight[host] = remaining
+                else:
+                    self._in_flight.pop(host, None)
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def head(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("HEAD", url, **kwargs)
+
+    async def aclose(self):
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "http2": self.http2,
+            "requests": self.requests,
+            "errors": self.errors,
+            "host_waits": self.host_waits,
+            "in_flight": dict(self._in_flight),
+            "per_host_limit": self.per_host,
+            "max_connections": self.max_connections
+        }
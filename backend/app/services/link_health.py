@@ -0,0 +1,264 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, Iterable, Iterator, Optional, Set, Tuple
+from urllib.parse import urlsplit, urlencode
+
+import httpx
+
+from app.core.config import settings
+from app.services.concurrency import async_map
+from app.services.http_pool import HttpPool
+from app.services.verification_cache import normalize_url
+
+OK = "ok"
+BROKEN = "broken"  # the page is gone (404/410 and other client errors)
+BLOCKED = "blocked"  # the site refused us (401/403/429); the link may still work in a browser
+ERROR = "error"  # server error
+UNREACHABLE = "unreachable"  # DNS, connection or timeout failure
+
+# HEAD answers that often mean "HEAD not supported" rather than "link dead"
+HEAD_FALLBACK_STATUSES = {400, 403, 404, 405, 501}
+YOUTUBE_HOSTS = {"youtube.com", "www.youtube.com", "m.youtube.com", "youtu.be"}
+
+# Keys of generated resources that hold checkable links
+URL_KEYS = ("url", "thumbnail", "thumbnail_url")
+
+# Singleton instance
+_link_health = None
+
+
+def _status_for(code: int) -> str:
+    if code < 400:
+        return OK
+    if code in (401, 403, 429):
+        return BLOCKED
+    if code >= 500:
+        return ERROR
+    return BROKEN
+
+
+def resource_links(data: Any) -> Iterator[Tuple[Dict[str, Any], str, str]]:
+    """
+    Walks generated roadmap/plan data and yields (resource, key, url) for every http(s) link.
+    """
+    if isinstance(data, dict):
+        for key in URL_KEYS:
+            value = data.get(key)
+            if isinstance(value, str) and value.startswith(("http://", "https://")):
+                yield data, key, value
+        for value in data.values():
+            if isinstance(value, (dict, list)):
+                yield from resource_links(value)
+    elif isinstance(data, list):
+        for value in data:
+            yield from resource_links(value)
+
+
+class LinkHealthChecker:
+    """
+    Checks generated resource links in the background.
+
+    Each URL gets a HEAD over the shared HttpPool (so the pool's per-host limit
+    applies), falling back to a GET whose body is never read when the server
+    does not handle HEAD. YouTube watch links are checked through oEmbed, since
+    the watch page answers 200 even for removed videos.
+
+    Results are cached per normalized URL: working links for
+    LINK_HEALTH_TTL_SECONDS, failures for the shorter
+    LINK_HEALTH_NEGATIVE_TTL_SECONDS. Concurrent checks of one URL share a request.
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[float] = None,
+        negative_ttl: Optional[float] = None,
+        concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        pool: Optional[HttpPool] = None
+    ):
+        self.ttl = settings.LINK_HEALTH_TTL_SECONDS if ttl is None else ttl
+        self.negative_ttl = settings.LINK_HEALTH_NEGATIVE_TTL_SECONDS if negative_ttl is None else negative_ttl
+        self.concurrency = concurrency or settings.LINK_HEALTH_CONCURRENCY
+        self.timeout = timeout or settings.LINK_HEALTH_TIMEOUT_SECONDS
+        self.max_entries = max_entries or settings.LINK_HEALTH_CACHE_SIZE
+        self.pool = pool
+
+        self._cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+        self.checks = 0
+        self.cache_hits = 0
+        self.negative_hits = 0
+        self.coalesced = 0
+        self.get_fallbacks = 0
+        self.statuses: Dict[str, int] = {}
+
+    @classmethod
+    def get_instance(cls):
+        global _link_health
+        if _link_health is None:
+            _link_health = LinkHealthChecker()
+        return _link_health
+
+    def _cached(self, key: str) -> Optional[Dict[str, Any]]:
+        cached = self._cache.get(key)
+        if cached is None:
+            return None
+        expires_at, result = cached
+        if time.monotonic() >= expires_at:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return result
+
+    def _remember(self, key: str, result: Dict[str, Any]):
+        ttl = self.ttl if result["status"] == OK else self.negative_ttl
+        self._cache[key] = (time.monotonic() + ttl, result)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    async def check(self, url: str) -> Dict[str, Any]:
+        """
+        Health of one URL: {"url", "status", "http_status", "checked_at"}.
+        """
+        key = normalize_url(url)
+        cached = self._cached(key)
+        if cached is not None:
+            self.cache_hits += 1
+            if cached["status"] != OK:
+                self.negative_hits += 1
+            return cached
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await self._probe(url)
+            self._remember(key, result)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # retrieved here so an unawaited future does not warn
+            raise
+        finally:
+            self._in_flight.pop(key, None)
+
+    async def check_many(self, urls: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Checks distinct URLs with at most LINK_HEALTH_CONCURRENCY in flight.
+        """
+        unique = list(dict.fromkeys(urls))
+        checked = await async_map(self.check, unique, concurrency=self.concurrency, timeout=0, label="LinkHealth")
+        return {url: result for url, result in zip(unique, checked.results) if result is not None}
+
+    async def _probe(self, url: str) -> Dict[str, Any]:
+        self.checks += 1
+        pool = self.pool or HttpPool.get_instance()
+        target = url
+        if urlsplit(url).hostname in YOUTUBE_HOSTS and settings.LINK_HEALTH_YOUTUBE_OEMBED:
+            target = f"{settings.YOUTUBE_OEMBED_URL}?{urlencode({'url': url, 'format': 'json'})}"
+        try:
+            response = await pool.request("HEAD", target, timeout=self.timeout)
+            code = response.status_code
+            if code in HEAD_FALLBACK_STATUSES:
+                self.get_fallbacks += 1
+                async with pool.stream("GET", target, timeout=self.timeout) as response:
+                    code = response.status_code  # headers are enough; the body is never read
+            status = _status_for(code)
+        except (httpx.HTTPError, OSError) as e:
+            logging.info(f"[LinkHealth] {url} unreachable: {e}")
+            code, status = None, UNREACHABLE
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        return {"url": url, "status": status, "http_status": code, "checked_at": datetime.utcnow().isoformat()}
+
+    async def annotate(self, data: Any) -> int:
+        """
+        Checks every link in `data` and records the result on its resource:
+        "link_health" for "url", "<key>_health" for thumbnails. Returns the number of broken links.
+        """
+        links = list(resource_links(data))
+        results = await self.check_many(url for _, _, url in links)
+        broken = 0
+        for resource, key, url in links:
+            result = results.get(url)
+            if result is None:
+                continue
+            field = "link_health" if key == "url" else f"{key}_health"
+            resource[field] = {"status": result["status"], "http_status": result["http_status"], "checked_at": result["checked_at"]}
+            broken += result["status"] != OK
+        return broken
+
+    async def annotate_result(self, result_id: str) -> Optional[int]:
+        """
+        Annotates a stored roadmap (and its execution plan) and saves it.
+        """
+        from app.services.result_storage import get_roadmap_result, save_results
+
+        roadmap = get_roadmap_result(result_id)
+        if roadmap is None:
+            return None
+        targets = [roadmap.get("months", []), (roadmap.get("execution_plan") or {}).get("plan")]
+        broken = await self.annotate(targets)
+        save_results()
+        logging.info(f"[LinkHealth] Roadmap {result_id}: {broken} broken link(s)")
+        return broken
+
+    def submit(self, result_id: str) -> Optional[asyncio.Task]:
+        """
+        Schedules annotate_result off the request path.
+        """
+        if not settings.LINK_HEALTH_ENABLED:
+            return None
+        task = asyncio.create_task(self._run(result_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _run(self, result_id: str):
+        try:
+            await self.annotate_result(result_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.error(f"[LinkHealth] Annotating {result_id} failed: {e}")
+
+    async def close(self):
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def prune_expired(self) -> int:
+        """Drops expired results; returns how many were removed"""
+        now = time.monotonic()
+        expired = [key for key, (expires_at, _) in self._cache.items() if now >= expires_at]
+        for key in expired:
+            del self._cache[key]
+        return len(expired)
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._cache),
+            "checks": self.checks,
+            "cache_hits": self.cache_hits,
+            "negative_hits": self.negative_hits,
+            "coalesced": self.coalesced,
+            "get_fallbacks": self.get_fallbacks,
+            "statuses": dict(self.statuses),
+            "pending": len(self._tasks)
+        }
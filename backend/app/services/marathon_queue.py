@@ -0,0 +1,416 @@
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Callable
+
+from sqlalchemy import update, or_, and_
+from sqlmodel import select, col
+
+from app.core.config import settings
+from app.core.db import get_session
+from app.models.roadmap import MarathonSession
+from app.services.database_service import DatabaseService
+from app.services.marathon_scheduler import SchedulerCapacityError
+
+# Singleton instance
+_marathon_queue_worker = None
+
+# Statuses a worker may claim and run
+CLAIMABLE_STATUSES = ("PENDING", "RUNNING")
+TERMINAL_STATUSES = ("COMPLETED", "FAILED", "CANCELLED")
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class MarathonJobQueue:
+    """
+    DB-backed marathon job queue (MarathonSession rows).
+
+    Leases are sticky: the worker that claims a session keeps it between cycles
+    and extends the lease with heartbeats. A lease that is not renewed expires
+    and the session becomes claimable by any other worker process.
+    All timestamps are naive UTC, like the rest of the models.
+    """
+
+    def __init__(self, worker_id: Optional[str] = None, lease_seconds: Optional[int] = None):
+        self.worker_id = worker_id or default_worker_id()
+        self.lease_seconds = settings.MARATHON_LEASE_SECONDS if lease_seconds is None else lease_seconds
+
+    def _lease_deadline(self) -> datetime:
+        return datetime.utcnow() + timedelta(seconds=self.lease_seconds)
+
+    async def enqueue(
+        self,
+        session_key: str,
+        user_id: str,
+        career_goal: str,
+        location: str = "Global",
+        constraints: Optional[Dict[str, Any]] = None,
+        duration_hours: int = 72,
+        check_interval_minutes: int = 30,
+        tournament_mode: bool = False,
+        claim: bool = True
+    ) -> int:
+        """
+        Adds a session to the queue. With claim=True the caller's worker owns it
+        immediately (it is about to run it in-process). Returns the job id.
+        """
+        now = datetime.utcnow()
+        return await DatabaseService(user_id).start_marathon_session(
+            career_goal,
+            duration_hours,
+            status="PENDING",
+            session_key=session_key,
+            location=location,
+            constraints=constraints,
+            check_interval_minutes=check_interval_minutes,
+            tournament_mode=tournament_mode,
+            next_run_at=now,
+            lease_owner=self.worker_id if claim else None,
+            lease_expires_at=self._lease_deadline() if claim else None,
+            heartbeat_at=now if claim else None
+        )
+
+    async def claim_due(self, limit: int = 10, exclude: Optional[List[int]] = None) -> List[MarathonSession]:
+        """
+        Claims up to `limit` due sessions that are unowned or whose lease expired.
+        Each claim is a conditional UPDATE, so two workers never win the same row.
+        """
+        now = datetime.utcnow()
+        claimable = or_(
+            col(MarathonSession.lease_owner).is_(None),
+            col(MarathonSession.lease_expires_at) < now
+        )
+        claimed: List[MarathonSession] = []
+        try:
+            async with get_session() as session:
+                query = select(MarathonSession.id).where(
+                    col(MarathonSession.status).in_(CLAIMABLE_STATUSES),
+                    or_(col(MarathonSession.next_run_at).is_(None), col(MarathonSession.next_run_at) <= now),
+                    claimable
+                ).order_by(col(MarathonSession.next_run_at)).limit(limit + len(exclude or []))
+                candidate_ids = [job_id for job_id in (await session.exec(query)).all() if job_id not in (exclude or [])]
+
+                for job_id in candidate_ids[:limit]:
+                    result = await session.exec(
+                        update(MarathonSession)
+                        .where(and_(MarathonSession.id == job_id, claimable))
+                        .values(lease_owner=self.worker_id, lease_expires_at=self._lease_deadline(), heartbeat_at=now)
+                    )
+                    await session.commit()
+                    if result.rowcount == 1:
+                        job = await session.get(MarathonSession, job_id)
+                        await session.refresh(job)
+                        claimed.append(job)
+        except Exception as e:
+            logging.error(f"[Queue] Failed to claim marathon jobs: {e}")
+        return claimed
+
+    async def heartbeat(self, job_ids: List[int]) -> Dict[int, MarathonSession]:
+        """
+        Extends the lease on every job this worker still owns and returns the
+        current rows, so the caller can spot lost leases and remote status changes.
+        """
+        if not job_ids:
+            return {}
+        now = datetime.utcnow()
+        try:
+            async with get_session() as session:
+                await session.exec(
+                    update(MarathonSession)
+                    .where(and_(col(MarathonSession.id).in_(job_ids), MarathonSession.lease_owner == self.worker_id))
+                    .values(lease_expires_at=self._lease_deadline(), heartbeat_at=now)
+                )
+                await session.commit()
+                rows = (await session.exec(select(MarathonSession).where(col(MarathonSession.id).in_(job_ids)))).all()
+                return {row.id: row for row in rows}
+        except Exception as e:
+            logging.error(f"[Queue] Heartbeat failed: {e}")
+            return {}
+
+    async def record_cycle(self, job_id: int, status: str, cycle_count: int, next_run_at: Optional[datetime], last_error: Optional[str] = None):
+        """
+        Persists progress after a cycle. The lease stays with this worker.
+        """
+        try:
+            async with get_session() as session:
+                await session.exec(
+                    update(MarathonSession)
+                    .where(and_(MarathonSession.id == job_id, MarathonSession.lease_owner == self.worker_id))
+                    .values(status=status, cycle_count=cycle_count, next_run_at=next_run_at, last_error=last_error)
+                )
+                await session.commit()
+        except Exception as e:
+            logging.error(f"[Queue] Failed to record cycle for job {job_id}: {e}")
+
+    async def finish(self, job: MarathonSession, status: str, cycle_count: int, last_error: Optional[str] = None):
+        """
+        Closes a job (COMPLETED / FAILED / CANCELLED) and drops its lease.
+        """
+        db = DatabaseService(job.user_id)
+        await db.end_marathon_session(job.id, cycle_count, {"last_error": last_error} if last_error else None, status=status)
+
+    async def release(self, job_ids: List[int]):
+        """
+        Gives up leases (graceful shutdown) so other workers can claim immediately.
+        """
+        if not job_ids:
+            return
+        try:
+            async with get_session() as session:
+                await session.exec(
+                    update(MarathonSession)
+                    .where(and_(col(MarathonSession.id).in_(job_ids), MarathonSession.lease_owner == self.worker_id))
+                    .values(lease_owner=None, lease_expires_at=None)
+                )
+                await session.commit()
+        except Exception as e:
+            logging.error(f"[Queue] Failed to release leases: {e}")
+
+    async def set_status(self, session_key: str, status: str) -> Optional[MarathonSession]:
+        """
+        Pause/resume/cancel requests from any process; the owning worker applies
+        them on its next heartbeat.
+        """
+        try:
+            async with get_session() as session:
+                job = (await session.exec(
+                    select(MarathonSession)
+                    .where(MarathonSession.session_key == session_key)
+                    .order_by(col(MarathonSession.id).desc())  # a resumed session has a newer row
+                )).first()
+                if not job or job.status in TERMINAL_STATUSES:
+                    return job
+                job.status = status
+                if status == "RUNNING":
+                    job.next_run_at = datetime.utcnow()
+                session.add(job)
+                await session.commit()
+                await session.refresh(job)
+                return job
+        except Exception as e:
+            logging.error(f"[Queue] Failed to set status for {session_key}: {e}")
+            return None
+
+    async def get(self, session_key: str) -> Optional[MarathonSession]:
+        try:
+            async with get_session() as session:
+                return (await session.exec(
+                    select(MarathonSession)
+                    .where(MarathonSession.session_key == session_key)
+                    .order_by(col(MarathonSession.id).desc())  # a resumed session has a newer row
+                )).first()
+        except Exception as e:
+            logging.error(f"[Queue] Failed to load job {session_key}: {e}")
+            return None
+
+
+class MarathonQueueWorker:
+    """
+    Bridges the DB queue and the in-process MarathonScheduler.
+
+    Every poll it heartbeats the jobs this process runs (applying remote
+    pause/cancel and dropping jobs whose lease was lost) and claims due jobs
+    left behind by crashed or stopped workers, resuming them from checkpoints.
+    """
+
+    def __init__(
+        self,
+        scheduler: Any = None,
+        queue: Optional[MarathonJobQueue] = None,
+        poll_interval: Optional[float] = None,
+        orchestrator_factory: Optional[Callable[[MarathonSession], Any]] = None
+    ):
+        if scheduler is None:
+            from app.services.marathon_scheduler import MarathonScheduler
+            scheduler = MarathonScheduler.get_instance()
+        self.scheduler = scheduler
+        self.queue = queue or MarathonJobQueue()
+        self.poll_interval = settings.MARATHON_QUEUE_POLL_SECONDS if poll_interval is None else poll_interval
+        self.orchestrator_factory = orchestrator_factory or self._build_orchestrator
+        self.jobs: Dict[int, MarathonSession] = {}  # job id -> row, for sessions running here
+        self.reclaimed = 0
+        self._task: Optional[asyncio.Task] = None
+        self.scheduler.on_session_update = self._on_session_update
+
+    @classmethod
+    def get_instance(cls):
+        global _marathon_queue_worker
+        if _marathon_queue_worker is None:
+            _marathon_queue_worker = MarathonQueueWorker()
+        return _marathon_queue_worker
+
+    @property
+    def worker_id(self) -> str:
+        return self.queue.worker_id
+
+    def _build_orchestrator(self, job: MarathonSession):
+        from app.agents.orchestrator import CareerOrchestrator
+        return CareerOrchestrator(
+            user_id=job.user_id,
+            career_goal=job.career_goal,
+            location=job.location,
+            agents=self.scheduler.shared_agents()
+        )
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._poll_loop())
+            logging.info(f"[Queue] Marathon queue worker {self.worker_id} started")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.queue.release(list(self.jobs))
+
+    async def submit(self, session_key: str, orchestrator: Any, constraints: Optional[Dict[str, Any]] = None,
+                     duration_hours: int = 72, check_interval_minutes: int = 30, tournament_mode: bool = False, resume: bool = False):
+        """
+        Enqueues a new session owned by this worker and starts it in-process.
+        Raises SchedulerCapacityError (without leaving a queued row) when full.
+        """
+        # Checked before the row exists: a rejected session must never be claimed later
+        self.scheduler.check_capacity()
+        job_id = await self.queue.enqueue(
+            session_key,
+            orchestrator.user_id,
+            orchestrator.career_goal,
+            orchestrator.location,
+            constraints,
+            duration_hours,
+            check_interval_minutes,
+            tournament_mode
+        )
+        try:
+            session = self.scheduler.submit(
+                session_key,
+                orchestrator,
+                constraints=constraints,
+                duration_hours=duration_hours,
+                check_interval_minutes=check_interval_minutes,
+                tournament_mode=tournament_mode,
+                resume=resume
+            )
+        except SchedulerCapacityError as e:
+            # Filled up while the row was being written: close it so no worker claims it
+            if job_id and job_id > 0:
+                job = MarathonSession(id=job_id, user_id=orchestrator.user_id, career_goal=orchestrator.career_goal,
+                                      duration_hours=duration_hours, session_key=session_key)
+                await self.queue.finish(job, "CANCELLED", 0, last_error=str(e))
+            raise
+        if job_id and job_id > 0:
+            session.job_id = job_id
+            self.jobs[job_id] = MarathonSession(
+                id=job_id, user_id=orchestrator.user_id, career_goal=orchestrator.career_goal,
+                duration_hours=duration_hours, status="PENDING", session_key=session_key
+            )
+        return session
+
+    async def control(self, session_key: str, action: str):
+        """
+        Applies pause/resume/cancel locally (if this process runs the session)
+        and records it in the queue for whichever worker owns it.
+        """
+        status = {"pause": "PAUSED", "resume": "RUNNING", "cancel": "CANCELLED"}[action]
+        local = getattr(self.scheduler, action)(session_key)
+        job = await self.queue.set_status(session_key, status)
+        return local, job
+
+    async def _poll_loop(self):
+        while True:
+            try:
+                await self.poll()
+                await asyncio.sleep(self.poll_interval)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logging.error(f"[Queue] Poll failed: {e}")
+                await asyncio.sleep(self.poll_interval)
+
+    async def poll(self) -> int:
+        """
+        One heartbeat + claim round. Returns how many jobs were claimed.
+        """
+        rows = await self.queue.heartbeat(list(self.jobs))
+        for job_id, row in rows.items():
+            session = self.scheduler.get(row.session_key)
+            if row.lease_owner != self.worker_id:
+                # Lease lost (this process stalled); another worker now runs it
+                logging.warning(f"[Queue] Lost lease on job {job_id} to {row.lease_owner}")
+                self.scheduler.release(row.session_key)
+                self.jobs.pop(job_id, None)
+                continue
+            if session is None:
+                continue
+            # Remote control requests
+            if row.status == "CANCELLED" and session.status != "CANCELLED":
+                self.scheduler.cancel(row.session_key)
+            elif row.status == "PAUSED" and session.status in ("PENDING", "RUNNING"):
+                self.scheduler.pause(row.session_key)
+            elif row.status == "RUNNING" and session.status == "PAUSED":
+                self.scheduler.resume(row.session_key)
+
+        capacity = self.scheduler.metrics()["capacity_remaining"]
+        if capacity <= 0:
+            return 0
+
+        claimed = await self.queue.claim_due(limit=min(capacity, 50), exclude=list(self.jobs))
+        for job in claimed:
+            # Always resume: stage checkpoints are scoped to the session, and a worker that
+            # crashed mid-pipeline leaves the row PENDING with no cycles
+            resume = True
+            try:
+                session = self.scheduler.submit(
+                    job.session_key or f"job_{job.id}",
+                    self.orchestrator_factory(job),
+                    constraints=job.constraints,
+                    duration_hours=job.duration_hours,
+                    check_interval_minutes=job.check_interval_minutes,
+                    tournament_mode=job.tournament_mode,
+                    resume=resume
+                )
+            except Exception as e:
+                logging.error(f"[Queue] Could not schedule claimed job {job.id}: {e}")
+                await self.queue.release([job.id])
+                continue
+            session.job_id = job.id
+            self.jobs[job.id] = job
+            self.reclaimed += 1
+            logging.info(f"[Queue] Claimed marathon job {job.id} ({job.session_key}), resume={resume}")
+        return len(claimed)
+
+    async def _on_session_update(self, session: Any):
+        """
+        Scheduler hook: mirrors cycle_count / status / next_run_at into the queue.
+        """
+        job_id = getattr(session, "job_id", None)
+        job = self.jobs.get(job_id) if job_id else None
+        if job is None:
+            return
+        cycle_count = getattr(session.orchestrator, "cycle_count", None)
+        if cycle_count is None:
+            cycle_count = job.cycle_count
+        job.cycle_count = cycle_count
+
+        if session.status in TERMINAL_STATUSES:
+            await self.queue.finish(job, session.status, cycle_count, session.last_error)
+            self.jobs.pop(job_id, None)
+        else:
+            next_run_at = datetime.utcfromtimestamp(session.next_run_at) if session.next_run_at else None
+            await self.queue.record_cycle(job_id, session.status, cycle_count, next_run_at, session.last_error)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "worker_id": self.worker_id,
+            "owned_jobs": len(self.jobs),
+            "reclaimed_jobs": self.reclaimed,
+            "lease_seconds": self.queue.lease_seconds,
+            "poll_interval_seconds": self.poll_interval
+        }
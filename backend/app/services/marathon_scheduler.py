@@ -0,0 +1,364 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Dict, Any, List, Optional, Tuple, Callable, Awaitable
+
+from app.core.config import settings
+
+# Singleton instance
+_marathon_scheduler = None
+
+# Session states that still occupy a scheduler slot
+ACTIVE_STATUSES = {"PENDING", "RUNNING", "PAUSED"}
+
+
+class SchedulerCapacityError(Exception):
+    """
+    Raised when a new marathon session would exceed MARATHON_MAX_SESSIONS.
+    """
+
+
+class ScheduledSession:
+    """
+    Scheduler-side record of one marathon session.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        orchestrator: Any,
+        constraints: Optional[Dict[str, Any]] = None,
+        duration_hours: int = 72,
+        check_interval_minutes: int = 30,
+        tournament_mode: bool = False,
+        resume: bool = False
+    ):
+        self.session_id = session_id
+        self.orchestrator = orchestrator
+        self.constraints = constraints or {}
+        self.duration_hours = duration_hours
+        self.check_interval_minutes = check_interval_minutes
+        self.tournament_mode = tournament_mode
+        self.resume = resume
+
+        self.status = "PENDING"  # PENDING, RUNNING, PAUSED, CANCELLED, COMPLETED, FAILED
+        self.started = False
+        self.in_flight = False
+        self.generation = 0  # bumped on pause/cancel to invalidate queued heap entries
+        self.next_run_at: Optional[float] = None
+        self.cycles_run = 0
+        self.last_error: Optional[str] = None
+        self.created_at = time.time()
+        self.job_id: Optional[int] = None  # MarathonSession row when queued in the DB
+
+    def to_dict(self) -> Dict[str, Any]:
+        from app.agents.agent_message_bus import AgentMessageBus
+        schedule = getattr(self.orchestrator, "cycle_schedule", None)
+        context = getattr(self.orchestrator, "context", None)
+        message_bus = getattr(self.orchestrator, "message_bus", None)
+        return {
+            "session_id": self.session_id,
+            "job_id": self.job_id,
+            "status": self.status,
+            "cycles_run": self.cycles_run,
+            "cycle_count": getattr(self.orchestrator, "cycle_count", None),
+            "next_run_at": self.next_run_at,
+            "in_flight": self.in_flight,
+            "last_error": self.last_error,
+            "schedule": schedule.stats() if schedule else None,
+            "memory": context.memory_usage() if hasattr(context, "memory_usage") else None,
+            "message_bus": message_bus.metrics() if isinstance(message_bus, AgentMessageBus) else None
+        }
+
+
+class MarathonScheduler:
+    """
+    Owns every marathon session in the process.
+
+    Instead of one sleeping coroutine (plus router task and agents) per session, due
+    cycles are kept in a single timer heap and executed by a bounded pool of workers.
+    Sessions cost memory only while waiting, so the session count is bounded by
+    MARATHON_MAX_SESSIONS rather than by how many tasks the loop can juggle.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_sessions: Optional[int] = None):
+        self.max_workers = max_workers or settings.MARATHON_MAX_WORKERS
+        self.max_sessions = max_sessions or settings.MARATHON_MAX_SESSIONS
+        self.sessions: Dict[str, ScheduledSession] = {}
+
+        self._heap: List[Tuple[float, int, str, int]] = []  # (due_at, seq, session_id, generation)
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._slots = asyncio.Semaphore(self.max_workers)
+        self._in_flight: set = set()
+        self._closing: set = set()  # _finish tasks started by cancel(); held so they are not garbage-collected
+        self._loop_task: Optional[asyncio.Task] = None
+        self._shared_agents: Optional[Dict[str, Any]] = None
+        # Called after every step and on close (MarathonQueueWorker persists progress)
+        self.on_session_update: Optional[Callable[[ScheduledSession], Awaitable[None]]] = None
+
+        self.cycles_completed = 0
+        self.cycle_failures = 0
+        self.total_cycle_seconds = 0.0
+        self.max_dispatch_lag = 0.0
+
+    @classmethod
+    def get_instance(cls):
+        global _marathon_scheduler
+        if _marathon_scheduler is None:
+            _marathon_scheduler = MarathonScheduler()
+        return _marathon_scheduler
+
+    @property
+    def is_running(self) -> bool:
+        return self._loop_task is not None and not self._loop_task.done()
+
+    def shared_agents(self) -> Dict[str, Any]:
+        """
+        One set of agents for all scheduled sessions.
+        """
+        if self._shared_agents is None:
+            from app.agents.orchestrator import build_agents
+            self._shared_agents = build_agents()
+        return self._shared_agents
+
+    def start(self):
+        if self.is_running:
+            return
+        self._loop_task = asyncio.create_task(self._run_loop())
+        logging.info(f"[Scheduler] Marathon scheduler started (workers={self.max_workers}, max_sessions={self.max_sessions})")
+
+    async def stop(self):
+        if self._loop_task:
+            self._loop_task.cancel()
+        for task in list(self._in_flight):
+            task.cancel()
+        await asyncio.gather(*([self._loop_task] if self._loop_task else []), *self._in_flight, *self._closing, return_exceptions=True)
+        self._loop_task = None
+
+    # ---------- Session control ----------
+
+    def submit(self, session_id: str, orchestrator: Any, **options) -> ScheduledSession:
+        """
+        Registers a session; its initial pipeline runs as soon as a worker is free.
+        """
+        self.check_capacity()
+        orchestrator.session_id = session_id  # tags its mission log events
+        session = ScheduledSession(session_id, orchestrator, **options)
+        self.sessions[session_id] = session
+        self._schedule(session, 0)
+        self.start()
+        return session
+
+    def check_capacity(self):
+        """
+        Raises SchedulerCapacityError when no further session can be submitted.
+        """
+        active = sum(1 for s in self.sessions.values() if s.status in ACTIVE_STATUSES)
+        if active >= self.max_sessions:
+            raise SchedulerCapacityError(f"Marathon capacity reached ({self.max_sessions} sessions)")
+
+    def get(self, session_id: str) -> Optional[ScheduledSession]:
+        return self.sessions.get(session_id)
+
+    def pause(self, session_id: str) -> Optional[ScheduledSession]:
+        session = self.sessions.get(session_id)
+        if session and session.status in ("PENDING", "RUNNING"):
+            session.status = "PAUSED"
+            session.generation += 1
+            session.next_run_at = None
+        return session
+
+    def resume(self, session_id: str) -> Optional[ScheduledSession]:
+        session = self.sessions.get(session_id)
+        if session and session.status == "PAUSED":
+            session.status = "RUNNING" if session.started else "PENDING"
+            if not session.in_flight:
+                self._schedule(session, 0)
+        return session
+
+    def cancel(self, session_id: str) -> Optional[ScheduledSession]:
+        session = self.sessions.get(session_id)
+        if session and session.status in ACTIVE_STATUSES:
+            session.status = "CANCELLED"
+            session.generation += 1
+            session.next_run_at = None
+            if not session.in_flight:
+                # Nothing running: close the session now, otherwise the worker does it
+                task = asyncio.create_task(self._finish(session))
+                self._closing.add(task)
+                task.add_done_callback(self._on_close_done)
+        return session
+
+    def release(self, session_id: str) -> Optional[ScheduledSession]:
+        """
+        Stops running a session here without closing it (another worker took it over).
+        """
+        session = self.sessions.get(session_id)
+        if session and session.status in ACTIVE_STATUSES:
+            session.status = "RELEASED"
+            session.generation += 1
+            session.next_run_at = None
+            # The new owner runs it now; this copy must stop reacting to market snapshots
+            detach = getattr(session.orchestrator, "detach", None)
+            if detach is not None:
+                detach()
+            session.orchestrator = None
+        return session
+
+    # ---------- Timer heap ----------
+
+    def _schedule(self, session: ScheduledSession, delay: float):
+        session.next_run_at = time.time() + delay
+        heapq.heappush(self._heap, (session.next_run_at, next(self._seq), session.session_id, session.generation))
+        self._wakeup.set()
+
+    async def _run_loop(self):
+        """
+        Sleeps exactly until the earliest due session (or a new submission) and
+        hands due sessions to the worker pool.
+        """
+        while True:
+            try:
+                self._wakeup.clear()
+                now = time.time()
+
+                while self._heap and self._heap[0][0] <= now:
+                    due_at, _, session_id, generation = heapq.heappop(self._heap)
+                    session = self.sessions.get(session_id)
+                    if not session or generation != session.generation or session.status not in ("PENDING", "RUNNING"):
+                        continue  # stale entry (paused / cancelled / rescheduled)
+
+                    await self._slots.acquire()  # bounded worker pool
+                    self.max_dispatch_lag = max(self.max_dispatch_lag, time.time() - due_at)
+                    session.in_flight = True
+                    task = asyncio.create_task(self._run_step(session))
+                    self._in_flight.add(task)
+                    task.add_done_callback(self._on_step_done)
+                    now = time.time()
+
+                timeout = max(0.0, self._heap[0][0] - time.time()) if self._heap else None
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logging.error(f"[Scheduler] Loop error: {e}")
+                await asyncio.sleep(1)
+
+    def _on_step_done(self, task: asyncio.Task):
+        self._in_flight.discard(task)
+        self._slots.release()
+
+    def _on_close_done(self, task: asyncio.Task):
+        self._closing.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logging.error(f"[Scheduler] Closing a cancelled session failed: {task.exception()}")
+
+    async def _run_step(self, session: ScheduledSession):
+        """
+        Runs the next unit of work for a session: the initial pipeline on first
+        dispatch, one marathon cycle afterwards.
+        """
+        orchestrator = session.orchestrator
+        started = time.perf_counter()
+        try:
+            if not session.started:
+                await orchestrator.begin_marathon(
+                    session.constraints,
+                    session.duration_hours,
+                    session.check_interval_minutes,
+                    session.tournament_mode,
+                    session.resume
+                )
+                session.started = True
+                delay = orchestrator.check_interval
+            else:
+                delay = await orchestrator.run_marathon_cycle()
+                await orchestrator.message_bus.drain()
+                session.cycles_run += 1
+                self.cycles_completed += 1
+
+            if session.status == "PENDING":
+                session.status = "RUNNING"
+
+            if session.status == "CANCELLED" or delay is None:
+                if session.status != "CANCELLED":
+                    session.status = "COMPLETED"
+                await self._finish(session)
+            elif session.status == "RUNNING":
+                self._schedule(session, delay)
+                await self._notify(session)
+            # PAUSED: stays off the heap until resume()
+
+        except Exception as e:
+            logging.error(f"[Scheduler] Session {session.session_id} failed: {e}")
+            self.cycle_failures += 1
+            session.status = "FAILED"
+            session.last_error = str(e)
+            await self._finish(session)
+        finally:
+            session.in_flight = False
+            self.total_cycle_seconds += time.perf_counter() - started
+
+    async def _finish(self, session: ScheduledSession):
+        orchestrator = session.orchestrator
+        if orchestrator is None:
+            return
+        try:
+            if session.status == "CANCELLED":
+                await orchestrator.stop_marathon_session()
+            await orchestrator.end_marathon()
+        except Exception as e:
+            logging.error(f"[Scheduler] Failed to close session {session.session_id}: {e}")
+        await self._notify(session)
+        # Drop the orchestrator so finished sessions only keep their summary record
+        session.orchestrator = None
+
+    async def _notify(self, session: ScheduledSession):
+        if self.on_session_update is None:
+            return
+        try:
+            await self.on_session_update(session)
+        except Exception as e:
+            logging.error(f"[Scheduler] Session update hook failed for {session.session_id}: {e}")
+
+    # ---------- Metrics ----------
+
+    def metrics(self) -> Dict[str, Any]:
+        by_status: Dict[str, int] = {}
+        for session in self.sessions.values():
+            by_status[session.status] = by_status.get(session.status, 0) + 1
+        active = sum(count for status, count in by_status.items() if status in ACTIVE_STATUSES)
+        dispatched = self.cycles_completed + self.cycle_failures
+        # Cycles avoided by adaptive intervals versus each session's fixed check interval
+        cycles_saved = sum(
+            session.orchestrator.cycle_schedule.cycles_saved()
+            for session in self.sessions.values()
+            if session.status in ACTIVE_STATUSES and hasattr(session.orchestrator, "cycle_schedule")
+        )
+        context_bytes = sum(
+            session.orchestrator.context.memory_usage()["total_bytes"]
+            for session in self.sessions.values()
+            if session.status in ACTIVE_STATUSES and hasattr(getattr(session.orchestrator, "context", None), "memory_usage")
+        )
+
+        return {
+            "sessions_by_status": by_status,
+            "active_sessions": active,
+            "max_sessions": self.max_sessions,
+            "capacity_remaining": max(0, self.max_sessions - active),
+            "timer_heap_size": len(self._heap),
+            "workers_busy": len(self._in_flight),
+            "max_workers": self.max_workers,
+            "cycles_completed": self.cycles_completed,
+            "cycles_saved": cycles_saved,
+            "context_bytes": context_bytes,
+            "cycle_failures": self.cycle_failures,
+            "avg_step_seconds": round(self.total_cycle_seconds / dispatched, 3) if dispatched else 0.0,
+            "max_dispatch_lag_seconds": round(self.max_dispatch_lag, 3)
+        }
@@ -0,0 +1,116 @@
+import hashlib
+import re
+from typing import Dict, Any, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+from app.core.config import settings
+
+
+def listing_identity(listing: Dict[str, Any]) -> str:
+    """
+    Returns a stable identity for a job listing.
+
+    Prefers the normalized posting link (scheme/query/fragment stripped, host lowercased);
+    falls back to a title+company cluster key so re-scrapes of the same posting from
+    different sources collapse into one identity.
+    """
+    link = (listing.get("link") or "").strip()
+    if link and not link.endswith("..."):
+        parts = urlsplit(link)
+        if parts.netloc:
+            path = parts.path.rstrip("/")
+            return urlunsplit(("", parts.netloc.lower(), path, "", "")).lstrip("/")
+
+    title = re.sub(r"\s+", " ", str(listing.get("title", ""))).strip().lower()
+    company = re.sub(r"\s+", " ", str(listing.get("company", ""))).strip().lower()
+    return f"cluster:{title}|{company}"
+
+
+def listing_fingerprint(listing: Dict[str, Any]) -> str:
+    """
+    Hashes the fields that make a posting materially different between cycles.
+    """
+    content = "|".join(
+        str(listing.get(field, "")).strip()
+        for field in ("title", "company", "location", "type", "description")
+    )
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()[:16]
+
+
+def build_listing_index(listings: List[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    Maps listing identity -> content fingerprint.
+    Duplicate identities (same posting from two scrapers) keep the first occurrence.
+    """
+    index: Dict[str, str] = {}
+    for listing in listings:
+        index.setdefault(listing_identity(listing), listing_fingerprint(listing))
+    return index
+
+
+class MarketDelta:
+    """
+    Result of diffing two listing snapshots by identity.
+    """
+
+    def __init__(self, added: List[str], removed: List[str], changed: List[str], previous_count: int, current_count: int):
+        self.added = added
+        self.removed = removed
+        self.changed = changed
+        self.previous_count = previous_count
+        self.current_count = current_count
+
+    @property
+    def churn(self) -> int:
+        return len(self.added) + len(self.removed) + len(self.changed)
+
+    @property
+    def net_change(self) -> int:
+        return self.current_count - self.previous_count
+
+    @property
+    def is_empty(self) -> bool:
+        return self.churn == 0
+
+    def is_material(self, min_changes: Optional[int] = None, min_ratio: Optional[float] = None) -> bool:
+        """
+        A delta is material when enough postings churned, either in absolute terms
+        or relative to the size of the previous snapshot.
+        """
+        min_changes = settings.MARKET_DELTA_MIN_CHANGES if min_changes is None else min_changes
+        min_ratio = settings.MARKET_DELTA_MIN_RATIO if min_ratio is None else min_ratio
+
+        if self.churn == 0:
+            return False
+        if self.churn >= min_changes:
+            return True
+        if self.previous_count == 0:
+            return False
+        return self.churn / self.previous_count >= min_ratio
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "added": len(self.added),
+            "removed": len(self.removed),
+            "changed": len(self.changed),
+            "churn": self.churn,
+            "net_change": self.net_change,
+            "previous_count": self.previous_count,
+            "current_count": self.current_count
+        }
+
+
+def compute_listing_delta(previous_index: Dict[str, str], current_index: Dict[str, str]) -> MarketDelta:
+    """
+    Diffs two listing indexes (see build_listing_index) into added/removed/changed identities.
+    """
+    previous_ids = previous_index.keys()
+    current_ids = current_index.keys()
+
+    added = sorted(current_ids - previous_ids)
+    removed = sorted(previous_ids - current_ids)
+    changed = sorted(
+        identity for identity in current_ids & previous_ids
+        if current_index[identity] != previous_index[identity]
+    )
+    return MarketDelta(added, removed, changed, len(previous_index), len(current_index))
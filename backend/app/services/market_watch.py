@@ -0,0 +1,238 @@
+import asyncio
+import logging
+import re
+import time
+from typing import Dict, Any, List, Optional, Callable, Awaitable
+
+from app.core.config import settings
+from app.services.market_delta import MarketDelta, build_listing_index, compute_listing_delta
+from app.services.adaptive_interval import AdaptiveInterval
+from app.services.mission_control import MissionControl
+
+# Singleton instance
+_market_watch_registry = None
+
+SnapshotCallback = Callable[["MarketSnapshot"], Awaitable[None]]
+
+
+def watch_key(career_goal: str, location: str) -> str:
+    """
+    Normalizes (career_goal, location) so "Data Scientist / Kenya" and
+    " data  scientist / KENYA" share one watch.
+    """
+    goal = re.sub(r"\s+", " ", career_goal or "").strip().lower()
+    place = re.sub(r"\s+", " ", location or "").strip().lower()
+    return f"{goal}|{place}"
+
+
+class MarketSnapshot:
+    """
+    One refresh of a watch, fanned out to every subscriber.
+    """
+
+    def __init__(self, key: str, version: int, listings: List[Dict[str, Any]], listing_index: Dict[str, str], research_data: Dict[str, Any], delta: MarketDelta):
+        self.key = key
+        self.version = version
+        self.listings = listings
+        self.listing_index = listing_index
+        self.research_data = research_data
+        self.delta = delta
+        self.is_shift = delta.is_material()
+
+
+class MarketWatch:
+    """
+    Shared market state for one (career_goal, location) pair.
+    """
+
+    def __init__(self, key: str, career_goal: str, location: str, research_agent: Any):
+        self.key = key
+        self.career_goal = career_goal
+        self.location = location
+        self.research_agent = research_agent
+        self.subscribers: Dict[str, SnapshotCallback] = {}
+        self.intervals: Dict[str, float] = {}
+
+        self.listing_index: Optional[Dict[str, str]] = None
+        self.research_data: Dict[str, Any] = {}
+        self.version = 0
+        self.refreshes = 0
+        self.analyses = 0
+        self.last_refresh: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+        self.schedule = AdaptiveInterval(settings.MARATHON_CYCLE_INTERVAL_MINUTES * 60)
+
+    @property
+    def base_interval(self) -> float:
+        # The most demanding subscriber sets the fixed-schedule reference
+        return min(self.intervals.values()) if self.intervals else settings.MARATHON_CYCLE_INTERVAL_MINUTES * 60
+
+    @property
+    def interval(self) -> float:
+        return self.schedule.current
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "key": self.key,
+            "subscribers": len(self.subscribers),
+            "version": self.version,
+            "refreshes": self.refreshes,
+            "analyses": self.analyses,
+            "interval_seconds": self.interval,
+            "last_refresh": self.last_refresh,
+            "schedule": self.schedule.stats()
+        }
+
+
+class MarketWatchRegistry:
+    """
+    Deduplicates market monitoring across marathon sessions.
+
+    Sessions subscribe to a normalized watch key; one refresher per key scrapes,
+    diffs and (only on a material delta) analyzes, then fans the snapshot out to
+    every subscriber. Each session is left with just its personalized roadmap step.
+    Those steps may call the model, so at most MARKET_WATCH_MAX_CONCURRENT_UPDATES
+    run at once across all watches.
+    """
+
+    def __init__(self, max_concurrent_updates: Optional[int] = None):
+        self.watches: Dict[str, MarketWatch] = {}
+        self._research_agent = None
+        self.max_concurrent_updates = max_concurrent_updates or settings.MARKET_WATCH_MAX_CONCURRENT_UPDATES
+        self._update_slots = asyncio.Semaphore(self.max_concurrent_updates)
+
+    @classmethod
+    def get_instance(cls):
+        global _market_watch_registry
+        if _market_watch_registry is None:
+            _market_watch_registry = MarketWatchRegistry()
+        return _market_watch_registry
+
+    def _default_research_agent(self):
+        if self._research_agent is None:
+            from app.agents.research_agent import ResearchAgent
+            self._research_agent = ResearchAgent()
+        return self._research_agent
+
+    def subscribe(
+        self,
+        subscriber_id: str,
+        career_goal: str,
+        location: str,
+        callback: SnapshotCallback,
+        interval: Optional[float] = None,
+        research_agent: Any = None,
+        seed_research: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Adds a subscriber to the watch for (career_goal, location), creating the
+        watch and its refresher on first use. Returns the watch key.
+        """
+        key = watch_key(career_goal, location)
+        watch = self.watches.get(key)
+        if watch is None:
+            watch = MarketWatch(key, career_goal, location, research_agent or self._default_research_agent())
+            self.watches[key] = watch
+            logging.info(f"[MarketWatch] Created watch '{key}'")
+
+        # The first subscriber's pipeline research seeds the baseline snapshot
+        if watch.listing_index is None and seed_research:
+            watch.research_data = seed_research
+            watch.listing_index = build_listing_index(seed_research.get("listings", []))
+
+        watch.subscribers[subscriber_id] = callback
+        watch.intervals[subscriber_id] = interval or watch.base_interval
+        watch.schedule.set_base(watch.base_interval)
+        if watch.task is None or watch.task.done():
+            watch.task = asyncio.create_task(self._run_watch(watch))
+        return key
+
+    def unsubscribe(self, subscriber_id: str, key: str):
+        """
+        Removes a subscriber; the watch is torn down with its last subscriber.
+        """
+        watch = self.watches.get(key)
+        if not watch:
+            return
+        watch.subscribers.pop(subscriber_id, None)
+        watch.intervals.pop(subscriber_id, None)
+        if watch.intervals:
+            watch.schedule.set_base(watch.base_interval)
+        if not watch.subscribers:
+            if watch.task:
+                watch.task.cancel()
+            del self.watches[key]
+            logging.info(f"[MarketWatch] Dropped watch '{key}' (no subscribers)")
+
+    async def _run_watch(self, watch: MarketWatch):
+        while watch.subscribers:
+            try:
+                await asyncio.sleep(watch.schedule.next_delay())
+                await self.refresh(watch.key)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logging.error(f"[MarketWatch] Refresh failed for '{watch.key}': {e}")
+
+    async def refresh(self, key: str) -> Optional[MarketSnapshot]:
+        """
+        Fetches listings once for the watch and fans the result out to subscribers.
+        """
+        watch = self.watches.get(key)
+        if not watch:
+            return None
+
+        listings = await watch.research_agent.fetch_listings(watch.career_goal, watch.location)
+        watch.refreshes += 1
+        watch.last_refresh = time.time()
+        if not listings:
+            MissionControl.get_instance().log_event("MARKET_WATCH", f"[{key}] No listings fetched. Keeping previous snapshot.")
+            return None
+
+        current_index = build_listing_index(listings)
+        delta = compute_listing_delta(watch.listing_index or {}, current_index)
+        watch.schedule.observe(delta)
+
+        if delta.is_material():
+            # Analyzed once per watch, not once per session
+            watch.research_data = await watch.research_agent.analyze_market_data(watch.career_goal, {
+                "listings": listings,
+                "market_trends": watch.research_data.get("analysis", {}).get("trends", [])
+            })
+            watch.analyses += 1
+        else:
+            watch.research_data = {**watch.research_data, "listings": listings}
+
+        watch.listing_index = current_index
+        watch.version += 1
+        snapshot = MarketSnapshot(key, watch.version, listings, current_index, watch.research_data, delta)
+
+        MissionControl.get_instance().log_event(
+            "MARKET_WATCH",
+            f"[{key}] v{watch.version}: +{len(delta.added)} -{len(delta.removed)} ~{len(delta.changed)} "
+            f"-> {len(watch.subscribers)} subscriber(s), next refresh in {watch.interval/60:.1f} min"
+        )
+
+        results = await asyncio.gather(
+            *(self._deliver(callback, snapshot) for callback in list(watch.subscribers.values())),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logging.error(f"[MarketWatch] Subscriber failed on '{key}': {result}")
+        return snapshot
+
+    async def _deliver(self, callback: SnapshotCallback, snapshot: MarketSnapshot):
+        async with self._update_slots:
+            await callback(snapshot)
+
+    def stats(self) -> Dict[str, Any]:
+        watches = [watch.to_dict() for watch in self.watches.values()]
+        total_subscribers = sum(w["subscribers"] for w in watches)
+        return {
+            "watches": watches,
+            "total_watches": len(watches),
+            "total_subscribers": total_subscribers,
+            "dedupe_ratio": round(total_subscribers / len(watches), 2) if watches else 0.0,
+            "max_concurrent_updates": self.max_concurrent_updates
+        }
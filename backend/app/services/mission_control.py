@@ -1,21 +1,93 @@
 import asyncio
+import heapq
+import itertools
 import logging
 import json
 import random
+import time
+from collections import OrderedDict, deque
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Deque, AsyncIterator, Awaitable, Callable, Set, Tuple
+
+from app.core.config import settings
+
+# Stream holding every event (the dashboard's live terminal)
+GLOBAL_STREAM = "global"
 
 # Singleton instance
 _mission_control = None
 
+async def _wait_event(event: asyncio.Event, timeout: Optional[float]) -> bool:
+    """
+    event.wait() with a timeout. Unlike asyncio.wait_for (3.11), a cancellation
+    that races with the event being set is never swallowed.
+    """
+    waiter = asyncio.ensure_future(event.wait())
+    try:
+        done, _ = await asyncio.wait({waiter}, timeout=timeout)
+        return bool(done)
+    finally:
+        waiter.cancel()
+
+class MissionJob:
+    """
+    A recurring job run by MissionControl's scheduler.
+    """
+
+    def __init__(self, name: str, func: Callable[[], Awaitable[Any]], interval: float, jitter: float = 0.1, max_concurrency: int = 1):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.jitter = jitter  # fraction of the interval, spreads jobs that would fire together
+        self.max_concurrency = max_concurrency
+        self.running: Set[asyncio.Task] = set()
+        self.next_run_at: Optional[float] = None  # monotonic
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0  # due while max_concurrency runs were still in flight
+        self.overruns = 0  # runs that took longer than the interval
+        self.last_duration: Optional[float] = None
+        self.max_duration = 0.0
+        self.last_error: Optional[str] = None
+
+    def next_delay(self) -> float:
+        return max(0.0, self.interval + random.uniform(-self.jitter, self.jitter) * self.interval)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "interval": self.interval,
+            "running": len(self.running),
+            "max_concurrency": self.max_concurrency,
+            "next_run_in": round(max(0.0, self.next_run_at - time.monotonic()), 2) if self.next_run_at is not None else None,
+            "runs": self.runs,
+            "failures": self.failures,
+            "skipped": self.skipped,
+            "overruns": self.overruns,
+            "last_duration": round(self.last_duration, 3) if self.last_duration is not None else None,
+            "max_duration": round(self.max_duration, 3),
+            "last_error": self.last_error
+        }
+
 class MissionControl:
     def __init__(self):
         self.is_running = False
-        self.mission_logs: List[Dict[str, Any]] = []
+        # Ring buffers: the global stream plus one per marathon session (LRU-bounded).
+        # Sequence numbers are global, so one cursor works on any stream.
+        self._global_logs: Deque[Dict[str, Any]] = deque(maxlen=settings.MISSION_LOG_SIZE)
+        self._session_logs: "OrderedDict[str, Deque[Dict[str, Any]]]" = OrderedDict()
+        self._seq = itertools.count(1)
+        self.last_seq = 0
+        self._new_events = asyncio.Event()
         self.last_scrape_time = None
         self.scrape_interval = 30 # Seconds (for demo purposes, usually hours)
         self.active_mission_id = "MISSION_ALPHA_001"
         self._loop_task = None
+        # Job scheduler: heap of (due, seq, job); the loop sleeps until the earliest is due
+        self._jobs: Dict[str, MissionJob] = {}
+        self._job_heap: List[Tuple[float, int, MissionJob]] = []
+        self._job_seq = itertools.count()
+        self._jobs_changed = asyncio.Event()
 
     @classmethod
     def get_instance(cls):
@@ -29,37 +101,184 @@ class MissionControl:
             return
         self.is_running = True
         self.log_event("SYSTEM", "Mission Control loop initiated. autonomous_mode=ENABLED")
+        if "autonomous_scrape" not in self._jobs:
+            self.register_job("autonomous_scrape", self.execute_autonomous_scrape, self.scrape_interval, run_immediately=True)
         self._loop_task = asyncio.create_task(self._run_loop())
 
     def stop_loop(self):
         self.is_running = False
         self.log_event("SYSTEM", "Mission Control loop paused.")
+        self._jobs_changed.set()
         if self._loop_task:
             self._loop_task.cancel()
+        for job in self._jobs.values():
+            for task in list(job.running):
+                task.cancel()
+
+    # ---------- Job scheduler ----------
+
+    def register_job(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[Any]],
+        interval: float,
+        jitter: float = 0.1,
+        max_concurrency: int = 1,
+        run_immediately: bool = False
+    ) -> MissionJob:
+        """
+        Registers (or replaces) a recurring job. `func` is an async callable run
+        every `interval` seconds, +/- `jitter` * interval.
+        """
+        job = MissionJob(name, func, interval, jitter, max_concurrency)
+        self._jobs[name] = job  # a replaced job's heap entry is dropped when popped
+        self._push_job(job, time.monotonic() + (0.0 if run_immediately else job.next_delay()))
+        return job
+
+    def unregister_job(self, name: str) -> bool:
+        job = self._jobs.pop(name, None)
+        if job:
+            self._jobs_changed.set()
+        return job is not None
+
+    def _push_job(self, job: MissionJob, due: float):
+        job.next_run_at = due
+        heapq.heappush(self._job_heap, (due, next(self._job_seq), job))
+        self._jobs_changed.set()  # the loop may need to wake earlier
+
+    def job_stats(self) -> List[Dict[str, Any]]:
+        return [job.to_dict() for job in self._jobs.values()]
+
+    def _run_due_jobs(self, now: float):
+        while self._job_heap and self._job_heap[0][0] <= now:
+            due, _, job = heapq.heappop(self._job_heap)
+            if self._jobs.get(job.name) is not job:
+                continue  # unregistered or replaced
+            self._dispatch(job)
+            # Fixed rate; if we fell a whole interval behind, restart from now instead of bursting
+            base = due if due + job.interval > now else now
+            self._push_job(job, base + job.next_delay())
+
+    def _dispatch(self, job: MissionJob):
+        if len(job.running) >= job.max_concurrency:
+            job.skipped += 1
+            logging.warning(f"[Scheduler] Job '{job.name}' still running after {job.interval:.0f}s; skipping this run")
+            return
+        task = asyncio.create_task(self._run_job(job))
+        job.running.add(task)
+        task.add_done_callback(job.running.discard)
+
+    async def _run_job(self, job: MissionJob):
+        started = time.monotonic()
+        try:
+            await job.func()
+            job.last_error = None
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            job.failures += 1
+            job.last_error = str(e)
+            logging.error(f"[Scheduler] Job '{job.name}' failed: {e}")
+            self.log_event("ERROR", f"Job '{job.name}' failed: {str(e)}")
+        finally:
+            job.runs += 1
+            job.last_duration = time.monotonic() - started
+            job.max_duration = max(job.max_duration, job.last_duration)
+            if job.last_duration > job.interval:
+                job.overruns += 1
+                logging.warning(f"[Scheduler] Job '{job.name}' overran: {job.last_duration:.1f}s > {job.interval:.0f}s interval")
 
-    def log_event(self, source: str, message: str, metadata: Dict = None):
+    @property
+    def mission_logs(self) -> List[Dict[str, Any]]:
+        """
+        The global stream as a list (kept for existing callers).
+        """
+        return list(self._global_logs)
+
+    def log_event(self, source: str, message: str, metadata: Dict = None, session_id: Optional[str] = None):
         """
         Logs an event to the mission log.
         This provides the data source for the frontend Live Terminal.
+        Events tagged with a session_id also go to that session's stream.
         """
+        self.last_seq = next(self._seq)
         event = {
+            "seq": self.last_seq,
             "timestamp": datetime.now().isoformat(),
             "source": source,
             "message": message,
-            "metadata": metadata or {}
+            "metadata": metadata or {},
+            "session_id": session_id
         }
-        self.mission_logs.append(event)
-        # Keep log size manageable
-        if len(self.mission_logs) > 100:
-            self.mission_logs.pop(0)
+        self._global_logs.append(event)
+        if session_id:
+            stream = self._session_logs.get(session_id)
+            if stream is None:
+                stream = self._session_logs[session_id] = deque(maxlen=settings.MISSION_SESSION_LOG_SIZE)
+                while len(self._session_logs) > settings.MISSION_LOG_MAX_SESSIONS:
+                    self._session_logs.popitem(last=False)
+            else:
+                self._session_logs.move_to_end(session_id)
+            stream.append(event)
+        
+        # Wake streaming clients; each waits on the event that was current when it started
+        self._new_events.set()
+        self._new_events = asyncio.Event()
         logging.info(f"[{source}] {message}")
 
+    def get_logs(self, session_id: Optional[str] = None, since: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Events with seq > since, oldest first. Walks back from the newest event,
+        so the cost is proportional to what the client has not seen yet.
+        """
+        stream = self._global_logs if not session_id or session_id == GLOBAL_STREAM else self._session_logs.get(session_id, ())
+        events: List[Dict[str, Any]] = []
+        for event in reversed(stream):
+            if event["seq"] <= since:
+                break
+            events.append(event)
+        events.reverse()
+        return events[-limit:] if limit else events
+
+    async def wait_for_events(self, session_id: Optional[str] = None, since: int = 0, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Returns new events as soon as there are any, or [] after `timeout` seconds.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            waiter = self._new_events
+            events = self.get_logs(session_id, since)
+            if events:
+                return events
+            remaining = None if deadline is None else deadline - loop.time()
+            if remaining is not None and remaining <= 0:
+                return []
+            if not await _wait_event(waiter, remaining):
+                return []
+
+    async def stream(self, session_id: Optional[str] = None, since: int = 0, heartbeat: float = 15.0) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Yields batches of new events; an empty batch every `heartbeat` seconds of silence.
+        """
+        cursor = since
+        while True:
+            events = await self.wait_for_events(session_id, cursor, timeout=heartbeat)
+            if events:
+                cursor = events[-1]["seq"]
+            yield events
+
     async def _run_loop(self):
+        """
+        Sleeps until the earliest job is due (or a job is registered), runs what is due, repeats.
+        """
         logging.info("Mission Control background loop started.")
         while self.is_running:
             try:
-                await self.tick()
-                await asyncio.sleep(5) # Tick every 5 seconds
+                self._run_due_jobs(time.monotonic())
+                self._jobs_changed.clear()
+                timeout = max(0.0, self._job_heap[0][0] - time.monotonic()) if self._job_heap else None
+                await _wait_event(self._jobs_changed, timeout)
             except asyncio.CancelledError:
                 break
             except Exception as e:
@@ -67,18 +286,9 @@ class MissionControl:
                 self.log_event("ERROR", f"Critical loop failure: {str(e)}")
                 await asyncio.sleep(5) # Backoff on error
 
-    async def tick(self):
-        # 1. Check if scraping is due
-        now = datetime.now()
-        if not self.last_scrape_time or (now - self.last_scrape_time).total_seconds() > self.scrape_interval:
-            await self.execute_autonomous_scrape()
-            self.last_scrape_time = now
-
     async def execute_autonomous_scrape(self):
+        self.last_scrape_time = datetime.now()
         self.log_event("MONITOR", "Initiating scheduled market surveillance...", {"target": "Nairobi_Tech_Cluster"})
-        
-        # Simulate scraping delay
-        await asyncio.sleep(2)
         self.log_event("RESEARCH_AGENT", "Scraping LinkedIn & Indeed [background_mode]...")
         
         # In a real app, we'd call the actual scrapers here.
@@ -0,0 +1,232 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import uuid
+from typing import Dict, Any, Awaitable, Callable, List, Optional, Set
+
+from app.core.config import settings
+
+# (kind, topic, difficulty, count) -> new questions
+Generator = Callable[[str, str, str, int], Awaitable[List[Any]]]
+
+SKILL_ALIASES = {
+    "py": "python", "python3": "python", "js": "javascript", "ts": "typescript",
+    "node": "nodejs", "node.js": "nodejs", "postgres": "postgresql", "k8s": "kubernetes",
+    "ml": "machine learning", "react.js": "react", "reactjs": "react", "golang": "go"
+}
+
+# Singleton instance
+_question_bank = None
+
+
+def normalize_skill(skill: Any) -> str:
+    """
+    Bank key for a skill or role: lowercase, single spaces, no trailing punctuation, common aliases merged.
+    """
+    text = re.sub(r"\s+", " ", str(skill or "").strip().lower()).strip(" .,:;!?")
+    return SKILL_ALIASES.get(text, text) or "general"
+
+
+def _question_text(question: Any) -> str:
+    if isinstance(question, dict):
+        question = question.get("q") or question.get("question") or json.dumps(question, sort_keys=True)
+    return re.sub(r"\W+", " ", str(question).lower()).strip()
+
+
+class QuestionBank:
+    """
+    Persistent quiz and interview questions, bucketed by kind, normalized skill
+    (or role) and difficulty.
+
+    Questions are sampled locally without repeating any a user has already been
+    served in that bucket (their history restarts once they have seen all of
+    it). A bucket is only regenerated when it cannot cover a request, or in the
+    background when a user has fewer than QUESTION_BANK_LOW_WATERMARK unseen
+    questions left and the bucket is below QUESTION_BANK_MAX_PER_BUCKET.
+    Concurrent refills of one bucket share a single generator call.
+    """
+
+    def __init__(self, path: Optional[str] = None, batch_size: Optional[int] = None,
+                 low_watermark: Optional[int] = None, max_per_bucket: Optional[int] = None):
+        self.path = path or settings.QUESTION_BANK_PATH
+        self.batch_size = batch_size or settings.QUESTION_BANK_BATCH_SIZE
+        self.low_watermark = settings.QUESTION_BANK_LOW_WATERMARK if low_watermark is None else low_watermark
+        self.max_per_bucket = max_per_bucket or settings.QUESTION_BANK_MAX_PER_BUCKET
+
+        self._buckets: Dict[str, List[Dict[str, Any]]] = {}
+        self._served: Dict[str, Dict[str, List[str]]] = {}  # user -> bucket -> question ids
+        self._refills: Dict[str, asyncio.Task] = {}
+        self._save_task: Optional[asyncio.Task] = None
+        self._dirty = False
+        self._load()
+
+        self.samples = 0
+        self.generated = 0
+        self.generator_calls = 0
+        self.background_refills = 0
+
+    @classmethod
+    def get_instance(cls):
+        global _question_bank
+        if _question_bank is None:
+            _question_bank = QuestionBank()
+        return _question_bank
+
+    @staticmethod
+    def bucket(kind: str, topic: str, difficulty: str) -> str:
+        return f"{kind}|{normalize_skill(topic)}|{difficulty.strip().lower()}"
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            self._buckets = data.get("buckets", {})
+            self._served = data.get("served", {})
+        except Exception as e:
+            logging.warning(f"[QuestionBank] Could not load {self.path}: {e}")
+
+    def _write(self, snapshot: str):
+        temp = f"{self.path}.tmp"
+        with open(temp, "w") as f:
+            f.write(snapshot)
+        os.replace(temp, self.path)
+
+    def _schedule_save(self):
+        # Saves are coalesced: one write in flight, and one more if anything changed meanwhile
+        self._dirty = True
+        if self._save_task is None or self._save_task.done():
+            self._save_task = asyncio.create_task(self._save_loop())
+
+    async def _save_loop(self):
+        while self._dirty:
+            self._dirty = False
+            snapshot = json.dumps({"buckets": self._buckets, "served": self._served})
+            try:
+                await asyncio.to_thread(self._write, snapshot)
+            except Exception as e:
+                logging.warning(f"[QuestionBank] Could not save {self.path}: {e}")
+
+    async def flush(self):
+        if self._save_task is not None:
+            await self._save_task
+
+    def size(self, kind: str, topic: str, difficulty: str) -> int:
+        return len(self._buckets.get(self.bucket(kind, topic, difficulty), []))
+
+    def unseen(self, kind: str, topic: str, difficulty: str, user_id: str) -> int:
+        key = self.bucket(kind, topic, difficulty)
+        served = set(self._served.get(user_id, {}).get(key, []))
+        return sum(1 for entry in self._buckets.get(key, []) if entry["id"] not in served)
+
+    def add(self, kind: str, topic: str, difficulty: str, questions: List[Any]) -> int:
+        """
+        Adds new questions to a bucket, skipping ones already in it. Returns how many were added.
+        """
+        key = self.bucket(kind, topic, difficulty)
+        entries = self._buckets.setdefault(key, [])
+        known: Set[str] = {entry["hash"] for entry in entries}
+        added = 0
+        for question in questions:
+            text = _question_text(question)
+            digest = hashlib.sha1(text.encode()).hexdigest()
+            if not text or digest in known or len(entries) >= self.max_per_bucket:
+                continue
+            known.add(digest)
+            entries.append({"id": uuid.uuid4().hex[:12], "hash": digest, "data": question})
+            added += 1
+        if added:
+            self.generated += added
+            self._schedule_save()
+        return added
+
+    def sample(self, kind: str, topic: str, difficulty: str, count: int, user_id: str) -> List[Any]:
+        """
+        Up to `count` random questions the user has not been served yet.
+        """
+        key = self.bucket(kind, topic, difficulty)
+        entries = self._buckets.get(key, [])
+        if not entries or count <= 0:
+            return []
+        history = self._served.setdefault(user_id, {}).setdefault(key, [])
+        served = set(history)
+        fresh = [entry for entry in entries if entry["id"] not in served]
+        picked = random.sample(fresh, min(count, len(fresh)))
+        if len(picked) < count and len(fresh) < len(entries):
+            # The user has seen the whole bucket: start their cycle over
+            history.clear()
+            seen = [entry for entry in entries if entry["id"] in served]
+            picked += random.sample(seen, min(count - len(picked), len(seen)))
+        history.extend(entry["id"] for entry in picked)
+        self.samples += 1
+        self._schedule_save()
+        return [entry["data"] for entry in picked]
+
+    async def refill(self, kind: str, topic: str, difficulty: str, generator: Generator) -> int:
+        """
+        Generates one batch into the bucket; concurrent calls for a bucket share it.
+        """
+        return await asyncio.shield(self._start_refill(kind, topic, difficulty, generator))
+
+    def _start_refill(self, kind: str, topic: str, difficulty: str, generator: Generator) -> asyncio.Task:
+        key = self.bucket(kind, topic, difficulty)
+        task = self._refills.get(key)
+        if task is None:
+            task = asyncio.create_task(self._generate(kind, topic, difficulty, generator))
+            self._refills[key] = task
+            task.add_done_callback(lambda _: self._refills.pop(key, None))
+        return task
+
+    async def _generate(self, kind: str, topic: str, difficulty: str, generator: Generator) -> int:
+        self.generator_calls += 1
+        questions = await generator(kind, normalize_skill(topic), difficulty, self.batch_size)
+        return self.add(kind, topic, difficulty, questions or [])
+
+    async def take(self, kind: str, topic: str, difficulty: str, count: int, user_id: str,
+                   generator: Generator) -> List[Any]:
+        """
+        Samples `count` unseen questions, generating a batch first only if the
+        bucket cannot cover them, and topping it up in the background when it runs low.
+        """
+        if self.unseen(kind, topic, difficulty, user_id) < count and self.size(kind, topic, difficulty) < self.max_per_bucket:
+            try:
+                await self.refill(kind, topic, difficulty, generator)
+            except Exception as e:
+                logging.error(f"[QuestionBank] Generating {self.bucket(kind, topic, difficulty)} failed: {e}")
+                if not self.size(kind, topic, difficulty):
+                    raise
+        picked = self.sample(kind, topic, difficulty, count, user_id)
+        if (self.unseen(kind, topic, difficulty, user_id) < self.low_watermark
+                and self.size(kind, topic, difficulty) < self.max_per_bucket
+                and self.bucket(kind, topic, difficulty) not in self._refills):
+            self.background_refills += 1
+            self._start_refill(kind, topic, difficulty, generator).add_done_callback(self._log_refill)
+        return picked
+
+    @staticmethod
+    def _log_refill(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logging.warning(f"[QuestionBank] Background refill failed: {task.exception()}")
+
+    async def close(self):
+        for task in list(self._refills.values()):
+            task.cancel()
+        await asyncio.gather(*self._refills.values(), return_exceptions=True)
+        await self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "buckets": len(self._buckets),
+            "questions": sum(len(entries) for entries in self._buckets.values()),
+            "users": len(self._served),
+            "samples": self.samples,
+            "generated": self.generated,
+            "generator_calls": self.generator_calls,
+            "background_refills": self.background_refills,
+            "refilling": len(self._refills)
+        }
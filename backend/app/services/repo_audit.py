@@ -0,0 +1,325 @@
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import tomllib
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.http_pool import HttpPool
+
+MANIFESTS = ("README.md", "package.json", "requirements.txt", "pyproject.toml")
+README_NAMES = ("readme.md", "readme.rst", "readme.txt", "readme")
+
+# Local markers: dependency names (lowercase, exact) and path fragments that indicate a feature
+MARKERS = {
+    "api": {
+        "deps": {"fastapi", "flask", "django", "djangorestframework", "express", "koa", "fastify", "@nestjs/core", "next", "starlette", "aiohttp"},
+        "paths": ("routes/", "routers/", "api/", "controllers/", "endpoints/", "views.py", "urls.py")
+    },
+    "auth": {
+        "deps": {"passport", "jsonwebtoken", "pyjwt", "python-jose", "next-auth", "authlib", "bcrypt", "passlib",
+                 "flask-login", "django-allauth", "firebase-admin", "@auth0/auth0-react", "@clerk/nextjs"},
+        "paths": ("auth", "login", "jwt", "session")
+    },
+    "database": {
+        "deps": {"sqlalchemy", "sqlmodel", "prisma", "@prisma/client", "mongoose", "pg", "mysql2", "psycopg2",
+                 "psycopg2-binary", "asyncpg", "pymongo", "motor", "sequelize", "typeorm", "django", "redis", "aiosqlite"},
+        "paths": ("migrations/", "models/", "models.py", "schema.prisma", ".sql", "alembic")
+    },
+    "tests": {
+        "deps": {"pytest", "jest", "vitest", "mocha", "@testing-library/react", "cypress", "playwright"},
+        "paths": ("tests/", "test/", "__tests__/", ".test.", ".spec.", "test_")
+    },
+    "docker": {"deps": set(), "paths": ("dockerfile", "docker-compose")},
+    "ci": {"deps": set(), "paths": (".github/workflows/", ".gitlab-ci", ".circleci/")},
+    "frontend": {
+        "deps": {"react", "vue", "svelte", "@angular/core", "next", "nuxt", "vite"},
+        "paths": ("src/components/", "components/", "pages/", "app/page.")
+    }
+}
+
+# Requirement wording -> marker; whole words only, so plurals and stems are listed explicitly
+REQUIREMENT_MARKERS = {
+    "api": ("api", "apis", "rest", "restful", "endpoint", "endpoints", "route", "routes", "routing", "backend"),
+    "auth": ("auth", "authentication", "authorization", "authorisation", "login", "logins", "log in",
+             "sign in", "sign up", "signin", "signup", "jwt"),
+    "database": ("database", "databases", "db", "persist", "persistence", "persistent", "sql", "storage"),
+    "tests": ("test", "tests", "testing", "tested"),
+    "docker": ("docker", "dockerfile", "dockerized", "container", "containers", "containerized"),
+    "ci": ("ci", "ci/cd", "pipeline", "pipelines"),
+    "frontend": ("frontend", "front-end", "ui")
+}
+_REQUIREMENT_PATTERNS = [
+    (marker, re.compile(rf"\b(?:{'|'.join(re.escape(word) for word in words)})\b"))
+    for marker, words in REQUIREMENT_MARKERS.items()
+]
+
+_GITHUB_URL = re.compile(r"github\.com[/:]([\w.-]+)/([\w.-]+?)(?:\.git)?(?:[/#?]|$)", re.IGNORECASE)
+_REQUIREMENT_NAME = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)")
+
+# Singleton instance
+_repo_auditor = None
+
+
+def parse_repo(repo_url: str) -> Optional[Tuple[str, str]]:
+    match = _GITHUB_URL.search(repo_url.strip())
+    return (match.group(1), match.group(2)) if match else None
+
+
+def _dependency_names(files: Dict[str, Optional[str]]) -> List[str]:
+    names = set()
+    if files.get("package.json"):
+        try:
+            package = json.loads(files["package.json"])
+            for section in ("dependencies", "devDependencies", "peerDependencies"):
+                names.update((package.get(section) or {}).keys())
+        except (ValueError, AttributeError):
+            pass
+    for line in (files.get("requirements.txt") or "").splitlines():
+        match = _REQUIREMENT_NAME.match(line)
+        if match and not line.lstrip().startswith(("#", "-")):
+            names.add(match.group(1))
+    if files.get("pyproject.toml"):
+        try:
+            pyproject = tomllib.loads(files["pyproject.toml"])
+            for spec in (pyproject.get("project") or {}).get("dependencies") or []:
+                match = _REQUIREMENT_NAME.match(spec)
+                if match:
+                    names.add(match.group(1))
+            poetry = ((pyproject.get("tool") or {}).get("poetry") or {}).get("dependencies") or {}
+            names.update(name for name in poetry if name.lower() != "python")
+        except (tomllib.TOMLDecodeError, AttributeError):
+            pass
+    return sorted(name.lower().replace("_", "-") for name in names)
+
+
+def static_checks(files: Dict[str, Optional[str]], paths: List[str]) -> Dict[str, Any]:
+    """
+    Dependency detection and feature markers from manifests and the file tree; no network, no model.
+    """
+    dependencies = _dependency_names(files)
+    lowered = [path.lower() for path in paths]
+    markers = {}
+    for marker, rules in MARKERS.items():
+        evidence = [dep for dep in dependencies if dep in rules["deps"]]
+        evidence += [path for path in lowered if any(fragment in path for fragment in rules["paths"])][:5]
+        markers[marker] = evidence[:8]
+    readme = files.get("README.md") or ""
+    return {
+        "dependencies": dependencies,
+        "markers": {marker: bool(evidence) for marker, evidence in markers.items()},
+        "evidence": markers,
+        "file_count": len(paths),
+        "has_readme": bool(readme.strip()),
+        "readme_chars": len(readme)
+    }
+
+
+def match_requirements(requirements: List[str], checks: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+    """
+    Requirements confirmed by the static checks, and the ones they cannot confirm.
+    """
+    found, unresolved = [], []
+    for requirement in requirements:
+        text = requirement.lower()
+        marker = next((m for m, pattern in _REQUIREMENT_PATTERNS if pattern.search(text)), None)
+        words = re.findall(r"[a-z0-9.+#-]{3,}", text)
+        if (marker and checks["markers"].get(marker)) or any(word in checks["dependencies"] for word in words):
+            found.append(requirement)
+        else:
+            unresolved.append(requirement)
+    return found, unresolved
+
+
+class RepoAuditor:
+    """
+    Audits a GitHub repository against roadmap requirements.
+
+    The commit SHA is resolved first; README, manifests and the file tree of
+    that commit are then fetched concurrently over the shared HttpPool, and
+    the snapshot is cached per (repo, SHA), so an unchanged repo is never
+    downloaded again. Static checks (dependencies, API/auth/database/test
+    markers) run locally. Gemini is only asked about requirements the static
+    checks cannot confirm, and its verdict is cached per (repo, SHA, requirements).
+    """
+
+    def __init__(self, api_url: Optional[str] = None, raw_url: Optional[str] = None,
+                 cache_size: Optional[int] = None, pool: Optional[HttpPool] = None):
+        self.api_url = (api_url or settings.GITHUB_API_URL).rstrip("/")
+        self.raw_url = (raw_url or settings.GITHUB_RAW_URL).rstrip("/")
+        self.cache_size = cache_size or settings.REPO_AUDIT_CACHE_SIZE
+        self.pool = pool
+
+        self._snapshots: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self._verdicts: "OrderedDict[Tuple[str, str, str], Dict[str, Any]]" = OrderedDict()
+
+        self.audits = 0
+        self.snapshot_hits = 0
+        self.verdict_hits = 0
+        self.gemini_calls = 0
+
+    @classmethod
+    def get_instance(cls):
+        global _repo_auditor
+        if _repo_auditor is None:
+            _repo_auditor = RepoAuditor()
+        return _repo_auditor
+
+    def _remember(self, cache: OrderedDict, key: Tuple, value: Dict[str, Any]):
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > self.cache_size:
+            cache.popitem(last=False)
+
+    def _api_headers(self, accept: str = "application/vnd.github+json") -> Dict[str, str]:
+        headers = {"Accept": accept}
+        if settings.GITHUB_TOKEN:
+            headers["Authorization"] = f"Bearer {settings.GITHUB_TOKEN}"
+        return headers
+
+    async def _get_text(self, url: str, headers: Optional[Dict[str, str]] = None) -> Optional[str]:
+        pool = self.pool or HttpPool.get_instance()
+        try:
+            response = await pool.get(url, headers=headers)
+        except Exception as e:
+            logging.info(f"[RepoAudit] {url} failed: {e}")
+            return None
+        if response.status_code != 200:
+            return None
+        return response.text[:settings.REPO_AUDIT_MAX_FILE_BYTES]
+
+    async def resolve_commit(self, owner: str, repo: str) -> Optional[str]:
+        """
+        SHA of the default branch head (one small API request), or None if the API is unavailable.
+        """
+        sha = await self._get_text(
+            f"{self.api_url}/repos/{owner}/{repo}/commits/HEAD",
+            headers=self._api_headers("application/vnd.github.sha")
+        )
+        sha = (sha or "").strip()
+        return sha if re.fullmatch(r"[0-9a-f]{40}", sha) else None
+
+    async def _tree(self, owner: str, repo: str, ref: str) -> List[str]:
+        listing = await self._get_text(f"{self.api_url}/repos/{owner}/{repo}/git/trees/{ref}?recursive=1", headers=self._api_headers())
+        try:
+            return [item["path"] for item in json.loads(listing or "{}").get("tree", []) if item.get("type") == "blob"]
+        except (ValueError, AttributeError, KeyError, TypeError):
+            return []
+
+    async def snapshot(self, owner: str, repo: str) -> Dict[str, Any]:
+        """
+        Files, tree and static checks for the repo's current commit (cached per SHA).
+        """
+        sha = await self.resolve_commit(owner, repo)
+        key = (f"{owner}/{repo}".lower(), sha or "")
+        if sha and key in self._snapshots:
+            self.snapshot_hits += 1
+            self._snapshots.move_to_end(key)
+            return {**self._snapshots[key], "cached": True}
+
+        refs = [sha] if sha else ["main", "master"]
+        for ref in refs:
+            fetched = await asyncio.gather(
+                *(self._get_text(f"{self.raw_url}/{owner}/{repo}/{ref}/{name}") for name in MANIFESTS),
+                self._tree(owner, repo, ref)
+            )
+            files = dict(zip(MANIFESTS, fetched[:-1]))
+            paths = fetched[-1]
+            if any(files.values()) or paths:
+                break
+
+        if not files["README.md"]:
+            # README.md missing: use whatever README variant the tree lists
+            readme = next((path for path in paths if path.lower() in README_NAMES), None)
+            if readme:
+                files["README.md"] = await self._get_text(f"{self.raw_url}/{owner}/{repo}/{ref}/{readme}")
+
+        result = {
+            "repo": f"{owner}/{repo}",
+            "commit": sha,
+            "ref": ref,
+            "files": {name: content for name, content in files.items() if content},
+            "paths": paths,
+            "static_checks": static_checks(files, paths)
+        }
+        if sha:
+            self._remember(self._snapshots, key, result)
+        return {**result, "cached": False}
+
+    async def audit(self, repo_url: str, requirements: List[str], client: Any) -> Dict[str, Any]:
+        self.audits += 1
+        parsed = parse_repo(repo_url)
+        if parsed is None:
+            return {"verified": False, "score": 0, "reason": "Not a GitHub repository URL."}
+        snapshot = await self.snapshot(*parsed)
+        checks = snapshot["static_checks"]
+        readme = snapshot["files"].get("README.md", "")
+        if not snapshot["files"] and not snapshot["paths"]:
+            return {
+                "verified": False,
+                "score": 0,
+                "reason": "Could not access the repository. Please ensure the repo is public and has a README.",
+                "static_checks": checks
+            }
+
+        found, unresolved = match_requirements(requirements, checks)
+        base = {"commit": snapshot["commit"], "static_checks": checks, "snapshot_cached": snapshot["cached"]}
+        if not unresolved:
+            score = 70 + (10 if checks["has_readme"] else 0) + (10 if checks["markers"]["tests"] else 0) + (10 if checks["markers"]["ci"] else 0)
+            return {
+                **base,
+                "verified": True,
+                "score": score,
+                "found_features": found,
+                "missing_features": [],
+                "feedback": "All requirements were confirmed from the repository's dependencies and file structure.",
+                "source": "static"
+            }
+
+        # Verdict depends on the content (hash covers commit-less fetches too) and the requirements asked about
+        content_key = snapshot["commit"] or hashlib.sha256(json.dumps(snapshot["files"], sort_keys=True).encode()).hexdigest()
+        verdict_key = (snapshot["repo"].lower(), content_key, json.dumps(sorted(requirements)))
+        cached = self._verdicts.get(verdict_key)
+        if cached is not None:
+            self.verdict_hits += 1
+            self._verdicts.move_to_end(verdict_key)
+            return {**cached, "snapshot_cached": snapshot["cached"], "cached": True}
+
+        prompt = f"""
+        Audit this GitHub project against these requirements: {unresolved}
+        Already confirmed by static analysis: {found}
+
+        Static analysis: {json.dumps({k: checks[k] for k in ('dependencies', 'markers', 'file_count')})}
+        Files (sample): {json.dumps(snapshot['paths'][:80])}
+
+        README Content:
+        {readme[:5000]}
+
+        Return JSON:
+        {{
+            "verified": true/false (true if most requirements met),
+            "score": 0-100,
+            "found_features": ["feature1", "feature2"],
+            "missing_features": ["feature3"],
+            "feedback": "Constructive feedback on the project."
+        }}
+        """
+        self.gemini_calls += 1
+        response = await client.generate_content_async(prompt, generation_config={"response_mime_type": "application/json"})
+        verdict = json.loads(response.text)
+        verdict["found_features"] = list(dict.fromkeys(found + list(verdict.get("found_features") or [])))
+        result = {**base, **verdict, "source": "gemini"}
+        self._remember(self._verdicts, verdict_key, result)
+        return {**result, "cached": False}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "audits": self.audits,
+            "snapshots": len(self._snapshots),
+            "snapshot_hits": self.snapshot_hits,
+            "verdict_hits": self.verdict_hits,
+            "gemini_calls": self.gemini_calls
+        }
@@ -1,5 +1,6 @@
 import uuid
 import json
+import hashlib
 import os
 from typing import Dict, Any, Optional
 from datetime import datetime
@@ -53,4 +54,39 @@ def get_roadmap_result(result_id: str) -> Optional[Dict[str, Any]]:
 
 def get_all_results() -> list:
     """Return all stored roadmaps (for history)"""
-    return list(roadmap_results.values())
\ No newline at end of file
+    return list(roadmap_results.values())
+
+def save_results():
+    """Persist in-place changes to stored roadmaps"""
+    _save_db()
+
+def roadmap_fingerprint(roadmap: Dict[str, Any]) -> str:
+    """Hash of the roadmap content an execution plan is generated from"""
+    # Only what the plan prompt uses; resource annotations (link health) must not invalidate it
+    months = [
+        {key: month.get(key) for key in ("month", "title", "skills", "tasks")}
+        for month in roadmap.get("months", []) if isinstance(month, dict)
+    ]
+    source = {"target_role": roadmap.get("target_role"), "months": months}
+    return hashlib.sha256(json.dumps(source, sort_keys=True, default=str).encode()).hexdigest()
+
+def get_execution_plan(result_id: str) -> Optional[Dict[str, Any]]:
+    """Stored execution plan, or None if missing or generated from an older version of the roadmap"""
+    roadmap = roadmap_results.get(result_id)
+    stored = (roadmap or {}).get("execution_plan")
+    if not stored or stored.get("fingerprint") != roadmap_fingerprint(roadmap):
+        return None
+    return stored.get("plan")
+
+def store_execution_plan(result_id: str, plan: Dict[str, Any]) -> bool:
+    """Store an execution plan next to its roadmap"""
+    roadmap = roadmap_results.get(result_id)
+    if roadmap is None:
+        return False
+    roadmap["execution_plan"] = {
+        "fingerprint": roadmap_fingerprint(roadmap),
+        "generated_at": datetime.now().isoformat(),
+        "plan": plan
+    }
+    _save_db()
+    return True
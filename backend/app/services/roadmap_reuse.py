@@ -0,0 +1,249 @@
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import re
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Any, Awaitable, Callable, List, Optional, Tuple
+
+from app.core.config import settings
+from app.schemas.roadmap import RoadmapInput
+from app.services.question_bank import normalize_skill
+
+POLICIES = ("off", "exact", "near")
+ROLE_ALIASES = {"jr": "junior", "sr": "senior", "dev": "developer", "engg": "engineer", "eng": "engineer"}
+
+# Singleton instance
+_roadmap_reuse = None
+
+
+def _normalize_text(value: Any) -> str:
+    words = re.findall(r"[a-z0-9+#]+", str(value or "").lower())
+    return " ".join(ROLE_ALIASES.get(word, word) for word in words)
+
+
+class RequestFingerprint:
+    """
+    Canonical form of a roadmap request: everything the generation prompt depends on.
+
+    `exact` covers all of it; `bucket` leaves out the skill set, which near
+    matches compare by Jaccard similarity instead.
+    """
+
+    def __init__(self, input_data: RoadmapInput):
+        self.role = _normalize_text(input_data.target_role)
+        self.location = _normalize_text(input_data.location)
+        self.timeframe = int(input_data.timeframe_months)
+        self.status = _normalize_text(input_data.current_status)
+        self.level = _normalize_text(input_data.skill_level)
+        self.skills = sorted({normalize_skill(skill) for skill in input_data.skills if str(skill).strip()})
+        self.constraints = sorted({_normalize_text(c) for c in input_data.constraints if str(c).strip()})
+
+        bucket = [self.role, self.location, self.timeframe, self.status, self.level, self.constraints]
+        self.bucket = hashlib.sha256(json.dumps(bucket).encode()).hexdigest()[:24]
+        self.exact = hashlib.sha256(json.dumps(bucket + [self.skills]).encode()).hexdigest()[:24]
+
+    def similarity(self, skills: List[str]) -> float:
+        mine, theirs = set(self.skills), set(skills)
+        if not mine and not theirs:
+            return 1.0
+        return len(mine & theirs) / len(mine | theirs)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"exact": self.exact, "bucket": self.bucket, "skills": self.skills}
+
+
+class RoadmapReuse:
+    """
+    Serves repeat roadmap requests from stored results instead of a new Gemini generation.
+
+    ROADMAP_REUSE_POLICY: "off", "exact" (same canonical request) or "near"
+    (same role, location, timeframe, level and constraints, and skill sets at
+    least ROADMAP_REUSE_MIN_SIMILARITY alike). Only results younger than
+    ROADMAP_REUSE_MAX_AGE_HOURS are reused; each reuse gets its own result_id,
+    lightly personalized when ROADMAP_REUSE_PERSONALIZE is on. Concurrent
+    identical requests share one generation.
+    """
+
+    def __init__(self, policy: Optional[str] = None, min_similarity: Optional[float] = None,
+                 max_age_hours: Optional[float] = None, personalize: Optional[bool] = None):
+        self.policy = (policy or settings.ROADMAP_REUSE_POLICY).lower()
+        if self.policy not in POLICIES:
+            logging.warning(f"[RoadmapReuse] Unknown policy '{self.policy}', using 'exact'")
+            self.policy = "exact"
+        self.min_similarity = settings.ROADMAP_REUSE_MIN_SIMILARITY if min_similarity is None else min_similarity
+        self.max_age_hours = settings.ROADMAP_REUSE_MAX_AGE_HOURS if max_age_hours is None else max_age_hours
+        self.personalize = settings.ROADMAP_REUSE_PERSONALIZE if personalize is None else personalize
+
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._exact: Optional[Dict[str, str]] = None  # exact fingerprint -> result_id
+        self._buckets: Dict[str, List[str]] = {}  # bucket fingerprint -> result_ids
+
+        self.lookups = 0
+        self.exact_hits = 0
+        self.near_hits = 0
+        self.coalesced = 0
+        self.generations = 0
+        self.generation_seconds = 0.0
+        self.reuse_seconds = 0.0
+
+    @classmethod
+    def get_instance(cls):
+        global _roadmap_reuse
+        if _roadmap_reuse is None:
+            _roadmap_reuse = RoadmapReuse()
+        return _roadmap_reuse
+
+    def _fresh(self, record: Dict[str, Any]) -> bool:
+        try:
+            created = datetime.fromisoformat(str(record.get("created_at")))
+        except ValueError:
+            return False
+        return datetime.now() - created < timedelta(hours=self.max_age_hours)
+
+    def _index(self):
+        # Built from the stored results on first use, so roadmaps from before a restart are reused too
+        if self._exact is not None:
+            return
+        from app.services.result_storage import roadmap_results
+
+        self._exact, self._buckets = {}, {}
+        for result_id, record in roadmap_results.items():
+            self._add(result_id, record.get("request_fingerprint"), record)
+
+    def _add(self, result_id: str, stored: Optional[Dict[str, Any]], record: Dict[str, Any]):
+        if not stored or record.get("reuse"):
+            return  # reused copies are never sources: matches always point at an original generation
+        self._exact[stored["exact"]] = result_id
+        self._buckets.setdefault(stored["bucket"], []).append(result_id)
+
+    def find(self, fingerprint: RequestFingerprint) -> Optional[Tuple[Dict[str, Any], str, float]]:
+        """
+        Best stored match for a request: (record, "exact" | "near", similarity), or None.
+        """
+        from app.services.result_storage import get_roadmap_result
+
+        self._index()
+        record = get_roadmap_result(self._exact.get(fingerprint.exact, ""))
+        if record is not None and self._fresh(record):
+            return record, "exact", 1.0
+        if self.policy != "near":
+            return None
+
+        best = None
+        live = []
+        for result_id in self._buckets.get(fingerprint.bucket, []):
+            record = get_roadmap_result(result_id)
+            if record is None:
+                continue  # expired and cleaned up
+            live.append(result_id)
+            if not self._fresh(record):
+                continue
+            similarity = fingerprint.similarity(record["request_fingerprint"].get("skills") or [])
+            if similarity >= self.min_similarity and (best is None or similarity > best[2]):
+                best = (record, "near", similarity)
+        self._buckets[fingerprint.bucket] = live
+        return best
+
+    def _personalized_copy(self, source: Dict[str, Any], input_data: RoadmapInput,
+                           fingerprint: RequestFingerprint, match: str, similarity: float) -> Dict[str, Any]:
+        result = copy.deepcopy({
+            key: value for key, value in source.items()
+            if key not in ("result_id", "created_at", "request_fingerprint")
+        })
+        result["reuse"] = {"source_id": source.get("result_id"), "match": match, "similarity": round(similarity, 3)}
+        result["request_fingerprint"] = fingerprint.to_dict()
+        if not self.personalize:
+            return result
+        if input_data.name:
+            result["summary"] = f"{input_data.name}, here is your plan. {result.get('summary', '')}".strip()
+        known = set(fingerprint.skills)
+        skim = []
+        for month in result.get("months", []):
+            overlap = [skill for skill in month.get("skills", []) if normalize_skill(skill) in known]
+            if overlap:
+                skim.append(f"Month {month.get('month')}: {', '.join(overlap)}")
+        if skim:
+            note = "You already know some of this material; skim it and spend the time on the rest. " + "; ".join(skim) + "."
+            result["additional_info"] = f"{result.get('additional_info') or ''}\n\n{note}".strip()
+        return result
+
+    async def get_or_create(self, input_data: RoadmapInput, create: Callable[[], Awaitable[str]]) -> str:
+        """
+        result_id for the request: a reused (copied) stored roadmap, or `create()`'s new one.
+        """
+        from app.services.result_storage import get_roadmap_result, store_roadmap_result
+
+        self.lookups += 1
+        started = time.monotonic()
+        fingerprint = RequestFingerprint(input_data)
+        if self.policy == "off":
+            return await self._generate(fingerprint, create)
+
+        pending = self._in_flight.get(fingerprint.exact)
+        if pending is not None:
+            self.coalesced += 1
+            record = get_roadmap_result(await asyncio.shield(pending))
+            found = (record, "exact", 1.0) if record is not None else None
+        else:
+            found = self.find(fingerprint)
+        if found is None:
+            return await self._generate(fingerprint, create)
+
+        record, match, similarity = found
+        result_id = store_roadmap_result(self._personalized_copy(record, input_data, fingerprint, match, similarity))
+        if match == "exact":
+            self.exact_hits += 1
+        else:
+            self.near_hits += 1
+        self.reuse_seconds += time.monotonic() - started
+        logging.info(f"[RoadmapReuse] {match} match ({similarity:.2f}) for '{fingerprint.role}': {record.get('result_id')} -> {result_id}")
+        return result_id
+
+    async def _generate(self, fingerprint: RequestFingerprint, create: Callable[[], Awaitable[str]]) -> str:
+        from app.services.result_storage import get_roadmap_result, save_results
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[fingerprint.exact] = future
+        started = time.monotonic()
+        try:
+            result_id = await create()
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                future.exception()  # retrieved here so an unawaited future does not warn
+            raise
+        finally:
+            self._in_flight.pop(fingerprint.exact, None)
+        self.generations += 1
+        self.generation_seconds += time.monotonic() - started
+
+        record = get_roadmap_result(result_id)
+        if record is not None:
+            record["request_fingerprint"] = fingerprint.to_dict()
+            save_results()
+            self._index()
+            self._add(result_id, record["request_fingerprint"], record)
+        future.set_result(result_id)
+        return result_id
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self.exact_hits + self.near_hits
+        average_generation = self.generation_seconds / self.generations if self.generations else 0.0
+        average_reuse = self.reuse_seconds / hits if hits else 0.0
+        return {
+            "policy": self.policy,
+            "lookups": self.lookups,
+            "exact_hits": self.exact_hits,
+            "near_hits": self.near_hits,
+            "coalesced": self.coalesced,
+            "generations": self.generations,
+            "hit_rate": round(hits / self.lookups, 3) if self.lookups else 0.0,
+            "avg_generation_seconds": round(average_generation, 3),
+            "avg_reuse_seconds": round(average_reuse, 4),
+            "latency_saved_seconds": round(max(0.0, average_generation - average_reuse) * hits, 3)
+        }
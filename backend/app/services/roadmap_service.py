@@ -7,6 +7,11 @@ from typing import List
 
 class RoadmapService:
     async def create_roadmap(self, input_data: RoadmapInput) -> str:
+        # Identical or near-identical requests reuse a stored roadmap (see ROADMAP_REUSE_POLICY)
+        from app.services.roadmap_reuse import RoadmapReuse
+        return await RoadmapReuse.get_instance().get_or_create(input_data, lambda: self._generate(input_data))
+
+    async def _generate(self, input_data: RoadmapInput) -> str:
         # 1. Generate roadmap using mock (Gemini temporarily disabled)
         roadmap_output = await gemini_client.generate_roadmap(input_data)
 
@@ -16,6 +21,10 @@ class RoadmapService:
         # 3. Store the result and return the ID
         result_data = roadmap_output.dict()
         result_id = store_roadmap_result(result_data)
+
+        # Generated links are checked in the background and annotated on the stored result
+        from app.services.link_health import LinkHealthChecker
+        LinkHealthChecker.get_instance().submit(result_id)
         return result_id
 
     async def get_history(self) -> List[dict]:
@@ -0,0 +1,208 @@
+import asyncio
+import itertools
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from app.core.config import settings
+
+WORKER_SCRIPT = Path(__file__).with_name("sandbox_worker.py")
+
+# Singleton instance
+_sandbox_pool = None
+
+
+class SandboxWorker:
+    """
+    One long-lived `python -I sandbox_worker.py` process; handles one batch at a time.
+    """
+
+    def __init__(self, process: asyncio.subprocess.Process):
+        self.process = process
+        self.tasks = 0
+
+    @classmethod
+    async def spawn(cls) -> "SandboxWorker":
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "-I", str(WORKER_SCRIPT),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            limit=16 * 1024 * 1024
+        )
+        return cls(process)
+
+    @property
+    def alive(self) -> bool:
+        return self.process.returncode is None
+
+    async def call(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        self.process.stdin.write((json.dumps(request) + "\n").encode("utf-8"))
+        await self.process.stdin.drain()
+        line = await self.process.stdout.readline()
+        if not line:
+            raise ConnectionError("sandbox worker exited")
+        self.tasks += 1
+        return json.loads(line)
+
+    async def close(self):
+        if self.alive:
+            self.process.stdin.close()
+            try:
+                await asyncio.wait_for(self.process.wait(), 2)
+            except asyncio.TimeoutError:
+                self.kill()
+        await self.process.wait()
+
+    def kill(self):
+        if self.alive:
+            try:
+                self.process.kill()
+            except ProcessLookupError:
+                pass
+
+
+class SandboxPool:
+    """
+    Pool of persistent sandbox worker processes.
+
+    Code blocks are sent over a pipe (JSON lines) in batches, one round trip
+    per batch, and compiled in the worker (optionally executed in a forked,
+    resource-limited child). Nothing blocks the event loop and there is no
+    interpreter start-up or temp file per block. A worker that hangs past the
+    batch timeout or dies is killed and replaced; workers are recycled after
+    SANDBOX_MAX_TASKS_PER_WORKER batches.
+    """
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        timeout: Optional[float] = None,
+        execute: Optional[bool] = None,
+        memory_mb: Optional[int] = None,
+        max_tasks_per_worker: Optional[int] = None
+    ):
+        self.size = size or settings.SANDBOX_WORKERS
+        self.timeout = timeout or settings.SANDBOX_TIMEOUT_SECONDS
+        self.execute = settings.SANDBOX_EXECUTE if execute is None else execute
+        self.memory_mb = memory_mb or settings.SANDBOX_MEMORY_MB
+        self.max_tasks_per_worker = max_tasks_per_worker or settings.SANDBOX_MAX_TASKS_PER_WORKER
+
+        self._idle: Optional[asyncio.Queue] = None
+        self._workers: List[SandboxWorker] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._ids = itertools.count(1)
+
+        self.batches = 0
+        self.blocks = 0
+        self.restarts = 0
+        self.timeouts = 0
+        self.busy_seconds = 0.0
+
+    @classmethod
+    def get_instance(cls):
+        global _sandbox_pool
+        if _sandbox_pool is None:
+            _sandbox_pool = SandboxPool()
+        return _sandbox_pool
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Processes from another (closed) loop cannot be awaited here; just kill them
+            for worker in self._workers:
+                worker.kill()
+            self._workers = []
+            self._idle = asyncio.Queue()
+            self._start_lock = asyncio.Lock()
+            self._loop = loop
+        async with self._start_lock:
+            while len(self._workers) < self.size:
+                worker = await SandboxWorker.spawn()
+                self._workers.append(worker)
+                self._idle.put_nowait(worker)
+
+    async def _replace(self, worker: SandboxWorker):
+        worker.kill()
+        await worker.process.wait()
+        if worker in self._workers:
+            self._workers.remove(worker)
+        self.restarts += 1
+        replacement = await SandboxWorker.spawn()
+        self._workers.append(replacement)
+        self._idle.put_nowait(replacement)
+
+    async def check(self, blocks: List[str], execute: Optional[bool] = None) -> List[Dict[str, Any]]:
+        """
+        Compiles (and, with execute, runs) a batch of code blocks in one round trip.
+        Returns one {"ok", "kind", "error"} result per block, in order.
+        """
+        if not blocks:
+            return []
+        await self.start()
+        execute = self.execute if execute is None else execute
+        request = {
+            "id": next(self._ids),
+            "blocks": blocks,
+            "execute": execute,
+            "timeout": self.timeout,
+            "memory_mb": self.memory_mb
+        }
+        # Executing blocks runs them one after another in the worker
+        batch_timeout = self.timeout * (len(blocks) if execute else 1) + 1
+
+        worker = await self._idle.get()
+        started = time.monotonic()
+        try:
+            response = await asyncio.wait_for(worker.call(request), batch_timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            logging.warning(f"[Sandbox] Batch of {len(blocks)} blocks timed out; replacing worker")
+            await self._replace(worker)
+            return [{"ok": False, "kind": "timeout", "error": "Execution timeout"} for _ in blocks]
+        except (ConnectionError, BrokenPipeError, ConnectionResetError, json.JSONDecodeError) as e:
+            logging.error(f"[Sandbox] Worker failed: {e}; replacing worker")
+            await self._replace(worker)
+            return [{"ok": False, "kind": "crash", "error": f"Sandbox worker failed: {e}"} for _ in blocks]
+        except asyncio.CancelledError:
+            # The worker may be mid-batch; its next response would be stale
+            await self._replace(worker)
+            raise
+        finally:
+            self.busy_seconds += time.monotonic() - started
+
+        if worker.tasks >= self.max_tasks_per_worker:
+            await self._replace(worker)
+        else:
+            self._idle.put_nowait(worker)
+
+        self.batches += 1
+        self.blocks += len(blocks)
+        if "results" not in response:
+            raise RuntimeError(response.get("error", "Malformed sandbox response"))
+        return response["results"]
+
+    async def close(self):
+        workers, self._workers = self._workers, []
+        if self._loop is asyncio.get_running_loop():
+            await asyncio.gather(*(worker.close() for worker in workers), return_exceptions=True)
+        else:
+            for worker in workers:
+                worker.kill()
+        self._loop = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": len(self._workers),
+            "idle": self._idle.qsize() if self._idle else 0,
+            "execute": self.execute,
+            "batches": self.batches,
+            "blocks": self.blocks,
+            "restarts": self.restarts,
+            "timeouts": self.timeouts,
+            "busy_seconds": round(self.busy_seconds, 3)
+        }
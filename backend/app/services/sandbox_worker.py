@@ -0,0 +1,104 @@
+"""
+Long-lived sandbox worker process (see app/services/sandbox_pool.py).
+
+Standalone on purpose: it is started with `python -I` and imports nothing from
+the app. Protocol: one JSON request per line on stdin, one JSON response per line
+on stdout.
+
+    request:  {"id": 1, "blocks": ["code", ...], "execute": false, "timeout": 5, "memory_mb": 256}
+    response: {"id": 1, "results": [{"ok": true, "kind": null, "error": null}, ...]}
+
+Blocks are always compiled here. With "execute", each block also runs in a
+forked child with CPU/memory limits and no stdio, so the worker itself never
+runs user code.
+"""
+import json
+import os
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # not POSIX
+    resource = None
+
+
+def compile_block(code):
+    try:
+        compile(code, "<block>", "exec")
+        return {"ok": True, "kind": None, "error": None}
+    except SyntaxError as e:
+        return {"ok": False, "kind": "syntax", "error": f"SyntaxError: {e.msg} (line {e.lineno})"}
+    except (ValueError, RecursionError, MemoryError) as e:
+        return {"ok": False, "kind": "syntax", "error": f"{type(e).__name__}: {e}"}
+
+
+def execute_block(code, timeout, memory_mb):
+    if resource is None or not hasattr(os, "fork"):
+        return {"ok": False, "kind": "unsupported", "error": "Execution requires a POSIX host"}
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # child
+        os.close(read_fd)
+        try:
+            devnull = os.open(os.devnull, os.O_RDWR)
+            for fd in (0, 1, 2):
+                os.dup2(devnull, fd)
+            cpu = max(1, int(timeout))
+            resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu))
+            memory = memory_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+            exec(compile(code, "<block>", "exec"), {"__name__": "__sandbox__"})
+            os._exit(0)
+        except SystemExit as e:
+            os._exit(0 if e.code in (0, None) else 1)
+        except BaseException as e:
+            os.write(write_fd, f"{type(e).__name__}: {e}"[:500].encode("utf-8", "replace"))
+            os._exit(1)
+
+    os.close(write_fd)
+    deadline = time.monotonic() + timeout
+    status = None
+    while time.monotonic() < deadline:
+        waited, status = os.waitpid(pid, os.WNOHANG)
+        if waited:
+            break
+        time.sleep(0.002)
+    else:
+        os.kill(pid, 9)
+        os.waitpid(pid, 0)
+        os.close(read_fd)
+        return {"ok": False, "kind": "timeout", "error": f"Execution timeout ({timeout}s)"}
+
+    with os.fdopen(read_fd, "rb") as pipe:
+        message = pipe.read().decode("utf-8", "replace")
+    if os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0:
+        return {"ok": True, "kind": None, "error": None}
+    if os.WIFSIGNALED(status):
+        return {"ok": False, "kind": "killed", "error": f"Killed by signal {os.WTERMSIG(status)} (resource limit)"}
+    return {"ok": False, "kind": "runtime", "error": message or "Non-zero exit"}
+
+
+def handle(request):
+    results = []
+    for code in request.get("blocks", []):
+        result = compile_block(code)
+        if result["ok"] and request.get("execute"):
+            result = execute_block(code, request.get("timeout", 5), request.get("memory_mb", 256))
+        results.append(result)
+    return {"id": request.get("id"), "results": results}
+
+
+def main():
+    for line in sys.stdin:
+        try:
+            response = handle(json.loads(line))
+        except Exception as e:
+            response = {"id": None, "error": f"{type(e).__name__}: {e}"}
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
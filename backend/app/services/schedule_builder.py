@@ -0,0 +1,250 @@
+import json
+import logging
+import re
+from typing import Dict, Any, List, Optional
+
+from app.core.config import settings
+from app.schemas.roadmap import DailyTask, ExecutionSchedule, ExecutionSprint
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+WEEKEND = {"Saturday", "Sunday"}
+SLOT_MIN = 15  # durations are multiples of this
+
+# Estimated effort per roadmap item, in minutes
+ITEM_MINUTES = {"task": 60, "skill": 45, "project": 120}
+MIN_SESSION_MIN = 30
+MIN_STUDY_DAY_MIN = 45  # small budgets are concentrated into fewer, longer days
+MIN_SPLIT_MIN = 45  # shortest session a split item is cut into (its last piece may be shorter)
+
+
+class ScheduleConstraints:
+    """
+    Study-time constraints parsed from free-text roadmap constraints.
+
+    Understood: evening-only study (capped sessions), weekends/weekdays only,
+    "no <day>" / "<day> off", a weekly rest day, and "max N hours per day".
+    Anything else (devices, data bundles) does not affect the timetable.
+    """
+
+    def __init__(self, constraints: Optional[List[str]] = None):
+        if isinstance(constraints, str):
+            constraints = [constraints]
+        self.raw = [str(constraint) for constraint in constraints or []]
+        self.evening_only = False
+        self.days = list(DAYS)
+        self.daily_cap_min: Optional[int] = None
+
+        for constraint in self.raw:
+            text = constraint.lower()
+            if re.search(r"\bevening|\bnight|after work", text):
+                self.evening_only = True
+            if re.search(r"weekends? only|only (on )?weekends?", text):
+                self.days = [day for day in self.days if day in WEEKEND]
+            if re.search(r"weekdays? only|only (on )?weekdays?|no weekends?", text):
+                self.days = [day for day in self.days if day not in WEEKEND]
+            if "rest day" in text and len(self.days) == 7:
+                self.days.remove("Sunday")
+            for day in DAYS:
+                name = day.lower()
+                if re.search(rf"no {name}s?|{name}s? off|not on {name}s?", text) and day in self.days:
+                    self.days.remove(day)
+            cap = re.search(r"(?:max(?:imum)?|at most|up to)\s*(\d+(?:\.\d+)?)\s*h(?:ours?|rs?)?\s*(?:a|per)\s*day", text)
+            if cap:
+                self.daily_cap_min = int(float(cap.group(1)) * 60)
+
+        if self.evening_only:
+            evening_cap = settings.SCHEDULE_EVENING_MAX_MINUTES
+            self.daily_cap_min = min(self.daily_cap_min or evening_cap, evening_cap)
+        if not self.days:
+            self.days = list(DAYS)  # contradictory constraints: keep every day available
+
+
+class _Item:
+    def __init__(self, title: str, minutes: int):
+        self.title = title
+        self.minutes = minutes
+
+
+def _round_down(minutes: float) -> int:
+    return int(minutes // SLOT_MIN) * SLOT_MIN
+
+
+def _phases(roadmap: Dict[str, Any]) -> List[Dict[str, Any]]:
+    # API roadmaps have "months" (skills/tasks/projects); planning-agent roadmaps have "milestones" (focus/tasks)
+    return list(roadmap.get("months") or roadmap.get("milestones") or [])[:2]
+
+
+def _items(phase: Dict[str, Any]) -> List[_Item]:
+    items = []
+    for task in phase.get("tasks") or []:
+        items.append(_Item(str(task), ITEM_MINUTES["task"]))
+    for skill in phase.get("skills") or phase.get("focus") or []:
+        items.append(_Item(f"Study {skill}", ITEM_MINUTES["skill"]))
+    for project in phase.get("projects") or []:
+        items.append(_Item(f"Project: {project}", ITEM_MINUTES["project"]))
+    return items
+
+
+def _day_capacities(budget: int, constraints: ScheduleConstraints) -> Dict[str, int]:
+    """
+    Splits the weekly budget over the available days in SLOT_MIN steps; the total never exceeds the budget.
+    """
+    available = constraints.days
+    count = max(1, min(len(available), budget // MIN_STUDY_DAY_MIN))
+    # Spread the study days evenly over the available ones
+    days = [available[(i * len(available)) // count] for i in range(count)]
+    per_day = _round_down(budget / len(days))
+    if constraints.daily_cap_min is not None:
+        per_day = min(per_day, _round_down(constraints.daily_cap_min))
+    capacities = {day: per_day for day in days}
+    # Hand leftover slots to the earliest days, still within the daily cap
+    leftover = _round_down(budget - per_day * len(days))
+    for day in days:
+        if leftover < SLOT_MIN:
+            break
+        if constraints.daily_cap_min is None or capacities[day] + SLOT_MIN <= constraints.daily_cap_min:
+            capacities[day] += SLOT_MIN
+            leftover -= SLOT_MIN
+    return capacities
+
+
+def _pack_week(queue: List[_Item], capacities: Dict[str, int], practice: List[str]) -> Dict[str, List[Any]]:
+    """
+    First-fit packing of queued items (in curriculum order) into the week's days.
+
+    Items longer than any study day are split over successive days as they come
+    up; items that only miss out because the days are fragmented get split over
+    the leftovers in a second pass. Whatever still does not fit stays queued for
+    next week, and spare time becomes practice on the phase's skills.
+    """
+    remaining = dict(capacities)
+    plan: Dict[str, List[Any]] = {day: [] for day in capacities}
+    order = list(plan)
+    largest_day = max(capacities.values(), default=0)
+
+    def split(item: _Item):
+        after = -1
+        while item.minutes > 0:
+            day = next((d for d in order[after + 1:] if remaining[d] >= min(item.minutes, MIN_SPLIT_MIN)), None)
+            if day is None:
+                return
+            session = min(item.minutes, remaining[day])
+            plan[day].append((item.title, session))
+            remaining[day] -= session
+            item.minutes -= session
+            after = order.index(day)
+            if not item.title.endswith(" (cont.)"):
+                item.title = f"{item.title} (cont.)"
+
+    for item in list(queue):
+        if item.minutes > largest_day:
+            split(item)
+        else:
+            day = next((d for d in order if remaining[d] >= item.minutes), None)
+            if day is not None:
+                plan[day].append((item.title, item.minutes))
+                remaining[day] -= item.minutes
+                item.minutes = 0
+        if item.minutes <= 0:
+            queue.remove(item)
+
+    for item in list(queue):
+        split(item)
+        if item.minutes <= 0:
+            queue.remove(item)
+
+    for index, day in enumerate(plan):
+        if remaining[day] >= MIN_SESSION_MIN and practice:
+            skill = practice[index % len(practice)]
+            plan[day].append((f"Practice {skill}", _round_down(remaining[day])))
+            remaining[day] = 0
+    return plan
+
+
+def _reminder(day: str, topic: str, minutes: int, constraints: ScheduleConstraints) -> str:
+    if minutes == 0:
+        return f"{day} is a rest day. Recharge for the week ahead."
+    when = "this evening" if constraints.evening_only else "today"
+    return f"{day}: set aside {minutes} min {when} for {topic}."
+
+
+def build_schedule(
+    roadmap: Dict[str, Any],
+    hours_per_week: float,
+    constraints: Optional[List[str]] = None,
+    weeks: Optional[int] = None
+) -> ExecutionSchedule:
+    """
+    Deterministic weekly timetable for the first two roadmap phases.
+
+    Phase items (tasks, skills, projects) are bin-packed into the available
+    days of each week; weekly minutes never exceed hours_per_week * 60.
+    """
+    weeks = weeks or settings.SCHEDULE_WEEKS
+    parsed = ScheduleConstraints(constraints)
+    budget = _round_down(max(0.0, hours_per_week) * 60)
+    capacities = _day_capacities(budget, parsed)
+
+    phases = _phases(roadmap) or [{"title": "Getting started", "skills": [], "tasks": []}]
+    weeks_per_phase = max(1, weeks // len(phases))
+    queue: List[_Item] = []
+    sprints = []
+
+    for week in range(weeks):
+        phase = phases[min(week // weeks_per_phase, len(phases) - 1)]
+        if week % weeks_per_phase == 0 and week // weeks_per_phase < len(phases):
+            queue.extend(_items(phase))  # unfinished work from the previous phase stays ahead
+        skills = [str(skill) for skill in (phase.get("skills") or phase.get("focus") or [])]
+        plan = _pack_week(queue, capacities, skills[:3] or [phase.get("title", "fundamentals")])
+
+        days = []
+        for day in DAYS:
+            sessions = plan.get(day, [])
+            topic = " + ".join(title for title, _ in sessions) or "Rest day"
+            minutes = sum(minutes for _, minutes in sessions)
+            days.append(DailyTask(
+                day=day,
+                topic=topic,
+                duration_min=minutes,
+                reminder_text=_reminder(day, topic, minutes, parsed)
+            ))
+
+        focus = ", ".join(skills[:3]) or phase.get("title", "the fundamentals")
+        sprints.append(ExecutionSprint(
+            week_number=week + 1,
+            milestone_title=phase.get("title", f"Phase {week // weeks_per_phase + 1}"),
+            days=days,
+            focus_area=f"Week {week + 1}: make steady progress on {focus}."
+        ))
+
+    return ExecutionSchedule(sprints=sprints)
+
+
+async def polish_reminders(schedule: ExecutionSchedule, client: Any) -> bool:
+    """
+    Rewrites every reminder_text in ONE batched model call. The timetable itself
+    is never changed; on any failure or malformed reply the templates are kept.
+    """
+    days = [day for sprint in schedule.sprints for day in sprint.days]
+    if not days or client is None:
+        return False
+    payload = [{"id": i, "day": day.day, "topic": day.topic, "minutes": day.duration_min} for i, day in enumerate(days)]
+    prompt = f"""
+    Write one short, motivating study reminder (max 140 characters) for each entry.
+    Keep the day, topic and minutes accurate. Entries: {json.dumps(payload)}
+
+    Return ONLY a JSON list of {len(days)} strings, in the same order.
+    """
+    try:
+        response = await client.generate_content_async(prompt, generation_config={"response_mime_type": "application/json"})
+        reminders = json.loads(response.text)
+    except Exception as e:
+        logging.warning(f"[Schedule] Reminder polish failed, keeping templates: {e}")
+        return False
+    if not isinstance(reminders, list) or len(reminders) != len(days):
+        logging.warning("[Schedule] Reminder polish returned the wrong shape, keeping templates")
+        return False
+    for day, reminder in zip(days, reminders):
+        if isinstance(reminder, str) and reminder.strip():
+            day.reminder_text = reminder.strip()[:200]
+    return True
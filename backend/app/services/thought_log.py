@@ -0,0 +1,178 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import deque
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Deque
+
+from app.core.config import settings
+
+# Steps emitted every marathon cycle; runs of these are collapsed on compaction
+HEARTBEAT_STEPS = {"PROGRESS_CHECK"}
+
+
+def compact_signatures(signatures: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Collapses consecutive heartbeat signatures into one entry that records how many
+    were folded and the time span they covered. Everything else is kept verbatim.
+    """
+    compacted: List[Dict[str, Any]] = []
+    for signature in signatures:
+        previous = compacted[-1] if compacted else None
+        if (
+            previous is not None
+            and signature.get("step") in HEARTBEAT_STEPS
+            and previous.get("step") == signature.get("step")
+        ):
+            collapsed = previous.setdefault("collapsed", {"count": 1, "first_timestamp": previous.get("timestamp")})
+            collapsed["count"] += 1
+            previous["timestamp"] = signature.get("timestamp")
+            previous["metadata"] = signature.get("metadata", {})
+            continue
+        compacted.append(dict(signature))
+    return compacted
+
+
+class ThoughtSignatureLog:
+    """
+    Append-only JSON-lines store for orchestrator thought signatures.
+
+    Signatures are buffered and written in batches off the event loop, the file is
+    rotated (and compacted) once it passes a size limit, and only a bounded tail is
+    kept in memory.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        backup_count: Optional[int] = None,
+        tail_size: Optional[int] = None
+    ):
+        self.path = Path(path)
+        self.batch_size = batch_size or settings.THOUGHT_LOG_BATCH_SIZE
+        self.flush_interval = settings.THOUGHT_LOG_FLUSH_SECONDS if flush_interval is None else flush_interval
+        self.max_bytes = max_bytes or settings.THOUGHT_LOG_MAX_BYTES
+        self.backup_count = settings.THOUGHT_LOG_BACKUP_COUNT if backup_count is None else backup_count
+        self.tail: Deque[Dict[str, Any]] = deque(maxlen=tail_size or settings.THOUGHT_LOG_TAIL_SIZE)
+
+        self._buffer: List[Dict[str, Any]] = []
+        self._lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._last_flush = time.monotonic()
+
+    def append(self, signature: Dict[str, Any]):
+        """
+        Records a signature. Disk writes happen in the background once the batch
+        is full or the flush interval has elapsed.
+        """
+        self.tail.append(signature)
+        self._buffer.append(signature)
+
+        if len(self._buffer) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+            self._schedule_flush()
+
+    def _schedule_flush(self):
+        if self._flush_task and not self._flush_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop (scripts, shutdown hooks): write synchronously
+            self._write_batch(self._take_buffer())
+            return
+        self._flush_task = loop.create_task(self.flush())
+
+    async def flush(self):
+        """
+        Writes all buffered signatures to disk.
+        """
+        async with self._lock:
+            batch = self._take_buffer()
+            if batch:
+                try:
+                    await asyncio.to_thread(self._write_batch, batch)
+                except Exception as e:
+                    logging.error(f"Failed to persist thought signatures: {e}")
+
+    def _take_buffer(self) -> List[Dict[str, Any]]:
+        batch, self._buffer = self._buffer, []
+        self._last_flush = time.monotonic()
+        return batch
+
+    def _write_batch(self, batch: List[Dict[str, Any]]):
+        if not batch:
+            return
+        payload = "".join(json.dumps(signature, default=str) + "\n" for signature in batch)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(payload)
+        if self.path.stat().st_size > self.max_bytes:
+            self._rotate()
+
+    def _segment_path(self, index: int) -> Path:
+        return self.path.with_name(f"{self.path.name}.{index}")
+
+    def _rotate(self):
+        """
+        Moves the active file to <name>.1 (compacted) and shifts older segments,
+        dropping anything beyond backup_count.
+        """
+        if self.backup_count <= 0:
+            self.path.unlink(missing_ok=True)
+            return
+
+        oldest = self._segment_path(self.backup_count)
+        oldest.unlink(missing_ok=True)
+        for index in range(self.backup_count - 1, 0, -1):
+            segment = self._segment_path(index)
+            if segment.exists():
+                os.replace(segment, self._segment_path(index + 1))
+
+        compacted = compact_signatures(self._read_lines(self.path))
+        with open(self._segment_path(1), "w", encoding="utf-8") as f:
+            f.write("".join(json.dumps(signature, default=str) + "\n" for signature in compacted))
+        self.path.unlink(missing_ok=True)
+        logging.info(f"[ThoughtLog] Rotated {self.path} ({len(compacted)} signatures after compaction)")
+
+    @staticmethod
+    def _read_lines(path: Path) -> List[Dict[str, Any]]:
+        signatures = []
+        if not path.exists():
+            return signatures
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    signatures.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue  # torn write from a crash
+        return signatures
+
+    def load_tail(self, legacy_path: Optional[Path] = None) -> List[Dict[str, Any]]:
+        """
+        Reloads the in-memory tail from disk (active file, then the newest rotated
+        segment if the active file is empty). Falls back to a legacy JSON array file.
+        """
+        signatures = self._read_lines(self.path)
+        if len(signatures) < (self.tail.maxlen or 0):
+            signatures = self._read_lines(self._segment_path(1)) + signatures
+
+        if not signatures and legacy_path is not None and Path(legacy_path).exists():
+            try:
+                with open(legacy_path, "r") as f:
+                    signatures = json.load(f)
+            except Exception as e:
+                logging.error(f"Failed to read legacy thought signatures: {e}")
+
+        self.tail.clear()
+        self.tail.extend(signatures)
+        return list(self.tail)
+
+    def last(self) -> Optional[Dict[str, Any]]:
+        return self.tail[-1] if self.tail else None
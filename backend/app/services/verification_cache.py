@@ -0,0 +1,183 @@
+import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from app.core.config import settings
+from app.core.db import get_session
+from app.models.roadmap import VerifiedResource
+
+# Query parameters that never change page content
+TRACKING_PARAMS = {"fbclid", "gclid", "ref", "ref_src"}
+
+# Singleton instance
+_verification_cache = None
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical cache key: lowercase scheme/host, no default port, fragment or
+    tracking parameters, sorted query, no trailing slash.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and (scheme, parts.port) not in (("http", 80), ("https", 443)):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip("/") or "/"
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key not in TRACKING_PARAMS and not key.startswith("utm_")
+    ))
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+class VerificationCache:
+    """
+    Verification results keyed by normalized URL, so a page referenced by many
+    roadmaps is scraped and sandboxed once.
+
+    Entries younger than VERIFICATION_CACHE_FRESH_SECONDS are reused without any
+    request. Older ones are revalidated with a conditional GET (ETag /
+    Last-Modified): a 304 reuses the stored verification without downloading
+    the page, and a 200 whose body hash is unchanged reuses it without
+    another sandbox run.
+    Entries live in an in-memory LRU backed by the VerifiedResource table.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        fresh_seconds: Optional[float] = None,
+        persist: Optional[bool] = None
+    ):
+        self.max_entries = max_entries or settings.VERIFICATION_CACHE_SIZE
+        self.fresh_seconds = settings.VERIFICATION_CACHE_FRESH_SECONDS if fresh_seconds is None else fresh_seconds
+        self.persist = settings.VERIFICATION_CACHE_PERSIST if persist is None else persist
+        self._entries: "OrderedDict[str, VerifiedResource]" = OrderedDict()
+
+        self.lookups = 0
+        self.misses = 0
+        self.fresh_hits = 0
+        self.revalidated = 0  # 304 Not Modified
+        self.unchanged = 0  # 200 with the same content hash
+        self.changed = 0
+        self.stores = 0
+        self.bytes_saved = 0  # response bodies not downloaded (fresh hits and 304s)
+
+    @classmethod
+    def get_instance(cls):
+        global _verification_cache
+        if _verification_cache is None:
+            _verification_cache = VerificationCache()
+        return _verification_cache
+
+    def _remember(self, entry: VerifiedResource):
+        self._entries[entry.url] = entry
+        self._entries.move_to_end(entry.url)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def lookup(self, url: str) -> Optional[VerifiedResource]:
+        self.lookups += 1
+        key = normalize_url(url)
+        entry = self._entries.get(key)
+        if entry is None and self.persist:
+            try:
+                async with get_session() as session:
+                    entry = await session.get(VerifiedResource, key)
+            except Exception as e:
+                logging.warning(f"[VerificationCache] Lookup failed for {key}: {e}")
+        if entry is None:
+            self.misses += 1
+            return None
+        self._remember(entry)
+        return entry
+
+    def is_fresh(self, entry: VerifiedResource) -> bool:
+        return datetime.utcnow() - entry.checked_at < timedelta(seconds=self.fresh_seconds)
+
+    def conditional_headers(self, entry: Optional[VerifiedResource]) -> Dict[str, str]:
+        headers = {}
+        if entry is not None and entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry is not None and entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def record_fresh_hit(self, entry: VerifiedResource):
+        self.fresh_hits += 1
+        self.bytes_saved += entry.content_length
+
+    async def record_revalidation(self, entry: VerifiedResource, headers: Any, not_modified: bool):
+        """
+        The origin confirmed the cached content (304, or same hash on 200).
+        """
+        if not_modified:
+            self.revalidated += 1
+            self.bytes_saved += entry.content_length
+        else:
+            self.unchanged += 1
+        entry.etag = headers.get("etag") or entry.etag
+        entry.last_modified = headers.get("last-modified") or entry.last_modified
+        entry.checked_at = datetime.utcnow()
+        await self._save(entry)
+
+    async def store(
+        self,
+        url: str,
+        content_length: int,
+        digest: str,
+        headers: Any,
+        code_blocks: List[Dict[str, Any]],
+        verification: Dict[str, Any]
+    ) -> VerifiedResource:
+        key = normalize_url(url)
+        if key in self._entries:
+            self.changed += 1
+        now = datetime.utcnow()
+        entry = VerifiedResource(
+            url=key,
+            etag=headers.get("etag"),
+            last_modified=headers.get("last-modified"),
+            content_hash=digest,
+            content_length=content_length,
+            code_blocks=code_blocks,
+            verification=verification,
+            verified_at=now,
+            checked_at=now
+        )
+        self.stores += 1
+        await self._save(entry)
+        return entry
+
+    async def _save(self, entry: VerifiedResource):
+        self._remember(entry)
+        if not self.persist:
+            return
+        try:
+            async with get_session() as session:
+                await session.merge(entry)
+                await session.commit()
+        except Exception as e:
+            logging.warning(f"[VerificationCache] Could not persist {entry.url}: {e}")
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self.fresh_hits + self.revalidated + self.unchanged
+        return {
+            "entries": len(self._entries),
+            "lookups": self.lookups,
+            "hits": hits,
+            "fresh_hits": self.fresh_hits,
+            "revalidated": self.revalidated,
+            "unchanged": self.unchanged,
+            "changed": self.changed,
+            "misses": self.misses,
+            "stores": self.stores,
+            "hit_rate": round(hits / self.lookups, 3) if self.lookups else 0.0,
+            "bytes_saved": self.bytes_saved
+        }
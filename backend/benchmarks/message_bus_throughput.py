@@ -0,0 +1,110 @@
+"""
+Message bus throughput: in-process mailboxes vs the SQLite log transport,
+including a consumer running in a separate process.
+
+Usage (from backend/):
+    python benchmarks/message_bus_throughput.py [messages]
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+
+from app.agents.agent_message_bus import AgentMessageBus  # noqa: E402
+from app.agents.message_transport import InProcessTransport, SQLiteLogTransport  # noqa: E402
+
+SENDERS = 16
+
+
+async def _send_all(bus: AgentMessageBus, count: int):
+    async def sender(offset: int):
+        for n in range(offset, count, SENDERS):
+            await bus.send_message("ResearchAgent", "PlanningAgent", "BENCH", {"n": n})
+    await asyncio.gather(*(sender(i) for i in range(SENDERS)))
+
+
+async def bench_inprocess(count: int) -> float:
+    bus = AgentMessageBus(transport=InProcessTransport(), mailbox_size=count + 1)
+    bus.subscribe("PlanningAgent", lambda message: asyncio.sleep(0))
+    start = time.perf_counter()
+    await _send_all(bus, count)
+    await bus.drain()
+    return time.perf_counter() - start
+
+
+async def bench_sqlite(path: str, count: int) -> float:
+    sender = AgentMessageBus(transport=SQLiteLogTransport(path=path, consumer_id="sender"), channel="bench")
+    receiver_transport = SQLiteLogTransport(path=path, consumer_id="local", start_from_latest=False)
+    receiver = AgentMessageBus(transport=receiver_transport, channel="bench")
+    receiver.subscribe("PlanningAgent", lambda message: asyncio.sleep(0))
+    start = time.perf_counter()
+    await _send_all(sender, count)
+    await receiver.drain()
+    elapsed = time.perf_counter() - start
+    print(f"  avg batch size: {sender.transport.stats()['avg_batch_size']}")
+    sender.transport.close()
+    receiver_transport.close()
+    return elapsed
+
+
+def _remote_consumer(path: str, count: int, ready, done):
+    async def run():
+        transport = SQLiteLogTransport(path=path, consumer_id="remote", poll_interval=0.001)
+        bus = AgentMessageBus(transport=transport, channel="bench")
+        received = 0
+        finished = asyncio.Event()
+
+        async def handler(message):
+            nonlocal received
+            received += 1
+            if received >= count:
+                finished.set()
+
+        bus.subscribe("PlanningAgent", handler)
+        router = asyncio.create_task(bus.start_router())
+        await asyncio.sleep(0.1)  # offset registered at the log head
+        ready.set()
+        await finished.wait()
+        done.value = time.time()
+        router.cancel()
+        await asyncio.gather(router, return_exceptions=True)
+        transport.close()
+
+    asyncio.run(run())
+
+
+async def bench_cross_process(path: str, count: int) -> float:
+    ctx = multiprocessing.get_context("spawn")
+    ready, done = ctx.Event(), ctx.Value("d", 0.0)
+    consumer = ctx.Process(target=_remote_consumer, args=(path, count, ready, done))
+    consumer.start()
+    await asyncio.to_thread(ready.wait, 30)
+
+    sender = AgentMessageBus(transport=SQLiteLogTransport(path=path, consumer_id="sender"), channel="bench")
+    start = time.time()
+    await _send_all(sender, count)
+    await asyncio.to_thread(consumer.join, 60)
+    sender.transport.close()
+    return done.value - start
+
+
+def _report(label: str, count: int, elapsed: float):
+    print(f"{label:<28} {count:>7} msgs  {elapsed:8.3f}s  {count / elapsed:>10.0f} msg/s")
+
+
+async def main(count: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        _report("in-process", count, await bench_inprocess(count))
+        _report("sqlite (same process)", count, await bench_sqlite(os.path.join(tmp, "local.db"), count))
+        _report("sqlite (cross process)", count, await bench_cross_process(os.path.join(tmp, "remote.db"), count))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "ERROR"), force=True)
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000))
@@ -0,0 +1,79 @@
+"""
+Code-block sandbox throughput: the old path (temp file + `python -m py_compile`
+subprocess per block) vs batches sent to the persistent SandboxPool.
+
+Usage (from backend/):
+    python benchmarks/sandbox_throughput.py [resources] [--execute]
+
+Each resource has 10 blocks (one with a syntax error), like a tutorial page.
+Resources are checked VERIFICATION_SANDBOX_WORKERS at a time in both variants.
+--execute also runs the blocks in the pool (rlimited fork per block).
+"""
+import asyncio
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+
+from app.core.config import settings  # noqa: E402
+from app.services.concurrency import async_map  # noqa: E402
+from app.services.sandbox_pool import SandboxPool  # noqa: E402
+
+BLOCKS = [f"def example_{n}(value):\n    return [value * i for i in range({n})]\n" for n in range(9)]
+BLOCKS.append("def broken(:\n    pass\n")
+
+
+def _py_compile(code):
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
+        f.write(code)
+        temp_file = f.name
+    try:
+        return subprocess.run(["python", "-m", "py_compile", temp_file], capture_output=True, timeout=5).returncode == 0
+    finally:
+        Path(temp_file).unlink(missing_ok=True)
+
+
+async def bench_subprocess(count):
+    async def check(_):
+        return sum([await asyncio.to_thread(_py_compile, code) for code in BLOCKS])
+
+    started = time.perf_counter()
+    outcome = await async_map(check, range(count), concurrency=settings.VERIFICATION_SANDBOX_WORKERS, timeout=0)
+    return sum(outcome.results), time.perf_counter() - started
+
+
+async def bench_pool(count, execute):
+    pool = SandboxPool.get_instance()
+    await pool.start()  # workers are long-lived; spawn cost is paid once at startup
+
+    async def check(_):
+        return sum(result["ok"] for result in await pool.check(BLOCKS, execute=execute))
+
+    started = time.perf_counter()
+    outcome = await async_map(check, range(count), concurrency=settings.VERIFICATION_SANDBOX_WORKERS, timeout=0)
+    elapsed = time.perf_counter() - started
+    print(f"  pool: {pool.stats()}")
+    await pool.close()
+    return sum(outcome.results), elapsed
+
+
+def _report(label, count, passed, elapsed):
+    blocks = count * len(BLOCKS)
+    print(f"{label:<28} {blocks:>5} blocks  {passed:>5} passed  {elapsed:7.2f}s  {blocks / elapsed:9.1f} blocks/s")
+
+
+async def main(count, execute):
+    _report("subprocess per block", count, *await bench_subprocess(count))
+    _report("pool" + (" (execute)" if execute else ""), count, *await bench_pool(count, execute))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "ERROR"), force=True)
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    asyncio.run(main(int(args[0]) if args else 20, "--execute" in sys.argv))
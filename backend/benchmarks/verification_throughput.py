@@ -0,0 +1,132 @@
+"""
+Resource verification throughput against a local fixture server:
+the old sequential path (new httpx client per fetch) vs VerificationPipeline
+over the shared HttpPool.
+
+Usage (from backend/):
+    python benchmarks/verification_throughput.py [resources] [latency_ms] [--io-only]
+
+--io-only swaps the sandbox worker pool for an in-process compile() check in
+both variants, isolating fetch/pipeline throughput from sandbox CPU cost.
+"""
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+os.environ.setdefault("VERIFICATION_CACHE_PERSIST", "false")  # fixture URLs change every run
+
+import httpx  # noqa: E402
+from app.agents.execution_agent import ExecutionAgent  # noqa: E402
+from app.agents.verification_pipeline import VerificationPipeline  # noqa: E402
+from app.services.http_pool import HttpPool  # noqa: E402
+from app.services.sandbox_pool import SandboxPool  # noqa: E402
+
+PAGE = ("<html><body>" + "".join(
+    f"<pre>def example_{n}(value):\n    return value * {n}\n</pre>" for n in range(5)
+) + "<p>" + "x" * 5000 + "</p></body></html>").encode()
+LATENCY = 0.05
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_GET(self):
+        time.sleep(LATENCY)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, *args):
+        pass
+
+
+class FixtureAgent(ExecutionAgent):
+    io_only = False
+
+    def __init__(self, urls):
+        super().__init__()
+        self.urls = urls
+
+    async def _search_resources_for_milestone(self, milestone):
+        return [{"name": url, "url": url} for url in self.urls[milestone["slice"]]]
+
+    async def _test_code_in_sandbox(self, code_blocks):
+        if not self.io_only:
+            return await super()._test_code_in_sandbox(code_blocks)
+        passed = 0
+        for block in code_blocks[:10]:
+            try:
+                compile(block["code"], "<block>", "exec")
+                passed += 1
+            except SyntaxError:
+                pass
+        tested = len(code_blocks[:10])
+        return {"total_blocks": len(code_blocks), "tested_blocks": tested, "passed_blocks": passed,
+                "failed_blocks": tested - passed, "syntax_errors": tested - passed, "errors": [],
+                "pass_rate": passed / tested if tested else 0.0}
+
+
+class SequentialAgent(FixtureAgent):
+    async def _scrape_url_safely(self, url, max_retries=3):
+        async with httpx.AsyncClient(timeout=10.0) as client:  # previous behaviour: no reuse
+            response = await client.get(url)
+            return response.text if response.status_code == 200 else None
+
+
+def _milestones(count):
+    per = max(1, count // 5)
+    return [{"title": f"M{i}", "slice": slice(i * per, (i + 1) * per)} for i in range(5)]
+
+
+async def bench_sequential(urls):
+    agent = SequentialAgent(urls)
+    started = time.perf_counter()
+    verified = 0
+    for milestone in _milestones(len(urls)):
+        for resource in await agent._search_resources_for_milestone(milestone):
+            verified += (await agent._verify_resource_quality(resource))["verified"]
+    return verified, time.perf_counter() - started
+
+
+async def bench_pipeline(urls):
+    pipeline = VerificationPipeline(FixtureAgent(urls))
+    started = time.perf_counter()
+    results = await pipeline.run(_milestones(len(urls)))
+    elapsed = time.perf_counter() - started
+    print(f"  pool: {HttpPool.get_instance().stats()}")
+    await HttpPool.get_instance().aclose()
+    return sum(verification["verified"] for _, verification in results), elapsed
+
+
+def _report(label, count, verified, elapsed):
+    print(f"{label:<24} {count:>4} resources  {verified:>4} verified  {elapsed:7.2f}s  {count / elapsed:7.2f} resources/s")
+
+
+async def main(count):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    urls = [f"http://127.0.0.1:{server.server_address[1]}/resource/{n}" for n in range(count)]
+    try:
+        _report("sequential", count, *await bench_sequential(urls))
+        _report("pipeline + shared pool", count, *await bench_pipeline(urls))
+    finally:
+        server.shutdown()
+        await SandboxPool.get_instance().close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "ERROR"), force=True)
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    FixtureAgent.io_only = "--io-only" in sys.argv
+    if len(args) > 1:
+        LATENCY = int(args[1]) / 1000
+    asyncio.run(main(int(args[0]) if args else 40))
@@ -0,0 +1,75 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+from app.agents.orchestrator import CareerOrchestrator
+from app.services.adaptive_interval import AdaptiveInterval
+from app.services.market_delta import build_listing_index, compute_listing_delta
+
+
+def _index(ids):
+    return build_listing_index([{"title": f"Job {n}", "company": "Co", "link": f"https://jobs.example.com/{n}"} for n in ids])
+
+
+QUIET = compute_listing_delta(_index(range(10)), _index(range(10)))
+SHIFT = compute_listing_delta(_index(range(10)), _index(range(10, 20)))
+SMALL = compute_listing_delta(_index(range(10)), _index(range(11)))
+
+
+def test_quiet_markets_back_off_to_max():
+    schedule = AdaptiveInterval(1800, min_seconds=300, max_seconds=14400, backoff_factor=2.0)
+
+    intervals = [schedule.observe(QUIET) for _ in range(5)]
+
+    assert intervals == [3600, 7200, 14400, 14400, 14400]
+
+
+def test_shift_tightens_below_base_and_respects_min():
+    schedule = AdaptiveInterval(1800, min_seconds=300, max_seconds=14400, tighten_factor=0.5)
+    schedule.observe(QUIET)
+    schedule.observe(QUIET)
+
+    assert schedule.observe(SHIFT) == 900
+    assert schedule.observe(SHIFT) == 450
+    assert schedule.observe(SHIFT) == 300
+    # Small, non-material churn keeps the current pace
+    assert schedule.observe(SMALL) == 300
+
+
+def test_requested_base_outside_bounds_is_kept():
+    fast = AdaptiveInterval(60, min_seconds=300, max_seconds=14400, backoff_factor=2.0)
+    slow = AdaptiveInterval(86400, min_seconds=300, max_seconds=14400)
+
+    assert fast.current == fast.base_seconds == 60
+    assert slow.current == slow.base_seconds == 86400
+    # Adaptation still backs off from the requested pace
+    assert fast.observe(QUIET) == 120
+    fast.started_at = 0
+    fast.runs = 0
+    assert fast.cycles_saved(now=600) == 10
+
+
+def test_cycles_saved_against_fixed_schedule():
+    schedule = AdaptiveInterval(1800, min_seconds=300, max_seconds=14400)
+    schedule.started_at = 0
+    schedule.runs = 4
+
+    # 12 hours on a fixed 30 minute schedule would have been 24 runs
+    assert schedule.cycles_saved(now=12 * 3600) == 20
+
+
+@pytest.mark.asyncio
+async def test_marathon_cycle_returns_adaptive_delay(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    orchestrator = CareerOrchestrator("adaptive_user", "Data Scientist", "Kenya")
+    orchestrator.is_running = True
+    orchestrator.cycle_schedule = AdaptiveInterval(1800, min_seconds=300, max_seconds=14400)
+
+    async def quiet_market():
+        await orchestrator._apply_market_update({"listings": []}, {}, QUIET)
+
+    with patch.object(orchestrator, "_check_market_updates", new=quiet_market), \
+         patch.object(orchestrator, "_save_marathon_checkpoint", new=AsyncMock()):
+        first = await orchestrator.run_marathon_cycle()
+        second = await orchestrator.run_marathon_cycle()
+
+    assert (first, second) == (3600, 7200)
+    assert orchestrator.cycle_schedule.stats()["next_run_at"] is not None
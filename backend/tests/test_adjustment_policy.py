@@ -0,0 +1,96 @@
+import time
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+from app.agents.verification_agent import VerificationAgent
+from app.services import adjustment_policy
+from app.services.adjustment_policy import AdjustmentPolicy, normalize_score
+
+ROADMAP = {
+    "career_goal": "Backend Developer",
+    "estimated_weekly_hours": 10,
+    "milestones": [
+        {"title": "Python Basics", "status": "completed"},
+        {"title": "APIs with FastAPI"},
+        {"title": "Deployment"}
+    ]
+}
+
+
+@pytest.fixture
+def policy(monkeypatch):
+    policy = AdjustmentPolicy(cache_size=8)
+    monkeypatch.setattr(adjustment_policy, "_adjustment_policy", policy)
+    return policy
+
+
+@pytest.mark.parametrize("score, action, hours, extra_weeks", [
+    (None, "NONE", 10, 0),
+    (12, "REBUILD_FOUNDATIONS", 12, 2),
+    (45, "ADD_BRIDGE_WEEK", 11, 1),
+    (50, "CONTINUE", 10, 0),
+    (85, "CONTINUE", 10, 0),
+    (92, "FAST_TRACK", 10, -1),
+    (0.95, "FAST_TRACK", 10, -1),  # fractions are scaled to 0-100
+])
+def test_thresholds(policy, score, action, hours, extra_weeks):
+    decision = policy.decide(ROADMAP, score)
+
+    assert decision["action"] == action
+    assert decision["adjusted_weekly_hours"] == hours
+    assert decision["extra_weeks"] == extra_weeks
+
+
+def test_uses_roadmap_structure(policy):
+    decision = policy.decide(ROADMAP, 40)
+    assert decision["target_phase"] == "APIs with FastAPI"  # first phase not completed
+    assert "APIs with FastAPI" in decision["reason"]
+
+    last_phase = {**ROADMAP, "milestones": ROADMAP["milestones"][:1] + [{"title": "Deployment", "progress": 20}]}
+    assert policy.decide(last_phase, 95)["action"] == "ADD_ADVANCED_TRACK"
+
+    heavy = {**ROADMAP, "estimated_weekly_hours": 38}
+    assert policy.decide(heavy, 10)["adjusted_weekly_hours"] == 40  # capped
+    assert policy.decide({"months": []}, 10)["adjusted_weekly_hours"] == 12  # default 10 hours
+
+
+def test_decisions_are_fast_and_local(policy):
+    started = time.perf_counter()
+    for score in range(1000):
+        policy.decide(ROADMAP, score % 101)
+    assert (time.perf_counter() - started) / 1000 < 0.001
+
+
+def test_normalize_score():
+    assert normalize_score(None) is None
+    assert normalize_score("bad") is None
+    assert normalize_score(150) == 100
+    assert normalize_score(1) == 1  # ints are already percentages
+
+
+@pytest.mark.asyncio
+async def test_narrative_only_for_plan_changes_and_cached(policy):
+    generate = AsyncMock(return_value=SimpleNamespace(text="Take a week to consolidate your API skills."))
+    with patch("app.agents.verification_agent.gemini_client.generate_content_async", generate):
+        agent = VerificationAgent()
+        steady = await agent.suggest_roadmap_adjustments(ROADMAP, 70)
+        first = await agent.suggest_roadmap_adjustments(ROADMAP, 44)
+        second = await agent.suggest_roadmap_adjustments(ROADMAP, 41)  # same band and decision
+
+    assert steady["action"] == "CONTINUE"
+    assert steady["narrative"] == steady["reason"]
+    assert first["narrative"] == second["narrative"] == "Take a week to consolidate your API skills."
+    assert generate.await_count == 1
+    assert "Current Roadmap" not in generate.await_args.args[0]  # the roadmap is not serialized into the prompt
+    assert policy.stats()["narrative_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_narrative_failure_falls_back_to_reason(policy):
+    failing = AsyncMock(side_effect=RuntimeError("quota exceeded"))
+    with patch("app.agents.verification_agent.gemini_client.generate_content_async", failing):
+        result = await VerificationAgent().suggest_roadmap_adjustments(ROADMAP, 20)
+
+    assert result["action"] == "REBUILD_FOUNDATIONS"
+    assert result["narrative"] == result["reason"]
+    assert policy.stats()["cached_narratives"] == 0
@@ -0,0 +1,74 @@
+import asyncio
+import pytest
+from app.agents.agent_message_bus import AgentMessageBus
+
+
+@pytest.mark.asyncio
+async def test_drain_delivers_by_priority_then_order():
+    bus = AgentMessageBus()
+    received = []
+
+    async def handler(message):
+        received.append((message.priority, message.data["n"]))
+
+    bus.subscribe("PlanningAgent", handler)
+    await bus.send_message("A", "PlanningAgent", "T", {"n": 1})
+    await bus.send_message("A", "PlanningAgent", "T", {"n": 2}, priority="URGENT")
+    await bus.send_message("A", "PlanningAgent", "T", {"n": 3})
+    await bus.send_message("A", "PlanningAgent", "T", {"n": 4}, priority="CRITICAL")
+
+    assert await bus.drain() == 4
+    assert received == [("CRITICAL", 4), ("URGENT", 2), ("NORMAL", 1), ("NORMAL", 3)]
+
+
+@pytest.mark.asyncio
+async def test_history_is_bounded_and_indexes_follow_evictions():
+    bus = AgentMessageBus(history_size=5)
+    for n in range(12):
+        await bus.send_message("ResearchAgent", "Nobody", "EVEN" if n % 2 == 0 else "ODD", {"n": n})
+
+    assert [m.data["n"] for m in bus.get_recent_messages(10)] == [7, 8, 9, 10, 11]
+    assert [m.data["n"] for m in bus.get_messages_by_type("EVEN")] == [8, 10]
+    assert len(bus.get_messages_for_agent("ResearchAgent")) == 5
+    assert bus.metrics()["unrouted"] == 12
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_does_not_block_others():
+    bus = AgentMessageBus(mailbox_size=1)
+    release = asyncio.Event()
+    fast_received = []
+
+    async def slow(message):
+        await release.wait()
+
+    async def fast(message):
+        fast_received.append(message.data["n"])
+
+    bus.subscribe("Slow", slow)
+    bus.subscribe("Fast", fast)
+    router = asyncio.create_task(bus.start_router())
+
+    await bus.send_message("X", "Slow", "T", {"n": 0})
+    await asyncio.sleep(0)
+    await bus.send_message("X", "Slow", "T", {"n": 1})  # fills the slow mailbox
+    for n in range(5):
+        await bus.send_message("X", "Fast", "T", {"n": n})
+    await asyncio.sleep(0.05)
+    assert fast_received == [0, 1, 2, 3, 4]
+
+    # Backpressure: the next send to the full mailbox waits
+    blocked = asyncio.create_task(bus.send_message("X", "Slow", "T", {"n": 2}))
+    await asyncio.sleep(0.05)
+    assert not blocked.done()
+
+    release.set()
+    await asyncio.wait_for(blocked, timeout=1)
+    await asyncio.sleep(0.05)
+    router.cancel()
+    await asyncio.gather(router, return_exceptions=True)
+
+    metrics = bus.metrics()
+    assert metrics["delivered"] == 8
+    assert metrics["total_queue_depth"] == 0
+    assert metrics["latency_ms"]["max"] > 0
@@ -0,0 +1,159 @@
+import pytest
+import pytest_asyncio
+from contextlib import asynccontextmanager, ExitStack
+from unittest.mock import AsyncMock, patch
+from datetime import datetime, timedelta
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+import app.models.roadmap  # noqa: F401
+from app.agents.orchestrator import CareerOrchestrator
+from app.core.config import settings
+from app.models.roadmap import AgentState
+
+
+@pytest_asyncio.fixture
+async def temp_db(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/checkpoints.db")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    @asynccontextmanager
+    async def get_session():
+        async with maker() as session:
+            yield session
+
+    monkeypatch.setattr("app.services.database_service.get_session", get_session)
+    yield get_session
+    await engine.dispose()
+
+
+def _patch_stages(stack, orchestrator):
+    mocks = {
+        "_run_research": AsyncMock(return_value={"listings": [{"title": "Dev", "company": "Co"}]}),
+        "_run_planning": AsyncMock(return_value={"milestones": [{"title": "M1"}]}),
+        "_run_execution": AsyncMock(return_value={"resources": [], "schedule": {"sprints": []}}),
+        "_run_verification": AsyncMock(return_value={"overall_score": 0}),
+        "_adjust_roadmap": AsyncMock(return_value={"recommendation": "hold"}),
+    }
+    for name, mock in mocks.items():
+        stack.enter_context(patch.object(orchestrator, name, new=mock))
+    stack.enter_context(patch("app.agents.orchestrator.CareerVelocityEngine.calculate_velocity_metrics", new=AsyncMock(return_value={"velocity": 1})))
+    stack.enter_context(patch("app.agents.orchestrator.StrategicCareerPathing.generate_career_trajectory", new=AsyncMock(return_value={"path": []})))
+    return mocks
+
+
+@pytest.mark.asyncio
+async def test_resume_skips_completed_stages(temp_db):
+    first = CareerOrchestrator("resume_user", "Data Scientist", "Kenya")
+    with ExitStack() as stack:
+        _patch_stages(stack, first)
+        await first.run_pipeline({"hours_per_week": 10})
+
+    second = CareerOrchestrator("resume_user", "Data Scientist", "Kenya")
+    with ExitStack() as stack:
+        mocks = _patch_stages(stack, second)
+        context = await second.run_pipeline({"hours_per_week": 10}, resume=True)
+
+    for mock in mocks.values():
+        mock.assert_not_called()
+    assert context["roadmap"] == {"milestones": [{"title": "M1"}]}
+    assert context["research_data"]["listings"][0]["title"] == "Dev"
+
+
+@pytest.mark.asyncio
+async def test_different_constraints_do_not_share_checkpoints(temp_db):
+    first = CareerOrchestrator("resume_user2", "Data Scientist", "Kenya")
+    with ExitStack() as stack:
+        _patch_stages(stack, first)
+        await first.run_pipeline({"hours_per_week": 10})
+
+    second = CareerOrchestrator("resume_user2", "Data Scientist", "Kenya")
+    with ExitStack() as stack:
+        mocks = _patch_stages(stack, second)
+        await second.run_pipeline({"hours_per_week": 20}, resume=True)
+
+    mocks["_run_research"].assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_checkpoints_are_scoped_to_the_marathon_session(temp_db):
+    first = CareerOrchestrator("resume_user3", "Data Scientist", "Kenya")
+    first.session_id = "session-a"
+    with ExitStack() as stack:
+        _patch_stages(stack, first)
+        await first.run_pipeline({"hours_per_week": 10})
+
+    other = CareerOrchestrator("resume_user3", "Data Scientist", "Kenya")
+    other.session_id = "session-b"
+    with ExitStack() as stack:
+        mocks = _patch_stages(stack, other)
+        await other.run_pipeline({"hours_per_week": 10}, resume=True)
+    mocks["_run_research"].assert_called_once()
+
+    reclaimed = CareerOrchestrator("resume_user3", "Data Scientist", "Kenya")
+    reclaimed.session_id = "session-a"
+    with ExitStack() as stack:
+        mocks = _patch_stages(stack, reclaimed)
+        await reclaimed.run_pipeline({"hours_per_week": 10}, resume=True)
+    mocks["_run_research"].assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_stale_checkpoints_are_not_resumed(temp_db):
+    first = CareerOrchestrator("resume_user4", "Data Scientist", "Kenya")
+    with ExitStack() as stack:
+        _patch_stages(stack, first)
+        await first.run_pipeline({"hours_per_week": 10})
+
+    # Age only the research checkpoint: the stages after it depend on it, so none are reused
+    async with temp_db() as session:
+        states = (await session.exec(select(AgentState).where(AgentState.user_id == "resume_user4"))).all()
+        for state in states:
+            if state.agent_name.endswith(":research"):
+                state.timestamp = datetime.utcnow() - timedelta(hours=settings.PIPELINE_CHECKPOINT_MAX_AGE_HOURS + 1)
+                session.add(state)
+        await session.commit()
+
+    second = CareerOrchestrator("resume_user4", "Data Scientist", "Kenya")
+    with ExitStack() as stack:
+        mocks = _patch_stages(stack, second)
+        await second.run_pipeline({"hours_per_week": 10}, resume=True)
+    mocks["_run_research"].assert_called_once()
+    mocks["_run_planning"].assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_marathon_checkpoint_round_trip(temp_db):
+    orchestrator = CareerOrchestrator("marathon_user", "Data Scientist", "Kenya")
+    orchestrator.cycle_count = 7
+    orchestrator.context["roadmap"] = {"milestones": [{"title": "Adjusted"}]}
+    orchestrator.context["roadmap_version"] = 3
+    await orchestrator._save_marathon_checkpoint()
+
+    restored = CareerOrchestrator("marathon_user", "Data Scientist", "Kenya")
+    state = await restored.db.load_agent_state("marathon")
+    restored._restore_marathon_checkpoint(state["checkpoint_data"])
+
+    assert restored.cycle_count == 7
+    assert restored.context["roadmap_version"] == 3
+    assert restored.context["roadmap"]["milestones"][0]["title"] == "Adjusted"
+
+
+@pytest.mark.asyncio
+async def test_marathon_checkpoint_is_scoped_to_the_session(temp_db):
+    orchestrator = CareerOrchestrator("marathon_user2", "Data Scientist", "Kenya")
+    orchestrator.session_id = "session-a"
+    orchestrator.cycle_count = 4
+    await orchestrator._save_marathon_checkpoint()
+
+    other = CareerOrchestrator("marathon_user2", "Data Scientist", "Kenya")
+    other.session_id = "session-b"
+    assert await other.db.load_agent_state(other._marathon_checkpoint_name()) is None
+
+    same = CareerOrchestrator("marathon_user2", "Data Scientist", "Kenya")
+    same.session_id = "session-a"
+    state = await same.db.load_agent_state(same._marathon_checkpoint_name())
+    assert state["checkpoint_data"]["cycle_count"] == 4
@@ -0,0 +1,107 @@
+import hashlib
+import pytest
+from app.services.code_extractor import CodeExtractor, PageScan, extract_code_blocks, language_hint
+
+PAGE = """<html><head>
+<script>var fake = "<pre>not code, just a script string</pre>";</script>
+<style>pre { color: red; }</style>
+</head><body>
+<p>Use <code>len()</code> to count.</p>
+<pre class="highlight"><code class="language-python">def greet(name):
+    return f"Hello, {name}" if name &amp;&amp; True else <span class="k">None</span>
+</code></pre>
+<PRE data-lang="bash">pip install requests --upgrade</PRE>
+<code class="lang-js">const total = items.reduce((a, b) =&gt; a + b, 0);</code>
+<pre><code class="language-python">def greet(name):
+    return f"Hello, {name}" if name &amp;&amp; True else <span class="k">None</span>
+</code></pre>
+<p>```sql
+SELECT name FROM users WHERE id = 1;
+```</p>
+</body></html>"""
+
+
+def _summary(blocks):
+    return [(block["source"], block["language"]) for block in blocks]
+
+
+def test_extracts_deduplicated_blocks_with_language_hints():
+    extractor = CodeExtractor()
+    extractor.feed(PAGE)
+    blocks = extractor.close()
+
+    assert _summary(blocks) == [
+        ("pre_tag", "python"),  # <pre><code> is one block; the repeat below is dropped
+        ("pre_tag", "bash"),
+        ("code_tag", "js"),
+        ("markdown", "sql")
+    ]
+    assert blocks[0]["code"].startswith("def greet(name):")
+    assert "name && True else None" in blocks[0]["code"]  # entities unescaped, highlight spans dropped
+    assert "=> a + b" in blocks[2]["code"]
+    assert extractor.duplicates == 1
+    assert not extractor.truncated
+
+
+@pytest.mark.parametrize("size", [1, 3, 7, 64])
+def test_chunk_boundaries_do_not_change_the_result(size):
+    whole = extract_code_blocks(PAGE)
+    chunked = extract_code_blocks(PAGE[i:i + size] for i in range(0, len(PAGE), size))
+
+    assert chunked == whole
+
+
+def test_stops_after_max_blocks_and_byte_cap():
+    page = "".join(f"<pre>value_{n} = {n} * 1000</pre><p>{'filler ' * 50}</p>" for n in range(100))
+
+    extractor = CodeExtractor(max_blocks=5)
+    for i in range(0, len(page), 256):
+        extractor.feed(page[i:i + 256])
+        if extractor.done:
+            break
+    assert len(extractor.close()) == 5
+    assert extractor.truncated
+    assert extractor.chars_seen < len(page) / 10
+
+    capped = extract_code_blocks(page, max_chars=2000)
+    assert 0 < len(capped) < 10
+
+
+def test_long_blocks_are_truncated_not_buffered():
+    blocks = extract_code_blocks("<pre>" + "x = 1\n" * 100000 + "</pre>", max_block_chars=1000)
+
+    assert len(blocks[0]["code"]) == 1000
+
+
+def test_language_hint_variants():
+    assert language_hint('class="highlight-source-python"') == "python"
+    assert language_hint('class="brush: ruby; gutter: false"') == "ruby"
+    assert language_hint('class="hljs typescript"') == "typescript"
+    assert language_hint('class="wide"') is None
+
+
+def test_page_scan_hashes_what_it_read_and_honours_the_byte_cap():
+    body = PAGE.encode()
+    scan = PageScan("utf-8")
+    for i in range(0, len(body), 100):
+        scan.feed(body[i:i + 100])
+    scan.finish()
+    assert scan.content_hash == hashlib.sha256(body).hexdigest()
+    assert scan.size == len(body)
+    assert len(scan.code_blocks) == 4
+
+    capped = PageScan("utf-8", max_bytes=300)
+    for i in range(0, len(body), 100):
+        capped.feed(body[i:i + 100])
+        if capped.done:
+            break
+    assert capped.size == 300 and capped.truncated
+
+
+def test_page_scan_decodes_multibyte_characters_split_across_chunks():
+    body = "<pre>print('héllo wörld — ✓')</pre>".encode("utf-8")
+    scan = PageScan("utf-8")
+    for byte in body:
+        scan.feed(bytes([byte]))
+
+    assert scan.finish().code_blocks[0]["code"] == "print('héllo wörld — ✓')"
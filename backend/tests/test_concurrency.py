@@ -0,0 +1,122 @@
+import asyncio
+import json
+import time
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+from fastapi.testclient import TestClient
+from app.agents.execution_agent import ExecutionAgent
+from app.main import app
+from app.services.concurrency import async_map, async_map_stream
+
+
+@pytest.mark.asyncio
+async def test_results_keep_input_order_with_bounded_concurrency():
+    in_flight = 0
+    peak = 0
+
+    async def work(n):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01 * (5 - n % 5))  # later items finish first
+        in_flight -= 1
+        return n * 10
+
+    result = await async_map(work, range(12), concurrency=3)
+
+    assert result.results == [n * 10 for n in range(12)]
+    assert peak == 3
+    assert result.complete
+
+
+@pytest.mark.asyncio
+async def test_failures_and_timeouts_leave_partial_results():
+    async def work(n):
+        if n == 1:
+            raise ValueError("bad item")
+        if n == 2:
+            await asyncio.sleep(1)
+        return n
+
+    result = await async_map(work, range(4), concurrency=4, timeout=0.05, default="missing")
+
+    assert result.results == [0, "missing", "missing", 3]
+    assert isinstance(result.errors[1], ValueError)
+    assert result.timed_out == [2]
+    assert result.stats()["succeeded"] == 2
+
+
+@pytest.mark.asyncio
+async def test_find_resources_fans_out_milestones():
+    agent = ExecutionAgent()
+    milestones = [{"title": f"M{n}", "focus": ["Python"]} for n in range(6)]
+
+    async def slow_suggestions(milestone):
+        await asyncio.sleep(0.1)
+        if milestone["title"] == "M3":
+            raise RuntimeError("Gemini unavailable")
+        return [{"name": milestone["title"], "platform": "YouTube"}]
+
+    with patch.object(agent, "_get_resource_suggestions", side_effect=slow_suggestions):
+        started = time.monotonic()
+        resources = await agent.find_resources({"milestones": milestones})
+        elapsed = time.monotonic() - started
+
+    assert elapsed < 0.45  # 6 sequential calls would take 0.6s
+    assert [r["milestone"] for r in resources] == [f"M{n}" for n in range(6)]
+    assert resources[3]["suggestions"] == []
+    assert resources[5]["suggestions"][0]["name"] == "M5"
+
+
+def test_execute_roadmap_falls_back_per_failed_month():
+    roadmap = {
+        "target_role": "Data Engineer",
+        "months": [{"month": n, "title": f"Month {n}", "skills": ["SQL"], "tasks": []} for n in (1, 2, 3)]
+    }
+
+    async def generate(prompt, generation_config=None):
+        if "Month 2" in prompt:
+            raise RuntimeError("quota exceeded")
+        return SimpleNamespace(text=json.dumps({"youtube_videos": [], "courses": [{"title": "SQL"}]}))
+
+    with patch("app.services.result_storage.get_roadmap_result", return_value=roadmap), \
+         patch("app.services.gemini_client.gemini_client.generate_content_async", new_callable=AsyncMock, side_effect=generate):
+        response = TestClient(app).post("/api/roadmap/execute-roadmap", json={"result_id": "r1"})
+
+    assert response.status_code == 200
+    months = response.json()["months"]
+    assert [m["month"] for m in months] == [1, 2, 3]
+    assert months[0]["resources"]["courses"] == [{"title": "SQL"}]
+    assert months[1]["resources"]["courses"][0]["platform"] == "Coursera"  # fallback
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_in_completion_order_and_cancels_on_close():
+    started = []
+
+    async def work(n):
+        started.append(n)
+        await asyncio.sleep(0.05 * (3 - n))
+        if n == 1:
+            raise ValueError("bad item")
+        return n * 10
+
+    seen = [(index, result, type(error).__name__ if error else None)
+            async for index, result, error in async_map_stream(work, range(3), concurrency=3)]
+    assert seen == [(2, 20, None), (1, None, "ValueError"), (0, 0, None)]
+
+    cancelled = []
+
+    async def slow(n):
+        try:
+            await asyncio.sleep(0.01 if n == 0 else 5)
+        except asyncio.CancelledError:
+            cancelled.append(n)
+            raise
+        return n
+
+    stream = async_map_stream(slow, range(3), concurrency=3)
+    assert (await stream.__anext__())[0] == 0
+    await stream.aclose()
+    assert sorted(cancelled) == [1, 2]
@@ -0,0 +1,103 @@
+import asyncio
+import json
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services import result_storage
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    roadmaps = {"r1": {
+        "result_id": "r1",
+        "target_role": "Data Engineer",
+        "months": [{"month": n, "title": f"Month {n}", "skills": ["SQL"], "tasks": []} for n in (1, 2, 3)]
+    }}
+    monkeypatch.setattr(result_storage, "roadmap_results", roadmaps)
+    monkeypatch.setattr(result_storage, "DB_FILE", str(tmp_path / "roadmap_store.json"))
+    return roadmaps
+
+
+def _gemini(delays=None, fail=()):
+    calls = []
+
+    async def generate(prompt, generation_config=None):
+        month = int(prompt.split("Month ")[1].split(" ")[0])
+        calls.append(month)
+        await asyncio.sleep((delays or {}).get(month, 0))
+        if month in fail:
+            raise RuntimeError("quota exceeded")
+        return SimpleNamespace(text=json.dumps({"courses": [{"title": f"Course {month}"}]}))
+
+    mock = patch("app.services.gemini_client.gemini_client.generate_content_async",
+                 new_callable=AsyncMock, side_effect=generate)
+    return mock, calls
+
+
+def _post(client, **kwargs):
+    return client.post("/api/roadmap/execute-roadmap", json={"result_id": "r1"}, **kwargs)
+
+
+def test_months_stream_as_they_complete(store):
+    mock, calls = _gemini(delays={1: 0.2, 2: 0.1, 3: 0})
+    with mock, TestClient(app).stream(
+        "POST", "/api/roadmap/execute-roadmap", json={"result_id": "r1"},
+        headers={"Accept": "application/x-ndjson"}
+    ) as response:
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        events = [json.loads(line) for line in response.iter_lines() if line]
+
+    assert [e["month"]["month"] for e in events[:-1]] == [3, 2, 1]  # completion order
+    done = events[-1]
+    assert done["type"] == "done" and done["cached"] is False
+    assert [m["month"] for m in done["plan"]["months"]] == [1, 2, 3]
+
+
+def test_plan_is_stored_and_reused(store):
+    mock, calls = _gemini()
+    client = TestClient(app)
+    with mock:
+        first = _post(client).json()
+        second = _post(client).json()
+
+    assert sorted(calls) == [1, 2, 3]  # second request made no model calls
+    assert first["cached"] is False and second["cached"] is True
+    assert second["months"] == first["months"]
+    assert store["r1"]["execution_plan"]["plan"]["months"][0]["resources"]["courses"] == [{"title": "Course 1"}]
+    with open(result_storage.DB_FILE) as f:
+        assert "execution_plan" in json.load(f)["r1"]
+
+
+def test_roadmap_change_invalidates_plan(store):
+    mock, calls = _gemini()
+    client = TestClient(app)
+    with mock:
+        _post(client)
+        store["r1"]["months"][1]["skills"] = ["Spark"]
+        response = _post(client, headers={"Accept": "text/event-stream"})
+
+    assert len(calls) == 6
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text.count("event: month") == 3
+    assert '"cached": false' in response.text
+    assert result_storage.get_execution_plan("r1")["months"][1]["skills"] == ["Spark"]
+
+
+def test_plan_with_fallback_months_is_not_stored(store):
+    mock, calls = _gemini(fail=(2,))
+    client = TestClient(app)
+    with mock:
+        months = _post(client).json()["months"]
+        _post(client)
+
+    assert months[1]["resources"]["courses"][0]["platform"] == "Coursera"  # fallback
+    assert "execution_plan" not in store["r1"]
+    assert calls.count(2) == 2
+
+
+def test_missing_roadmap_is_404(store):
+    response = TestClient(app).post("/api/roadmap/execute-roadmap", json={"result_id": "nope"})
+
+    assert response.status_code == 404
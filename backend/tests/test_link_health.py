@@ -0,0 +1,174 @@
+import asyncio
+import socket
+import threading
+import time
+import pytest
+import pytest_asyncio
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from app.core.config import settings
+from app.services import result_storage
+from app.services.http_pool import HttpPool
+from app.services.link_health import LinkHealthChecker
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, handler):
+        super().__init__(address, handler)
+        self.lock = threading.Lock()
+        self.requests = Counter()  # (method, path) -> count
+        self.delay = 0.0
+
+
+class LinkHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _answer(self, method):
+        server = self.server
+        path = urlsplit(self.path).path
+        with server.lock:
+            server.requests[(method, path)] += 1
+        time.sleep(server.delay)
+        if path.startswith("/ok"):
+            code = 200
+        elif path == "/no-head":
+            code = 405 if method == "HEAD" else 200
+        elif path.startswith("/gone"):
+            code = 404
+        elif path == "/private":
+            code = 403
+        elif path == "/oembed":
+            video = parse_qs(urlsplit(self.path).query)["url"][0]
+            code = 200 if "v=live" in video else 404
+        else:
+            code = 500
+        body = b"" if method == "HEAD" else b"x" * 1000
+        self.send_response(code)
+        self.send_header("Content-Length", str(1000))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self):
+        self._answer("HEAD")
+
+    def do_GET(self):
+        self._answer("GET")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = StubServer(("127.0.0.1", 0), LinkHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest_asyncio.fixture
+async def checker():
+    pool = HttpPool(timeout=5, per_host=4)
+    checker = LinkHealthChecker(ttl=60, negative_ttl=60, concurrency=8, timeout=2, pool=pool)
+    yield checker
+    await checker.close()
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_statuses_and_head_fallback(server, checker):
+    results = await checker.check_many([
+        f"{server.url}/ok", f"{server.url}/no-head", f"{server.url}/gone",
+        f"{server.url}/private", f"{server.url}/broken-server"
+    ])
+
+    statuses = {url.rsplit("/", 1)[1]: result["status"] for url, result in results.items()}
+    assert statuses == {"ok": "ok", "no-head": "ok", "gone": "broken", "private": "blocked", "broken-server": "error"}
+    assert server.requests[("GET", "/ok")] == 0  # HEAD was enough
+    assert server.requests[("GET", "/no-head")] == 1
+    assert checker.stats()["get_fallbacks"] == 3  # 405, 404 and 403 are retried with GET
+
+
+@pytest.mark.asyncio
+async def test_results_are_cached_and_failures_expire_sooner(server):
+    pool = HttpPool(timeout=5)
+    checker = LinkHealthChecker(ttl=60, negative_ttl=0.2, pool=pool)
+    try:
+        await checker.check_many([f"{server.url}/ok", f"{server.url}/gone"])
+        await checker.check_many([f"{server.url}/ok/", f"{server.url}/gone#section"])  # same normalized URLs
+        assert server.requests[("HEAD", "/ok")] == 1
+        assert server.requests[("HEAD", "/gone")] == 1
+        assert checker.stats()["negative_hits"] == 1
+
+        await asyncio.sleep(0.25)
+        await checker.check_many([f"{server.url}/ok", f"{server.url}/gone"])
+        assert server.requests[("HEAD", "/ok")] == 1
+        assert server.requests[("HEAD", "/gone")] == 2  # negative entry expired
+    finally:
+        await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_checks_of_one_url_share_a_request(server, checker):
+    server.delay = 0.1
+    results = await asyncio.gather(*(checker.check(f"{server.url}/ok") for _ in range(5)))
+
+    assert {result["status"] for result in results} == {"ok"}
+    assert server.requests[("HEAD", "/ok")] == 1
+    assert checker.stats()["coalesced"] == 4
+
+
+@pytest.mark.asyncio
+async def test_unreachable_host(checker):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]  # nothing listens once the socket is closed
+    result = await checker.check(f"http://127.0.0.1:{port}/ok")
+
+    assert result["status"] == "unreachable"
+    assert result["http_status"] is None
+
+
+@pytest.mark.asyncio
+async def test_youtube_links_are_checked_through_oembed(server, checker, monkeypatch):
+    monkeypatch.setattr(settings, "YOUTUBE_OEMBED_URL", f"{server.url}/oembed")
+    results = await checker.check_many([
+        "https://www.youtube.com/watch?v=live123",
+        "https://www.youtube.com/watch?v=removed"
+    ])
+
+    assert [result["status"] for result in results.values()] == ["ok", "broken"]
+
+
+@pytest.mark.asyncio
+async def test_background_annotation_of_stored_roadmap(server, checker, tmp_path, monkeypatch):
+    plan_months = [{
+        "month": 1,
+        "resources": {
+            "youtube_videos": [{"title": "Intro", "url": f"{server.url}/ok/video", "thumbnail": f"{server.url}/gone/thumb.jpg"}],
+            "courses": [{"title": "Course", "url": f"{server.url}/no-head"}]
+        }
+    }]
+    roadmap = {
+        "target_role": "Data Engineer",
+        "months": [{"month": 1, "title": "Basics", "skills": ["SQL"], "tasks": [],
+                    "resources": [{"title": "Docs", "url": f"{server.url}/gone/docs"}]}]
+    }
+    monkeypatch.setattr(result_storage, "roadmap_results", {"r1": roadmap})
+    monkeypatch.setattr(result_storage, "DB_FILE", str(tmp_path / "roadmap_store.json"))
+    result_storage.store_execution_plan("r1", {"months": plan_months})
+
+    await checker.submit("r1")
+
+    video = plan_months[0]["resources"]["youtube_videos"][0]
+    assert video["link_health"]["status"] == "ok"
+    assert video["thumbnail_health"]["status"] == "broken"
+    assert plan_months[0]["resources"]["courses"][0]["link_health"]["status"] == "ok"
+    assert roadmap["months"][0]["resources"][0]["link_health"]["status"] == "broken"
+    # Annotations do not invalidate the stored plan
+    assert result_storage.get_execution_plan("r1") is not None
@@ -0,0 +1,192 @@
+import asyncio
+import pytest
+import pytest_asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from app.agents.orchestrator import CareerOrchestrator
+from app.models.roadmap import MarathonSession
+from app.services.marathon_queue import MarathonJobQueue, MarathonQueueWorker
+from app.services.marathon_scheduler import MarathonScheduler, SchedulerCapacityError
+
+
+@pytest_asyncio.fixture
+async def temp_db(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/queue.db")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    @asynccontextmanager
+    async def get_session():
+        async with maker() as session:
+            yield session
+
+    monkeypatch.setattr("app.services.database_service.get_session", get_session)
+    monkeypatch.setattr("app.services.marathon_queue.get_session", get_session)
+    yield get_session
+    await engine.dispose()
+
+
+async def _expire_lease(get_session, job_id):
+    async with get_session() as session:
+        job = await session.get(MarathonSession, job_id)
+        job.lease_expires_at = datetime.utcnow() - timedelta(seconds=1)
+        session.add(job)
+        await session.commit()
+
+
+class FakeOrchestrator:
+    def __init__(self, job):
+        self.user_id = job.user_id
+        self.cycle_count = job.cycle_count
+        self.check_interval = 0.01
+        self.begin_marathon = AsyncMock()
+        self.end_marathon = AsyncMock()
+        self.stop_marathon_session = AsyncMock()
+        self.message_bus = AsyncMock()
+
+    async def run_marathon_cycle(self):
+        self.cycle_count += 1
+        return None if self.cycle_count >= 3 else self.check_interval
+
+
+@pytest.mark.asyncio
+async def test_only_one_worker_claims_and_expired_leases_are_reclaimed(temp_db):
+    worker_a = MarathonJobQueue("worker-a", lease_seconds=60)
+    worker_b = MarathonJobQueue("worker-b", lease_seconds=60)
+    job_id = await worker_a.enqueue("session-1", "user_1", "Data Scientist", "Kenya", claim=False)
+
+    claimed_a = await worker_a.claim_due()
+    claimed_b = await worker_b.claim_due()
+    assert [job.id for job in claimed_a] == [job_id]
+    assert claimed_b == []
+
+    # Heartbeats keep the lease; once it lapses the other worker takes over
+    rows = await worker_a.heartbeat([job_id])
+    assert rows[job_id].lease_owner == "worker-a"
+    await _expire_lease(temp_db, job_id)
+    assert [job.id for job in await worker_b.claim_due()] == [job_id]
+    assert (await worker_a.heartbeat([job_id]))[job_id].lease_owner == "worker-b"
+
+
+@pytest.mark.asyncio
+async def test_cycles_and_completion_are_persisted(temp_db):
+    queue = MarathonJobQueue("worker-a")
+    job_id = await queue.enqueue("session-2", "user_2", "Backend", claim=True)
+
+    await queue.record_cycle(job_id, "RUNNING", 4, datetime.utcnow())
+    job = await queue.get("session-2")
+    assert (job.status, job.cycle_count) == ("RUNNING", 4)
+
+    await queue.finish(job, "COMPLETED", 5)
+    job = await queue.get("session-2")
+    assert (job.status, job.cycle_count, job.lease_owner) == ("COMPLETED", 5, None)
+    assert await queue.claim_due() == []
+
+
+@pytest.mark.asyncio
+async def test_worker_resumes_orphaned_session(temp_db):
+    crashed = MarathonJobQueue("crashed-worker")
+    job_id = await crashed.enqueue("session-3", "user_3", "Data Scientist", "Kenya", claim=True)
+    await crashed.record_cycle(job_id, "RUNNING", 1, datetime.utcnow())
+    await _expire_lease(temp_db, job_id)
+
+    scheduler = MarathonScheduler(max_workers=2, max_sessions=10)
+    worker = MarathonQueueWorker(scheduler, MarathonJobQueue("survivor"), orchestrator_factory=FakeOrchestrator)
+
+    assert await worker.poll() == 1
+    session = scheduler.get("session-3")
+    assert session.resume is True
+
+    for _ in range(200):
+        job = await worker.queue.get("session-3")
+        if job.status == "COMPLETED":
+            break
+        await asyncio.sleep(0.01)
+    await scheduler.stop()
+
+    assert job.status == "COMPLETED"
+    assert job.cycle_count == 3
+    assert worker.stats()["reclaimed_jobs"] == 1
+
+
+@pytest.mark.asyncio
+async def test_rejected_submission_leaves_nothing_to_claim(temp_db, monkeypatch):
+    scheduler = MarathonScheduler(max_workers=1, max_sessions=1)
+    worker = MarathonQueueWorker(scheduler, MarathonJobQueue("worker-a", lease_seconds=60))
+    first = FakeOrchestrator(MarathonSession(user_id="user_4", career_goal="Backend", duration_hours=1))
+    first.career_goal, first.location = "Backend", "Kenya"
+    await worker.submit("session-4", first)
+
+    # Full before the enqueue: no row is written
+    with pytest.raises(SchedulerCapacityError):
+        await worker.submit("session-5", first)
+    assert await worker.queue.get("session-5") is None
+
+    # Filled up while the row was being written: the row is closed
+    checks = iter([lambda: None, scheduler.check_capacity])
+    monkeypatch.setattr(scheduler, "check_capacity", lambda: next(checks)())
+    with pytest.raises(SchedulerCapacityError):
+        await worker.submit("session-6", first)
+    job = await worker.queue.get("session-6")
+    assert (job.status, job.lease_owner) == ("CANCELLED", None)
+
+    assert await MarathonJobQueue("worker-b").claim_due() == []  # session-4 is leased, session-6 closed
+    await scheduler.stop()
+
+
+def _pipeline_orchestrator(job):
+    """A real orchestrator whose stages are mocks; begin_marathon just runs the pipeline."""
+    orchestrator = CareerOrchestrator(job.user_id, job.career_goal, job.location)
+    orchestrator.session_id = job.session_key
+    orchestrator.stages = {
+        "_run_research": AsyncMock(return_value={"listings": [{"title": "Dev", "company": "Co"}]}),
+        "_run_planning": AsyncMock(return_value={"milestones": [{"title": "M1"}]}),
+        "_run_execution": AsyncMock(return_value={"resources": [], "schedule": {"sprints": []}}),
+        "_run_verification": AsyncMock(return_value={"overall_score": 0}),
+        "_adjust_roadmap": AsyncMock(return_value={"recommendation": "hold"}),
+    }
+    for name, mock in orchestrator.stages.items():
+        setattr(orchestrator, name, mock)
+
+    async def begin_marathon(constraints, duration_hours, check_interval_minutes, tournament_mode, resume):
+        await orchestrator.run_pipeline(constraints, tournament_mode, resume=resume)
+    orchestrator.begin_marathon = begin_marathon
+    orchestrator.check_interval = None  # end right after the pipeline
+    orchestrator.end_marathon = AsyncMock()
+    return orchestrator
+
+
+@pytest.mark.asyncio
+async def test_reclaimed_pending_job_resumes_from_stage_checkpoints(temp_db, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # thought signature logs
+    crashed = MarathonJobQueue("crashed-worker", lease_seconds=60)
+    job_id = await crashed.enqueue("session-7", "user_7", "Data Scientist", "Kenya", claim=True)
+    job = await crashed.get("session-7")
+
+    # The crashed worker finished its stages but died before begin_marathon returned
+    with patch("app.agents.orchestrator.CareerVelocityEngine.calculate_velocity_metrics", new=AsyncMock(return_value={"velocity": 1})), \
+         patch("app.agents.orchestrator.StrategicCareerPathing.generate_career_trajectory", new=AsyncMock(return_value={"path": []})):
+        await _pipeline_orchestrator(job).run_pipeline({})
+        await _expire_lease(temp_db, job_id)
+        assert (job.status, job.cycle_count) == ("PENDING", 0)
+
+        built = []
+        scheduler = MarathonScheduler(max_workers=1, max_sessions=10)
+        worker = MarathonQueueWorker(scheduler, MarathonJobQueue("survivor"),
+                                     orchestrator_factory=lambda row: built.append(_pipeline_orchestrator(row)) or built[-1])
+        assert await worker.poll() == 1
+        for _ in range(200):
+            if built and built[0].end_marathon.await_count:
+                break
+            await asyncio.sleep(0.01)
+        await scheduler.stop()
+
+    assert scheduler.get("session-7").resume is True
+    for mock in built[0].stages.values():
+        mock.assert_not_called()
+    assert built[0].context["roadmap"] == {"milestones": [{"title": "M1"}]}
@@ -0,0 +1,100 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+from app.services.marathon_scheduler import MarathonScheduler, SchedulerCapacityError
+
+
+class FakeOrchestrator:
+    def __init__(self, cycles=3, interval=0.01):
+        self.cycles = cycles
+        self.check_interval = interval
+        self.cycle_count = 0
+        self.begin_marathon = AsyncMock()
+        self.end_marathon = AsyncMock()
+        self.stop_marathon_session = AsyncMock()
+        self.message_bus = AsyncMock()
+
+    async def run_marathon_cycle(self):
+        self.cycle_count += 1
+        return None if self.cycle_count >= self.cycles else self.check_interval
+
+
+async def _wait_for(predicate, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not reached")
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_sessions_run_to_completion_on_shared_workers():
+    scheduler = MarathonScheduler(max_workers=2, max_sessions=100)
+    orchestrators = [FakeOrchestrator(cycles=3) for _ in range(20)]
+    for n, orchestrator in enumerate(orchestrators):
+        scheduler.submit(f"s{n}", orchestrator)
+
+    await _wait_for(lambda: all(s.status == "COMPLETED" for s in scheduler.sessions.values()))
+    await scheduler.stop()
+
+    for orchestrator in orchestrators:
+        orchestrator.begin_marathon.assert_awaited_once()
+        orchestrator.end_marathon.assert_awaited_once()
+        assert orchestrator.cycle_count == 3
+    metrics = scheduler.metrics()
+    assert metrics["cycles_completed"] == 60
+    assert metrics["active_sessions"] == 0
+    assert scheduler.sessions["s0"].orchestrator is None
+
+
+@pytest.mark.asyncio
+async def test_pause_resume_and_cancel():
+    scheduler = MarathonScheduler(max_workers=4, max_sessions=10)
+    paused = FakeOrchestrator(cycles=1000, interval=0.02)
+    cancelled = FakeOrchestrator(cycles=1000, interval=0.02)
+    scheduler.submit("paused", paused)
+    scheduler.submit("cancelled", cancelled)
+    await _wait_for(lambda: paused.cycle_count >= 1 and cancelled.cycle_count >= 1)
+
+    scheduler.pause("paused")
+    scheduler.cancel("cancelled")
+    await _wait_for(lambda: not scheduler.sessions["paused"].in_flight)
+    frozen = paused.cycle_count
+    await asyncio.sleep(0.1)
+    assert paused.cycle_count == frozen
+
+    scheduler.resume("paused")
+    await _wait_for(lambda: paused.cycle_count > frozen)
+    await _wait_for(lambda: scheduler.sessions["cancelled"].orchestrator is None)
+    await scheduler.stop()
+
+    cancelled.stop_marathon_session.assert_awaited_once()
+    cancelled.end_marathon.assert_awaited_once()
+    assert scheduler.sessions["cancelled"].status == "CANCELLED"
+
+
+@pytest.mark.asyncio
+async def test_cancelling_an_idle_session_holds_its_close_task():
+    scheduler = MarathonScheduler(max_workers=1, max_sessions=10)
+    idle = FakeOrchestrator(cycles=1000, interval=10)
+    scheduler.submit("idle", idle)
+    session = scheduler.sessions["idle"]
+    await _wait_for(lambda: session.started and not session.in_flight)
+
+    scheduler.cancel("idle")
+    assert len(scheduler._closing) == 1
+    await scheduler.stop()  # waits for the close
+
+    idle.end_marathon.assert_awaited_once()
+    assert scheduler._closing == set()
+
+
+@pytest.mark.asyncio
+async def test_capacity_limit():
+    scheduler = MarathonScheduler(max_workers=1, max_sessions=1)
+    scheduler.submit("a", FakeOrchestrator(cycles=1000, interval=10))
+
+    with pytest.raises(SchedulerCapacityError):
+        scheduler.submit("b", FakeOrchestrator())
+    assert scheduler.metrics()["capacity_remaining"] == 0
+    await scheduler.stop()
@@ -0,0 +1,56 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services import marathon_queue, result_storage
+
+PAYLOAD = {"career_goal": "Data Scientist", "location": "Kenya", "current_status": "student"}
+
+
+@pytest.fixture
+def worker(monkeypatch, tmp_path):
+    monkeypatch.setattr(result_storage, "roadmap_results", {})
+    monkeypatch.setattr(result_storage, "DB_FILE", str(tmp_path / "roadmap_store.json"))
+    fake = SimpleNamespace(queue=SimpleNamespace(get=AsyncMock(return_value=None)), submit=AsyncMock())
+    monkeypatch.setattr(marathon_queue, "_marathon_queue_worker", fake)
+    return fake
+
+
+def test_new_session_gets_a_new_id(worker):
+    response = TestClient(app).post("/api/orchestrator/start", json=PAYLOAD)
+
+    assert response.status_code == 200
+    session_id = response.json()["session_id"]
+    assert session_id in result_storage.roadmap_results
+    assert worker.submit.await_args.args[0] == session_id
+    assert worker.submit.await_args.kwargs["resume"] is False
+
+
+def test_resume_keeps_the_session_id_and_user(worker):
+    worker.queue.get.return_value = SimpleNamespace(status="FAILED", user_id="user_old")
+    response = TestClient(app).post("/api/orchestrator/start", json={**PAYLOAD, "resume": True, "session_id": "session-1"})
+
+    assert response.status_code == 200
+    assert response.json()["session_id"] == "session-1"
+    assert response.json()["user_id"] == "user_old"
+    session_id, orchestrator = worker.submit.await_args.args
+    assert session_id == "session-1"
+    assert orchestrator.user_id == "user_old"
+    assert worker.submit.await_args.kwargs["resume"] is True
+    assert result_storage.roadmap_results == {}  # no new session record
+
+
+def test_resume_of_a_live_session_is_rejected(worker):
+    worker.queue.get.return_value = SimpleNamespace(status="RUNNING", user_id="user_old")
+    response = TestClient(app).post("/api/orchestrator/start", json={**PAYLOAD, "resume": True, "session_id": "session-1"})
+
+    assert response.status_code == 409
+    worker.submit.assert_not_awaited()
+
+
+def test_non_positive_check_interval_is_rejected(worker):
+    response = TestClient(app).post("/api/orchestrator/start", json={**PAYLOAD, "check_interval_minutes": 0})
+
+    assert response.status_code == 422
+    worker.submit.assert_not_awaited()
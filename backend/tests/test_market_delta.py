@@ -0,0 +1,74 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+from app.agents.orchestrator import CareerOrchestrator
+from app.services.market_delta import (
+    build_listing_index,
+    compute_listing_delta,
+    listing_identity,
+)
+
+
+def _job(n, description="Backend role"):
+    return {
+        "title": f"Engineer {n}",
+        "company": f"Co {n}",
+        "link": f"https://www.linkedin.com/jobs/view/{n}/?trk=feed",
+        "description": description,
+    }
+
+
+def test_identity_ignores_query_string_and_scheme():
+    a = listing_identity({"link": "https://LinkedIn.com/jobs/view/1/?trk=x"})
+    b = listing_identity({"link": "http://linkedin.com/jobs/view/1"})
+    assert a == b
+
+
+def test_identity_falls_back_to_title_company_cluster():
+    a = listing_identity({"title": "Data  Scientist", "company": "Safaricom", "link": "https://linkedin.com/jobs/view/..."})
+    b = listing_identity({"title": "data scientist", "company": "SAFARICOM"})
+    assert a == b
+
+
+def test_delta_reports_added_removed_changed():
+    previous = build_listing_index([_job(1), _job(2), _job(3)])
+    current = build_listing_index([_job(2), _job(3, "Now remote"), _job(4)])
+
+    delta = compute_listing_delta(previous, current)
+
+    assert len(delta.added) == 1
+    assert len(delta.removed) == 1
+    assert len(delta.changed) == 1
+    assert delta.net_change == 0
+    assert delta.is_material(min_changes=3)
+    assert not delta.is_material(min_changes=10, min_ratio=2.0)
+
+
+def test_same_count_turnover_is_detected():
+    previous = build_listing_index([_job(n) for n in range(10)])
+    current = build_listing_index([_job(n) for n in range(10, 20)])
+
+    delta = compute_listing_delta(previous, current)
+
+    assert delta.net_change == 0
+    assert delta.churn == 20
+    assert delta.is_material()
+
+
+@pytest.mark.asyncio
+async def test_unchanged_cycle_makes_no_llm_calls(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    orchestrator = CareerOrchestrator("delta_user", "Data Scientist", "Kenya")
+    listings = [_job(n) for n in range(5)]
+    orchestrator.context["research_data"] = {"listings": listings, "analysis": {"emerging_trends": ["MLOps"]}}
+    orchestrator.context["roadmap"] = {"milestones": []}
+
+    research = orchestrator.agents["research"]
+    with patch.object(research, "fetch_listings", new=AsyncMock(return_value=list(listings))), \
+         patch.object(research, "analyze_market_data", new=AsyncMock()) as analyze, \
+         patch.object(orchestrator.agents["planning"], "adjust_roadmap", new=AsyncMock()) as adjust:
+        await orchestrator._check_market_updates()
+
+    analyze.assert_not_called()
+    adjust.assert_not_called()
+    assert orchestrator.context["market_trend_history"][-1]["delta"]["churn"] == 0
+    assert orchestrator.context["research_data"]["analysis"]["emerging_trends"] == ["MLOps"]
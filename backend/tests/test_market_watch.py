@@ -0,0 +1,143 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from app.agents.orchestrator import CareerOrchestrator
+from app.services.market_watch import MarketWatchRegistry, watch_key
+
+
+def _job(n):
+    return {"title": f"Engineer {n}", "company": f"Co {n}", "link": f"https://jobs.example.com/{n}"}
+
+
+def _research_agent(listings):
+    agent = MagicMock()
+    agent.fetch_listings = AsyncMock(return_value=listings)
+    agent.analyze_market_data = AsyncMock(return_value={"listings": listings, "analysis": {"emerging_trends": ["LLMOps"]}})
+    return agent
+
+
+def test_watch_key_is_normalized():
+    assert watch_key(" Data  Scientist", "KENYA ") == watch_key("data scientist", "Kenya")
+
+
+@pytest.mark.asyncio
+async def test_identical_subscriptions_share_one_refresh():
+    registry = MarketWatchRegistry()
+    agent = _research_agent([_job(n) for n in range(10)])
+    received = {}
+
+    def callback(name):
+        async def on_snapshot(snapshot):
+            received[name] = snapshot
+        return on_snapshot
+
+    keys = {
+        registry.subscribe(f"user_{n}", "Data Scientist", "Kenya" if n % 2 else " kenya", callback(n), interval=3600, research_agent=agent)
+        for n in range(6)
+    }
+    assert len(keys) == 1
+
+    snapshot = await registry.refresh(keys.pop())
+
+    agent.fetch_listings.assert_awaited_once()
+    agent.analyze_market_data.assert_awaited_once()
+    assert snapshot.is_shift
+    assert set(received) == set(range(6))
+    assert all(s is snapshot for s in received.values())
+
+    stats = registry.stats()
+    assert stats["total_watches"] == 1
+    assert stats["dedupe_ratio"] == 6.0
+
+    for n in range(6):
+        registry.unsubscribe(f"user_{n}", snapshot.key)
+    assert registry.stats()["total_watches"] == 0
+
+
+@pytest.mark.asyncio
+async def test_subscriber_updates_are_bounded():
+    registry = MarketWatchRegistry(max_concurrent_updates=3)
+    agent = _research_agent([_job(n) for n in range(10)])
+    active = peak = 0
+
+    async def on_snapshot(snapshot):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+
+    for n in range(20):
+        key = registry.subscribe(f"user_{n}", "Backend", "Kenya", on_snapshot, interval=3600, research_agent=agent)
+    await registry.refresh(key)
+
+    assert peak == 3
+    for n in range(20):
+        registry.unsubscribe(f"user_{n}", key)
+
+
+@pytest.mark.asyncio
+async def test_quiet_refresh_skips_analysis():
+    registry = MarketWatchRegistry()
+    listings = [_job(n) for n in range(10)]
+    agent = _research_agent(listings)
+    key = registry.subscribe("user_1", "Backend", "Kenya", AsyncMock(), interval=3600, research_agent=agent,
+                             seed_research={"listings": listings})
+
+    snapshot = await registry.refresh(key)
+
+    agent.analyze_market_data.assert_not_called()
+    assert not snapshot.is_shift
+    registry.unsubscribe("user_1", key)
+
+
+@pytest.mark.asyncio
+async def test_session_only_adjusts_roadmap_on_shared_shift(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    registry = MarketWatchRegistry()
+    agent = _research_agent([_job(n) for n in range(10)])
+    orchestrator = CareerOrchestrator("watch_user", "Data Scientist", "Kenya")
+    orchestrator.is_running = True
+    orchestrator.context["roadmap"] = {"milestones": []}
+    orchestrator.agents["planning"].adjust_roadmap = AsyncMock(return_value={"milestones": ["new"]})
+    key = registry.subscribe("watch_user", "Data Scientist", "Kenya", orchestrator._on_market_snapshot, interval=3600, research_agent=agent)
+
+    await registry.refresh(key)
+
+    orchestrator.agents["planning"].adjust_roadmap.assert_awaited_once()
+    assert orchestrator.context["roadmap"] == {"milestones": ["new"]}
+    assert orchestrator.context["research_data"]["analysis"]["emerging_trends"] == ["LLMOps"]
+    registry.unsubscribe("watch_user", key)
+
+
+@pytest.mark.asyncio
+async def test_released_session_stops_receiving_snapshots(tmp_path, monkeypatch):
+    from app.services import market_watch
+    from app.services.marathon_scheduler import MarathonScheduler, ScheduledSession
+
+    monkeypatch.chdir(tmp_path)
+    registry = MarketWatchRegistry()
+    monkeypatch.setattr(market_watch, "_market_watch_registry", registry)
+    agent = _research_agent([_job(n) for n in range(10)])
+    orchestrator = CareerOrchestrator("lost_lease_user", "Data Scientist", "Kenya")
+    orchestrator.is_running = True
+    orchestrator.context["roadmap"] = {"milestones": []}
+    orchestrator.agents["planning"].adjust_roadmap = AsyncMock(return_value={"milestones": ["new"]})
+    orchestrator.save_thought_signature = AsyncMock()
+    key = registry.subscribe("lost_lease_user", "Data Scientist", "Kenya", orchestrator._on_market_snapshot,
+                             interval=3600, research_agent=agent)
+    orchestrator.market_watch_key = key
+    other_session = AsyncMock()
+    registry.subscribe("other_user", "Data Scientist", "Kenya", other_session, interval=3600, research_agent=agent)
+
+    scheduler = MarathonScheduler(max_workers=1, max_sessions=10)
+    scheduler.sessions["session-1"] = ScheduledSession("session-1", orchestrator)
+    scheduler.release("session-1")
+
+    assert orchestrator.is_running is False
+    assert list(registry.watches[key].subscribers) == ["other_user"]
+    await registry.refresh(key)
+    other_session.assert_awaited_once()
+    orchestrator.agents["planning"].adjust_roadmap.assert_not_awaited()
+    orchestrator.save_thought_signature.assert_not_awaited()  # no closing signature from a detach
+    registry.unsubscribe("other_user", key)
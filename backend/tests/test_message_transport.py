@@ -0,0 +1,166 @@
+import asyncio
+import pytest
+from app.agents.agent_message_bus import AgentMessageBus
+from app.agents import message_transport
+from app.agents.message_transport import MessageTransport, SQLiteLogTransport, build_transport, close_shared_transport
+
+
+def _bus(path, channel="session-1", **kwargs):
+    transport = SQLiteLogTransport(path=str(path), linger=0.01, poll_interval=0.01, **kwargs)
+    return AgentMessageBus(transport=transport, channel=channel), transport
+
+
+@pytest.mark.asyncio
+async def test_message_crosses_buses_through_shared_log(tmp_path):
+    log = tmp_path / "bus.db"
+    sender, sender_transport = _bus(log, consumer_id="api")
+    receiver, receiver_transport = _bus(log, start_from_latest=False)
+    received = []
+
+    async def handler(message):
+        received.append((message.from_agent, message.data["n"]))
+
+    receiver.subscribe("PlanningAgent", handler)
+    await sender.send_message("ResearchAgent", "PlanningAgent", "MARKET_SHIFT", {"n": 1})
+
+    assert await receiver.drain() == 1
+    assert received == [("ResearchAgent", 1)]
+    # Offset committed: nothing is delivered twice
+    assert await receiver.drain() == 0
+
+    sender_transport.close()
+    receiver_transport.close()
+
+
+@pytest.mark.asyncio
+async def test_channels_isolate_sessions_with_same_agent_names(tmp_path):
+    log = tmp_path / "bus.db"
+    bus_a, transport_a = _bus(log, channel="user_a", start_from_latest=False)
+    bus_b, transport_b = _bus(log, channel="user_b", start_from_latest=False)
+    received = {"user_a": [], "user_b": []}
+
+    for bus in (bus_a, bus_b):
+        async def handler(message, channel=bus.channel):
+            received[channel].append(message.data["n"])
+        bus.subscribe("PlanningAgent", handler)
+
+    await bus_a.send_message("ResearchAgent", "PlanningAgent", "T", {"n": 1})
+    await bus_b.send_message("ResearchAgent", "PlanningAgent", "T", {"n": 2})
+    await bus_a.drain()
+    await bus_b.drain()
+
+    assert received == {"user_a": [1], "user_b": [2]}
+    transport_a.close()
+    transport_b.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_sends_are_group_committed(tmp_path):
+    bus, transport = _bus(tmp_path / "bus.db", batch_size=64)
+
+    await asyncio.gather(*(bus.send_message("A", "PlanningAgent", "T", {"n": n}) for n in range(200)))
+
+    stats = transport.stats()
+    assert stats["published"] == 200
+    assert stats["batches_written"] <= 200 // 64 + 1
+    transport.close()
+
+
+@pytest.mark.asyncio
+async def test_uncommitted_batch_is_redelivered(tmp_path, monkeypatch):
+    log = tmp_path / "bus.db"
+    sender, sender_transport = _bus(log, consumer_id="api")
+    await sender.send_message("A", "PlanningAgent", "T", {"n": 1})
+    await sender.send_message("A", "PlanningAgent", "T", {"n": 2}, priority="CRITICAL")
+
+    crashed, crashed_transport = _bus(log, start_from_latest=False)
+    crashed.subscribe("PlanningAgent", lambda message: asyncio.sleep(0))
+
+    def crash(*args):
+        raise RuntimeError("process died before committing")
+
+    monkeypatch.setattr(crashed_transport, "_commit_offset", crash)
+    with pytest.raises(RuntimeError):
+        await crashed.drain()
+    crashed_transport.close()
+
+    # The replacement consumer resumes from the last committed offset
+    received = []
+
+    async def handler(message):
+        received.append(message.data["n"])
+
+    restarted, restarted_transport = _bus(log, start_from_latest=False)
+    restarted.subscribe("PlanningAgent", handler)
+    assert await restarted.drain() == 2
+    assert received == [2, 1]  # CRITICAL first within the batch
+
+    sender_transport.close()
+    restarted_transport.close()
+
+
+@pytest.mark.asyncio
+async def test_consumer_loop_delivers_while_router_runs(tmp_path):
+    log = tmp_path / "bus.db"
+    sender, sender_transport = _bus(log, consumer_id="api")
+    receiver, receiver_transport = _bus(log)
+    got = asyncio.Event()
+
+    async def handler(message):
+        got.set()
+
+    receiver.subscribe("PlanningAgent", handler)
+    router = asyncio.create_task(receiver.start_router())
+    await asyncio.sleep(0.05)  # consumer registers its offset at the log head
+
+    await sender.send_message("ResearchAgent", "PlanningAgent", "T", {})
+    await asyncio.wait_for(got.wait(), timeout=2)
+    await asyncio.sleep(0.05)  # let the batch commit its offset
+
+    router.cancel()
+    await asyncio.gather(router, return_exceptions=True)
+    assert receiver.metrics()["transport"]["consumed"] == 1
+    sender_transport.close()
+    receiver_transport.close()
+
+
+def test_transport_base_is_abstract():
+    with pytest.raises(TypeError):
+        MessageTransport()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_transport_is_shared_per_process(tmp_path, monkeypatch):
+    monkeypatch.setattr(message_transport, "_shared_sqlite_transport", None)
+    monkeypatch.setattr(message_transport.settings, "MESSAGE_BUS_LOG_PATH", str(tmp_path / "bus.db"))
+    monkeypatch.setattr(message_transport.settings, "MESSAGE_BUS_TRANSPORT", "sqlite")
+    bus_a = AgentMessageBus(channel="user_a")
+    bus_b = AgentMessageBus(channel="user_b")
+    transport = bus_a.transport
+    transport.poll_interval = 0.01
+    assert bus_b.transport is transport
+    received = {"user_a": asyncio.Event(), "user_b": asyncio.Event()}
+
+    routers = []
+    for bus in (bus_a, bus_b):
+        async def handler(message, channel=bus.channel):
+            received[channel].set()
+        bus.subscribe("PlanningAgent", handler)
+        routers.append(asyncio.create_task(bus.start_router()))
+    await asyncio.sleep(0.05)
+    assert transport.stats()["consumers"] == 2
+
+    # Stopping one session's router leaves the other consuming
+    routers[0].cancel()
+    await asyncio.gather(routers[0], return_exceptions=True)
+    assert transport.stats()["consumers"] == 1
+    await bus_b.send_message("ResearchAgent", "PlanningAgent", "T", {})
+    await asyncio.wait_for(received["user_b"].wait(), timeout=2)
+    assert len(transport._conns) == 2  # one writer and one reader for the whole process
+
+    await close_shared_transport()
+    routers[1].cancel()
+    await asyncio.gather(routers[1], return_exceptions=True)
+    assert transport._conns == {} and transport.stats()["consumers"] == 0
+    assert message_transport._shared_sqlite_transport is None
+    assert build_transport("inprocess") is not build_transport("inprocess")
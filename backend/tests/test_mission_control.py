@@ -0,0 +1,205 @@
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.main import app
+from app.services import mission_control
+from app.services.mission_control import MissionControl
+
+
+def test_cursor_returns_only_new_events_from_bounded_buffer():
+    mc = MissionControl()
+    for n in range(150):
+        mc.log_event("TEST", f"event {n}")
+
+    assert len(mc.mission_logs) == settings.MISSION_LOG_SIZE
+    assert mc.mission_logs[0]["message"] == "event 50"
+
+    newest = mc.get_logs(since=145)
+    assert [event["seq"] for event in newest] == [146, 147, 148, 149, 150]
+    assert mc.get_logs(since=mc.last_seq) == []
+    assert len(mc.get_logs(limit=3)) == 3
+
+
+def test_session_streams_are_isolated_and_lru_bounded(monkeypatch):
+    monkeypatch.setattr(settings, "MISSION_LOG_MAX_SESSIONS", 2)
+    mc = MissionControl()
+    mc.log_event("MARATHON", "a1", session_id="a")
+    mc.log_event("MARATHON", "b1", session_id="b")
+    mc.log_event("SYSTEM", "global only")
+    mc.log_event("MARATHON", "a2", session_id="a")
+
+    assert [e["message"] for e in mc.get_logs("a")] == ["a1", "a2"]
+    assert [e["message"] for e in mc.get_logs("a", since=1)] == ["a2"]
+    assert len(mc.get_logs()) == 4
+
+    mc.log_event("MARATHON", "c1", session_id="c")  # evicts "b", the least recently written
+    assert mc.get_logs("b") == []
+    assert [e["message"] for e in mc.get_logs("a")] == ["a1", "a2"]
+
+
+@pytest.mark.asyncio
+async def test_waiters_wake_on_new_events_and_time_out():
+    mc = MissionControl()
+    mc.log_event("SYSTEM", "old")
+
+    waiter = asyncio.create_task(mc.wait_for_events(since=mc.last_seq, timeout=2))
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+    mc.log_event("ALERT", "new")
+    events = await asyncio.wait_for(waiter, timeout=1)
+    assert [e["message"] for e in events] == ["new"]
+
+    assert await mc.wait_for_events(since=mc.last_seq, timeout=0.01) == []
+
+    stream = mc.stream(since=mc.last_seq, heartbeat=0.01)
+    assert await stream.__anext__() == []  # heartbeat
+    await stream.aclose()
+
+
+def test_logs_endpoint_supports_since_cursor(monkeypatch):
+    mc = MissionControl()
+    monkeypatch.setattr(mission_control, "_mission_control", mc)
+    for n in range(3):
+        mc.log_event("TEST", f"event {n}", session_id="s1")
+
+    client = TestClient(app)
+    first = client.get("/api/mission/logs", params={"session_id": "s1"}).json()
+    assert len(first["logs"]) == 3
+
+    mc.log_event("TEST", "event 3", session_id="s1")
+    second = client.get("/api/mission/logs", params={"session_id": "s1", "since": first["cursor"]}).json()
+    assert [e["message"] for e in second["logs"]] == ["event 3"]
+    assert second["cursor"] == mc.last_seq
+
+
+async def _run_scheduler(mc, seconds):
+    mc.is_running = True
+    loop_task = asyncio.create_task(mc._run_loop())
+    await asyncio.sleep(seconds)
+    mc.stop_loop()
+    await asyncio.gather(loop_task, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_jobs_run_on_their_interval_and_failures_are_counted():
+    mc = MissionControl()
+    calls = []
+
+    async def job():
+        calls.append(asyncio.get_running_loop().time())
+
+    async def broken():
+        raise ValueError("boom")
+
+    mc.register_job("fast", job, interval=0.05, jitter=0, run_immediately=True)
+    mc.register_job("broken", broken, interval=0.05, jitter=0)
+    await _run_scheduler(mc, 0.18)
+
+    assert 3 <= len(calls) <= 5
+    stats = {job["name"]: job for job in mc.job_stats()}
+    assert stats["broken"]["failures"] >= 2
+    assert stats["broken"]["last_error"] == "boom"
+
+
+@pytest.mark.asyncio
+async def test_slow_job_is_not_run_concurrently_and_overrun_is_detected():
+    mc = MissionControl()
+    active = 0
+    peak = 0
+
+    async def slow():
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.12)
+        active -= 1
+
+    mc.register_job("slow", slow, interval=0.03, jitter=0, run_immediately=True)
+    await _run_scheduler(mc, 0.2)
+
+    stats = mc.job_stats()[0]
+    assert peak == 1
+    assert stats["skipped"] >= 2
+    assert stats["overruns"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_registering_an_earlier_job_wakes_the_loop():
+    mc = MissionControl()
+    ran = asyncio.Event()
+
+    async def later():
+        pass
+
+    async def now():
+        ran.set()
+
+    mc.register_job("later", later, interval=60)
+    mc.is_running = True
+    loop_task = asyncio.create_task(mc._run_loop())
+    await asyncio.sleep(0.02)  # loop is asleep until "later" is due
+
+    mc.register_job("now", now, interval=60, run_immediately=True)
+    await asyncio.wait_for(ran.wait(), timeout=0.5)
+    mc.stop_loop()
+    await asyncio.gather(loop_task, return_exceptions=True)
+    assert mc.unregister_job("later")
+    assert [job["name"] for job in mc.job_stats()] == ["now"]
+
+
+@pytest.mark.asyncio
+async def test_cleanup_job_removes_expired_results(monkeypatch, tmp_path):
+    from datetime import datetime, timedelta
+    from app.main import cleanup_expired_results
+    from app.services import result_storage
+
+    monkeypatch.setattr(result_storage, "DB_FILE", str(tmp_path / "store.json"))
+    monkeypatch.setattr(result_storage, "roadmap_results", {
+        "old": {"created_at": datetime.now() - timedelta(hours=25)},
+        "fresh": {"created_at": datetime.now()}
+    })
+    await cleanup_expired_results()
+    assert list(result_storage.roadmap_results) == ["fresh"]
+
+
+@pytest.mark.asyncio
+async def test_registered_cleanup_job_expires_stored_results(monkeypatch, tmp_path):
+    from datetime import datetime, timedelta
+    from app.main import register_maintenance_jobs
+    from app.services import result_storage
+
+    monkeypatch.setattr(result_storage, "DB_FILE", str(tmp_path / "store.json"))
+    monkeypatch.setattr(result_storage, "roadmap_results", {
+        "old": {"created_at": (datetime.now() - timedelta(hours=25)).isoformat()},
+        "fresh": {"created_at": datetime.now().isoformat()},
+        "undated": {},
+        "malformed": {"created_at": "yesterday"}
+    })
+    mc = MissionControl()
+    register_maintenance_jobs(mc)
+    await mc._run_job(mc._jobs["cleanup_expired_results"])
+
+    stats = {job["name"]: job for job in mc.job_stats()}
+    assert stats["cleanup_expired_results"]["failures"] == 0
+    assert sorted(result_storage.roadmap_results) == ["fresh", "malformed", "undated"]
+
+
+@pytest.mark.asyncio
+async def test_registered_cache_refresh_job_prunes_expired_link_checks(monkeypatch):
+    import time
+    from app.main import register_maintenance_jobs
+    from app.services import link_health
+    from app.services.link_health import LinkHealthChecker
+
+    checker = LinkHealthChecker(ttl=60, negative_ttl=60)
+    monkeypatch.setattr(link_health, "_link_health", checker)
+    checker._cache["https://old.example"] = (time.monotonic() - 1, {"status": "ok"})
+    checker._cache["https://new.example"] = (time.monotonic() + 60, {"status": "ok"})
+
+    mc = MissionControl()
+    register_maintenance_jobs(mc)
+    assert {job["name"] for job in mc.job_stats()} == {"cleanup_expired_results", "refresh_caches"}
+    await mc._run_job(mc._jobs["refresh_caches"])
+
+    assert list(checker._cache) == ["https://new.example"]
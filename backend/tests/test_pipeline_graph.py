@@ -0,0 +1,90 @@
+import asyncio
+import time
+import pytest
+from unittest.mock import AsyncMock, patch
+from app.agents.orchestrator import CareerOrchestrator
+from app.agents.pipeline_graph import StageGraph, PipelineStageError
+
+
+def _sleeper(value, delay=0.1):
+    async def stage(results):
+        await asyncio.sleep(delay)
+        return value
+    return stage
+
+
+@pytest.mark.asyncio
+async def test_independent_stages_overlap():
+    graph = StageGraph()
+    graph.add_stage("root", _sleeper("r", 0.01))
+    graph.add_stage("a", _sleeper("a"), depends_on=["root"])
+    graph.add_stage("b", _sleeper("b"), depends_on=["root"])
+    graph.add_stage("c", _sleeper("c"), depends_on=["root"])
+
+    started = time.perf_counter()
+    results = await graph.run()
+    elapsed = time.perf_counter() - started
+
+    assert results == {"root": "r", "a": "a", "b": "b", "c": "c"}
+    assert elapsed < 0.25
+    assert set(graph.timings) == {"root", "a", "b", "c"}
+    assert all(t["status"] == "completed" for t in graph.timings.values())
+
+
+@pytest.mark.asyncio
+async def test_dependencies_see_upstream_results():
+    async def double(results):
+        return results["root"] * 2
+
+    graph = StageGraph()
+    graph.add_stage("double", double, depends_on=["root"])
+    graph.add_stage("root", _sleeper(21, 0))
+
+    assert (await graph.run())["double"] == 42
+
+
+@pytest.mark.asyncio
+async def test_stage_timeout_raises_and_records_status():
+    graph = StageGraph()
+    graph.add_stage("slow", _sleeper("x", 1.0), timeout=0.05)
+
+    with pytest.raises(PipelineStageError) as exc:
+        await graph.run()
+
+    assert exc.value.stage == "slow"
+    assert graph.timings["slow"]["status"] == "timeout"
+
+
+def test_cycle_is_rejected():
+    graph = StageGraph()
+    graph.add_stage("a", _sleeper(1), depends_on=["b"])
+    graph.add_stage("b", _sleeper(2), depends_on=["a"])
+
+    with pytest.raises(ValueError):
+        graph.execution_order()
+
+
+@pytest.mark.asyncio
+async def test_run_pipeline_records_stage_timings(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    orchestrator = CareerOrchestrator("graph_user", "Backend Developer")
+    roadmap = {"milestones": [{"title": "M1", "focus": ["Python"]}]}
+
+    with patch.object(orchestrator, "_run_research", new=AsyncMock(return_value={"listings": []})), \
+         patch.object(orchestrator, "_run_planning", new=AsyncMock(return_value=roadmap)), \
+         patch.object(orchestrator, "_run_execution", new=AsyncMock(return_value={"resources": [], "schedule": {"sprints": []}})), \
+         patch.object(orchestrator, "_run_verification", new=AsyncMock(return_value={"overall_score": 0})), \
+         patch.object(orchestrator, "_adjust_roadmap", new=AsyncMock(return_value={"recommendation": "hold"})), \
+         patch("app.agents.orchestrator.CareerVelocityEngine.calculate_velocity_metrics", new=AsyncMock(return_value={})), \
+         patch("app.agents.orchestrator.StrategicCareerPathing.generate_career_trajectory", new=AsyncMock(return_value={"path": []})), \
+         patch.object(orchestrator.db, "load_user_progress", new=AsyncMock(return_value=None)), \
+         patch.object(orchestrator.db, "save_stage_checkpoint", new=AsyncMock()) as save_checkpoint:
+        context = await orchestrator.run_pipeline({"hours_per_week": 10})
+
+    assert context["roadmap"] == roadmap
+    assert save_checkpoint.await_count == 7
+    assert context["suggested_adjustment"] == {"recommendation": "hold"}
+    complete = [s for s in orchestrator.thought_signatures if s["step"] == "PIPELINE_COMPLETE"][-1]
+    assert set(complete["metadata"]["stage_timings"]) == {
+        "research", "planning", "execution", "verification", "velocity", "trajectory", "adjustment"
+    }
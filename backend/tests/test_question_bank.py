@@ -0,0 +1,141 @@
+import asyncio
+import json
+import time
+import pytest
+import pytest_asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+from app.agents.verification_agent import VerificationAgent
+from app.services import question_bank
+from app.services.question_bank import QuestionBank, normalize_skill
+
+ROADMAP = {"career_goal": "Data Engineer", "milestones": [{"title": "M1", "focus": ["Python", "SQL", "Docker"]}]}
+
+
+class FakeGemini:
+    """Answers question-bank prompts with numbered questions; counts calls."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.prompts = []
+
+    async def __call__(self, prompt, generation_config=None):
+        self.prompts.append(prompt)
+        await asyncio.sleep(self.delay)
+        n = len(self.prompts)
+        if "multiple-choice" in prompt:
+            skill = prompt.split("testing the skill: ")[1].split(".")[0].strip()
+            items = [{"q": f"{skill} question {n}.{i}?", "options": ["a", "b", "c", "d"], "correct_answer": "a"} for i in range(10)]
+        else:
+            items = [f"Interview question {n}.{i}?" for i in range(10)]
+        return SimpleNamespace(text=json.dumps(items))
+
+
+@pytest_asyncio.fixture
+async def bank(tmp_path, monkeypatch):
+    bank = QuestionBank(path=str(tmp_path / "bank.json"), batch_size=10, low_watermark=3, max_per_bucket=100)
+    monkeypatch.setattr(question_bank, "_question_bank", bank)
+    yield bank
+    await bank.close()
+
+
+def _patched(fake):
+    return patch("app.agents.verification_agent.gemini_client.generate_content_async", new_callable=AsyncMock, side_effect=fake.__call__)
+
+
+def test_normalize_skill():
+    assert normalize_skill("  Python3 ") == "python"
+    assert normalize_skill("Node.js") == "nodejs"
+    assert normalize_skill("Machine   Learning.") == "machine learning"
+    assert normalize_skill("") == "general"
+
+
+@pytest.mark.asyncio
+async def test_warm_bank_needs_no_model_calls(bank):
+    fake = FakeGemini()
+    agent = VerificationAgent()
+    with _patched(fake):
+        first = await agent.verify_skills(ROADMAP, user_id="alice")
+        cold_calls = len(fake.prompts)
+        second = await agent.verify_skills(ROADMAP, user_id="alice")
+
+    assert cold_calls == 5  # 3 quiz skills + technical + behavioral
+    assert len(fake.prompts) == cold_calls
+    assert len(first["quiz"]["questions"]) == 3
+    assert {q["q"].split(" ")[0] for q in first["quiz"]["questions"]} == {"python", "sql", "docker"}
+    assert len(second["mock_interview"]["technical"]) == 3
+    # No repeats for the same user
+    asked = [q["q"] for q in first["quiz"]["questions"] + second["quiz"]["questions"]]
+    assert len(set(asked)) == 6
+    assert not set(first["mock_interview"]["behavioral"]) & set(second["mock_interview"]["behavioral"])
+
+
+@pytest.mark.asyncio
+async def test_quiz_and_interview_are_generated_concurrently(bank):
+    fake = FakeGemini(delay=0.2)
+    with _patched(fake):
+        started = time.monotonic()
+        await VerificationAgent().verify_skills(ROADMAP)
+        elapsed = time.monotonic() - started
+
+    assert len(fake.prompts) == 5
+    assert elapsed < 0.5  # one round of calls, not five
+
+
+@pytest.mark.asyncio
+async def test_bank_refills_in_background_when_running_low(bank):
+    fake = FakeGemini()
+    with _patched(fake):
+        agent = VerificationAgent()
+        roadmap = {"career_goal": "Data Engineer", "milestones": [{"focus": ["SQL"]}]}
+        for _ in range(2):  # 6 of the 10 SQL questions served: still enough left
+            await agent._generate_gemini_quiz(roadmap, "bob")
+        assert bank.stats()["background_refills"] == 0
+
+        await agent._generate_gemini_quiz(roadmap, "bob")  # 1 left: top up in the background
+        assert bank.stats()["background_refills"] == 1
+        while bank.stats()["refilling"]:
+            await asyncio.sleep(0.01)
+
+    assert bank.size("quiz", "sql", "intermediate") == 20
+    assert bank.unseen("quiz", "sql", "intermediate", "bob") == 11
+    assert bank.stats()["generator_calls"] == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_generation(bank):
+    fake = FakeGemini(delay=0.05)
+    with _patched(fake):
+        agent = VerificationAgent()
+        roadmap = {"milestones": [{"focus": ["Go"]}]}
+        results = await asyncio.gather(*(agent._generate_gemini_quiz(roadmap, f"user{n}") for n in range(4)))
+
+    assert len(fake.prompts) == 1
+    assert all(len(result["questions"]) == 3 for result in results)
+
+
+@pytest.mark.asyncio
+async def test_bank_persists_and_cycles_when_exhausted(bank):
+    bank.add("technical", "Data Engineer", "intermediate", ["What is a DAG?", "Explain partitioning.", "what is a dag"])
+    assert bank.size("technical", "data engineer", "intermediate") == 2  # near-duplicate skipped
+
+    first = bank.sample("technical", "data engineer", "intermediate", 2, "carol")
+    again = bank.sample("technical", "data engineer", "intermediate", 1, "carol")  # all seen: cycle restarts
+    assert sorted(first) == ["Explain partitioning.", "What is a DAG?"]
+    assert again[0] in first
+    await bank.flush()
+
+    reloaded = QuestionBank(path=bank.path)
+    assert reloaded.size("technical", "Data Engineer", "intermediate") == 2
+    assert reloaded.unseen("technical", "Data Engineer", "intermediate", "carol") == 1
+
+
+@pytest.mark.asyncio
+async def test_generation_failure_keeps_error_shape(bank):
+    failing = AsyncMock(side_effect=RuntimeError("quota exceeded"))
+    with patch("app.agents.verification_agent.gemini_client.generate_content_async", failing):
+        result = await VerificationAgent().verify_skills(ROADMAP)
+
+    assert result["quiz"]["questions"] == []
+    assert "quota exceeded" in result["quiz"]["error"]
+    assert result["mock_interview"]["technical"] == []
@@ -0,0 +1,173 @@
+import json
+import threading
+import time
+import pytest
+import pytest_asyncio
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from app.services.http_pool import HttpPool
+from app.services.repo_audit import RepoAuditor, match_requirements, parse_repo, static_checks
+
+SHA = "a" * 40
+PACKAGE = json.dumps({"dependencies": {"express": "^4", "mongoose": "^8", "jsonwebtoken": "^9"}, "devDependencies": {"jest": "^29"}})
+PYPROJECT = '[project]\nname = "shop"\ndependencies = ["fastapi>=0.110", "sqlmodel", "python-jose[cryptography]"]\n'
+TREE = ["README.md", "package.json", "src/routes/users.js", "src/middleware/auth.js", "src/models/user.js", "Dockerfile"]
+
+
+class FakeGitHub(ThreadingHTTPServer):
+    """Serves the API (commit SHA, tree) and the raw-content host on one port."""
+    daemon_threads = True
+
+    def __init__(self, address, handler):
+        super().__init__(address, handler)
+        self.lock = threading.Lock()
+        self.hits = Counter()
+        self.sha = SHA
+        self.delay = 0.0
+        self.files = {"README.md": "# Shop API\nAn express backend.", "package.json": PACKAGE}
+        self.tree = TREE
+
+
+class GitHubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        path = self.path.split("?")[0]
+        with server.lock:
+            server.hits[path] += 1
+        time.sleep(server.delay)
+        if path == "/api/repos/dev/shop/commits/HEAD":
+            self._send(200, server.sha)
+        elif path == f"/api/repos/dev/shop/git/trees/{server.sha}":
+            self._send(200, json.dumps({"tree": [{"path": p, "type": "blob"} for p in server.tree]}))
+        elif path.startswith(f"/raw/dev/shop/{server.sha}/") and path.rsplit("/", 1)[1] in server.files:
+            self._send(200, server.files[path.rsplit("/", 1)[1]])
+        else:
+            self._send(404, "Not Found")
+
+    def _send(self, code, body):
+        data = body.encode()
+        self.send_response(code)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def github():
+    server = FakeGitHub(("127.0.0.1", 0), GitHubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest_asyncio.fixture
+async def auditor(github):
+    pool = HttpPool(timeout=5, per_host=8)
+    yield RepoAuditor(api_url=f"{github.url}/api", raw_url=f"{github.url}/raw", pool=pool)
+    await pool.aclose()
+
+
+def _gemini(verdict):
+    return SimpleNamespace(generate_content_async=AsyncMock(return_value=SimpleNamespace(text=json.dumps(verdict))))
+
+
+def test_parse_repo():
+    assert parse_repo("https://github.com/dev/shop") == ("dev", "shop")
+    assert parse_repo("https://github.com/dev/shop.git") == ("dev", "shop")
+    assert parse_repo("https://github.com/dev/shop/tree/main/src") == ("dev", "shop")
+    assert parse_repo("https://gitlab.com/dev/shop") is None
+
+
+def test_static_checks_read_manifests_and_tree():
+    checks = static_checks({"pyproject.toml": PYPROJECT, "requirements.txt": "# pinned\nPyJWT==2.8\n-r base.txt\n"}, ["app/api/routes.py", "tests/test_api.py"])
+
+    assert checks["dependencies"] == ["fastapi", "pyjwt", "python-jose", "sqlmodel"]
+    assert checks["markers"]["api"] and checks["markers"]["auth"] and checks["markers"]["database"]
+    assert checks["markers"]["tests"]
+    assert not checks["markers"]["docker"]
+
+
+def test_requirement_keywords_match_whole_words_only():
+    checks = {"dependencies": [], "markers": {marker: True for marker in ("api", "auth", "database", "tests", "docker", "ci", "frontend")}}
+    confirmed = ["REST endpoints", "User sign in", "Unit tests", "Containers", "CI/CD pipeline", "React UI"]
+    prefixes = ["Restaurant menu", "City search", "Signal processing", "uint8 buffers", "Testimonials page", "Dbase export"]
+
+    found, unresolved = match_requirements(confirmed + prefixes, checks)
+    assert found == confirmed
+    assert unresolved == prefixes
+
+
+@pytest.mark.asyncio
+async def test_prefix_words_are_not_confirmed_statically(github, auditor):
+    client = _gemini({"verified": False, "score": 20, "found_features": [], "missing_features": ["ordering"], "feedback": "no"})
+    result = await auditor.audit("https://github.com/dev/shop", ["Build a restaurant ordering system"], client)
+
+    assert result["source"] == "gemini"
+    assert result["verified"] is False
+    client.generate_content_async.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_static_checks_confirm_requirements_without_gemini(github, auditor):
+    client = _gemini({})
+    result = await auditor.audit("https://github.com/dev/shop", ["authentication", "database", "api"], client)
+
+    assert result["verified"] is True
+    assert result["source"] == "static"
+    assert result["commit"] == SHA
+    assert result["static_checks"]["evidence"]["database"][0] == "mongoose"
+    client.generate_content_async.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_files_are_fetched_concurrently(github, auditor):
+    github.delay = 0.15
+    started = time.monotonic()
+    await auditor.snapshot("dev", "shop")
+    elapsed = time.monotonic() - started
+
+    # SHA first, then 4 files + tree in parallel: two round trips, not six
+    assert elapsed < 0.5
+    assert github.hits[f"/raw/dev/shop/{SHA}/pyproject.toml"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unchanged_repo_is_served_from_cache(github, auditor):
+    client = _gemini({"verified": True, "score": 80, "found_features": ["payments"], "missing_features": [], "feedback": "ok"})
+    requirements = ["api", "stripe payments"]
+
+    first = await auditor.audit("https://github.com/dev/shop", requirements, client)
+    second = await auditor.audit("https://github.com/dev/shop/", requirements, client)
+
+    assert first["source"] == "gemini" and first["cached"] is False
+    assert second["cached"] is True and second["snapshot_cached"] is True
+    assert client.generate_content_async.await_count == 1
+    assert "stripe payments" in client.generate_content_async.await_args.args[0]
+    assert github.hits[f"/raw/dev/shop/{SHA}/README.md"] == 1  # only the SHA lookup was repeated
+    assert github.hits["/api/repos/dev/shop/commits/HEAD"] == 2
+
+    # A new commit invalidates both the snapshot and the verdict
+    github.sha = "b" * 40
+    github.files["package.json"] = json.dumps({"dependencies": {"express": "^4", "stripe": "^14"}})
+    third = await auditor.audit("https://github.com/dev/shop", requirements, client)
+    assert third["source"] == "static"
+    assert third["commit"] == "b" * 40
+
+
+@pytest.mark.asyncio
+async def test_inaccessible_repo(github, auditor):
+    client = _gemini({})
+    result = await auditor.audit("https://github.com/dev/private-repo", ["api"], client)
+
+    assert result["verified"] is False
+    assert "Could not access" in result["reason"]
+    client.generate_content_async.assert_not_awaited()
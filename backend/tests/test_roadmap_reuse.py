@@ -0,0 +1,160 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from app.schemas.roadmap import RoadmapInput
+from app.services import result_storage, roadmap_reuse
+from app.services.roadmap_reuse import RequestFingerprint, RoadmapReuse
+
+ROADMAP = {
+    "summary": "Six months to a backend role.",
+    "additional_info": "",
+    "months": [
+        {"month": 1, "title": "Python", "skills": ["Python", "Git"], "tasks": []},
+        {"month": 2, "title": "APIs", "skills": ["FastAPI", "SQL"], "tasks": []}
+    ]
+}
+
+
+def _input(**overrides):
+    data = {
+        "name": "Amina", "location": "Kenya", "current_status": "Student", "skills": ["Python", "Git", "SQL", "Linux"],
+        "skill_level": "beginner", "target_role": "Backend Developer", "hours_per_week": 10,
+        "timeframe_months": 6, "constraints": ["laptop"]
+    }
+    data.update(overrides)
+    return RoadmapInput(**data)
+
+
+@pytest.fixture
+def storage(monkeypatch, tmp_path):
+    monkeypatch.setattr(result_storage, "roadmap_results", {})
+    monkeypatch.setattr(result_storage, "DB_FILE", str(tmp_path / "store.json"))
+    return result_storage.roadmap_results
+
+
+def _reuse(monkeypatch, **kwargs):
+    reuse = RoadmapReuse(**{"policy": "near", "min_similarity": 0.6, "max_age_hours": 24, "personalize": True, **kwargs})
+    monkeypatch.setattr(roadmap_reuse, "_roadmap_reuse", reuse)
+    return reuse
+
+
+class Generator:
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.delay = delay
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return result_storage.store_roadmap_result(dict(ROADMAP))
+
+
+def test_fingerprint_normalizes_request():
+    first = RequestFingerprint(_input(target_role="Jr. Backend Dev", skills=["python", " Git ", "SQL", "linux"]))
+    second = RequestFingerprint(_input(target_role="junior backend developer", skills=["Linux", "SQL", "git", "Python"]))
+    other_skills = RequestFingerprint(_input(target_role="junior backend developer", skills=["Python", "Git", "SQL"]))
+
+    assert first.role == "junior backend developer"
+    assert first.exact == second.exact
+    assert other_skills.exact != first.exact and other_skills.bucket == first.bucket
+    assert first.similarity(other_skills.skills) == 0.75
+    assert RequestFingerprint(_input(timeframe_months=3)).bucket != first.bucket
+
+
+@pytest.mark.asyncio
+async def test_identical_request_reuses_stored_roadmap(storage, monkeypatch):
+    reuse = _reuse(monkeypatch)
+    create = Generator()
+
+    first = await reuse.get_or_create(_input(), create)
+    second = await reuse.get_or_create(_input(name="Brian"), create)
+
+    assert create.calls == 1
+    assert first != second
+    copy = storage[second]
+    assert copy["reuse"] == {"source_id": first, "match": "exact", "similarity": 1.0}
+    assert copy["summary"].startswith("Brian, here is your plan.")
+    assert "Month 1: Python, Git" in copy["additional_info"] and "Month 2: SQL" in copy["additional_info"]
+    assert storage[first]["summary"] == ROADMAP["summary"]  # the source is not modified
+
+
+@pytest.mark.asyncio
+async def test_near_match_threshold(storage, monkeypatch):
+    reuse = _reuse(monkeypatch)
+    create = Generator()
+    source = await reuse.get_or_create(_input(), create)
+
+    near = await reuse.get_or_create(_input(skills=["Python", "Git", "SQL"]), create)
+    assert storage[near]["reuse"]["match"] == "near"
+    assert storage[near]["reuse"]["source_id"] == source  # copies are never used as sources
+    assert create.calls == 1
+
+    await reuse.get_or_create(_input(skills=["Python", "Docker"]), create)
+    await reuse.get_or_create(_input(skills=["Python", "Git", "SQL", "Linux"], location="Nigeria"), create)
+    assert create.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_policies_and_age(storage, monkeypatch):
+    create = Generator()
+    exact_only = _reuse(monkeypatch, policy="exact")
+    await exact_only.get_or_create(_input(), create)
+    await exact_only.get_or_create(_input(skills=["Python", "Git", "SQL"]), create)
+    assert create.calls == 2
+
+    off = _reuse(monkeypatch, policy="off")
+    await off.get_or_create(_input(), create)
+    assert create.calls == 3
+    assert off.stats()["hit_rate"] == 0.0
+
+    # Results older than the reuse window are regenerated
+    fresh = _reuse(monkeypatch)
+    for record in storage.values():
+        record["created_at"] = (datetime.now() - timedelta(hours=30)).isoformat()
+    await fresh.get_or_create(_input(), create)
+    assert create.calls == 4
+
+
+@pytest.mark.asyncio
+async def test_index_is_rebuilt_from_storage(storage, monkeypatch):
+    create = Generator()
+    source = await _reuse(monkeypatch).get_or_create(_input(), create)
+
+    restarted = _reuse(monkeypatch, personalize=False)
+    result_id = await restarted.get_or_create(_input(), create)
+    assert create.calls == 1
+    assert storage[result_id]["reuse"]["source_id"] == source
+    assert storage[result_id]["summary"] == ROADMAP["summary"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests_share_one_generation(storage, monkeypatch):
+    reuse = _reuse(monkeypatch)
+    create = Generator(delay=0.05)
+
+    ids = await asyncio.gather(*(reuse.get_or_create(_input(), create) for _ in range(4)))
+
+    assert create.calls == 1
+    assert len(set(ids)) == 4
+    stats = reuse.stats()
+    assert stats["coalesced"] == 3
+    assert stats["exact_hits"] == 3 and stats["hit_rate"] == 0.75
+
+    # Coalesced requests still waited for the generation; a later hit does not
+    await reuse.get_or_create(_input(), create)
+    assert reuse.stats()["latency_saved_seconds"] > 0
+
+
+@pytest.mark.asyncio
+async def test_failed_generation_is_not_cached(storage, monkeypatch):
+    reuse = _reuse(monkeypatch)
+
+    async def failing():
+        raise RuntimeError("quota exceeded")
+
+    with pytest.raises(RuntimeError):
+        await reuse.get_or_create(_input(), failing)
+    create = Generator()
+    await reuse.get_or_create(_input(), create)
+    assert create.calls == 1
+    assert reuse.stats()["generations"] == 1
@@ -0,0 +1,117 @@
+import asyncio
+import time
+import pytest
+import pytest_asyncio
+from app.agents.execution_agent import ExecutionAgent
+from app.services import sandbox_pool
+from app.services.sandbox_pool import SandboxPool
+
+
+@pytest_asyncio.fixture
+async def pool():
+    pool = SandboxPool(size=2, timeout=1, execute=False)
+    yield pool
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_batch_compiles_blocks_in_one_round_trip(pool):
+    results = await pool.check([
+        "def ok(value):\n    return value * 2\n",
+        "def broken(:\n    pass\n",
+        "print('hello world')"
+    ])
+
+    assert [r["ok"] for r in results] == [True, False, True]
+    assert results[1]["kind"] == "syntax"
+    assert "SyntaxError" in results[1]["error"]
+    assert pool.stats()["batches"] == 1
+    assert pool.stats()["blocks"] == 3
+
+
+@pytest.mark.asyncio
+async def test_execute_reports_runtime_errors_and_timeouts(pool):
+    results = await pool.check([
+        "total = sum(range(10))\nassert total == 45\n",
+        "raise ValueError('bad example')",
+        "while True:\n    pass\n",
+        "import sys\nsys.exit(0)\n"
+    ], execute=True)
+
+    assert results[0]["ok"] is True
+    assert results[1]["kind"] == "runtime"
+    assert "ValueError: bad example" in results[1]["error"]
+    assert results[2]["kind"] in ("timeout", "killed")
+    assert results[3]["ok"] is True
+    # The worker survives user code and keeps serving
+    assert (await pool.check(["x = 1 + 1  # still alive"]))[0]["ok"] is True
+    assert pool.stats()["restarts"] == 0
+
+
+@pytest.mark.asyncio
+async def test_dead_worker_is_replaced(pool):
+    await pool.check(["warm_up = True"])
+    for worker in pool._workers:
+        worker.kill()
+        await worker.process.wait()
+
+    results = await pool.check(["value = 'after crash'"])
+    assert results[0]["kind"] == "crash"
+    assert pool.stats()["restarts"] == 1
+
+    # Next batch goes to the replacement or the other (also dead) worker, which is replaced too
+    await pool.check(["value = 'again'"])
+    results = await pool.check(["value = 'recovered'"])
+    assert results[0]["ok"] is True
+    assert len(pool._workers) == 2
+
+
+@pytest.mark.asyncio
+async def test_workers_are_recycled_after_max_tasks():
+    pool = SandboxPool(size=1, timeout=1, execute=False, max_tasks_per_worker=2)
+    try:
+        first = None
+        for _ in range(3):
+            await pool.check(["value = 1 + 1"])
+            first = first or pool._workers[0].process.pid
+        assert pool.stats()["restarts"] == 1
+        assert pool._workers[0].process.pid != first
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_event_loop_stays_responsive(pool):
+    await pool.check(["warm_up = True"])
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    started = time.monotonic()
+    await pool.check(["import time\ntime.sleep(0.3)\n"], execute=True)
+    task.cancel()
+
+    assert time.monotonic() - started >= 0.3
+    assert ticks >= 10
+
+
+@pytest.mark.asyncio
+async def test_agent_sandbox_uses_pool(pool, monkeypatch):
+    monkeypatch.setattr(sandbox_pool, "_sandbox_pool", pool)
+    agent = ExecutionAgent()
+    blocks = [{"code": "def add(a, b):\n    return a + b\n"}, {"code": "x ="}, {"code": "def (broken syntax here"}]
+    blocks += [{"code": f"value_{n} = {n} * 2"} for n in range(12)]
+
+    results = await agent._test_code_in_sandbox(blocks)
+
+    assert results["total_blocks"] == 15
+    assert results["tested_blocks"] == 9  # first 10 only, "x =" is too short
+    assert results["syntax_errors"] == 1
+    assert results["errors"][0]["block_index"] == 2
+    assert results["pass_rate"] == pytest.approx(8 / 9)
+    assert pool.stats()["batches"] == 1
@@ -0,0 +1,129 @@
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.agents.execution_agent import ExecutionAgent
+from app.services.schedule_builder import ScheduleConstraints, build_schedule, polish_reminders
+
+ROADMAP = {
+    "months": [
+        {
+            "month": 1,
+            "title": "Python Foundations",
+            "skills": ["Python", "Git", "SQL"],
+            "tasks": ["Set up a dev environment", "Complete a Python basics course", "Write 10 katas"],
+            "projects": ["CLI expense tracker"]
+        },
+        {
+            "month": 2,
+            "title": "Web APIs",
+            "skills": ["FastAPI", "REST"],
+            "tasks": ["Build CRUD endpoints", "Write API tests"],
+            "projects": ["Deploy a todo API"]
+        },
+        {"month": 3, "title": "Not scheduled yet", "skills": ["Docker"], "tasks": [], "projects": []}
+    ]
+}
+
+
+def _week_minutes(sprint):
+    return sum(day.duration_min for day in sprint.days)
+
+
+@pytest.mark.parametrize("hours", [0, 1, 3, 7.5, 10, 15, 40])
+@pytest.mark.parametrize("constraints", [[], ["Evening-only study"], ["weekends only"], ["no Mondays", "max 1 hour per day"]])
+def test_weekly_budget_is_never_exceeded(hours, constraints):
+    schedule = build_schedule(ROADMAP, hours, constraints)
+
+    assert len(schedule.sprints) == 4
+    for sprint in schedule.sprints:
+        assert [day.day for day in sprint.days][0] == "Monday" and len(sprint.days) == 7
+        assert _week_minutes(sprint) <= hours * 60
+        assert all(day.duration_min % 15 == 0 for day in sprint.days)
+
+
+def test_tasks_are_packed_in_order_and_phases_map_to_weeks():
+    schedule = build_schedule(ROADMAP, 10)
+
+    assert [sprint.milestone_title for sprint in schedule.sprints] == ["Python Foundations"] * 2 + ["Web APIs"] * 2
+    week_one = " + ".join(day.topic for day in schedule.sprints[0].days)
+    assert week_one.index("Set up a dev environment") < week_one.index("Write 10 katas") < week_one.index("Study Python")
+    assert "Project: CLI expense tracker" in week_one
+    assert "Docker" not in json.dumps(schedule.model_dump())
+    assert all(_week_minutes(sprint) >= 10 * 60 - 15 * 7 for sprint in schedule.sprints)  # budget is actually used
+
+
+def test_unfinished_work_carries_over_to_the_next_week():
+    schedule = build_schedule(ROADMAP, 2)
+
+    topics = [day.topic for sprint in schedule.sprints for day in sprint.days]
+    assert sum(1 for topic in topics[:7] if topic != "Rest day") == 2  # 2 hours: two 60-minute days, not seven slivers
+    assert not any("Write 10 katas" in topic for topic in topics[:7])
+    assert any("Write 10 katas" in topic for topic in topics[7:14])
+
+
+def test_long_items_are_split_over_successive_days():
+    schedule = build_schedule(ROADMAP, 3)  # 45-minute study days
+    days = [(sprint.week_number, day.day, day.topic) for sprint in schedule.sprints for day in sprint.days]
+    project = [entry for entry in days if "CLI expense tracker" in entry[2]]
+
+    assert len(project) == 3  # 120 minutes as 45 + 45 + 30
+    assert "(cont.)" not in project[0][2] and all("(cont.)" in entry[2] for entry in project[1:])
+    assert [days.index(entry) for entry in project] == sorted(days.index(entry) for entry in project)
+
+
+def test_evening_only_and_day_constraints():
+    evening = build_schedule(ROADMAP, 20, ["I can only study in the evening"])
+    assert all(day.duration_min <= 120 for sprint in evening.sprints for day in sprint.days)
+    assert "this evening" in evening.sprints[0].days[0].reminder_text
+
+    weekends = build_schedule(ROADMAP, 6, ["Weekends only"])
+    assert all(day.duration_min == 0 for day in weekends.sprints[0].days[:5])
+    assert weekends.sprints[0].days[5].duration_min > 0
+
+    parsed = ScheduleConstraints(["no Fridays", "laptop", "4G bundles"])
+    assert parsed.days == ["Monday", "Tuesday", "Wednesday", "Thursday", "Saturday", "Sunday"]
+    assert "Sunday" not in ScheduleConstraints(["need a rest day"]).days
+    assert ScheduleConstraints(["weekends only", "no weekends"]).days[0] == "Monday"  # contradictory
+
+
+def test_milestone_roadmaps_from_the_planning_agent():
+    schedule = build_schedule({"milestones": [{"title": "Foundation", "focus": ["Python"], "tasks": ["Master fundamentals"]}]}, 5)
+
+    assert schedule.sprints[0].milestone_title == "Foundation"
+    assert "Master fundamentals" in schedule.sprints[0].days[0].topic
+
+
+@pytest.mark.asyncio
+async def test_generate_schedule_does_not_call_gemini_by_default():
+    client = MagicMock()
+    client.generate_content_async = AsyncMock()
+    with patch("app.agents.execution_agent.gemini_client", client):
+        schedule = await ExecutionAgent().generate_schedule(ROADMAP, 8, ["evenings"])
+
+    client.generate_content_async.assert_not_awaited()
+    assert len(schedule["sprints"]) == 4
+    assert all(_week <= 8 * 60 for _week in (sum(d["duration_min"] for d in s["days"]) for s in schedule["sprints"]))
+
+
+@pytest.mark.asyncio
+async def test_polish_rewrites_reminders_in_one_call():
+    schedule = build_schedule(ROADMAP, 8)
+    client = MagicMock()
+    client.generate_content_async = AsyncMock(return_value=MagicMock(text=json.dumps([f"Go {n}!" for n in range(28)])))
+    minutes = [day.duration_min for sprint in schedule.sprints for day in sprint.days]
+
+    assert await polish_reminders(schedule, client)
+    assert client.generate_content_async.await_count == 1
+    assert schedule.sprints[3].days[6].reminder_text == "Go 27!"
+    assert [day.duration_min for sprint in schedule.sprints for day in sprint.days] == minutes
+
+
+@pytest.mark.asyncio
+async def test_polish_keeps_templates_on_bad_reply():
+    schedule = build_schedule(ROADMAP, 8)
+    before = schedule.model_dump()
+    client = MagicMock()
+    client.generate_content_async = AsyncMock(return_value=MagicMock(text='["only one"]'))
+
+    assert not await polish_reminders(schedule, client)
+    assert schedule.model_dump() == before
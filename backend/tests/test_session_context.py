@@ -0,0 +1,78 @@
+import pytest
+import pytest_asyncio
+from contextlib import asynccontextmanager
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+import app.models.roadmap  # noqa: F401
+from app.agents.session_context import SessionContext
+from app.services.database_service import DatabaseService
+
+
+@pytest_asyncio.fixture
+async def db(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/context.db")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    @asynccontextmanager
+    async def get_session():
+        async with maker() as session:
+            yield session
+
+    monkeypatch.setattr("app.services.database_service.get_session", get_session)
+    yield DatabaseService("context_user")
+    await engine.dispose()
+
+
+def _listings(n):
+    return [{"title": f"Engineer {i}", "company": "Co", "description": "x" * 200} for i in range(n)]
+
+
+@pytest.mark.asyncio
+async def test_history_keeps_window_and_spills_overflow(db):
+    context = SessionContext(db, {"market_trend_history": []}, history_limit=5)
+    for cycle in range(12):
+        context["market_trend_history"].append({"cycle": cycle})
+
+    assert [entry["cycle"] for entry in context["market_trend_history"]] == [7, 8, 9, 10, 11]
+    assert context["market_trend_history"][-1]["cycle"] == 11
+
+    await context.enforce_budget()
+    usage = context.memory_usage()
+    assert usage["history"]["market_trend_history"] == {"in_memory": 5, "total": 12}
+
+    page = await context.load_history("market_trend_history", limit=4, offset=5)
+    assert [entry["cycle"] for entry in page] == [5, 6, 7, 8]
+    everything = await context.load_history("market_trend_history", limit=100)
+    assert [entry["cycle"] for entry in everything] == list(range(12))
+
+
+@pytest.mark.asyncio
+async def test_over_budget_values_spill_and_load_lazily(db):
+    research = {"listings": _listings(100), "analysis": {"emerging_trends": ["MLOps"]}}
+    context = SessionContext(db, {"research_data": research, "roadmap": {"milestones": []}}, budget_bytes=5_000)
+
+    spilled = await context.enforce_budget()
+
+    assert spilled == ["research_data"]
+    compact = context["research_data"]
+    assert compact["listings_count"] == 100
+    assert compact["analysis"] == {"emerging_trends": ["MLOps"]}
+    assert context.memory_usage()["total_bytes"] < 5_000
+
+    full = await context.fetch("research_data")
+    assert len(full["listings"]) == 100
+
+    # A fresh value replaces the spilled one
+    context["research_data"] = {"listings": []}
+    assert await context.fetch("research_data") == {"listings": []}
+    assert context.memory_usage()["spilled_keys"] == []
+
+
+@pytest.mark.asyncio
+async def test_under_budget_nothing_spills(db):
+    context = SessionContext(db, {"research_data": {"listings": _listings(2)}}, budget_bytes=1_000_000)
+    assert await context.enforce_budget() == []
+    assert len(context["research_data"]["listings"]) == 2
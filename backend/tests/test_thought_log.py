@@ -0,0 +1,63 @@
+import json
+import pytest
+from app.services.thought_log import ThoughtSignatureLog, compact_signatures
+
+
+def _sig(step, n):
+    return {"step": step, "metadata": {"cycle": n}, "timestamp": f"t{n}", "global_state": "IDLE"}
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines() if line.strip()]
+
+
+@pytest.mark.asyncio
+async def test_writes_are_batched_and_appended(tmp_path):
+    log = ThoughtSignatureLog(tmp_path / "sig.jsonl", batch_size=3, flush_interval=3600)
+
+    log.append(_sig("A", 1))
+    log.append(_sig("B", 2))
+    assert not log.path.exists()
+
+    log.append(_sig("C", 3))
+    await log._flush_task
+    assert [s["step"] for s in _lines(log.path)] == ["A", "B", "C"]
+
+    log.append(_sig("D", 4))
+    await log.flush()
+    assert [s["step"] for s in _lines(log.path)] == ["A", "B", "C", "D"]
+
+
+@pytest.mark.asyncio
+async def test_tail_is_bounded(tmp_path):
+    log = ThoughtSignatureLog(tmp_path / "sig.jsonl", batch_size=1000, tail_size=5)
+    for n in range(50):
+        log.append(_sig("PROGRESS_CHECK", n))
+    await log.flush()
+
+    assert len(log.tail) == 5
+    assert log.last()["metadata"]["cycle"] == 49
+    assert len(_lines(log.path)) == 50
+
+
+@pytest.mark.asyncio
+async def test_rotation_compacts_heartbeats(tmp_path):
+    log = ThoughtSignatureLog(tmp_path / "sig.jsonl", batch_size=1000, max_bytes=200, backup_count=2)
+    log.append(_sig("PIPELINE_COMPLETE", 0))
+    for n in range(1, 10):
+        log.append(_sig("PROGRESS_CHECK", n))
+    await log.flush()
+
+    assert not log.path.exists()
+    rotated = _lines(tmp_path / "sig.jsonl.1")
+    assert [s["step"] for s in rotated] == ["PIPELINE_COMPLETE", "PROGRESS_CHECK"]
+    assert rotated[1]["collapsed"]["count"] == 9
+
+    reloaded = ThoughtSignatureLog(tmp_path / "sig.jsonl")
+    reloaded.load_tail()
+    assert reloaded.last()["step"] == "PROGRESS_CHECK"
+
+
+def test_compaction_keeps_non_heartbeat_runs():
+    signatures = [_sig("MARKET_SHIFT_DETECTED", 1), _sig("MARKET_SHIFT_DETECTED", 2)]
+    assert len(compact_signatures(signatures)) == 2
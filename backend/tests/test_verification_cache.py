@@ -0,0 +1,186 @@
+import threading
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+import pytest
+import pytest_asyncio
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from app.agents.execution_agent import ExecutionAgent
+from app.agents.verification_pipeline import VerificationPipeline
+from app.services import http_pool, sandbox_pool
+from app.services.http_pool import HttpPool
+from app.services.sandbox_pool import SandboxPool
+from app.services.verification_cache import VerificationCache, normalize_url
+
+PAGE = "<html><body>" + "".join(
+    f"<pre>def example_{n}(value):\n    return value * {n}\n</pre>" for n in range(5)
+) + "<p>" + "x" * 5000 + "</p></body></html>"
+
+
+class CountingServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, handler):
+        super().__init__(address, handler)
+        self.lock = threading.Lock()
+        self.full = 0  # 200 responses with a body
+        self.not_modified = 0
+        self.version = "v1"
+
+
+class ValidatorHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        etag = f'"{server.version}"'
+        # /etag/* pages send validators; /plain/* pages don't, so only the content hash can match
+        if self.path.startswith("/etag") and self.headers.get("If-None-Match") == etag:
+            with server.lock:
+                server.not_modified += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        body = (PAGE if server.version == "v1" else PAGE.replace("example_", "changed_")).encode()
+        with server.lock:
+            server.full += 1
+        self.send_response(200)
+        if self.path.startswith("/etag"):
+            self.send_header("ETag", etag)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = CountingServer(("127.0.0.1", 0), ValidatorHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def pools(monkeypatch):
+    http = HttpPool(timeout=5)
+    sandbox = SandboxPool(size=1, timeout=5, execute=False)
+    monkeypatch.setattr(http_pool, "_http_pool", http)
+    monkeypatch.setattr(sandbox_pool, "_sandbox_pool", sandbox)
+    yield
+    await http.aclose()
+    await sandbox.close()
+
+
+class FixtureAgent(ExecutionAgent):
+    def __init__(self):
+        super().__init__()
+        self.sandboxed = 0
+
+    async def _search_resources_for_milestone(self, milestone):
+        return [{"name": url.rsplit("/", 1)[-1], "url": url} for url in milestone["urls"]]
+
+    async def _test_code_in_sandbox(self, code_blocks):
+        self.sandboxed += 1
+        return await super()._test_code_in_sandbox(code_blocks)
+
+
+async def _verify(cache, urls):
+    agent = FixtureAgent()
+    pipeline = VerificationPipeline(agent, cache=cache)
+    results = await pipeline.run([{"title": "Basics", "urls": urls}])
+    return [verification for _, verification in results], agent
+
+
+def _age(cache, url):
+    cache._entries[normalize_url(url)].checked_at = datetime.utcnow() - timedelta(hours=2)
+
+
+def test_normalize_url():
+    assert normalize_url("HTTPS://Developer.Mozilla.org:443/en-US/docs/?b=2&a=1&utm_source=x#intro") == \
+        "https://developer.mozilla.org/en-US/docs?a=1&b=2"
+    assert normalize_url("http://example.com") == "http://example.com/"
+    assert normalize_url("http://example.com:8080/a/") == "http://example.com:8080/a"
+
+
+@pytest.mark.asyncio
+async def test_fresh_entries_skip_the_network(server):
+    cache = VerificationCache(persist=False, fresh_seconds=3600)
+    url = f"{server.url}/etag/page"
+
+    first, agent = await _verify(cache, [url])
+    second, agent = await _verify(cache, [url + "#section"])
+
+    assert first[0]["verified"] and second == first
+    assert server.full == 1 and server.not_modified == 0
+    assert agent.sandboxed == 0
+    assert cache.stats()["fresh_hits"] == 1
+    assert cache.stats()["bytes_saved"] == len(PAGE)
+
+
+@pytest.mark.asyncio
+async def test_stale_entries_are_revalidated_with_conditional_get(server):
+    cache = VerificationCache(persist=False, fresh_seconds=3600)
+    etag_url, plain_url = f"{server.url}/etag/page", f"{server.url}/plain/page"
+    await _verify(cache, [etag_url, plain_url])
+    _age(cache, etag_url)
+    _age(cache, plain_url)
+
+    results, agent = await _verify(cache, [etag_url, plain_url])
+
+    assert all(result["verified"] for result in results)
+    assert server.not_modified == 1  # etag page: 304
+    assert server.full == 3  # plain page re-downloaded, but its hash matched
+    assert agent.sandboxed == 0
+    stats = cache.stats()
+    assert (stats["revalidated"], stats["unchanged"], stats["misses"]) == (1, 1, 2)
+    assert stats["hit_rate"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_changed_content_is_verified_again(server):
+    cache = VerificationCache(persist=False, fresh_seconds=3600)
+    url = f"{server.url}/etag/page"
+    await _verify(cache, [url])
+    _age(cache, url)
+    server.version = "v2"
+
+    results, agent = await _verify(cache, [url])
+
+    assert agent.sandboxed == 1
+    assert cache.stats()["changed"] == 1
+    entry = cache._entries[normalize_url(url)]
+    assert entry.etag == '"v2"'
+    assert "changed_0" in entry.code_blocks[0]["code"]
+
+
+@pytest.mark.asyncio
+async def test_entries_persist_across_cache_instances(server, tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/cache.db")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    @asynccontextmanager
+    async def get_session():
+        async with maker() as session:
+            yield session
+
+    monkeypatch.setattr("app.services.verification_cache.get_session", get_session)
+    url = f"{server.url}/etag/page"
+    await _verify(VerificationCache(persist=True), [url])
+
+    restarted = VerificationCache(persist=True, fresh_seconds=0)
+    results, agent = await _verify(restarted, [url])
+    await engine.dispose()
+
+    assert results[0]["verified"]
+    assert agent.sandboxed == 0
+    assert restarted.stats()["revalidated"] == 1
@@ -0,0 +1,150 @@
+import asyncio
+import threading
+import time
+import pytest
+import pytest_asyncio
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from app.agents.execution_agent import ExecutionAgent
+from app.agents.verification_pipeline import VerificationPipeline
+from app.services import http_pool
+from app.services.http_pool import HttpPool
+from app.services import sandbox_pool
+from app.services.sandbox_pool import SandboxPool
+from app.services import verification_cache
+from app.services.verification_cache import VerificationCache
+
+GOOD_PAGE = "<html><body>" + "".join(
+    f"<pre>def example_{n}(value):\n    return value * {n}\n</pre>" for n in range(5)
+) + "<p>" + "x" * 5000 + "</p></body></html>"
+
+
+class FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, handler):
+        super().__init__(address, handler)
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0  # most requests served at once
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+        try:
+            if self.path.startswith("/slow"):
+                time.sleep(float(self.path.rsplit("/", 1)[-1]))
+            if self.path.startswith("/missing"):
+                self.send_response(404)
+                self.end_headers()
+                return
+            body = (GOOD_PAGE if "good" in self.path or self.path.startswith("/slow") else "<p>no code here</p>").encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fixture_server():
+    server = FixtureServer(("127.0.0.1", 0), FixtureHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = HttpPool(per_host=2, timeout=5)
+    monkeypatch.setattr(http_pool, "_http_pool", pool)
+    return pool
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def sandbox(monkeypatch):
+    sandbox = SandboxPool(size=2, timeout=5, execute=False)
+    monkeypatch.setattr(sandbox_pool, "_sandbox_pool", sandbox)
+    yield sandbox
+    await sandbox.close()
+
+
+@pytest.fixture(autouse=True)
+def cache(monkeypatch):
+    cache = VerificationCache(persist=False)
+    monkeypatch.setattr(verification_cache, "_verification_cache", cache)
+    return cache
+
+
+class FixtureAgent(ExecutionAgent):
+    async def _search_resources_for_milestone(self, milestone):
+        return [{"name": url.rsplit("/", 1)[-1], "url": url} for url in milestone["urls"]]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_verifies_candidates_in_search_order(fixture_server, pool):
+    milestones = [
+        {"title": "Basics", "urls": [f"{fixture_server.url}/good/1", f"{fixture_server.url}/missing/2"]},
+        {"title": "Advanced", "urls": [f"{fixture_server.url}/plain/3", f"{fixture_server.url}/good/4"]}
+    ]
+    pipeline = VerificationPipeline(FixtureAgent())
+    results = await pipeline.run(milestones)
+    await pool.aclose()
+
+    assert [resource["name"] for resource, _ in results] == ["1", "2", "3", "4"]
+    assert [verification["verified"] for _, verification in results] == [True, False, False, True]
+    assert results[1][1]["summary"] == "Failed to scrape content"
+    assert results[2][1]["summary"] == "No code examples found"
+    assert pipeline.stats()["sandboxed"] == 2
+    assert fixture_server.peak <= 2  # per-host limit
+
+
+@pytest.mark.asyncio
+async def test_find_and_verify_resources_uses_the_pipeline(fixture_server, pool):
+    agent = FixtureAgent()
+    verified = await agent.find_and_verify_resources({
+        "milestones": [{"title": "Basics", "urls": [f"{fixture_server.url}/good/a", f"{fixture_server.url}/plain/b"]}]
+    })
+    await pool.aclose()
+
+    assert [resource["name"] for resource in verified] == ["a"]
+    assert verified[0]["verification_score"] > 0.8
+
+
+@pytest.mark.asyncio
+async def test_deadline_returns_partial_results(fixture_server, pool):
+    milestones = [{"title": "Slow", "urls": [f"{fixture_server.url}/slow/{n}/2" for n in range(3)]}]
+    pipeline = VerificationPipeline(FixtureAgent(), deadline=0.3)
+
+    started = time.monotonic()
+    results = await pipeline.run(milestones)
+    await pool.aclose()
+
+    assert time.monotonic() - started < 1.5
+    assert pipeline.stats()["deadline_hit"]
+    assert {verification["summary"] for _, verification in results} == {"Verification deadline reached"}
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_one_client_and_limits_per_host(fixture_server):
+    pool = HttpPool(per_host=2, timeout=5)
+    client = pool.client
+    responses = await asyncio.gather(*(pool.get(f"{fixture_server.url}/slow/{n}/0.05") for n in range(6)))
+
+    assert all(response.status_code == 200 for response in responses)
+    assert pool.client is client
+    assert fixture_server.peak <= 2
+    assert pool.stats()["host_waits"] >= 1
+    await pool.aclose()
@@ -4,6 +4,7 @@ import { useEffect, useState, useRef } from "react";
 import { Terminal, Activity, Wifi, ShieldCheck, Zap } from "lucide-react";
 
 const API_URL = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000";
+const MAX_LOGS = 200;
 
 export default function MissionDashboard() {
     const [logs, setLogs] = useState<any[]>([]);
@@ -11,19 +12,42 @@ export default function MissionDashboard() {
     const logsContainerRef = useRef<HTMLDivElement>(null);
 
     useEffect(() => {
-        const interval = setInterval(async () => {
+        // Only new events are sent: pushed over SSE, or fetched with the ?since= cursor as a fallback
+        let cursor = 0;
+        let interval: ReturnType<typeof setInterval> | null = null;
+
+        const append = (incoming: any[]) => {
+            if (incoming.length === 0) return;
+            cursor = incoming[incoming.length - 1].seq;
+            setLogs(prev => [...prev, ...incoming].slice(-MAX_LOGS));
+            setStatus("ACTIVE");
+        };
+
+        const poll = async () => {
             try {
-                const res = await fetch(`${API_URL}/api/mission/logs`);
+                const res = await fetch(`${API_URL}/api/mission/logs?since=${cursor}`);
                 const data = await res.json();
                 if (data.logs) {
-                    setLogs(data.logs);
+                    append(data.logs);
                 }
             } catch (e) {
                 setStatus("CONNECTING...");
             }
-        }, 2000);
+        };
+
+        let source: EventSource | null = null;
+        if (typeof EventSource !== "undefined") {
+            source = new EventSource(`${API_URL}/api/mission/stream`);
+            source.onmessage = (event) => append([JSON.parse(event.data)]);
+            source.onerror = () => setStatus("CONNECTING...");  // EventSource reconnects with Last-Event-ID
+        } else {
+            interval = setInterval(poll, 2000);
+        }
 
-        return () => clearInterval(interval);
+        return () => {
+            source?.close();
+            if (interval) clearInterval(interval);
+        };
     }, []);
 
     useEffect(() => {
@@ -64,8 +88,8 @@ export default function MissionDashboard() {
                     className="p-6 pt-16 h-[300px] overflow-y-auto custom-scrollbar space-y-2"
                 >
                     {logs.length === 0 && <div className="text-slate-600 italic">Establishing link to Mission Control...</div>}
-                    {logs.map((log, i) => (
-                        <div key={i} className="flex gap-4 animate-fade-in">
+                    {logs.map((log) => (
+                        <div key={log.seq} className="flex gap-4 animate-fade-in">
                             <span className="text-slate-600 shrink-0">[{log.timestamp.split('T')[1].split('.')[0]}]</span>
                             <span className={`font-bold shrink-0 w-32 ${log.source === "ALERT" ? "text-red-500" :
                                     log.source === "DECISION" ? "text-accent" :